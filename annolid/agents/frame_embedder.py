@@ -2,9 +2,10 @@ import asyncio
 import logging
 from pathlib import Path
 from random import sample
-from typing import Any, Dict, List, Optional
+from typing import Any, Dict, List, Optional, Sequence
 
 import lancedb
+import numpy as np
 from lancedb.embeddings import EmbeddingFunctionRegistry
 from lancedb.pydantic import Vector
 from watchdog.events import FileSystemEventHandler
@@ -34,6 +35,32 @@ registry = EmbeddingFunctionRegistry.get_instance()
 clip = registry.get("open-clip").create()
 
 
+def embed_images(images: Sequence[Any], batch_size: int = 32) -> np.ndarray:
+    """Embed RGB frames (arrays or PIL images) with the CLIP model in batches.
+
+    Returns L2-normalized float32 vectors, one row per image.
+    """
+    import torch
+    from PIL import Image
+
+    pils = [
+        image if isinstance(image, Image.Image) else Image.fromarray(image)
+        for image in images
+    ]
+    if not pils:
+        return np.zeros((0, clip.ndims()), dtype=np.float32)
+    batch_size = max(1, int(batch_size))
+    chunks = []
+    with torch.no_grad():
+        for start in range(0, len(pils), batch_size):
+            batch = torch.stack(
+                [clip._preprocess(image) for image in pils[start : start + batch_size]]
+            )
+            features = clip._model.encode_image(batch.to(clip.device)).float()
+            chunks.append(torch.nn.functional.normalize(features, dim=-1).cpu().numpy())
+    return np.concatenate(chunks).astype(np.float32, copy=False)
+
+
 class LanceDBFrameIndexer:
     def __init__(
         self, db_path: str = Config.DB_PATH, table_name: str = Config.TABLE_NAME
@@ -0,0 +1,694 @@
+"""Project-level approximate nearest-neighbour index over video frames.
+
+The index is an IVF-PQ structure built locally with numpy: a coarse k-means
+quantizer splits the embedding space into ``nlist`` cells and each frame
+is scanned as its cell plus a product-quantized residual (``m`` bytes). A
+query scores the ``nprobe`` closest cells with one lookup table, so its cost
+depends on the cell sizes rather than on the corpus size. ``nlist`` has to
+track the corpus (about ``4 * sqrt(frames)``) to keep latency flat: call
+:meth:`ProjectFrameIndex.train` on a corpus-wide sample sized for the target
+corpus, or let the index retrain and re-encode itself once the corpus has
+outgrown the trained ``nlist`` (see :meth:`ProjectFrameIndex.retrain`). The
+few best candidates are re-ranked against float16 copies of the embeddings,
+which stay on disk and are only paged in for those rows.
+
+Layout under the index root::
+
+    meta.json          dimensions, embedder, registered videos, segments
+    coarse.npy         (nlist, dim) float32 coarse centroids
+    codebooks.npy      (m, ksub, dim // m) float32 residual codebooks
+    seg_000000/        one immutable segment per ingestion batch
+        codes.npy      (n, m) uint8 residual codes, rows grouped by cell
+        ids.npy        (n, 2) int32 (video id, frame index)
+        offsets.npy    (nlist + 1,) int64 first row of each cell
+        vectors.npy    (n, dim) float16 embeddings used to re-rank candidates
+
+New videos are appended as new segments, so adding a video never rewrites
+the existing ones; once there are more than ``max_segments`` segments they
+are merged into one. Re-adding a changed video retires its old rows.
+Embeddings are L2-normalized, so scores approximate cosine similarity.
+"""
+
+from __future__ import annotations
+
+import argparse
+import json
+import os
+import shutil
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Any, Callable, Dict, List, Optional, Sequence, Tuple
+
+import cv2
+import numpy as np
+
+from annolid.utils.logger import logger
+
+META_FILENAME = "meta.json"
+COARSE_FILENAME = "coarse.npy"
+CODEBOOKS_FILENAME = "codebooks.npy"
+_FORMAT_VERSION = 1
+_MAX_TRAIN_ROWS = 262144
+_TRAIN_ROWS_PER_CENTROID = 64
+_PQ_TRAIN_ROWS = 65536
+_DISTANCE_CHUNK_ROWS = 16384
+# Retrain once the nlist sized for the corpus is this many times the trained one.
+_RETRAIN_NLIST_GROWTH = 2
+
+ImageEmbedder = Callable[[Sequence[np.ndarray]], np.ndarray]
+
+
+@dataclass(frozen=True)
+class FrameHit:
+    video_path: str
+    frame_index: int
+    score: float
+
+    def to_dict(self) -> Dict[str, object]:
+        return {
+            "video_path": self.video_path,
+            "frame_index": int(self.frame_index),
+            "score": float(self.score),
+        }
+
+
+def _l2_normalize_rows(vectors: np.ndarray) -> np.ndarray:
+    vectors = np.asarray(vectors, dtype=np.float32)
+    norms = np.linalg.norm(vectors, axis=-1, keepdims=True)
+    return vectors / np.maximum(norms, 1e-12)
+
+
+def _nearest_centroids(x: np.ndarray, centroids: np.ndarray) -> np.ndarray:
+    """Index of the L2-nearest centroid for each row of ``x``."""
+    sq_norms = np.einsum("ij,ij->i", centroids, centroids)
+    out = np.empty(len(x), dtype=np.int64)
+    for start in range(0, len(x), _DISTANCE_CHUNK_ROWS):
+        chunk = x[start : start + _DISTANCE_CHUNK_ROWS]
+        out[start : start + len(chunk)] = np.argmin(
+            sq_norms[None, :] - 2.0 * (chunk @ centroids.T), axis=1
+        )
+    return out
+
+
+def _kmeans(
+    x: np.ndarray, k: int, iterations: int, rng: np.random.Generator
+) -> np.ndarray:
+    k = max(1, min(int(k), len(x)))
+    centroids = x[rng.choice(len(x), k, replace=False)].astype(np.float32)
+    for _ in range(max(1, int(iterations))):
+        assign = _nearest_centroids(x, centroids)
+        counts = np.bincount(assign, minlength=k)
+        order = np.argsort(assign, kind="stable")
+        nonempty = np.flatnonzero(counts)
+        starts = np.concatenate(([0], np.cumsum(counts)[:-1]))[nonempty]
+        sums = np.add.reduceat(x[order], starts, axis=0)
+        centroids[nonempty] = sums / counts[nonempty, None]
+        empty = np.flatnonzero(counts == 0)
+        if empty.size:
+            centroids[empty] = x[rng.choice(len(x), empty.size, replace=False)]
+    return centroids
+
+
+def _default_nlist(rows: int) -> int:
+    return max(1, min(65536, round(4 * np.sqrt(max(0, int(rows))))))
+
+
+def _default_subquantizers(dim: int) -> int:
+    # Sub-vectors of about four dimensions, at most 64 bytes per frame.
+    for m in range(max(1, min(64, dim // 4)), 0, -1):
+        if dim % m == 0:
+            return m
+    return 1
+
+
+class ProjectFrameIndex:
+    """IVF-PQ frame index shared by all videos of a project."""
+
+    def __init__(
+        self,
+        root: Path,
+        *,
+        max_segments: int = 16,
+        store_vectors: bool = True,
+        auto_retrain: bool = True,
+    ) -> None:
+        self.root = Path(root).expanduser()
+        self.max_segments = max(1, int(max_segments))
+        self.store_vectors = bool(store_vectors)
+        self.auto_retrain = bool(auto_retrain)
+        self._meta: Dict[str, object] = {
+            "version": _FORMAT_VERSION,
+            "embedder": None,
+            "videos": {},
+            "next_video_id": 0,
+            "retired_video_ids": [],
+            "segments": [],
+            "next_segment": 0,
+        }
+        self._coarse: Optional[np.ndarray] = None
+        self._codebooks: Optional[np.ndarray] = None
+        self._segments: Dict[str, Tuple[Any, ...]] = {}
+        meta_path = self.root / META_FILENAME
+        if meta_path.exists():
+            self._meta.update(json.loads(meta_path.read_text(encoding="utf-8")))
+            if (self.root / COARSE_FILENAME).exists():
+                self._coarse = np.load(self.root / COARSE_FILENAME)
+                self._codebooks = np.load(self.root / CODEBOOKS_FILENAME)
+
+    @property
+    def is_trained(self) -> bool:
+        return self._coarse is not None
+
+    @property
+    def nlist(self) -> int:
+        return 0 if self._coarse is None else int(self._coarse.shape[0])
+
+    @property
+    def dim(self) -> Optional[int]:
+        return None if self._coarse is None else int(self._coarse.shape[1])
+
+    @property
+    def videos(self) -> List[str]:
+        return sorted(self._meta["videos"])
+
+    def __len__(self) -> int:
+        return sum(
+            int(entry.get("frames", 0)) for entry in self._meta["videos"].values()
+        )
+
+    def train(
+        self,
+        vectors: np.ndarray,
+        *,
+        nlist: Optional[int] = None,
+        m: Optional[int] = None,
+        iterations: int = 10,
+        seed: int = 0,
+    ) -> None:
+        """Fit the coarse quantizer and residual codebooks on sample embeddings.
+
+        Pass a sample drawn from the whole corpus and an ``nlist`` sized for
+        the corpus the index is expected to reach; by default ``nlist`` is
+        sized for the sample itself.
+        """
+        if self.is_trained:
+            raise RuntimeError(f"Frame index {self.root} is already trained.")
+        x = _l2_normalize_rows(vectors)
+        if x.ndim != 2 or not len(x):
+            raise ValueError("Training needs a non-empty (n, dim) array.")
+        coarse, codebooks = self._fit(x, nlist, m, iterations, seed)
+        self._save_quantizer(coarse, codebooks)
+        self._save_meta()
+
+    def retrain(
+        self,
+        *,
+        nlist: Optional[int] = None,
+        iterations: int = 10,
+        seed: int = 0,
+    ) -> None:
+        """Refit the quantizer on the indexed embeddings and re-encode all rows.
+
+        ``nlist`` defaults to the size for the current corpus. Each segment is
+        re-encoded into a new one, so peak memory stays at one segment plus
+        the training sample. Needs the stored float16 embeddings.
+        """
+        names = list(self._meta["segments"])
+        if not self.is_trained or not names:
+            return
+        if any(self._segment(name)[3] is None for name in names):
+            raise RuntimeError(
+                f"Frame index {self.root} has no stored embeddings to retrain on."
+            )
+        rng = np.random.default_rng(seed)
+        retired = np.asarray(self._meta["retired_video_ids"], dtype=np.int32)
+        live_rows = [self._live_rows(name, retired) for name in names]
+        total = sum(int(rows.size) for rows in live_rows)
+        if not total:
+            return
+        nlist = int(nlist or _default_nlist(total))
+        sample_share = min(1.0, _MAX_TRAIN_ROWS / total)
+        sample = []
+        for name, rows in zip(names, live_rows):
+            count = int(np.ceil(rows.size * sample_share))
+            picked = np.sort(rng.choice(rows, count, replace=False))
+            sample.append(np.asarray(self._segment(name)[3][picked], np.float32))
+        m = int(self._codebooks.shape[0])
+        coarse, codebooks = self._fit(
+            np.concatenate(sample), nlist, m, iterations, seed
+        )
+        logger.info(
+            "Retraining frame index %s: nlist %d -> %d over %d frames",
+            self.root,
+            self.nlist,
+            int(coarse.shape[0]),
+            total,
+        )
+        self._coarse, self._codebooks = coarse, codebooks
+        self._segments.clear()
+        self._meta["segments"] = []
+        for name, rows in zip(names, live_rows):
+            if not rows.size:
+                continue
+            _codes, ids, _offsets, vectors = self._segment(name)
+            x = np.asarray(vectors[rows], dtype=np.float32)
+            self._write_segment(*self._encode(x), np.asarray(ids[rows]), x)
+        self._meta["retired_video_ids"] = []
+        self._save_quantizer(coarse, codebooks)
+        self._save_meta()
+        for name in names:
+            self._segments.pop(name, None)
+            shutil.rmtree(self.root / name, ignore_errors=True)
+
+    @staticmethod
+    def _fit(
+        x: np.ndarray,
+        nlist: Optional[int],
+        m: Optional[int],
+        iterations: int,
+        seed: int,
+    ) -> Tuple[np.ndarray, np.ndarray]:
+        rng = np.random.default_rng(seed)
+        dim = int(x.shape[1])
+        m = int(m or _default_subquantizers(dim))
+        if dim % m:
+            raise ValueError(f"Embedding dimension {dim} is not divisible by m={m}.")
+        nlist = int(nlist or _default_nlist(len(x)))
+        # A few dozen samples per centroid are enough for k-means.
+        limit = min(_MAX_TRAIN_ROWS, _TRAIN_ROWS_PER_CENTROID * max(nlist, 256))
+        if len(x) > limit:
+            x = x[rng.choice(len(x), limit, replace=False)]
+        coarse = _kmeans(x, nlist, iterations, rng)
+        residuals = x - coarse[_nearest_centroids(x, coarse)]
+        if len(residuals) > _PQ_TRAIN_ROWS:
+            sample = rng.choice(len(residuals), _PQ_TRAIN_ROWS, replace=False)
+            residuals = residuals[sample]
+        dsub = dim // m
+        ksub = min(256, len(residuals))
+        codebooks = np.zeros((m, ksub, dsub), dtype=np.float32)
+        for sub in range(m):
+            part = np.ascontiguousarray(residuals[:, sub * dsub : (sub + 1) * dsub])
+            trained = _kmeans(part, ksub, iterations, rng)
+            codebooks[sub, : len(trained)] = trained
+        return coarse, codebooks
+
+    def _save_quantizer(self, coarse: np.ndarray, codebooks: np.ndarray) -> None:
+        self.root.mkdir(parents=True, exist_ok=True)
+        for filename, array in (
+            (COARSE_FILENAME, coarse),
+            (CODEBOOKS_FILENAME, codebooks),
+        ):
+            temp_path = self.root / f".{filename}.{os.getpid()}.tmp"
+            with open(temp_path, "wb") as handle:
+                np.save(handle, array)
+            os.replace(temp_path, self.root / filename)
+        self._coarse = coarse
+        self._codebooks = codebooks
+
+    def add_vectors(
+        self,
+        video_path: Path,
+        frame_indices: Sequence[int],
+        vectors: np.ndarray,
+        *,
+        embedder: Optional[str] = None,
+    ) -> int:
+        """Index one video's frame embeddings, replacing any earlier version.
+
+        An untrained index is trained on these vectors first. With
+        ``auto_retrain`` the index is retrained and re-encoded once the corpus
+        has outgrown that quantizer; see :meth:`retrain`.
+        """
+        x = _l2_normalize_rows(vectors)
+        if x.ndim != 2 or len(x) != len(frame_indices):
+            raise ValueError(
+                f"Expected {len(frame_indices)} embedding rows, got shape {x.shape}"
+            )
+        self._check_embedder(embedder)
+        if len(x) and not self.is_trained:
+            self.train(x)
+        if len(x) and x.shape[1] != self.dim:
+            raise ValueError(
+                f"Embedding dimension {x.shape[1]} does not match index ({self.dim})"
+            )
+        key = str(Path(video_path).expanduser().resolve())
+        self._retire(key)
+        video_id = int(self._meta["next_video_id"])
+        self._meta["next_video_id"] = video_id + 1
+        stat = Path(key).stat() if Path(key).exists() else None
+        self._meta["videos"][key] = {
+            "id": video_id,
+            "size": stat.st_size if stat else None,
+            "mtime_ns": stat.st_mtime_ns if stat else None,
+            "frames": int(len(x)),
+        }
+        if len(x):
+            ids = np.column_stack(
+                (
+                    np.full(len(x), video_id, dtype=np.int32),
+                    np.asarray(frame_indices, dtype=np.int32),
+                )
+            )
+            vectors = x if self.store_vectors else None
+            self._write_segment(*self._encode(x), ids, vectors)
+        self._save_meta()
+        if self._outgrown():
+            self.retrain()
+        elif len(self._meta["segments"]) > self.max_segments:
+            self.compact()
+        return int(len(x))
+
+    def add_video(
+        self,
+        video_path: Path,
+        embed_images: Optional[ImageEmbedder] = None,
+        *,
+        stride: int = 1,
+        batch_size: int = 32,
+        max_frames: Optional[int] = None,
+        force: bool = False,
+    ) -> int:
+        """Decode every ``stride``-th frame, embed in batches and index them.
+
+        Videos whose size and modification time are unchanged since they were
+        indexed are skipped unless ``force`` is set. ``embed_images`` maps a
+        list of RGB frames to an (n, dim) array and defaults to the CLIP
+        embedder of :mod:`annolid.agents.frame_embedder`.
+        """
+        key = str(Path(video_path).expanduser().resolve())
+        entry = self._meta["videos"].get(key)
+        stat = Path(key).stat()
+        if (
+            entry is not None
+            and not force
+            and entry.get("size") == stat.st_size
+            and entry.get("mtime_ns") == stat.st_mtime_ns
+        ):
+            logger.info("Skipping unchanged video %s", key)
+            return 0
+        embedder_name = None
+        if embed_images is None:
+            from annolid.agents.frame_embedder import embed_images as clip_embed
+
+            embed_images = clip_embed
+            embedder_name = "open-clip"
+        frames, vectors = self._embed_video(
+            key, embed_images, max(1, int(stride)), max(1, int(batch_size)), max_frames
+        )
+        return self.add_vectors(key, frames, vectors, embedder=embedder_name)
+
+    def remove_video(self, video_path: Path) -> bool:
+        key = str(Path(video_path).expanduser().resolve())
+        if key not in self._meta["videos"]:
+            return False
+        self._retire(key)
+        self._save_meta()
+        return True
+
+    def search(
+        self,
+        query: np.ndarray,
+        *,
+        k: int = 10,
+        nprobe: int = 16,
+        refine: int = 4,
+    ) -> List[FrameHit]:
+        """Approximate top-``k`` frames by cosine similarity to ``query``.
+
+        The best ``k * refine`` candidates by PQ score are re-scored with the
+        stored float16 embeddings; ``refine=0`` returns PQ scores directly.
+        """
+        if not self.is_trained or not self._meta["segments"]:
+            return []
+        q = _l2_normalize_rows(np.asarray(query, dtype=np.float32).reshape(1, -1))[0]
+        coarse, codebooks = self._coarse, self._codebooks
+        m, ksub, dsub = codebooks.shape
+        nprobe = max(1, min(int(nprobe), self.nlist))
+        coarse_sq = np.einsum("ij,ij->i", coarse, coarse)
+        cell_scores = coarse @ q
+        probe = np.argpartition(coarse_sq - 2.0 * cell_scores, nprobe - 1)[:nprobe]
+        lut = np.einsum("jd,jkd->jk", q.reshape(m, dsub), codebooks).ravel()
+        lut_offsets = np.arange(m, dtype=np.intp) * ksub
+        retired = np.asarray(self._meta["retired_video_ids"], dtype=np.int32)
+
+        scores: List[np.ndarray] = []
+        hits: List[np.ndarray] = []
+        rows: List[np.ndarray] = []
+        for seg_no, name in enumerate(self._meta["segments"]):
+            codes, ids, offsets, _vectors = self._segment(name)
+            for cell in probe:
+                start, stop = int(offsets[cell]), int(offsets[cell + 1])
+                if start == stop:
+                    continue
+                cell_codes = np.asarray(codes[start:stop], dtype=np.intp)
+                scores.append(
+                    cell_scores[cell] + lut[cell_codes + lut_offsets].sum(axis=1)
+                )
+                hits.append(np.asarray(ids[start:stop]))
+                rows.append(
+                    np.column_stack(
+                        (np.full(stop - start, seg_no), np.arange(start, stop))
+                    )
+                )
+        if not scores:
+            return []
+        all_scores = np.concatenate(scores)
+        all_ids = np.concatenate(hits)
+        all_rows = np.concatenate(rows)
+        if retired.size:
+            live = ~np.isin(all_ids[:, 0], retired)
+            all_scores, all_ids, all_rows = (
+                all_scores[live],
+                all_ids[live],
+                all_rows[live],
+            )
+        k = max(1, int(k))
+        pool = k * max(1, int(refine))
+        if len(all_scores) > pool:
+            top = np.argpartition(-all_scores, pool - 1)[:pool]
+        else:
+            top = np.arange(len(all_scores))
+        if refine:
+            self._rescore(q, top, all_scores, all_rows)
+        top = top[np.argsort(-all_scores[top], kind="stable")][:k]
+        paths = {int(entry["id"]): path for path, entry in self._meta["videos"].items()}
+        return [
+            FrameHit(
+                video_path=paths.get(int(all_ids[i, 0]), ""),
+                frame_index=int(all_ids[i, 1]),
+                score=float(all_scores[i]),
+            )
+            for i in top
+        ]
+
+    def compact(self) -> None:
+        """Merge all segments into one and drop rows of retired videos."""
+        names = list(self._meta["segments"])
+        if not names:
+            return
+        retired = np.asarray(self._meta["retired_video_ids"], dtype=np.int32)
+        parts: List[Tuple[np.ndarray, ...]] = []
+        for name in names:
+            codes, ids, offsets, vectors = self._segment(name)
+            cells = np.repeat(np.arange(self.nlist), np.diff(offsets))
+            keep = self._live_rows(name, retired)
+            parts.append(
+                (
+                    cells[keep],
+                    np.asarray(codes[keep]),
+                    np.asarray(ids[keep]),
+                    None if vectors is None else np.asarray(vectors[keep]),
+                )
+            )
+        self._segments.clear()
+        self._meta["segments"] = []
+        cells, codes, ids = (np.concatenate([p[i] for p in parts]) for i in range(3))
+        vectors = None
+        if all(p[3] is not None for p in parts):
+            vectors = np.concatenate([p[3] for p in parts])
+        if len(codes):
+            self._write_segment(cells, codes, ids, vectors)
+        self._meta["retired_video_ids"] = []
+        self._save_meta()
+        for name in names:
+            shutil.rmtree(self.root / name, ignore_errors=True)
+
+    def _rescore(
+        self,
+        q: np.ndarray,
+        top: np.ndarray,
+        scores: np.ndarray,
+        rows: np.ndarray,
+    ) -> None:
+        """Replace PQ scores of the ``top`` candidates with exact ones in place."""
+        for seg_no, name in enumerate(self._meta["segments"]):
+            vectors = self._segment(name)[3]
+            if vectors is None:
+                continue
+            picked = top[rows[top, 0] == seg_no]
+            if not picked.size:
+                continue
+            picked = picked[np.argsort(rows[picked, 1])]
+            exact = np.asarray(vectors[rows[picked, 1]], dtype=np.float32) @ q
+            scores[picked] = exact
+
+    def _check_embedder(self, embedder: Optional[str]) -> None:
+        if embedder is None:
+            return
+        current = self._meta.get("embedder")
+        if current is None:
+            self._meta["embedder"] = embedder
+        elif current != embedder:
+            raise ValueError(
+                f"Frame index {self.root} holds {current!r} embeddings, not {embedder!r}."
+            )
+
+    def _outgrown(self) -> bool:
+        if not self.auto_retrain or not self.is_trained or not self.store_vectors:
+            return False
+        return _default_nlist(len(self)) >= _RETRAIN_NLIST_GROWTH * self.nlist
+
+    def _live_rows(self, name: str, retired: np.ndarray) -> np.ndarray:
+        ids = self._segment(name)[1]
+        if not retired.size:
+            return np.arange(len(ids))
+        return np.flatnonzero(~np.isin(ids[:, 0], retired))
+
+    def _retire(self, key: str) -> None:
+        entry = self._meta["videos"].pop(key, None)
+        if entry is not None:
+            self._meta["retired_video_ids"].append(int(entry["id"]))
+
+    def _encode(self, x: np.ndarray) -> Tuple[np.ndarray, np.ndarray]:
+        cells = _nearest_centroids(x, self._coarse)
+        residuals = x - self._coarse[cells]
+        m, _ksub, dsub = self._codebooks.shape
+        codes = np.empty((len(x), m), dtype=np.uint8)
+        for sub in range(m):
+            part = np.ascontiguousarray(residuals[:, sub * dsub : (sub + 1) * dsub])
+            codes[:, sub] = _nearest_centroids(part, self._codebooks[sub])
+        return cells, codes
+
+    def _write_segment(
+        self,
+        cells: np.ndarray,
+        codes: np.ndarray,
+        ids: np.ndarray,
+        vectors: Optional[np.ndarray] = None,
+    ) -> None:
+        order = np.argsort(cells, kind="stable")
+        offsets = np.zeros(self.nlist + 1, dtype=np.int64)
+        np.cumsum(np.bincount(cells, minlength=self.nlist), out=offsets[1:])
+        number = int(self._meta["next_segment"])
+        name = f"seg_{number:06d}"
+        staging = self.root / f".{name}.tmp"
+        shutil.rmtree(staging, ignore_errors=True)
+        staging.mkdir(parents=True)
+        np.save(staging / "codes.npy", np.ascontiguousarray(codes[order]))
+        np.save(staging / "ids.npy", np.ascontiguousarray(ids[order]))
+        np.save(staging / "offsets.npy", offsets)
+        if vectors is not None:
+            np.save(
+                staging / "vectors.npy",
+                np.ascontiguousarray(vectors[order], dtype=np.float16),
+            )
+        os.replace(staging, self.root / name)
+        self._meta["next_segment"] = number + 1
+        self._meta["segments"].append(name)
+
+    def _segment(
+        self, name: str
+    ) -> Tuple[np.ndarray, np.ndarray, np.ndarray, Optional[np.ndarray]]:
+        cached = self._segments.get(name)
+        if cached is None:
+            folder = self.root / name
+            vectors_path = folder / "vectors.npy"
+            cached = (
+                np.load(folder / "codes.npy", mmap_mode="r"),
+                np.load(folder / "ids.npy", mmap_mode="r"),
+                np.load(folder / "offsets.npy"),
+                np.load(vectors_path, mmap_mode="r") if vectors_path.exists() else None,
+            )
+            self._segments[name] = cached
+        return cached
+
+    def _save_meta(self) -> None:
+        self.root.mkdir(parents=True, exist_ok=True)
+        temp_path = self.root / f"{META_FILENAME}.{os.getpid()}.tmp"
+        temp_path.write_text(json.dumps(self._meta, indent=2), encoding="utf-8")
+        os.replace(temp_path, self.root / META_FILENAME)
+
+    @staticmethod
+    def _embed_video(
+        video_path: str,
+        embed_images: ImageEmbedder,
+        stride: int,
+        batch_size: int,
+        max_frames: Optional[int],
+    ) -> Tuple[List[int], np.ndarray]:
+        capture = cv2.VideoCapture(video_path)
+        if not capture.isOpened():
+            raise FileNotFoundError(f"Could not open video: {video_path}")
+        frame_indices: List[int] = []
+        chunks: List[np.ndarray] = []
+        batch: List[np.ndarray] = []
+        batch_indices: List[int] = []
+        frame_idx = 0
+        try:
+            while max_frames is None or len(frame_indices) + len(batch) < max_frames:
+                if frame_idx % stride:
+                    if not capture.grab():
+                        break
+                    frame_idx += 1
+                    continue
+                ok, frame = capture.read()
+                if not ok or frame is None:
+                    break
+                batch.append(cv2.cvtColor(frame, cv2.COLOR_BGR2RGB))
+                batch_indices.append(frame_idx)
+                frame_idx += 1
+                if len(batch) >= batch_size:
+                    chunks.append(np.asarray(embed_images(batch), dtype=np.float32))
+                    frame_indices.extend(batch_indices)
+                    batch, batch_indices = [], []
+            if batch:
+                chunks.append(np.asarray(embed_images(batch), dtype=np.float32))
+                frame_indices.extend(batch_indices)
+        finally:
+            capture.release()
+        if not chunks:
+            return [], np.zeros((0, 0), dtype=np.float32)
+        return frame_indices, np.concatenate(chunks)
+
+
+def _parse_args() -> argparse.Namespace:
+    p = argparse.ArgumentParser(description="Project-level ANN frame index")
+    p.add_argument("index_dir", help="Directory holding the index")
+    p.add_argument("--add", nargs="*", default=[], help="Videos to index")
+    p.add_argument("--stride", type=int, default=1, help="Index every Nth frame")
+    p.add_argument("--batch-size", type=int, default=32, help="Frames per embed call")
+    p.add_argument("--force", action="store_true", help="Re-index unchanged videos")
+    p.add_argument("--query", help="Image to search for")
+    p.add_argument("--k", type=int, default=10, help="Number of results")
+    p.add_argument("--nprobe", type=int, default=16, help="Cells scanned per query")
+    return p.parse_args()
+
+
+def main():
+    args = _parse_args()
+    index = ProjectFrameIndex(args.index_dir)
+    for video in args.add:
+        added = index.add_video(
+            video, stride=args.stride, batch_size=args.batch_size, force=args.force
+        )
+        logger.info("Indexed %d frames from %s", added, video)
+    if args.query:
+        from annolid.agents.frame_embedder import embed_images
+
+        image = cv2.cvtColor(cv2.imread(args.query), cv2.COLOR_BGR2RGB)
+        hits = index.search(embed_images([image])[0], k=args.k, nprobe=args.nprobe)
+        print(json.dumps([hit.to_dict() for hit in hits], indent=2))
+
+
+if __name__ == "__main__":  # pragma: no cover
+    main()
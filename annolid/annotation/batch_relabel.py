@@ -114,6 +114,7 @@ def _process_annotation_store(
         tmp.write_text("\n".join(out_lines) + "\n", encoding="utf-8")
         tmp.replace(path)
         AnnotationStore._CACHE.pop(path, None)
+        AnnotationStore(path).index.invalidate()
     return changed_shapes, changed_records, True
 
 
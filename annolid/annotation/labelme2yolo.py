@@ -2,9 +2,12 @@
 # python annolid/main.py --labelme2yolo /path/to/labelme_json_folder/ --val_size 0.1 --test_size 0.1
 # Refer to https://docs.ultralytics.com/datasets/pose/#dataset-yaml-format for more details.
 import hashlib
+import json
 import math
 import os
 import re
+from concurrent.futures import ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
 from pathlib import Path
 import numpy as np
 import PIL.Image
@@ -26,6 +29,7 @@ from annolid.annotation.keypoint_visibility import (
     visibility_from_labelme_shape,
 )
 from annolid.core.behavior.spec import DEFAULT_SCHEMA_FILENAME, load_behavior_spec
+from annolid.utils.logger import logger
 
 _SPLIT_NAME_PATTERN = re.compile(
     r"^(train(?:ing)?|val|valid(?:ation)?|test)(?:[_-].+)?$",
@@ -48,6 +52,36 @@ def _normalize_split_name(name: str) -> Optional[str]:
     return None
 
 
+EXPORT_MANIFEST_NAME = "export_manifest.json"
+_EXPORT_MANIFEST_VERSION = 1
+_IMAGE_EXTENSIONS = (".png", ".jpg", ".jpeg", ".bmp", ".tif", ".tiff")
+# Below this many items a process pool costs more than it saves.
+_PARALLEL_MIN_ITEMS = 64
+_EXPORT_CHUNK_ITEMS = 32
+
+_EXPORT_WORKER: Optional["Labelme2YOLO"] = None
+
+
+def _init_export_worker(converter: "Labelme2YOLO") -> None:
+    global _EXPORT_WORKER
+    _EXPORT_WORKER = converter
+
+
+def _export_chunk(tasks: List[Dict[str, object]]) -> List[Dict[str, object]]:
+    return [_EXPORT_WORKER._export_item(task) for task in tasks]
+
+
+def _hashed_split(output_stem: str, val_size: float, test_size: float) -> str:
+    """Stable split for an item that was not part of an earlier export."""
+    digest = hashlib.sha1(output_stem.encode("utf-8")).hexdigest()
+    position = int(digest[:8], 16) / float(1 << 32)
+    if position < val_size:
+        return "val"
+    if position < val_size + test_size:
+        return "test"
+    return "train"
+
+
 def point_list_to_numpy_array(point_list: List[str]) -> np.ndarray:
     """
     Given a list of points, this function extends the bounding box
@@ -219,13 +253,14 @@ class Labelme2YOLO:
             dims = 3 if self.include_visibility else 2
             self.kpt_shape = [len(self.keypoint_labels_order), dims]
 
-    def create_yolo_dataset_dirs(self):
+    def create_yolo_dataset_dirs(self, reset: bool = True):
         """
         Create necessary directories for YOLO dataset and delete
         any existing directories with the same name.
 
         Args:
-            None
+            reset (bool): Delete existing split directories first. An
+                incremental export keeps them.
 
         Returns:
             None
@@ -251,9 +286,9 @@ class Labelme2YOLO:
 
         # Delete existing directories and create new ones
         for yolo_path in yolo_paths:
-            if os.path.exists(yolo_path):
+            if reset and os.path.exists(yolo_path):
                 shutil.rmtree(yolo_path)
-            os.makedirs(yolo_path)
+            os.makedirs(yolo_path, exist_ok=True)
 
     def split_jsons(self, folders, json_names, val_size, test_size):
         """Splits json files into training, validation, and test sets.
@@ -1157,15 +1192,28 @@ class Labelme2YOLO:
             # Ensure annotation type is updated for downstream checks
             self.annotation_type = "pose"
 
-    def convert(self, val_size, test_size):
+    def convert(self, val_size, test_size, workers=None, incremental=True):
         """
         Converts a set of JSON files in Labelme format to YOLO format. Splits the dataset
         into train, validation and test sets, and saves the resulting files in the appropriate
         directories.
 
+        Every export records its outputs in ``export_manifest.json`` inside the
+        dataset folder. When an earlier export used the same split sizes, a re-run
+        keeps each item in its earlier split, only re-exports new or changed items
+        and deletes the outputs of items that no longer exist. New items are given a
+        split derived from a hash of their name. Images that need no conversion are
+        hard-linked where the filesystem allows it.
+
         Args:
             val_size (float): The percentage of data to set aside for the validation set.
             test_size (float): The percentage of data to set aside for the test set.
+            workers (int, optional): Export processes; defaults to the CPU count.
+            incremental (bool): Reuse a matching earlier export. ``False`` always
+                rebuilds the dataset from scratch.
+
+        Returns:
+            dict: Number of ``written``, ``unchanged`` and ``removed`` items.
         """
         items = self._discover_items(require_image=True)
         if not items:
@@ -1189,7 +1237,24 @@ class Labelme2YOLO:
                 ]
 
         if not items:
-            return
+            return {"written": 0, "unchanged": 0, "removed": 0}
+
+        val_size = float(val_size or 0.0)
+        test_size = float(test_size or 0.0)
+        dataset_dir = Path(self.json_file_dir) / self.yolo_dataset_name
+        split_settings = {"val_size": val_size, "test_size": test_size}
+        label_settings = {
+            "include_visibility": bool(self.include_visibility),
+            "labels": list(self.label_to_id_dict),
+            "keypoints": list(self.keypoint_labels_order),
+        }
+        previous = self._load_export_manifest(dataset_dir) if incremental else None
+        if previous is not None and previous.get("split_settings") != split_settings:
+            previous = None
+        previous_items = previous["items"] if previous is not None else {}
+        relabel = previous is None or previous.get("label_settings") != label_settings
+        if not relabel:
+            self._adopt_label_state(previous)
 
         # If dataset already has split-like directories (e.g. train*, val*, test*),
         # always respect them and ignore val_size/test_size.
@@ -1209,26 +1274,288 @@ class Labelme2YOLO:
                     train_items.append(val_items.pop())
                 elif test_items:
                     train_items.append(test_items.pop())
+        elif previous_items:
+            # Items keep the split of the earlier export so re-runs stay incremental.
+            by_split: Dict[str, List[Labelme2YOLO._LabelmeItem]] = {
+                "train": [],
+                "val": [],
+                "test": [],
+            }
+            for item in items:
+                entry = previous_items.get(item.output_stem) or {}
+                split = entry.get("split")
+                if split not in by_split:
+                    split = _hashed_split(item.output_stem, val_size, test_size)
+                by_split[split].append(item)
+            train_items, val_items, test_items = (
+                by_split["train"],
+                by_split["val"],
+                by_split["test"],
+            )
         else:
             train_items, val_items, test_items = self.split_jsons(
                 [], items, val_size, test_size
             )
 
         # Create the train and validation directories if they don't exist already
-        self.create_yolo_dataset_dirs()
+        self.create_yolo_dataset_dirs(reset=previous is None)
 
         # Convert labelme object to yolo format object, and save them to files
         # Also get image from labelme json file and save them under images folder
-        for target_dir, split_items in zip(
-            ("train/", "val/", "test/"),
+        tasks: List[Dict[str, object]] = []
+        for split, split_items in zip(
+            ("train", "val", "test"),
             (train_items, val_items, test_items),
         ):
             for item in split_items:
-                self.json_to_text(target_dir, item)
+                tasks.append(
+                    {
+                        "json_path": str(item.json_path),
+                        "image_path": str(item.image_path) if item.image_path else None,
+                        "output_stem": item.output_stem,
+                        "split": split,
+                        "previous": previous_items.get(item.output_stem),
+                        "relabel": relabel,
+                    }
+                )
+        labels_before = list(self.label_to_id_dict)
+        keypoints_before = list(self.keypoint_labels_order)
+        results = self._run_export_tasks(tasks, workers)
+        self._merge_export_state(results)
+        if (
+            list(self.label_to_id_dict) != labels_before
+            or self.keypoint_labels_order != keypoints_before
+        ):
+            # Conversion found classes or keypoints the initial scan missed; rewrite
+            # every label file against the final mapping (images are reused).
+            for task, result in zip(tasks, results):
+                task["previous"] = result["entry"]
+                task["relabel"] = True
+            self._run_export_tasks(tasks, workers)
+
+        current_items = {
+            task["output_stem"]: result["entry"] for task, result in zip(tasks, results)
+        }
+        removed = self._remove_stale_outputs(dataset_dir, previous_items, current_items)
+        self._write_export_manifest(
+            dataset_dir,
+            {
+                "version": _EXPORT_MANIFEST_VERSION,
+                "split_settings": split_settings,
+                "label_settings": label_settings,
+                "labels": [
+                    [label, int(label_id)]
+                    for label, label_id in self.label_to_id_dict.items()
+                ],
+                "keypoints": list(self.keypoint_labels_order),
+                "annotation_type": self.annotation_type,
+                "items": current_items,
+            },
+        )
 
         # Save the dataset configuration file
         self.save_data_yaml()
 
+        written = sum(1 for result in results if result["status"] == "written")
+        stats = {
+            "written": written,
+            "unchanged": len(results) - written,
+            "removed": removed,
+        }
+        logger.info(
+            "YOLO export to %s: %d written, %d unchanged, %d removed.",
+            dataset_dir,
+            stats["written"],
+            stats["unchanged"],
+            stats["removed"],
+        )
+        return stats
+
+    def _run_export_tasks(
+        self, tasks: List[Dict[str, object]], workers: Optional[int]
+    ) -> List[Dict[str, object]]:
+        """Export items in order, across a process pool for larger datasets."""
+        workers = max(1, int(workers if workers is not None else os.cpu_count() or 1))
+        if workers > 1 and len(tasks) >= _PARALLEL_MIN_ITEMS:
+            chunks = [
+                tasks[start : start + _EXPORT_CHUNK_ITEMS]
+                for start in range(0, len(tasks), _EXPORT_CHUNK_ITEMS)
+            ]
+            try:
+                with ProcessPoolExecutor(
+                    max_workers=min(workers, len(chunks)),
+                    initializer=_init_export_worker,
+                    initargs=(self,),
+                ) as pool:
+                    return [
+                        result
+                        for part in pool.map(_export_chunk, chunks)
+                        for result in part
+                    ]
+            except (BrokenProcessPool, OSError) as exc:
+                logger.warning(
+                    "Parallel YOLO export unavailable (%s); exporting serially.", exc
+                )
+        return [self._export_item(task) for task in tasks]
+
+    def _export_item(self, task: Dict[str, object]) -> Dict[str, object]:
+        """Export one item unless its manifest entry shows the outputs are current.
+
+        Returns the item's new manifest entry, whether anything was written, and
+        the classes and keypoints this item added to the converter state.
+        """
+        json_path = str(task["json_path"])
+        output_stem = str(task["output_stem"])
+        split = str(task["split"])
+        json_data = load_labelme_json(json_path)
+        json_sha1 = hashlib.sha1(
+            json.dumps(json_data, sort_keys=True, separators=(",", ":")).encode("utf-8")
+        ).hexdigest()
+        img_src = task.get("image_path") or self._resolve_image_path(
+            json_data, json_path=Path(json_path)
+        )
+        img_src = str(img_src) if img_src else None
+        image_signature = self._image_signature(json_data, json_path, img_src)
+        image_name = self._export_image_name(json_data, output_stem, img_src)
+        try:
+            json_ref = Path(json_path).relative_to(self.json_file_dir).as_posix()
+        except ValueError:
+            json_ref = json_path
+        entry = {
+            "split": split,
+            "json": json_ref,
+            "json_sha1": json_sha1,
+            "image_signature": image_signature,
+            "label": f"labels/{split}/{output_stem}.txt",
+            "image": f"images/{split}/{image_name}" if image_signature else "",
+        }
+        previous = task.get("previous") or {}
+        dataset_dir = Path(self.json_file_dir) / self.yolo_dataset_name
+        image_path = dataset_dir / entry["image"] if entry["image"] else None
+        image_current = image_path is None or (
+            previous.get("image") == entry["image"]
+            and previous.get("image_signature") == image_signature
+            and image_path.exists()
+        )
+        label_current = (
+            not task.get("relabel")
+            and previous.get("label") == entry["label"]
+            and previous.get("json_sha1") == json_sha1
+            and (dataset_dir / entry["label"]).exists()
+        )
+        result = {
+            "entry": entry,
+            "status": "unchanged",
+            "new_labels": [],
+            "new_keypoints": [],
+            "pose": self.annotation_type == "pose",
+        }
+        if image_current and label_current:
+            return result
+
+        result["status"] = "written"
+        target_dir = f"{split}/"
+        if not image_current:
+            if image_path.exists():
+                image_path.unlink()
+            self.save_or_copy_image(
+                json_data,
+                output_stem,
+                self.image_folder,
+                target_dir,
+                json_path=json_path,
+                source_image_path=img_src,
+                link=True,
+            )
+        label_count = len(self.label_to_id_dict)
+        keypoint_count = len(self.keypoint_labels_order)
+        yolo_objects = self.get_yolo_objects(
+            Path(json_path), json_data, str(image_path or "")
+        )
+        self.save_yolo_txt_label_file(
+            output_stem, self.label_folder, target_dir, yolo_objects
+        )
+        result["new_labels"] = list(self.label_to_id_dict)[label_count:]
+        result["new_keypoints"] = list(self.keypoint_labels_order[keypoint_count:])
+        result["pose"] = self.annotation_type == "pose"
+        return result
+
+    def _merge_export_state(self, results: Iterable[Dict[str, object]]) -> None:
+        """Fold in classes and keypoints found by export workers, in item order."""
+        for result in results:
+            for label in result.get("new_labels") or ():
+                if label not in self.label_to_id_dict:
+                    self.label_to_id_dict[label] = len(self.label_to_id_dict)
+            self._update_keypoint_order(result.get("new_keypoints") or ())
+            if result.get("pose"):
+                self.annotation_type = "pose"
+
+    def _adopt_label_state(self, manifest: Dict[str, object]) -> None:
+        """Continue from the class/keypoint mapping an earlier export ended with."""
+        labels = manifest.get("labels") or []
+        self.label_to_id_dict = OrderedDict(
+            (str(label), int(label_id)) for label, label_id in labels
+        )
+        self.keypoint_labels_order = [str(kp) for kp in manifest.get("keypoints") or []]
+        if self.keypoint_labels_order:
+            dims = 3 if self.include_visibility else 2
+            self.kpt_shape = [len(self.keypoint_labels_order), dims]
+        if manifest.get("annotation_type") == "pose":
+            self.annotation_type = "pose"
+
+    @staticmethod
+    def _load_export_manifest(dataset_dir: Path) -> Optional[Dict[str, object]]:
+        path = Path(dataset_dir) / EXPORT_MANIFEST_NAME
+        if not path.is_file():
+            return None
+        try:
+            manifest = json.loads(path.read_text(encoding="utf-8"))
+        except Exception as exc:
+            logger.warning("Ignoring unreadable export manifest %s: %s", path, exc)
+            return None
+        if (
+            not isinstance(manifest, dict)
+            or manifest.get("version") != _EXPORT_MANIFEST_VERSION
+            or not isinstance(manifest.get("items"), dict)
+        ):
+            return None
+        return manifest
+
+    @staticmethod
+    def _write_export_manifest(dataset_dir: Path, manifest: Dict[str, object]) -> None:
+        path = Path(dataset_dir) / EXPORT_MANIFEST_NAME
+        tmp = path.with_suffix(path.suffix + ".tmp")
+        tmp.write_text(json.dumps(manifest, indent=1) + "\n", encoding="utf-8")
+        os.replace(tmp, path)
+
+    @staticmethod
+    def _remove_stale_outputs(
+        dataset_dir: Path,
+        previous_items: Dict[str, Dict[str, object]],
+        current_items: Dict[str, Dict[str, object]],
+    ) -> int:
+        """Delete outputs the earlier export wrote that this one no longer produces.
+
+        Returns the number of items that disappeared from the dataset.
+        """
+        keep = {
+            str(entry.get(key))
+            for entry in current_items.values()
+            for key in ("label", "image")
+            if entry.get(key)
+        }
+        removed = 0
+        for output_stem, entry in previous_items.items():
+            for key in ("label", "image"):
+                rel = entry.get(key) if isinstance(entry, dict) else None
+                if rel and str(rel) not in keep:
+                    stale = Path(dataset_dir) / str(rel)
+                    if stale.is_file():
+                        stale.unlink()
+            if output_stem not in current_items:
+                removed += 1
+        return removed
+
     def get_yolo_objects(self, json_path: Union[str, Path], json_data, img_path):
         """Return a list of YOLO formatted objects from a JSON annotation file and image."""
         image_height = json_data["imageHeight"]
@@ -1424,29 +1751,16 @@ class Labelme2YOLO:
         return label_id, yolo_cx, yolo_cy, yolo_w, yolo_h
 
     @staticmethod
-    def save_or_copy_image(
-        json_data: dict,
-        output_stem: str,
-        image_dir_path: str,
-        target_dir: str,
-        json_path: Optional[str] = None,
-        source_image_path: Optional[str] = None,
+    def _export_image_name(
+        json_data: dict, output_stem: str, source_image_path: Optional[str] = None
     ) -> str:
-        """
-        Save an image in YOLO format.
-
-        :param json_data: Dictionary containing the data from the json file.
-        :param json_name: Name of the json file.
-        :param image_dir_path: Path to the directory containing the image data.
-        :param target_dir: Target directory to save the image in.
-        :return: Path of the saved image.
-        """
+        """File name of the exported image, keeping the source image format."""
         output_stem = str(output_stem or "").strip() or "image"
         ext = ".png"
         if source_image_path:
             try:
                 src_ext = Path(source_image_path).suffix.lower()
-                if src_ext in (".png", ".jpg", ".jpeg", ".bmp", ".tif", ".tiff"):
+                if src_ext in _IMAGE_EXTENSIONS:
                     ext = src_ext
             except Exception:
                 pass
@@ -1455,11 +1769,80 @@ class Labelme2YOLO:
             if isinstance(image_path_field, str) and image_path_field.strip():
                 try:
                     field_ext = Path(image_path_field).suffix.lower()
-                    if field_ext in (".png", ".jpg", ".jpeg", ".bmp", ".tif", ".tiff"):
+                    if field_ext in _IMAGE_EXTENSIONS:
                         ext = field_ext
                 except Exception:
                     pass
-        img_name = f"{output_stem}{ext}"
+        return f"{output_stem}{ext}"
+
+    @staticmethod
+    def _find_source_image(
+        json_data: dict,
+        json_path: Optional[str] = None,
+        source_image_path: Optional[str] = None,
+    ) -> Optional[str]:
+        src_img_path = json_data.get("imagePath") or ""
+        candidates = []
+        if source_image_path:
+            candidates.append(source_image_path)
+        if src_img_path:
+            candidates.append(src_img_path)
+            if json_path:
+                candidates.append(
+                    os.path.join(os.path.dirname(json_path), src_img_path)
+                )
+        for candidate in candidates:
+            if candidate and os.path.exists(candidate):
+                return candidate
+        return None
+
+    @staticmethod
+    def _image_signature(
+        json_data: dict,
+        json_path: Optional[str] = None,
+        source_image_path: Optional[str] = None,
+    ) -> str:
+        """Change key for an item's image; empty when there is no image to export.
+
+        Embedded image data is hashed; source files are keyed by path, size and
+        modification time so unchanged images are never re-read.
+        """
+        image_data = json_data.get("imageData")
+        if image_data:
+            digest = hashlib.sha1(str(image_data).encode("utf-8")).hexdigest()
+            return f"data:{digest}"
+        chosen = Labelme2YOLO._find_source_image(
+            json_data, json_path=json_path, source_image_path=source_image_path
+        )
+        if not chosen:
+            return ""
+        stat = os.stat(chosen)
+        return f"{os.path.abspath(chosen)}:{stat.st_size}:{stat.st_mtime_ns}"
+
+    @staticmethod
+    def save_or_copy_image(
+        json_data: dict,
+        output_stem: str,
+        image_dir_path: str,
+        target_dir: str,
+        json_path: Optional[str] = None,
+        source_image_path: Optional[str] = None,
+        link: bool = False,
+    ) -> str:
+        """
+        Save an image in YOLO format.
+
+        :param json_data: Dictionary containing the data from the json file.
+        :param json_name: Name of the json file.
+        :param image_dir_path: Path to the directory containing the image data.
+        :param target_dir: Target directory to save the image in.
+        :param link: Hard-link a source image instead of copying it, falling back
+            to a copy when linking is not possible (e.g. across filesystems).
+        :return: Path of the saved image.
+        """
+        img_name = Labelme2YOLO._export_image_name(
+            json_data, output_stem, source_image_path
+        )
         img_path = os.path.join(image_dir_path, target_dir, img_name)
 
         # if the image is not already saved, then save it
@@ -1469,22 +1852,18 @@ class Labelme2YOLO:
                 img = img_b64_to_arr(image_data)
                 PIL.Image.fromarray(img).save(img_path)
             else:
-                src_img_path = json_data.get("imagePath") or ""
-                candidates = []
-                if source_image_path:
-                    candidates.append(source_image_path)
-                if src_img_path:
-                    candidates.append(src_img_path)
-                    if json_path:
-                        candidates.append(
-                            os.path.join(os.path.dirname(json_path), src_img_path)
-                        )
-                chosen = None
-                for candidate in candidates:
-                    if candidate and os.path.exists(candidate):
-                        chosen = candidate
-                        break
+                chosen = Labelme2YOLO._find_source_image(
+                    json_data,
+                    json_path=json_path,
+                    source_image_path=source_image_path,
+                )
                 if chosen:
+                    if link:
+                        try:
+                            os.link(chosen, img_path)
+                            return img_path
+                        except OSError:
+                            pass
                     shutil.copy(chosen, img_path)
         return img_path
 
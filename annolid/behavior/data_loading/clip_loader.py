@@ -0,0 +1,226 @@
+"""Clip decoding for behavior datasets.
+
+``VideoReaderPool`` keeps a few ``cv2.VideoCapture`` handles open per process
+(DataLoader workers each get their own after fork/pickle) and decodes the
+requested frame indices in ascending order, grabbing forward over short gaps
+instead of seeking for every frame. ``ClipCache`` stores decoded, optionally
+resized, uint8 clips as ``.npy`` files that later epochs memory-map instead of
+decoding the video again.
+"""
+
+import hashlib
+import logging
+import os
+import tempfile
+from collections import OrderedDict
+from pathlib import Path
+from typing import Dict, Optional, Sequence
+
+import cv2
+import numpy as np
+
+logger = logging.getLogger(__name__)
+
+# Gaps up to this many frames are decoded through with grab() rather than a
+# seek, which for most codecs means decoding from the previous keyframe.
+MAX_FORWARD_GRAB = 64
+
+
+class _OpenReader:
+    __slots__ = ("capture", "position", "frame_count")
+
+    def __init__(self, capture: cv2.VideoCapture, frame_count: int):
+        self.capture = capture
+        self.position = 0
+        self.frame_count = frame_count
+
+
+class VideoReaderPool:
+    """Per-process LRU of open video readers with forward-only clip decoding."""
+
+    def __init__(self, max_open: int = 4, max_forward_grab: int = MAX_FORWARD_GRAB):
+        self.max_open = max(1, int(max_open))
+        self.max_forward_grab = max(0, int(max_forward_grab))
+        self._readers: "OrderedDict[str, _OpenReader]" = OrderedDict()
+        self._frame_counts: Dict[str, int] = {}
+        self._pid = os.getpid()
+
+    def __getstate__(self) -> dict:
+        # Capture handles cannot cross process boundaries.
+        return {"max_open": self.max_open, "max_forward_grab": self.max_forward_grab}
+
+    def __setstate__(self, state: dict) -> None:
+        self.__init__(state["max_open"], state["max_forward_grab"])
+
+    def frame_count(self, video_path: str) -> Optional[int]:
+        """Frame count (None if the video cannot be opened), kept after eviction."""
+        count = self._frame_counts.get(video_path)
+        if count is None:
+            reader = self._reader(video_path)
+            count = None if reader is None else reader.frame_count
+        return count
+
+    def read_frames(
+        self, video_path: str, frame_indices: Sequence[int]
+    ) -> Optional[np.ndarray]:
+        """Return RGB frames ``(N, H, W, 3)`` uint8 in the requested order."""
+        reader = self._reader(video_path)
+        if reader is None:
+            return None
+        decoded: Dict[int, np.ndarray] = {}
+        for index in sorted({int(i) for i in frame_indices}):
+            frame = self._read_at(reader, index)
+            if frame is None:
+                logger.warning(f"Failed to read frame {index} from {video_path}")
+                self._drop(video_path)
+                return None
+            decoded[index] = frame
+        return np.stack([decoded[int(i)] for i in frame_indices])
+
+    def close(self) -> None:
+        for path in list(self._readers):
+            self._drop(path)
+
+    def _read_at(self, reader: _OpenReader, index: int) -> Optional[np.ndarray]:
+        capture = reader.capture
+        gap = index - reader.position
+        if gap < 0 or gap > self.max_forward_grab:
+            capture.set(cv2.CAP_PROP_POS_FRAMES, index)
+            reader.position = index
+        while reader.position < index:
+            if not capture.grab():
+                return None
+            reader.position += 1
+        ok, frame = capture.read()
+        if not ok or frame is None:
+            return None
+        reader.position += 1
+        return cv2.cvtColor(frame, cv2.COLOR_BGR2RGB)
+
+    def _reader(self, video_path: str) -> Optional[_OpenReader]:
+        if os.getpid() != self._pid:
+            # Forked worker: inherited handles belong to the parent.
+            self._readers.clear()
+            self._pid = os.getpid()
+        reader = self._readers.get(video_path)
+        if reader is not None:
+            self._readers.move_to_end(video_path)
+            return reader
+        capture = cv2.VideoCapture(video_path)
+        if not capture.isOpened():
+            logger.error(f"Could not open video: {video_path}")
+            return None
+        reader = _OpenReader(capture, int(capture.get(cv2.CAP_PROP_FRAME_COUNT)))
+        self._readers[video_path] = reader
+        self._frame_counts[video_path] = reader.frame_count
+        while len(self._readers) > self.max_open:
+            self._drop(next(iter(self._readers)))
+        return reader
+
+    def _drop(self, video_path: str) -> None:
+        reader = self._readers.pop(video_path, None)
+        if reader is not None:
+            reader.capture.release()
+
+
+def resize_short_side(frames: np.ndarray, size: Optional[int]) -> np.ndarray:
+    """Resize ``(N, H, W, C)`` frames so the shorter side equals ``size``."""
+    if not size or frames.size == 0:
+        return frames
+    height, width = frames.shape[1:3]
+    scale = float(size) / float(min(height, width))
+    if abs(scale - 1.0) < 1e-6:
+        return frames
+    target = (max(1, round(width * scale)), max(1, round(height * scale)))
+    interpolation = cv2.INTER_AREA if scale < 1.0 else cv2.INTER_LINEAR
+    return np.stack(
+        [cv2.resize(frame, target, interpolation=interpolation) for frame in frames]
+    )
+
+
+class ClipCache:
+    """On-disk cache of decoded uint8 clips, memory-mapped on read.
+
+    Keys cover the video path, its size and modification time, the frame
+    indices and the resize setting, so edited videos are decoded again.
+    """
+
+    def __init__(self, cache_dir: str, frame_size: Optional[int] = None):
+        self.cache_dir = Path(cache_dir).expanduser()
+        self.cache_dir.mkdir(parents=True, exist_ok=True)
+        self.frame_size = int(frame_size) if frame_size else None
+
+    def key(self, video_path: str, frame_indices: Sequence[int]) -> str:
+        stat = os.stat(video_path)
+        payload = repr(
+            (
+                os.path.abspath(video_path),
+                stat.st_size,
+                stat.st_mtime_ns,
+                [int(i) for i in frame_indices],
+                self.frame_size,
+            )
+        )
+        return hashlib.sha1(payload.encode("utf-8")).hexdigest()
+
+    def path(self, key: str) -> Path:
+        return self.cache_dir / key[:2] / f"{key}.npy"
+
+    def load(self, key: str) -> Optional[np.ndarray]:
+        path = self.path(key)
+        if not path.exists():
+            return None
+        try:
+            return np.load(path, mmap_mode="r", allow_pickle=False)
+        except Exception as e:
+            logger.warning(f"Ignoring unreadable clip cache entry {path}: {e}")
+            return None
+
+    def store(self, key: str, clip: np.ndarray) -> None:
+        path = self.path(key)
+        path.parent.mkdir(parents=True, exist_ok=True)
+        fd, temp_name = tempfile.mkstemp(dir=str(path.parent), suffix=".tmp")
+        try:
+            with os.fdopen(fd, "wb") as fh:
+                np.save(fh, np.ascontiguousarray(clip), allow_pickle=False)
+            os.replace(temp_name, path)
+        except Exception as e:
+            logger.warning(f"Failed to write clip cache entry {path}: {e}")
+        finally:
+            if os.path.exists(temp_name):
+                os.unlink(temp_name)
+
+
+class ClipLoader:
+    """Decode (or fetch from cache) uint8 RGB clips ``(N, H, W, 3)``."""
+
+    def __init__(
+        self,
+        *,
+        cache_dir: Optional[str] = None,
+        frame_size: Optional[int] = None,
+        max_open_readers: int = 4,
+    ):
+        self.readers = VideoReaderPool(max_open=max_open_readers)
+        self.frame_size = int(frame_size) if frame_size else None
+        self.cache = ClipCache(cache_dir, self.frame_size) if cache_dir else None
+
+    def frame_count(self, video_path: str) -> Optional[int]:
+        return self.readers.frame_count(video_path)
+
+    def load(
+        self, video_path: str, frame_indices: Sequence[int]
+    ) -> Optional[np.ndarray]:
+        key = None
+        if self.cache is not None:
+            key = self.cache.key(video_path, frame_indices)
+            cached = self.cache.load(key)
+            if cached is not None:
+                return cached
+        clip = self.readers.read_frames(video_path, frame_indices)
+        if clip is None:
+            return None
+        clip = resize_short_side(clip, self.frame_size)
+        if self.cache is not None and key is not None:
+            self.cache.store(key, clip)
+        return clip
@@ -1,6 +1,6 @@
-from .transforms import ResizeCenterCropNormalize
+from .clip_loader import ClipLoader
+from .transforms import IdentityTransform, ResizeCenterCropNormalize
 import os
-import cv2
 import pandas as pd
 import numpy as np
 import torch
@@ -29,6 +29,9 @@ class BehaviorDataset(Dataset):
         split: str = "train",
         val_ratio: float = 0.2,
         random_seed: int = 42,
+        clip_cache_dir: Optional[str] = None,
+        clip_frame_size: Optional[int] = None,
+        max_open_videos: int = 4,
     ):
         """
         Initializes the dataset with optional training/validation split.
@@ -42,6 +45,11 @@ class BehaviorDataset(Dataset):
         :param split: Either 'train' or 'val' to specify the dataset split.
         :param val_ratio: Ratio of data for validation.
         :param random_seed: Random seed for reproducibility.
+        :param clip_cache_dir: Optional directory where decoded uint8 clips are
+            cached and memory-mapped on later epochs.
+        :param clip_frame_size: Optional shorter-side size frames are resized
+            to right after decoding (and before caching).
+        :param max_open_videos: Video readers kept open per worker process.
         """
         self.video_folder = video_folder
         self.num_frames = num_frames
@@ -52,6 +60,11 @@ class BehaviorDataset(Dataset):
         self.split = split
         self.val_ratio = val_ratio
         self.random_seed = random_seed
+        self.clip_loader = ClipLoader(
+            cache_dir=clip_cache_dir,
+            frame_size=clip_frame_size,
+            max_open_readers=max_open_videos,
+        )
 
         self.video_files, self.all_annotations = self.load_annotations()
         if not self.video_files or not self.all_annotations:
@@ -112,17 +125,19 @@ class BehaviorDataset(Dataset):
                 f"Failed to load frames for video {video_path} at row {row_index}"
             )
 
-        processed_frames = []
-        for frame_tensor in frames:
-            if self.transform:
-                processed_frames.append(self.transform(frame_tensor))
-            else:
-                processed_frames.append(frame_tensor)
-
-        frames_tensor = torch.stack(processed_frames)
+        frames_tensor = self.apply_transform(frames)
 
         return frames_tensor, label, video_path
 
+    def apply_transform(self, frames: torch.Tensor) -> torch.Tensor:
+        """Apply ``self.transform`` to a ``(T, C, H, W)`` clip."""
+        if not self.transform:
+            return frames
+        if isinstance(self.transform, (ResizeCenterCropNormalize, IdentityTransform)):
+            # These operate on batched tensors; one call covers the clip.
+            return self.transform(frames)
+        return torch.stack([self.transform(frame) for frame in frames])
+
     def fetch_data(self, index: int) -> Optional[Tuple[torch.Tensor, int, str]]:
         try:
             video_file, row_index, annotations = self.get_video_and_row_index(index)
@@ -141,14 +156,7 @@ class BehaviorDataset(Dataset):
             if frames is None:
                 return None
 
-            processed_frames = []
-            for frame_tensor in frames:
-                if self.transform:
-                    processed_frames.append(self.transform(frame_tensor))
-                else:
-                    processed_frames.append(frame_tensor)
-
-            frames_tensor = torch.stack(processed_frames)
+            frames_tensor = self.apply_transform(frames)
 
             return frames_tensor, label, video_path
         except Exception as e:
@@ -186,13 +194,11 @@ class BehaviorDataset(Dataset):
     def load_video_frames(
         self, video_path: str, row_index: int, annotations: pd.DataFrame
     ) -> Optional[torch.Tensor]:
-        cap = cv2.VideoCapture(video_path)
-        if not cap.isOpened():
-            logger.error(f"Could not open video: {video_path}")
+        """Load the annotated clip as a float ``(T, 3, H, W)`` tensor in [0, 1]."""
+        total_frames = self.clip_loader.frame_count(video_path)
+        if total_frames is None:
             return None
 
-        total_frames = int(cap.get(cv2.CAP_PROP_FRAME_COUNT))
-
         try:
             start_frame = int(annotations.iloc[row_index]["Trial time"] * self.fps)
         except KeyError as e:
@@ -204,30 +210,21 @@ class BehaviorDataset(Dataset):
         )
         end_frame = start_frame + int(self.clip_len * self.fps)
 
-        frames = []
         frame_indices = torch.linspace(
             start_frame, end_frame - 1, self.num_frames, dtype=torch.int
         ).tolist()
 
-        for i in frame_indices:
-            cap.set(cv2.CAP_PROP_POS_FRAMES, i)
-            ret, frame = cap.read()
-            if ret:
-                frame = cv2.cvtColor(frame, cv2.COLOR_BGR2RGB)
-                frames.append(torch.from_numpy(frame).permute(2, 0, 1).float() / 255.0)
-            else:
-                logger.warning(f"Failed to read frame {i} from {video_path}")
-                cap.release()
-                return None
-
-        cap.release()
-        if len(frames) != self.num_frames:
+        clip = self.clip_loader.load(video_path, frame_indices)
+        if clip is None:
+            return None
+        if len(clip) != self.num_frames:
             logger.warning(
-                f"Expected {self.num_frames} frames, but got {len(frames)} from {video_path}"
+                f"Expected {self.num_frames} frames, but got {len(clip)} from {video_path}"
             )
             return None
 
-        return torch.stack(frames)
+        # One conversion for the whole clip: (T, H, W, C) uint8 -> (T, C, H, W).
+        return torch.from_numpy(np.array(clip)).permute(0, 3, 1, 2).float() / 255.0
 
     def get_video_and_row_index(self, index: int) -> Tuple[str, int, pd.DataFrame]:
         current_index = 0
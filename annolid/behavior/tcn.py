@@ -16,7 +16,7 @@ from __future__ import annotations
 
 from dataclasses import asdict, dataclass, field
 from pathlib import Path
-from typing import Any, Iterable, Mapping
+from typing import Any, Callable, Iterable, Mapping
 
 import numpy as np
 import pandas as pd
@@ -492,55 +492,114 @@ def train_tcn(
     return history
 
 
+class _TCNWindowDataset(Dataset):
+    """Zero-padded inference windows over one session's features."""
+
+    def __init__(
+        self, features: np.ndarray, starts: list[int], sequence_length: int
+    ) -> None:
+        self.features = features
+        self.starts = list(starts)
+        self.sequence_length = int(sequence_length)
+
+    def __len__(self) -> int:
+        return len(self.starts)
+
+    def __getitem__(self, idx: int) -> tuple[torch.Tensor, int, int]:
+        start = self.starts[int(idx)]
+        x = np.zeros((self.sequence_length, self.features.shape[1]), dtype=np.float32)
+        valid_len = min(self.sequence_length, max(0, len(self.features) - start))
+        x[:valid_len] = self.features[start : start + valid_len]
+        return torch.from_numpy(x), int(start), int(valid_len)
+
+
+def _predict_session_scores(
+    model: BehaviorTCN,
+    features: np.ndarray,
+    *,
+    sequence_length: int,
+    num_classes: int,
+    device: torch.device,
+    batch_size: int,
+    num_workers: int,
+    stride: int | None,
+) -> np.ndarray:
+    """Window-averaged class probabilities (``T x K``) for one session.
+
+    Windows are run ``batch_size`` at a time and scattered into running
+    totals with ``index_add_``, so only one batch of windows is ever held
+    besides the per-frame totals.
+    """
+    length = len(features)
+    totals = torch.zeros((length, int(num_classes)), dtype=torch.float32)
+    counts = torch.zeros(length, dtype=torch.float32)
+    starts = _sequence_starts(length, int(sequence_length), stride=stride)
+    loader = DataLoader(
+        _TCNWindowDataset(features, starts, sequence_length),
+        batch_size=max(1, int(batch_size)),
+        shuffle=False,
+        num_workers=max(0, int(num_workers)),
+    )
+    offsets = torch.arange(int(sequence_length))
+    for x, start, valid_len in loader:
+        probs = torch.softmax(model(x.to(device)), dim=-1).float().cpu()
+        keep = offsets[None, :] < valid_len[:, None]
+        frame_idx = (start[:, None] + offsets[None, :])[keep]
+        totals.index_add_(0, frame_idx, probs[keep])
+        counts.index_add_(0, frame_idx, torch.ones(len(frame_idx)))
+    return (totals / counts.clamp_min(1.0)[:, None]).numpy()
+
+
 def predict_tcn(
     model: BehaviorTCN,
     dataset: TCNSequenceDataset,
     *,
     device: str | torch.device = "auto",
     smoothing_window: int = 1,
+    batch_size: int = 32,
+    num_workers: int = 0,
+    stride: int | None = None,
+    on_session: Callable[[str, np.ndarray, np.ndarray], None] | None = None,
 ) -> dict[str, np.ndarray]:
     """Predict per-frame labels.
 
     ``smoothing_window`` applies a centered moving average to class
     probabilities before the final argmax. This is useful for behavior labels
     that are expected to persist across neighboring frames.
+
+    Windows of ``dataset.sequence_length`` frames start every ``stride``
+    frames (default: back to back) and run ``batch_size`` at a time;
+    overlapping probabilities are averaged. Sessions are processed one at a
+    time; with ``on_session`` each result is handed to the callback as
+    ``(session_id, predictions, scores)`` and not retained, so memory stays
+    bounded by the longest session.
     """
     device_t = (
         resolve_device(str(device)) if not isinstance(device, torch.device) else device
     )
     model.to(device_t)
     model.eval()
-    pred_by_session: dict[str, np.ndarray] = {
-        session_id: np.zeros(len(features), dtype=np.int64)
-        for session_id, features in dataset.features_by_session.items()
-    }
-    score_by_session: dict[str, np.ndarray] = {
-        session_id: np.zeros(
-            (len(features), len(dataset.label_names)), dtype=np.float32
-        )
-        for session_id, features in dataset.features_by_session.items()
-    }
-    counts_by_session: dict[str, np.ndarray] = {
-        session_id: np.zeros(len(features), dtype=np.float32)
-        for session_id, features in dataset.features_by_session.items()
-    }
-    loader = DataLoader(dataset, batch_size=1, shuffle=False, num_workers=0)
+    pred_by_session: dict[str, np.ndarray] = {}
+    score_by_session: dict[str, np.ndarray] = {}
     with torch.no_grad():
-        for batch in loader:
-            session_id = str(batch["session_id"][0])
-            start = int(batch["start"][0])
-            valid_len = int(batch["valid_length"][0])
-            logits = model(batch["features"].to(device_t))
-            probs = torch.softmax(logits, dim=-1).cpu().numpy()[0, :valid_len]
-            stop = start + valid_len
-            score_by_session[session_id][start:stop] += probs
-            counts_by_session[session_id][start:stop] += 1.0
-    for session_id, scores in score_by_session.items():
-        counts = np.maximum(counts_by_session[session_id][:, None], 1.0)
-        scores = scores / counts
-        scores = _smooth_scores(scores, int(smoothing_window))
-        score_by_session[session_id] = scores
-        pred_by_session[session_id] = scores.argmax(axis=1).astype(np.int64)
+        for session_id, features in dataset.features_by_session.items():
+            scores = _predict_session_scores(
+                model,
+                features,
+                sequence_length=dataset.sequence_length,
+                num_classes=len(dataset.label_names),
+                device=device_t,
+                batch_size=batch_size,
+                num_workers=num_workers,
+                stride=stride,
+            )
+            scores = _smooth_scores(scores, int(smoothing_window))
+            predictions = scores.argmax(axis=1).astype(np.int64)
+            if on_session is not None:
+                on_session(session_id, predictions, scores)
+                continue
+            score_by_session[session_id] = scores
+            pred_by_session[session_id] = predictions
     return {"predictions": pred_by_session, "scores": score_by_session}
 
 
@@ -551,11 +610,11 @@ def _smooth_scores(scores: np.ndarray, smoothing_window: int) -> np.ndarray:
     if window % 2 == 0:
         window += 1
     pad = window // 2
-    kernel = np.ones(window, dtype=np.float32) / float(window)
     padded = np.pad(scores, ((pad, pad), (0, 0)), mode="edge")
-    smoothed = np.empty_like(scores)
-    for class_idx in range(scores.shape[1]):
-        smoothed[:, class_idx] = np.convolve(padded[:, class_idx], kernel, mode="valid")
+    # One cumulative-sum pass over all classes; float64 keeps long sessions exact.
+    csum = np.zeros((len(padded) + 1, scores.shape[1]), dtype=np.float64)
+    np.cumsum(padded, axis=0, dtype=np.float64, out=csum[1:])
+    smoothed = (csum[window:] - csum[:-window]) / float(window)
     return smoothed.astype(scores.dtype, copy=False)
 
 
@@ -605,9 +664,18 @@ def evaluate_tcn(
     background_index: int = 0,
     device: str | torch.device = "auto",
     smoothing_window: int = 1,
+    batch_size: int = 32,
+    num_workers: int = 0,
+    stride: int | None = None,
 ) -> dict[str, Any]:
     pred = predict_tcn(
-        model, dataset, device=device, smoothing_window=int(smoothing_window)
+        model,
+        dataset,
+        device=device,
+        smoothing_window=int(smoothing_window),
+        batch_size=batch_size,
+        num_workers=num_workers,
+        stride=stride,
     )["predictions"]
     y_true: list[np.ndarray] = []
     y_pred: list[np.ndarray] = []
@@ -0,0 +1,253 @@
+from __future__ import annotations
+
+import threading
+import time
+from collections import OrderedDict
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Optional, Tuple
+
+import cv2
+import numpy as np
+
+from annolid.core.media.seek_index import VideoSeekIndex, seek_capture
+from annolid.utils.logger import logger
+
+
+@dataclass(frozen=True)
+class PrefetchStats:
+    """Counters describing how a :class:`FramePrefetcher` spent its time."""
+
+    frames_decoded: int
+    decode_time_sec: float
+    frames_served: int
+    wait_time_sec: float
+    hits: int
+    misses: int
+    seeks: int
+    buffered: int
+
+    def as_dict(self) -> dict[str, float | int]:
+        return {
+            "frames_decoded": self.frames_decoded,
+            "decode_time_sec": self.decode_time_sec,
+            "frames_served": self.frames_served,
+            "wait_time_sec": self.wait_time_sec,
+            "hits": self.hits,
+            "misses": self.misses,
+            "seeks": self.seeks,
+            "buffered": self.buffered,
+        }
+
+
+class FramePrefetcher:
+    """Background decoder that keeps a bounded ring buffer of RGB frames.
+
+    A dedicated thread owns its own ``cv2.VideoCapture`` and decodes forward
+    from the most recently requested frame, staying at most ``lookahead``
+    frames ahead of the consumer. Requests that land in the buffer return
+    immediately; requests outside the look-ahead window reposition the decoder
+    with a single seek. Frames are handed over on :meth:`get` (removed from the
+    buffer), so callers may modify them freely.
+    """
+
+    def __init__(
+        self,
+        video_file: str | Path,
+        *,
+        total_frames: int,
+        lookahead: int = 32,
+        wait_timeout: float = 10.0,
+        seek_index: Optional[VideoSeekIndex] = None,
+    ) -> None:
+        self.video_file = Path(video_file)
+        self.total_frames = int(total_frames)
+        self.lookahead = max(1, int(lookahead))
+        self.wait_timeout = float(wait_timeout)
+        self.seek_index = seek_index
+        self._cap = cv2.VideoCapture(str(self.video_file))
+        if not self._cap.isOpened():
+            raise RuntimeError(f"Unable to open video for prefetch: {self.video_file}")
+
+        self._cond = threading.Condition()
+        self._buffer: "OrderedDict[int, Optional[Tuple[np.ndarray, float]]]" = (
+            OrderedDict()
+        )
+        self._consumer_pos = 0
+        self._next_index = 0
+        self._seek_request: Optional[int] = 0
+        self._generation = 0
+        self._stopped = False
+
+        self._frames_decoded = 0
+        self._decode_time = 0.0
+        self._frames_served = 0
+        self._wait_time = 0.0
+        self._hits = 0
+        self._misses = 0
+        self._seeks = 0
+
+        self._thread = threading.Thread(
+            target=self._run, name=f"FramePrefetcher[{self.video_file.name}]"
+        )
+        self._thread.daemon = True
+        self._thread.start()
+
+    # ------------------------------------------------------------------
+    # Consumer API
+    # ------------------------------------------------------------------
+    def get(self, frame_number: int) -> Tuple[np.ndarray, float]:
+        """Return ``(rgb_frame, timestamp_msec)`` for ``frame_number``.
+
+        Raises ``KeyError`` when the frame cannot be decoded.
+        """
+        frame_number = int(frame_number)
+        started = time.perf_counter()
+        with self._cond:
+            self._consumer_pos = frame_number
+            if frame_number in self._buffer:
+                self._hits += 1
+            else:
+                self._misses += 1
+                if not self._in_flight_window(frame_number):
+                    self._request_seek(frame_number)
+            self._evict_before(frame_number)
+            self._cond.notify_all()
+
+            deadline = started + self.wait_timeout
+            while frame_number not in self._buffer and not self._stopped:
+                if self._seek_request is None and not self._in_flight_window(
+                    frame_number
+                ):
+                    self._request_seek(frame_number)
+                    self._cond.notify_all()
+                remaining = deadline - time.perf_counter()
+                if remaining <= 0:
+                    raise KeyError(f"Timed out waiting for frame {frame_number}")
+                self._cond.wait(remaining)
+
+            if self._stopped and frame_number not in self._buffer:
+                raise KeyError(f"Prefetcher stopped before frame {frame_number}")
+            entry = self._buffer.pop(frame_number)
+            self._wait_time += time.perf_counter() - started
+            self._frames_served += 1
+            self._cond.notify_all()
+
+        if entry is None:
+            raise KeyError(f"Cannot load frame number: {frame_number}")
+        return entry
+
+    def stats(self) -> PrefetchStats:
+        with self._cond:
+            return PrefetchStats(
+                frames_decoded=self._frames_decoded,
+                decode_time_sec=self._decode_time,
+                frames_served=self._frames_served,
+                wait_time_sec=self._wait_time,
+                hits=self._hits,
+                misses=self._misses,
+                seeks=self._seeks,
+                buffered=len(self._buffer),
+            )
+
+    def close(self) -> None:
+        with self._cond:
+            self._stopped = True
+            self._buffer.clear()
+            self._cond.notify_all()
+        if self._thread.is_alive() and self._thread is not threading.current_thread():
+            self._thread.join(timeout=2.0)
+        try:
+            self._cap.release()
+        except Exception:
+            pass
+
+    # ------------------------------------------------------------------
+    # Internals (call with ``self._cond`` held)
+    # ------------------------------------------------------------------
+    def _in_flight_window(self, frame_number: int) -> bool:
+        """True when forward decoding will reach ``frame_number`` soon."""
+        if self._seek_request is not None:
+            return (
+                self._seek_request
+                <= frame_number
+                < (self._seek_request + self.lookahead)
+            )
+        return self._next_index <= frame_number < self._next_index + self.lookahead
+
+    def _request_seek(self, frame_number: int) -> None:
+        self._seek_request = frame_number
+        self._buffer.clear()
+
+    def _evict_before(self, frame_number: int) -> None:
+        for index in [index for index in self._buffer if index < frame_number]:
+            del self._buffer[index]
+
+    def _should_decode(self) -> bool:
+        if self._seek_request is not None:
+            return True
+        return (
+            self._next_index < self.total_frames
+            and self._next_index <= self._consumer_pos + self.lookahead
+        )
+
+    def _run(self) -> None:
+        cap_position: Optional[int] = None
+        while True:
+            with self._cond:
+                while not self._stopped and not self._should_decode():
+                    self._cond.wait()
+                if self._stopped:
+                    return
+                seek_to = self._seek_request
+                if seek_to is not None:
+                    self._seek_request = None
+                    self._generation += 1
+                    self._next_index = seek_to
+                    self._seeks += 1
+                index = self._next_index
+                generation = self._generation
+
+            started = time.perf_counter()
+            try:
+                if seek_to is not None and cap_position != index:
+                    seek_capture(
+                        self._cap,
+                        index,
+                        self.seek_index,
+                        current_position=cap_position,
+                    )
+                cap_position = None
+                ok, frame_bgr = self._cap.read()
+                entry: Optional[Tuple[np.ndarray, float]] = None
+                if ok and frame_bgr is not None:
+                    cap_position = index + 1
+                    timestamp = self._cap.get(cv2.CAP_PROP_POS_MSEC)
+                    entry = (
+                        cv2.cvtColor(frame_bgr, cv2.COLOR_BGR2RGB),
+                        float(timestamp) if timestamp is not None else None,
+                    )
+            except Exception as exc:  # noqa: BLE001
+                logger.warning(
+                    "Prefetch decode failed for %s frame %s: %s",
+                    self.video_file,
+                    index,
+                    exc,
+                )
+                entry = None
+            elapsed = time.perf_counter() - started
+
+            with self._cond:
+                self._decode_time += elapsed
+                self._frames_decoded += 1
+                if generation != self._generation or self._seek_request is not None:
+                    # The consumer jumped elsewhere while this frame decoded.
+                    continue
+                if index >= self._consumer_pos:
+                    self._buffer[index] = entry
+                if entry is None:
+                    # End of stream or decode error: stop until the next seek.
+                    self._next_index = self.total_frames
+                else:
+                    self._next_index = index + 1
+                self._cond.notify_all()
@@ -0,0 +1,318 @@
+from __future__ import annotations
+
+import bisect
+import json
+import subprocess
+import threading
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Any, List, Optional
+
+import cv2
+
+from annolid.utils.logger import logger
+
+SEEK_INDEX_SUFFIX = ".seekindex.json"
+SEEK_INDEX_VERSION = 1
+DEFAULT_PROBE_TIMEOUT = 600.0
+
+
+def seek_index_path(video_file: str | Path) -> Path:
+    video_file = Path(video_file)
+    return video_file.with_name(video_file.name + SEEK_INDEX_SUFFIX)
+
+
+def _video_signature(video_file: Path) -> tuple[int, int]:
+    stat = video_file.stat()
+    return int(stat.st_size), int(stat.st_mtime_ns)
+
+
+def _probe_packets(video_file: Path, timeout: float) -> Optional[List[dict]]:
+    """Return video packets as dicts with pts_time/dts_time/pos/flags via ffprobe."""
+    cmd = [
+        "ffprobe",
+        "-v",
+        "error",
+        "-select_streams",
+        "v:0",
+        "-show_entries",
+        "packet=pts_time,dts_time,pos,flags",
+        "-of",
+        "compact=p=0",
+        str(video_file),
+    ]
+    try:
+        result = subprocess.run(
+            cmd,
+            stdout=subprocess.PIPE,
+            stderr=subprocess.PIPE,
+            text=True,
+            timeout=timeout,
+        )
+    except (FileNotFoundError, subprocess.TimeoutExpired):
+        return None
+    if result.returncode != 0:
+        logger.warning(
+            "ffprobe returned a non-zero exit code while indexing %s: %s",
+            video_file,
+            result.stderr.strip(),
+        )
+        return None
+    packets: List[dict] = []
+    for line in result.stdout.splitlines():
+        fields = dict(
+            part.split("=", 1) for part in line.strip().split("|") if "=" in part
+        )
+        if fields:
+            packets.append(fields)
+    return packets
+
+
+def _as_float(value: Any) -> Optional[float]:
+    try:
+        result = float(value)
+    except (TypeError, ValueError):
+        return None
+    return result if result == result else None
+
+
+def _as_int(value: Any) -> int:
+    try:
+        return int(value)
+    except (TypeError, ValueError):
+        return -1
+
+
+@dataclass
+class VideoSeekIndex:
+    """Keyframe frame numbers with their presentation time and byte position.
+
+    Frame numbers are presentation-order indices, i.e. the numbering used by
+    ``CV2Video.load_frame``. The index is persisted next to the video as
+    ``<video>.seekindex.json`` and invalidated when the video's size or mtime
+    changes.
+    """
+
+    video_file: Path
+    keyframes: List[int]
+    keyframe_times: List[float] = field(default_factory=list)
+    keyframe_positions: List[int] = field(default_factory=list)
+    frame_count: int = 0
+    video_size: int = 0
+    video_mtime_ns: int = 0
+
+    def keyframe_at_or_before(self, frame_number: int) -> int:
+        """Return the closest keyframe that decodes forward to ``frame_number``."""
+        position = bisect.bisect_right(self.keyframes, int(frame_number)) - 1
+        if position < 0:
+            return 0
+        return int(self.keyframes[position])
+
+    def keyframe_msec(self, keyframe: int) -> Optional[float]:
+        """Presentation time of ``keyframe`` in ms from the first frame.
+
+        Returns None when the index holds no time for it (older indexes).
+        """
+        position = bisect.bisect_left(self.keyframes, int(keyframe))
+        if (
+            position >= len(self.keyframes)
+            or self.keyframes[position] != int(keyframe)
+            or len(self.keyframe_times) != len(self.keyframes)
+        ):
+            return None
+        # OpenCV reports positions relative to the stream start, i.e. frame 0.
+        start = self.keyframe_times[0] if self.keyframes[0] == 0 else 0.0
+        return max(0.0, (self.keyframe_times[position] - start) * 1000.0)
+
+    def max_gop_length(self) -> int:
+        if not self.keyframes:
+            return int(self.frame_count)
+        bounds = list(self.keyframes) + [int(self.frame_count)]
+        return max(b - a for a, b in zip(bounds[:-1], bounds[1:]))
+
+    # ------------------------------------------------------------------
+    # Construction / persistence
+    # ------------------------------------------------------------------
+    @classmethod
+    def from_packets(cls, video_file: Path, packets: List[dict]) -> "VideoSeekIndex":
+        ordered = []
+        for decode_order, packet in enumerate(packets):
+            pts = _as_float(packet.get("pts_time"))
+            if pts is None:
+                pts = _as_float(packet.get("dts_time"))
+            if pts is None:
+                continue
+            ordered.append(
+                (
+                    pts,
+                    decode_order,
+                    "K" in str(packet.get("flags", "")),
+                    _as_int(packet.get("pos")),
+                )
+            )
+        ordered.sort()
+        keyframes: List[int] = []
+        times: List[float] = []
+        positions: List[int] = []
+        for frame_number, (pts, _, is_key, pos) in enumerate(ordered):
+            if is_key:
+                keyframes.append(frame_number)
+                times.append(pts)
+                positions.append(pos)
+        size, mtime_ns = _video_signature(video_file)
+        return cls(
+            video_file=video_file,
+            keyframes=keyframes,
+            keyframe_times=times,
+            keyframe_positions=positions,
+            frame_count=len(ordered),
+            video_size=size,
+            video_mtime_ns=mtime_ns,
+        )
+
+    @classmethod
+    def build(
+        cls, video_file: str | Path, *, timeout: float = DEFAULT_PROBE_TIMEOUT
+    ) -> Optional["VideoSeekIndex"]:
+        """Probe ``video_file`` with ffprobe; returns None when unavailable."""
+        video_file = Path(video_file)
+        packets = _probe_packets(video_file, timeout)
+        if not packets:
+            return None
+        index = cls.from_packets(video_file, packets)
+        if not index.keyframes:
+            return None
+        return index
+
+    @classmethod
+    def load(cls, video_file: str | Path) -> Optional["VideoSeekIndex"]:
+        """Load a persisted index if it still matches the video on disk."""
+        video_file = Path(video_file)
+        path = seek_index_path(video_file)
+        try:
+            payload = json.loads(path.read_text(encoding="utf-8"))
+            size, mtime_ns = _video_signature(video_file)
+        except (OSError, ValueError):
+            return None
+        if (
+            not isinstance(payload, dict)
+            or payload.get("version") != SEEK_INDEX_VERSION
+            or payload.get("video_size") != size
+            or payload.get("video_mtime_ns") != mtime_ns
+        ):
+            return None
+        keyframes = [int(value) for value in payload.get("keyframes") or []]
+        if not keyframes:
+            return None
+        return cls(
+            video_file=video_file,
+            keyframes=keyframes,
+            keyframe_times=[float(v) for v in payload.get("keyframe_times") or []],
+            keyframe_positions=[
+                int(v) for v in payload.get("keyframe_positions") or []
+            ],
+            frame_count=int(payload.get("frame_count") or 0),
+            video_size=size,
+            video_mtime_ns=mtime_ns,
+        )
+
+    def save(self) -> Optional[Path]:
+        path = seek_index_path(self.video_file)
+        payload = {
+            "version": SEEK_INDEX_VERSION,
+            "video_size": self.video_size,
+            "video_mtime_ns": self.video_mtime_ns,
+            "frame_count": self.frame_count,
+            "keyframes": self.keyframes,
+            "keyframe_times": self.keyframe_times,
+            "keyframe_positions": self.keyframe_positions,
+        }
+        try:
+            tmp_path = path.with_name(path.name + ".tmp")
+            tmp_path.write_text(json.dumps(payload), encoding="utf-8")
+            tmp_path.replace(path)
+        except OSError as exc:
+            logger.debug("Could not persist seek index %s: %s", path, exc)
+            return None
+        return path
+
+    @classmethod
+    def load_or_build(
+        cls, video_file: str | Path, *, timeout: float = DEFAULT_PROBE_TIMEOUT
+    ) -> Optional["VideoSeekIndex"]:
+        index = cls.load(video_file)
+        if index is not None:
+            return index
+        index = cls.build(video_file, timeout=timeout)
+        if index is not None:
+            index.save()
+        return index
+
+    @classmethod
+    def build_in_background(cls, video_file: str | Path, callback) -> threading.Thread:
+        """Run :meth:`load_or_build` on a daemon thread and pass the result on."""
+
+        def _worker() -> None:
+            try:
+                callback(cls.load_or_build(video_file))
+            except Exception as exc:  # noqa: BLE001
+                logger.debug("Background seek index build failed: %s", exc)
+
+        thread = threading.Thread(target=_worker, name="VideoSeekIndexBuilder")
+        thread.daemon = True
+        thread.start()
+        return thread
+
+
+def seek_capture(
+    cap: cv2.VideoCapture,
+    frame_number: int,
+    seek_index: Optional[VideoSeekIndex],
+    *,
+    current_position: Optional[int] = None,
+) -> None:
+    """Position ``cap`` so the next ``read()`` returns ``frame_number``.
+
+    With a seek index the capture jumps to the presentation time of the
+    closest preceding keyframe, which stays accurate on variable frame rate
+    and long-GOP files where frame-number seeks drift. The frame the seek
+    actually landed on is read back from ``CAP_PROP_POS_FRAMES`` and the
+    capture grabs forward from there, so the cost is bounded by one GOP. When
+    ``current_position`` (the frame the next read would return) is already
+    inside that GOP and before the target, no seek is issued at all. Without
+    an index, or when the timed seek lands past the target, this falls back to
+    OpenCV's ``CAP_PROP_POS_FRAMES`` seek.
+    """
+    frame_number = int(frame_number)
+    if seek_index is None:
+        cap.set(cv2.CAP_PROP_POS_FRAMES, frame_number)
+        return
+    keyframe = seek_index.keyframe_at_or_before(frame_number)
+    if current_position is not None and keyframe <= current_position <= frame_number:
+        start = int(current_position)
+    else:
+        start = _seek_to_keyframe(cap, keyframe, frame_number, seek_index)
+    for _ in range(frame_number - start):
+        if not cap.grab():
+            break
+
+
+def _seek_to_keyframe(
+    cap: cv2.VideoCapture,
+    keyframe: int,
+    frame_number: int,
+    seek_index: VideoSeekIndex,
+) -> int:
+    """Seek to ``keyframe`` and return the frame the next read will return."""
+    msec = seek_index.keyframe_msec(keyframe)
+    if msec is not None and cap.set(cv2.CAP_PROP_POS_MSEC, msec):
+        landed = _as_float(cap.get(cv2.CAP_PROP_POS_FRAMES))
+        if landed is not None and 0 <= round(landed) <= frame_number:
+            return int(round(landed))
+        logger.debug(
+            "Timed seek to keyframe %d landed on %s; seeking by frame number.",
+            keyframe,
+            landed,
+        )
+    cap.set(cv2.CAP_PROP_POS_FRAMES, keyframe)
+    return keyframe
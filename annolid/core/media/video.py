@@ -10,6 +10,8 @@ from typing import Generator, List, Optional, Sequence
 import cv2
 import numpy as np
 
+from annolid.core.media.frame_prefetch import FramePrefetcher, PrefetchStats
+from annolid.core.media.seek_index import VideoSeekIndex, seek_capture
 from annolid.utils.logger import logger
 
 DEFAULT_SUBPROCESS_TIMEOUT = 10.0
@@ -462,7 +464,16 @@ def encode_rgb_image_data_uri(
 
 
 class CV2Video:
-    """Lightweight OpenCV video reader that returns RGB frames."""
+    """Lightweight OpenCV video reader that returns RGB frames.
+
+    Pass ``prefetch=N`` (or call :meth:`enable_prefetch`) to decode up to ``N``
+    frames ahead on a background thread so sequential readers such as playback
+    and batched inference do not stall on decode.
+
+    Random access uses a keyframe seek index when one is available: by default
+    (``seek_index=None``) a valid index persisted next to the video is loaded,
+    ``True`` also builds one with ffprobe, and ``False`` disables it.
+    """
 
     def __init__(
         self,
@@ -470,6 +481,8 @@ class CV2Video:
         use_decord: bool = False,
         *,
         cache_first_frame: bool = False,
+        prefetch: int = 0,
+        seek_index: Optional[bool] = None,
     ):
         _ = use_decord  # kept for backward compatibility with older signature
         self.video_file = Path(video_file).expanduser().resolve()
@@ -491,6 +504,14 @@ class CV2Video:
         height = int(self.cap.get(cv2.CAP_PROP_FRAME_HEIGHT) or 0)
         self._width: Optional[int] = width if width > 0 else None
         self._height: Optional[int] = height if height > 0 else None
+        self.seek_index: Optional[VideoSeekIndex] = None
+        if seek_index is None:
+            self.seek_index = VideoSeekIndex.load(self.video_file)
+        elif seek_index:
+            self.seek_index = VideoSeekIndex.load_or_build(self.video_file)
+        self._prefetcher: Optional[FramePrefetcher] = None
+        if prefetch and int(prefetch) > 0:
+            self.enable_prefetch(lookahead=int(prefetch))
 
     def total_frames(self) -> int:
         return int(self._frame_count)
@@ -505,15 +526,74 @@ class CV2Video:
             self._fps = fps if fps > 0 else 0.0
         return float(self._fps)
 
+    def enable_prefetch(self, lookahead: int = 32) -> None:
+        """Start background read-ahead decoding of up to ``lookahead`` frames."""
+        self.disable_prefetch()
+        self._prefetcher = FramePrefetcher(
+            self.video_file,
+            total_frames=self.total_frames(),
+            lookahead=lookahead,
+            seek_index=self.seek_index,
+        )
+
+    def build_seek_index(self, *, background: bool = False) -> None:
+        """Load or build the keyframe seek index for this video.
+
+        With ``background=True`` the ffprobe pass runs on a daemon thread and
+        the index is attached when ready, so UI callers never block on it.
+        """
+        if self.seek_index is not None:
+            return
+        if background:
+            VideoSeekIndex.build_in_background(self.video_file, self._attach_seek_index)
+            return
+        self._attach_seek_index(VideoSeekIndex.load_or_build(self.video_file))
+
+    def _attach_seek_index(self, seek_index: Optional[VideoSeekIndex]) -> None:
+        if seek_index is None:
+            return
+        self.seek_index = seek_index
+        prefetcher = getattr(self, "_prefetcher", None)
+        if prefetcher is not None:
+            prefetcher.seek_index = seek_index
+
+    def disable_prefetch(self) -> None:
+        prefetcher = getattr(self, "_prefetcher", None)
+        self._prefetcher = None
+        if prefetcher is not None:
+            prefetcher.close()
+
+    @property
+    def prefetch_enabled(self) -> bool:
+        return self._prefetcher is not None
+
+    def prefetch_stats(self) -> Optional[PrefetchStats]:
+        """Decode-time vs. wait-time counters, or None when prefetch is off."""
+        if self._prefetcher is None:
+            return None
+        return self._prefetcher.stats()
+
     def load_frame(self, frame_number: int):
         if frame_number < 0 or frame_number >= self.total_frames():
             raise KeyError(f"Frame index out of bounds: {frame_number}")
 
+        if self._prefetcher is not None:
+            frame_rgb, ts = self._prefetcher.get(int(frame_number))
+            self._last_frame_index = None
+            self.current_frame_timestamp_msec = ts
+            self.current_frame_timestamp = ts
+            return frame_rgb
+
         expected_next = (
             self._last_frame_index + 1 if self._last_frame_index is not None else None
         )
         if expected_next is None or frame_number != expected_next:
-            self.cap.set(cv2.CAP_PROP_POS_FRAMES, int(frame_number))
+            seek_capture(
+                self.cap,
+                int(frame_number),
+                self.seek_index,
+                current_position=expected_next,
+            )
 
         ok, frame_bgr = self.cap.read()
         if not ok or frame_bgr is None:
@@ -533,6 +613,7 @@ class CV2Video:
         return ts if ts >= 0 else None
 
     def release(self) -> None:
+        self.disable_prefetch()
         try:
             if getattr(self, "cap", None) is not None and self.cap.isOpened():
                 self.cap.release()
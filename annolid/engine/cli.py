@@ -72,6 +72,7 @@ _ROOT_COMMAND_GROUPS: tuple[tuple[str, tuple[str, ...]], ...] = (
             "citations-remove",
             "citations-format",
             "memory",
+            "benchmark-postprocessing",
         ),
     ),
 )
@@ -429,6 +430,41 @@ def _cmd_agent_validate_tools(_: argparse.Namespace) -> int:
     return exit_code
 
 
+def _cmd_benchmark_postprocessing(args: argparse.Namespace) -> int:
+    from annolid.postprocessing.benchmarks import compare_reports, run_suite
+
+    names = [name.strip() for name in str(args.benchmarks or "").split(",")]
+    report = run_suite(
+        [value for value in str(args.rows).split(",") if value.strip()],
+        benchmarks=[name for name in names if name] or None,
+        animals=int(args.animals),
+        repeats=int(args.repeats),
+        seed=int(args.seed),
+        workdir=Path(args.workdir) if args.workdir else None,
+    )
+    exit_code = 0
+    if args.compare:
+        baseline = json.loads(Path(args.compare).read_text(encoding="utf-8"))
+        comparison = compare_reports(
+            baseline, report, tolerance=float(args.max_regression)
+        )
+        report["comparison"] = {
+            "baseline": str(args.compare),
+            "baseline_commit": (baseline.get("environment") or {}).get("git_commit"),
+            "tolerance": float(args.max_regression),
+            "entries": comparison,
+        }
+        if any(entry["regression"] for entry in comparison):
+            exit_code = 1
+    text = json.dumps(report, indent=2)
+    if args.output:
+        output = Path(args.output)
+        output.parent.mkdir(parents=True, exist_ok=True)
+        output.write_text(text + "\n", encoding="utf-8")
+    print(text)
+    return exit_code
+
+
 def _cmd_collect_labels(args: argparse.Namespace) -> int:
     from annolid.datasets.labelme_collection import (
         DEFAULT_LABEL_INDEX_NAME,
@@ -1988,6 +2024,43 @@ def _build_root_parser() -> argparse.ArgumentParser:
     )
     citations_format_p.set_defaults(_handler=_cmd_citations_format)
 
+    bench_p = sub.add_parser(
+        "benchmark-postprocessing",
+        help="Benchmark tracking post-processing on synthetic datasets.",
+    )
+    bench_p.add_argument(
+        "--rows",
+        default="10k,100k",
+        help="Comma-separated dataset sizes in tracking rows (e.g. 10k,1M,10M).",
+    )
+    bench_p.add_argument(
+        "--benchmarks",
+        default="",
+        help="Comma-separated subset of: zone_engine, tracking_results_analyzer, "
+        "tracks_from_labelme_csv, annotation_store_reads, identity_governor.",
+    )
+    bench_p.add_argument("--animals", type=int, default=4, help="Animals per frame.")
+    bench_p.add_argument("--repeats", type=int, default=3, help="Timed runs per case.")
+    bench_p.add_argument("--seed", type=int, default=0, help="Dataset random seed.")
+    bench_p.add_argument(
+        "--workdir",
+        default=None,
+        help="Keep generated datasets here and reuse them (default: temp dir).",
+    )
+    bench_p.add_argument("--output", default=None, help="Write the JSON report here.")
+    bench_p.add_argument(
+        "--compare",
+        default=None,
+        help="Baseline JSON report; exit 1 when a case regresses.",
+    )
+    bench_p.add_argument(
+        "--max-regression",
+        type=float,
+        default=0.2,
+        help="Allowed slowdown vs. the baseline (0.2 = 20%%).",
+    )
+    bench_p.set_defaults(_handler=_cmd_benchmark_postprocessing)
+
     collect_p = sub.add_parser(
         "collect-labels",
         help="Index LabelMe PNG/JSON pairs by absolute path (no copying).",
@@ -37,23 +37,21 @@ def _normalization_from_payload(payload: dict[str, Any] | None) -> Any:
     )
 
 
-def _write_prediction_csv(
-    path: Path, predictions: dict[str, Any], label_names: list[str]
+_PREDICTION_CSV_HEADER = ["session_id", "frame", "predicted_index", "predicted_label"]
+
+
+def _write_prediction_rows(
+    writer: Any, session_id: str, values: Any, label_names: list[str]
 ) -> None:
-    path.parent.mkdir(parents=True, exist_ok=True)
-    with path.open("w", newline="", encoding="utf-8") as f:
-        writer = csv.writer(f)
-        writer.writerow(["session_id", "frame", "predicted_index", "predicted_label"])
-        for session_id, values in predictions.items():
-            for frame_idx, class_idx in enumerate(values.tolist()):
-                writer.writerow(
-                    [
-                        session_id,
-                        int(frame_idx),
-                        int(class_idx),
-                        label_names[int(class_idx)],
-                    ]
-                )
+    for frame_idx, class_idx in enumerate(values.tolist()):
+        writer.writerow(
+            [
+                session_id,
+                int(frame_idx),
+                int(class_idx),
+                label_names[int(class_idx)],
+            ]
+        )
 
 
 @register_model
@@ -198,6 +196,28 @@ class TCNBehaviorPlugin(ModelPluginBase):
                 "probabilities before argmax. Use 1 to disable smoothing."
             ),
         )
+        parser.add_argument(
+            "--batch-size",
+            type=int,
+            default=32,
+            help="Number of windows per inference batch.",
+        )
+        parser.add_argument(
+            "--num-workers",
+            type=int,
+            default=0,
+            help="DataLoader workers assembling inference windows.",
+        )
+        parser.add_argument(
+            "--window-stride",
+            type=int,
+            default=None,
+            help=(
+                "Frames between consecutive inference windows. Smaller than the "
+                "sequence length gives overlapping windows whose probabilities "
+                "are averaged. Defaults to the sequence length."
+            ),
+        )
 
     def predict(self, args: argparse.Namespace) -> int:
         from annolid.behavior.tcn import (
@@ -227,14 +247,27 @@ class TCNBehaviorPlugin(ModelPluginBase):
             require_labels=False,
         )
         smoothing_window = max(1, int(getattr(args, "smoothing_window", 1) or 1))
-        result = predict_tcn(
-            model,
-            dataset,
-            device=args.device,
-            smoothing_window=smoothing_window,
-        )
+        inference_options = {
+            "batch_size": max(1, int(getattr(args, "batch_size", 32) or 32)),
+            "num_workers": max(0, int(getattr(args, "num_workers", 0) or 0)),
+            "stride": getattr(args, "window_stride", None),
+        }
         output_csv = Path(args.output_csv).expanduser().resolve()
-        _write_prediction_csv(output_csv, result["predictions"], label_names)
+        output_csv.parent.mkdir(parents=True, exist_ok=True)
+        # Rows are written as each session finishes instead of held in memory.
+        with output_csv.open("w", newline="", encoding="utf-8") as f:
+            writer = csv.writer(f)
+            writer.writerow(_PREDICTION_CSV_HEADER)
+            predict_tcn(
+                model,
+                dataset,
+                device=args.device,
+                smoothing_window=smoothing_window,
+                on_session=lambda session_id, values, _scores: (
+                    _write_prediction_rows(writer, session_id, values, label_names)
+                ),
+                **inference_options,
+            )
 
         if args.metrics_json:
             if any(session.labels is not None for session in sessions):
@@ -243,6 +276,7 @@ class TCNBehaviorPlugin(ModelPluginBase):
                     dataset,
                     device=args.device,
                     smoothing_window=smoothing_window,
+                    **inference_options,
                 )
             else:
                 metrics = {
@@ -195,6 +195,12 @@ class YOLOLabelMePlugin(ModelPluginBase):
             action="store_true",
             help="For pose models, also save bounding boxes alongside keypoints.",
         )
+        parser.add_argument(
+            "--batch-size",
+            type=int,
+            default=1,
+            help="Frames per predict() call for video sources (applies with --no-tracking or pose models).",
+        )
 
     def predict(self, args: argparse.Namespace) -> int:
         from annolid.segmentation.yolos import InferenceProcessor
@@ -261,6 +267,7 @@ class YOLOLabelMePlugin(ModelPluginBase):
             save_pose_bbox=bool(args.save_pose_bbox)
             if bool(args.save_pose_bbox)
             else None,
+            batch_size=max(1, int(args.batch_size)),
         )
         print(str(message))
         return 0
@@ -1,6 +1,6 @@
 from __future__ import annotations
 from dataclasses import dataclass
-from typing import Iterable, Literal, Optional, Tuple, Union
+from typing import Dict, Iterable, List, Literal, Optional, Sequence, Tuple, Union
 import logging
 import math
 import os
@@ -84,6 +84,7 @@ class Dinov3FeatureExtractor:
 
     Public API:
       - extract(image, return_type) -> [D, H, W] or [L, D, H, W]
+      - extract_batch(images) -> one extract() result per image, batched
       - quantize_mask(mask_image) -> [H_patches, W_patches]
       - map between patches and image pixels
     """
@@ -310,11 +311,71 @@ class Dinov3FeatureExtractor:
         """
         pil = self._to_pil(image, color_space=color_space)
         x = self._preprocess(pil)
+        f = self._forward_grids(
+            x, ret_mode=return_layer or self.cfg.return_layer, normalize=normalize
+        )[0]
+        if return_type == "numpy":
+            return f.numpy()
+        return f
 
-        use_amp = self.cfg.use_amp and self.device.type == "cuda"
-        autocast_device = "cuda" if self.device.type == "cuda" else "cpu"
+    @torch.inference_mode()
+    def extract_batch(
+        self,
+        images: Sequence[Union[Image.Image, np.ndarray]],
+        *,
+        color_space: Literal["RGB", "BGR"] = "RGB",
+        return_type: Literal["torch", "numpy"] = "torch",
+        return_layer: Optional[Literal["last", "all"]] = None,
+        normalize: bool = True,
+        batch_size: Optional[int] = None,
+    ) -> List[Union[torch.Tensor, np.ndarray]]:
+        """Extract dense features for several images with batched forward passes.
+
+        Images are grouped by their preprocessed size and each group runs
+        through the backbone in chunks of ``batch_size`` (all at once when
+        None). Each result matches what :meth:`extract` returns for that
+        image; results are returned in input order.
+        """
+        if type(self).extract is not Dinov3FeatureExtractor.extract:
+            # Subclasses with their own forward path keep per-image semantics.
+            return [
+                self.extract(
+                    image,
+                    color_space=color_space,
+                    return_type=return_type,
+                    return_layer=return_layer,
+                    normalize=normalize,
+                )
+                for image in images
+            ]
 
+        pils = [self._to_pil(image, color_space=color_space) for image in images]
+        groups: Dict[Tuple[int, int], List[int]] = {}
+        for idx, pil in enumerate(pils):
+            groups.setdefault(self._compute_resized_hw(*pil.size), []).append(idx)
+
+        chunk = max(1, int(batch_size)) if batch_size else max(1, len(pils))
         ret_mode = return_layer or self.cfg.return_layer
+        results: List[Union[torch.Tensor, np.ndarray, None]] = [None] * len(pils)
+        for indices in groups.values():
+            for start in range(0, len(indices), chunk):
+                part = indices[start : start + chunk]
+                x = torch.cat([self._preprocess(pils[idx]) for idx in part], dim=0)
+                grids = self._forward_grids(x, ret_mode=ret_mode, normalize=normalize)
+                for idx, f in zip(part, grids):
+                    results[idx] = f.numpy() if return_type == "numpy" else f
+        return results  # type: ignore[return-value]
+
+    def _forward_grids(
+        self,
+        x: torch.Tensor,
+        *,
+        ret_mode: Optional[str],
+        normalize: bool,
+    ) -> List[torch.Tensor]:
+        """Run the backbone on an NCHW batch; returns one feature grid per sample."""
+        use_amp = self.cfg.use_amp and self.device.type == "cuda"
+        autocast_device = "cuda" if self.device.type == "cuda" else "cpu"
 
         # Requesting all hidden states is expensive (and can OOM on MPS).
         # Only do it when we actually need intermediate layers.
@@ -337,19 +398,11 @@ class Dinov3FeatureExtractor:
                 output_hidden_states=bool(need_hidden_states),
             )
 
-        selected_grids = []
         if not need_hidden_states:
-            tokens = outputs.last_hidden_state
-            grid = self._tokens_to_grid(
-                tokens,
-                spatial_hw=(x.shape[-2], x.shape[-1]),
-                detach=True,
-                normalize=normalize,
-            )
-            selected_grids.append(grid)
+            layer_tokens = [outputs.last_hidden_state]
         else:
             hidden_states = outputs.hidden_states  # (num_layers + 1) tensors
-            selected_grids = []
+            layer_tokens = []
             num_layers = len(hidden_states) - 1
             for layer_idx in self._layers:
                 resolved_idx = layer_idx
@@ -359,26 +412,28 @@ class Dinov3FeatureExtractor:
                     raise IndexError(
                         f"Requested layer {layer_idx} outside available range -{num_layers}..{num_layers - 1}"
                     )
-                tokens = hidden_states[resolved_idx + 1]
-                grid = self._tokens_to_grid(
-                    tokens,
-                    spatial_hw=(x.shape[-2], x.shape[-1]),
-                    detach=True,
-                    normalize=normalize,
-                )
-                selected_grids.append(grid)
+                layer_tokens.append(hidden_states[resolved_idx + 1])
 
-        if not selected_grids:
+        if not layer_tokens:
             raise RuntimeError("No layers selected for feature extraction")
 
-        if ret_mode == "last":
-            f = selected_grids[-1]
-        else:
-            f = torch.stack(selected_grids, dim=0)
-
-        if return_type == "numpy":
-            return f.numpy()
-        return f
+        spatial_hw = (x.shape[-2], x.shape[-1])
+        features = []
+        for sample in range(x.shape[0]):
+            selected_grids = [
+                self._tokens_to_grid(
+                    tokens[sample : sample + 1],
+                    spatial_hw=spatial_hw,
+                    detach=True,
+                    normalize=normalize,
+                )
+                for tokens in layer_tokens
+            ]
+            if ret_mode == "last":
+                features.append(selected_grids[-1])
+            else:
+                features.append(torch.stack(selected_grids, dim=0))
+        return features
 
     def _tokens_to_grid(
         self,
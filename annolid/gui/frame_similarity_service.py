@@ -2,14 +2,16 @@ from __future__ import annotations
 
 from dataclasses import dataclass
 from pathlib import Path
-from typing import Any, Dict, List, Optional, Tuple
+from typing import Any, Dict, List, Optional, Sequence, Tuple
 
 import cv2
 import numpy as np
 from qtpy import QtCore
 
 from annolid.core.media.video import CV2Video
+from annolid.services.embedding_index import FrameEmbeddingIndex
 from annolid.services.embedding_search import run_embedding_search
+from annolid.utils.logger import logger
 
 
 @dataclass(frozen=True)
@@ -244,6 +246,9 @@ class _EmbeddingBackend:
     def embed_frame_rgb(self, frame_rgb: np.ndarray) -> np.ndarray:
         raise NotImplementedError
 
+    def embed_frames_rgb(self, frames_rgb: Sequence[np.ndarray]) -> np.ndarray:
+        return np.stack([self.embed_frame_rgb(frame) for frame in frames_rgb])
+
     @property
     def key(self) -> Tuple[str, ...]:
         raise NotImplementedError
@@ -277,6 +282,17 @@ class _Dinov3Backend(_EmbeddingBackend):
         vec = feats.mean(axis=(1, 2)).astype(np.float32, copy=False)
         return _l2_normalize(vec)
 
+    def embed_frames_rgb(self, frames_rgb: Sequence[np.ndarray]) -> np.ndarray:
+        feats = self._extractor.extract_batch(
+            list(frames_rgb), return_type="numpy", return_layer="last", normalize=True
+        )
+        return np.stack(
+            [
+                _l2_normalize(feat.mean(axis=(1, 2)).astype(np.float32, copy=False))
+                for feat in feats
+            ]
+        )
+
 
 class _Qwen3VLBackend(_EmbeddingBackend):
     def __init__(
@@ -351,6 +367,25 @@ def _build_backend(request: FrameSimilaritySearchRequest) -> _EmbeddingBackend:
     raise ValueError(f"Unknown embedding backend: {backend!r}")
 
 
+def _annotation_fingerprint(annotation_dir: Path, store: Optional[object]) -> str:
+    """Cheap summary of the annotations overlaid on frames, for index validity."""
+    parts: List[str] = []
+    try:
+        json_files = list(annotation_dir.glob("*.json"))
+        mtimes = [path.stat().st_mtime_ns for path in json_files]
+        parts.append(f"json:{len(json_files)}:{max(mtimes, default=0)}")
+    except Exception:
+        parts.append("json:?")
+    store_path = getattr(store, "store_path", None)
+    if store_path is not None:
+        try:
+            stat = Path(store_path).stat()
+            parts.append(f"store:{stat.st_size}:{stat.st_mtime_ns}")
+        except Exception:
+            parts.append("store:?")
+    return "|".join(parts)
+
+
 def _backend_key_for_request(request: FrameSimilaritySearchRequest) -> Tuple[str, ...]:
     backend = request.backend
     params = dict(request.backend_params or {})
@@ -460,7 +495,7 @@ class _FrameSimilarityWorker(QtCore.QObject):
             try:
                 total_frames = int(video.total_frames())
 
-                def _embed_at_frame(frame_idx: int) -> np.ndarray:
+                def _frame_rgb(frame_idx: int) -> np.ndarray:
                     frame_rgb = video.load_frame(int(frame_idx))
                     if overlay_shapes and annotation_dir is not None:
                         try:
@@ -475,7 +510,22 @@ class _FrameSimilarityWorker(QtCore.QObject):
                                 )
                         except Exception:
                             pass
-                    return backend.embed_frame_rgb(frame_rgb)
+                    return frame_rgb
+
+                def _embed_frames(frame_indices: Sequence[int]) -> np.ndarray:
+                    return backend.embed_frames_rgb(
+                        [_frame_rgb(frame_idx) for frame_idx in frame_indices]
+                    )
+
+                index = self._open_index(
+                    backend=backend,
+                    video_path=video_path,
+                    stride=int(request.stride),
+                    total_frames=total_frames,
+                    overlay_shapes=overlay_shapes,
+                    annotation_dir=annotation_dir,
+                    store=store,
+                )
 
                 matches = run_embedding_search(
                     query_vector=query_vec,
@@ -485,7 +535,9 @@ class _FrameSimilarityWorker(QtCore.QObject):
                     max_frames=request.max_frames,
                     threshold=float(request.threshold),
                     top_k=int(request.top_k),
-                    embed_frame=_embed_at_frame,
+                    embed_frame=lambda idx: backend.embed_frame_rgb(_frame_rgb(idx)),
+                    embed_frames=_embed_frames,
+                    index=index,
                     is_stopped=self._stop.stopped,
                     on_match=lambda m: self.matchFound.emit(
                         int(m.frame_index), float(m.similarity)
@@ -516,6 +568,32 @@ class _FrameSimilarityWorker(QtCore.QObject):
             self._backend_key = tuple(backend.key)
         return self._backend
 
+    def _open_index(
+        self,
+        *,
+        backend: _EmbeddingBackend,
+        video_path: Path,
+        stride: int,
+        total_frames: int,
+        overlay_shapes: bool,
+        annotation_dir: Path,
+        store: Optional[object],
+    ) -> Optional[FrameEmbeddingIndex]:
+        salt = ""
+        if overlay_shapes:
+            salt = _annotation_fingerprint(annotation_dir, store)
+        try:
+            return FrameEmbeddingIndex.open(
+                video_path,
+                embedder_key=(*backend.key, f"overlay={int(overlay_shapes)}"),
+                stride=stride,
+                total_frames=total_frames,
+                salt=salt,
+            )
+        except Exception as exc:
+            logger.warning("Embedding index unavailable for %s: %s", video_path, exc)
+            return None
+
     def _query_embedding(
         self,
         *,
@@ -554,4 +554,9 @@ class VideoWorkflowMixin:
             (".ome.tif", ".ome.tiff")
         ):
             return videos.TiffStackVideo(video_filename)
-        return videos.CV2Video(video_filename)
+        loader = videos.CV2Video(video_filename)
+        # Timeline scrubbing seeks randomly; index keyframes off the UI thread.
+        build_seek_index = getattr(loader, "build_seek_index", None)
+        if callable(build_seek_index):
+            build_seek_index(background=True)
+        return loader
@@ -225,6 +225,7 @@ def build_realtime_launch_payload(
     max_fps: float = 30.0,
     publish_frames: bool = True,
     publish_annotated_frames: bool = False,
+    shared_memory_frames: bool = True,
     viewer_only: bool = False,
     rtsp_transport: str = "auto",
     bot_report_enabled: bool = False,
@@ -288,6 +289,7 @@ def build_realtime_launch_payload(
         viewer_only=viewer_only_mode,
         frame_encoding="jpg",
         frame_quality=80,
+        shared_memory_frames=bool(shared_memory_frames),
         save_detection_segments=(
             False if viewer_only_mode else bool(save_detection_segments)
         ),
@@ -0,0 +1,277 @@
+from __future__ import annotations
+
+from collections import OrderedDict
+from dataclasses import dataclass, field
+import itertools
+import os
+import threading
+from typing import Any, Hashable
+
+
+DEFAULT_TILE_CACHE_BUDGET_BYTES = 512 * 1024 * 1024
+TILE_CACHE_BUDGET_ENV = "ANNOLID_TILE_CACHE_MB"
+
+
+def estimate_tile_nbytes(tile: Any) -> int:
+    """Best-effort byte size of a cached tile (QImage, numpy array, bytes)."""
+    nbytes = getattr(tile, "nbytes", None)
+    if isinstance(nbytes, int):
+        return nbytes
+    for attr in ("sizeInBytes", "byteCount"):
+        method = getattr(tile, attr, None)
+        if callable(method):
+            try:
+                return int(method())
+            except Exception:
+                continue
+    if isinstance(tile, (bytes, bytearray, memoryview)):
+        return len(tile)
+    width = getattr(tile, "width", None)
+    height = getattr(tile, "height", None)
+    if callable(width) and callable(height):
+        try:
+            return int(width()) * int(height()) * 4
+        except Exception:
+            pass
+    return 0
+
+
+def _tile_level(key: Any) -> int:
+    try:
+        return int(getattr(key, "level", 0) or 0)
+    except (TypeError, ValueError):
+        return 0
+
+
+def _budget_from_env() -> int:
+    raw = str(os.environ.get(TILE_CACHE_BUDGET_ENV) or "").strip()
+    if raw:
+        try:
+            return max(1, int(float(raw) * 1024 * 1024))
+        except ValueError:
+            pass
+    return DEFAULT_TILE_CACHE_BUDGET_BYTES
+
+
+@dataclass
+class TileCacheStats:
+    budget_bytes: int = 0
+    total_bytes: int = 0
+    items: int = 0
+    hits: int = 0
+    misses: int = 0
+    evictions: int = 0
+    evicted_bytes: int = 0
+    layer_bytes: dict[str, int] = field(default_factory=dict)
+    level_bytes: dict[str, dict[int, int]] = field(default_factory=dict)
+
+
+class SharedTileCache:
+    """Process-wide LRU tile cache bounded by a byte budget.
+
+    Entries are stored per owner (one :class:`TileCache` view per raster,
+    label or overlay layer) and accounted per layer name and pyramid level.
+    When the budget is exceeded the least recently used entries are evicted,
+    except that within the oldest ``eviction_window`` entries the finest
+    pyramid level goes first: coarse tiles are cheap, cover a large area and
+    are what the viewer falls back to while fine tiles load.
+    """
+
+    _instance: "SharedTileCache | None" = None
+    _instance_lock = threading.Lock()
+
+    def __init__(
+        self, budget_bytes: int | None = None, *, eviction_window: int = 8
+    ) -> None:
+        self.budget_bytes = max(
+            1, int(_budget_from_env() if budget_bytes is None else budget_bytes)
+        )
+        self.eviction_window = max(1, int(eviction_window))
+        self._entries: OrderedDict[tuple[int, Hashable], tuple[Any, int, str, int]] = (
+            OrderedDict()
+        )
+        self._owner_items: dict[int, int] = {}
+        self._layer_level_bytes: dict[str, dict[int, int]] = {}
+        self._total_bytes = 0
+        self._hits = 0
+        self._misses = 0
+        self._evictions = 0
+        self._evicted_bytes = 0
+        self._lock = threading.RLock()
+
+    @classmethod
+    def instance(cls) -> "SharedTileCache":
+        with cls._instance_lock:
+            if cls._instance is None:
+                cls._instance = cls()
+            return cls._instance
+
+    # ------------------------------------------------------------------
+    # Entry access
+    # ------------------------------------------------------------------
+    def get(self, owner: int, key: Hashable):
+        with self._lock:
+            entry = self._entries.get((owner, key))
+            if entry is None:
+                self._misses += 1
+                return None
+            self._entries.move_to_end((owner, key))
+            self._hits += 1
+            return entry[0]
+
+    def put(self, owner: int, layer: str, key: Hashable, tile: Any) -> None:
+        nbytes = estimate_tile_nbytes(tile)
+        level = _tile_level(key)
+        with self._lock:
+            self._discard((owner, key))
+            self._entries[(owner, key)] = (tile, nbytes, layer, level)
+            self._account(owner, layer, level, nbytes, 1)
+            self._enforce_budget()
+
+    def clear_owner(self, owner: int) -> None:
+        with self._lock:
+            for entry_key in [k for k in self._entries if k[0] == owner]:
+                self._discard(entry_key)
+
+    def trim_owner(self, owner: int, max_items: int) -> None:
+        """Drop the least recently used entries of ``owner`` beyond ``max_items``."""
+        with self._lock:
+            owned = [k for k in self._entries if k[0] == owner]
+            for entry_key in owned[: max(0, len(owned) - int(max_items))]:
+                self._discard(entry_key)
+                self._evictions += 1
+
+    def owner_items(self, owner: int) -> int:
+        with self._lock:
+            return int(self._owner_items.get(owner, 0))
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+            self._owner_items.clear()
+            self._layer_level_bytes.clear()
+            self._total_bytes = 0
+
+    # ------------------------------------------------------------------
+    # Budget / statistics
+    # ------------------------------------------------------------------
+    def set_budget_bytes(self, budget_bytes: int) -> None:
+        with self._lock:
+            self.budget_bytes = max(1, int(budget_bytes))
+            self._enforce_budget()
+
+    @property
+    def total_bytes(self) -> int:
+        return int(self._total_bytes)
+
+    def stats(self) -> TileCacheStats:
+        with self._lock:
+            return TileCacheStats(
+                budget_bytes=int(self.budget_bytes),
+                total_bytes=int(self._total_bytes),
+                items=len(self._entries),
+                hits=int(self._hits),
+                misses=int(self._misses),
+                evictions=int(self._evictions),
+                evicted_bytes=int(self._evicted_bytes),
+                layer_bytes={
+                    layer: int(sum(levels.values()))
+                    for layer, levels in self._layer_level_bytes.items()
+                },
+                level_bytes={
+                    layer: dict(levels)
+                    for layer, levels in self._layer_level_bytes.items()
+                },
+            )
+
+    def reset_stats(self) -> None:
+        with self._lock:
+            self._hits = 0
+            self._misses = 0
+            self._evictions = 0
+            self._evicted_bytes = 0
+
+    # ------------------------------------------------------------------
+    # Internals (call with ``self._lock`` held)
+    # ------------------------------------------------------------------
+    def _account(
+        self, owner: int, layer: str, level: int, nbytes: int, items: int
+    ) -> None:
+        self._total_bytes += nbytes
+        owner_items = self._owner_items.get(owner, 0) + items
+        if owner_items > 0:
+            self._owner_items[owner] = owner_items
+        else:
+            self._owner_items.pop(owner, None)
+        levels = self._layer_level_bytes.setdefault(layer, {})
+        levels[level] = levels.get(level, 0) + nbytes
+        if items < 0 and levels[level] <= 0:
+            levels.pop(level, None)
+            if not levels:
+                self._layer_level_bytes.pop(layer, None)
+
+    def _discard(self, entry_key: tuple[int, Hashable]) -> int:
+        entry = self._entries.pop(entry_key, None)
+        if entry is None:
+            return 0
+        _tile, nbytes, layer, level = entry
+        self._account(entry_key[0], layer, level, -nbytes, -1)
+        return nbytes
+
+    def _enforce_budget(self) -> None:
+        while self._total_bytes > self.budget_bytes and len(self._entries) > 1:
+            victim = None
+            victim_level = None
+            for candidate in itertools.islice(self._entries, self.eviction_window):
+                level = self._entries[candidate][3]
+                if victim_level is None or level < victim_level:
+                    victim, victim_level = candidate, level
+            self._evicted_bytes += self._discard(victim)
+            self._evictions += 1
+
+
+def shared_tile_cache() -> SharedTileCache:
+    return SharedTileCache.instance()
+
+
+_OWNER_IDS = itertools.count(1)
+
+
+class TileCache:
+    """Per-layer view onto the process-wide :class:`SharedTileCache`.
+
+    Keeps the historical ``get``/``put``/``trim`` API used by the tile
+    schedulers. ``layer`` names the view in cache statistics; ``max_items``
+    optionally caps this view on top of the shared byte budget.
+    """
+
+    def __init__(
+        self,
+        max_items: int | None = None,
+        *,
+        layer: str = "raster",
+        shared: SharedTileCache | None = None,
+    ):
+        self.max_items = None if max_items is None else max(1, int(max_items))
+        self.layer = str(layer or "raster")
+        self.shared = shared if shared is not None else shared_tile_cache()
+        self._owner = next(_OWNER_IDS)
+
+    def get(self, key):
+        return self.shared.get(self._owner, key)
+
+    def put(self, key, image):
+        self.shared.put(self._owner, self.layer, key, image)
+        if self.max_items is not None:
+            self.trim(self.max_items)
+
+    def trim(self, max_items: int | None = None):
+        limit = self.max_items if max_items is None else max(1, int(max_items))
+        if limit is not None and len(self) > limit:
+            self.shared.trim_owner(self._owner, limit)
+
+    def clear(self) -> None:
+        self.shared.clear_owner(self._owner)
+
+    def __len__(self) -> int:
+        return self.shared.owner_items(self._owner)
@@ -2,13 +2,28 @@ from __future__ import annotations
 
 from concurrent.futures import Future, ThreadPoolExecutor
 from dataclasses import dataclass
+import os
 import threading
-from typing import Callable, Generic, Iterable, TypeVar
+from typing import Any, Callable, Generic, Iterable, TypeVar
 
 
 T = TypeVar("T")
 K = TypeVar("K")
 
+MAX_TILE_DECODE_WORKERS = 4
+
+
+def tile_decode_workers(backend: Any, *, limit: int = MAX_TILE_DECODE_WORKERS) -> int:
+    """Number of decode threads worth running for ``backend``.
+
+    Backends whose ``read_region`` releases the GIL (tifffile, pyvips,
+    openslide) advertise ``supports_parallel_reads`` and decode on several
+    workers; everything else keeps a single background worker.
+    """
+    if backend is None or not bool(getattr(backend, "supports_parallel_reads", False)):
+        return 1
+    return max(1, min(int(limit), int(os.cpu_count() or 1)))
+
 
 @dataclass(frozen=True)
 class TileRenderPlan(Generic[K]):
@@ -68,7 +83,9 @@ class TileRequestScheduler:
 
     def stats(self) -> TileSchedulerStats:
         stats = TileSchedulerStats(**self._stats.__dict__)
-        stats.outstanding_requests = len(self._pending)
+        with self._lock:
+            # Finished-but-unpolled tiles keep the caller's poll timer alive.
+            stats.outstanding_requests = len(self._pending) + len(self._completed)
         stats.cache_misses = max(
             0,
             int(stats.visible_requests)
@@ -152,7 +169,16 @@ class TileRequestScheduler:
             self._stats.cache_hits += 1
             return cached
         with self._lock:
-            if key in self._pending:
+            # A tile still in flight (or finished but not yet polled) stays
+            # wanted: re-tag it with this generation so a pan or zoom that
+            # keeps it visible does not turn its result into a stale skip.
+            pending = self._pending.get(key)
+            if pending is not None:
+                self._pending[key] = (generation, pending[1])
+                return None
+            completed = self._completed.get(key)
+            if completed is not None:
+                self._completed[key] = (generation, completed[1])
                 return None
         if not self._async_load or force_sync or self._executor is None:
             self._stats.loads_started += 1
@@ -168,20 +194,21 @@ class TileRequestScheduler:
         with self._lock:
             self._pending[key] = (generation, future)
 
-        def _on_done(
-            done: Future[T], *, tile_key: K = key, tile_generation: int = generation
-        ) -> None:
-            with self._lock:
-                self._pending.pop(tile_key, None)
-            if done.cancelled():
-                return
-            try:
-                tile = done.result()
-            except Exception:
-                return
-            self._stats.loads_completed += 1
+        def _on_done(done: Future[T], *, tile_key: K = key) -> None:
+            tile = None
+            if not done.cancelled():
+                try:
+                    tile = done.result()
+                except Exception:
+                    tile = None
+            # Publish the result in the same critical section that clears the
+            # pending entry so no poll can observe the tile as neither.
             with self._lock:
-                self._completed[tile_key] = (tile_generation, tile)
+                entry = self._pending.pop(tile_key, None)
+                tile_generation = entry[0] if entry is not None else -1
+                if tile is not None:
+                    self._stats.loads_completed += 1
+                    self._completed[tile_key] = (tile_generation, tile)
 
         future.add_done_callback(_on_done)
         return None
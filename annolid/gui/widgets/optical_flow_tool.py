@@ -14,6 +14,7 @@ from qtpy import QtCore, QtWidgets
 from annolid.gui.widgets.optical_flow_dialog import FlowOptionsDialog
 from annolid.gui.workers import FlexibleWorker
 from annolid.motion.flow_runner import process_video_flow, flow_to_color
+from annolid.motion.flow_store import FlowStore
 from annolid.utils import draw
 
 
@@ -38,10 +39,11 @@ class FlowPreferences:
 class FlowRunSettings(FlowPreferences):
     video_path: str = ""
     ndjson_path: str = ""
+    flow_store_path: str = ""
 
 
 class OpticalFlowTool(QtCore.QObject):
-    """Encapsulates optical-flow UI, running, and NDJSON overlay playback."""
+    """Encapsulates optical-flow UI, running, and flow-store/NDJSON overlay playback."""
 
     def __init__(self, window: QtWidgets.QWidget) -> None:
         super().__init__(window)
@@ -49,8 +51,10 @@ class OpticalFlowTool(QtCore.QObject):
         self._worker: Optional[FlexibleWorker] = None
         self._worker_thread: Optional[QtCore.QThread] = None
         self._active_ndjson_path: Optional[Path] = None
+        self._active_flow_store_path: Optional[Path] = None
         self._live_running: bool = False
         self._records: Dict[int, Dict[str, object]] = {}
+        self._flow_store: Optional[FlowStore] = None
         self._global_mag_max: Optional[float] = None
 
     # ------------------------------------------------------------------ #
@@ -131,6 +135,7 @@ class OpticalFlowTool(QtCore.QObject):
 
     def clear(self) -> None:
         self._records = {}
+        self._flow_store = None
         self._global_mag_max = None
         self._live_running = False
         w = self._window
@@ -141,9 +146,13 @@ class OpticalFlowTool(QtCore.QObject):
             pass
 
     def load_records(self, video_file: Optional[str] = None) -> None:
-        path = self._flow_ndjson_path(video_file)
+        path = self._flow_store_path(video_file)
+        if not path or not path.is_dir():
+            # Fall back to NDJSON written by older runs.
+            path = self._flow_ndjson_path(video_file)
         if not path:
             self._records = {}
+            self._flow_store = None
             self._global_mag_max = None
             return
         self._load_records_from_path(path)
@@ -151,6 +160,17 @@ class OpticalFlowTool(QtCore.QObject):
     def _load_records_from_path(self, path: Path) -> None:
         records: Dict[int, Dict[str, object]] = {}
         global_mag_max = 0.0
+        self._flow_store = None
+        if path.is_dir():
+            try:
+                self._flow_store = FlowStore.open(path)
+            except Exception:
+                self._flow_store = None
+            self._records = records
+            self._global_mag_max = (
+                self._flow_store.max_magnitude() if self._flow_store else None
+            )
+            return
         if not path.exists():
             self._records = records
             self._global_mag_max = None
@@ -192,14 +212,23 @@ class OpticalFlowTool(QtCore.QObject):
         if not getattr(w, "canvas", None):
             return
         record = self._records.get(int(frame_number))
-        if record is None:
-            # During a live run, let preview overlays persist even if NDJSON
-            # hasn't been appended/loaded yet.
+        flow = None
+        if record is None and self._flow_store is not None:
+            try:
+                flow = self._flow_store.read(int(frame_number))
+            except Exception:
+                flow = None
+        if record is None and flow is None:
+            # During a live run, let preview overlays persist even if the
+            # flow output hasn't been written/loaded yet.
             if self._live_running:
                 return
             w.canvas.setFlowPreviewOverlay(None)
             return
-        overlay = self._overlay_from_record(record)
+        if record is not None:
+            overlay = self._overlay_from_record(record)
+        else:
+            overlay = self._overlay_from_flow(flow)
         if overlay is None:
             w.canvas.setFlowPreviewOverlay(None)
             return
@@ -213,7 +242,11 @@ class OpticalFlowTool(QtCore.QObject):
 
     def has_overlay_for_frame(self, frame_number: int) -> bool:
         try:
-            return int(frame_number) in self._records
+            if int(frame_number) in self._records:
+                return True
+            return (
+                self._flow_store is not None and int(frame_number) in self._flow_store
+            )
         except Exception:
             return False
 
@@ -243,7 +276,7 @@ class OpticalFlowTool(QtCore.QObject):
             backend=prefs.backend,
             raft_model=prefs.raft_model,
             visualization=prefs.visualization,
-            ndjson_path=str(self._default_ndjson_path(video_path)),
+            flow_store_path=str(self._default_flow_store_path(video_path)),
             opacity=int(prefs.opacity),
             quiver_step=int(prefs.quiver_step),
             quiver_gain=float(prefs.quiver_gain),
@@ -329,7 +362,12 @@ class OpticalFlowTool(QtCore.QObject):
     def _start_worker(self, settings: FlowRunSettings) -> None:
         w = self._window
         self._live_running = True
-        self._active_ndjson_path = Path(settings.ndjson_path)
+        self._active_ndjson_path = (
+            Path(settings.ndjson_path) if settings.ndjson_path else None
+        )
+        self._active_flow_store_path = (
+            Path(settings.flow_store_path) if settings.flow_store_path else None
+        )
         backend_val = str(settings.backend).lower()
         use_torch_farneback = ("torch" in backend_val) and ("raft" not in backend_val)
         worker = FlexibleWorker(
@@ -337,7 +375,8 @@ class OpticalFlowTool(QtCore.QObject):
             settings.video_path,
             backend=settings.backend,
             save_csv=None,
-            save_ndjson=settings.ndjson_path,
+            save_ndjson=settings.ndjson_path or None,
+            save_flow_store=settings.flow_store_path or None,
             sample_stride=1,
             visualization=settings.visualization,
             raft_model=settings.raft_model,
@@ -388,11 +427,19 @@ class OpticalFlowTool(QtCore.QObject):
         opacity = float(getattr(w, "flow_opacity", 70))
         return int(np.clip(opacity, 0, 100) / 100.0 * 255.0)
 
-    def _default_ndjson_path(self, video_file: Optional[str] = None) -> Path:
-        path = self._flow_ndjson_path(video_file)
+    def _default_flow_store_path(self, video_file: Optional[str] = None) -> Path:
+        path = self._flow_store_path(video_file)
         if path:
             return path
-        return Path.home() / "flow.ndjson"
+        return Path.home() / "flow_store"
+
+    def _flow_store_path(self, video_file: Optional[str] = None) -> Optional[Path]:
+        candidate = video_file or getattr(self._window, "video_file", None)
+        if not candidate:
+            return None
+        video_path = Path(candidate).expanduser()
+        flow_dir = video_path.parent / video_path.stem
+        return flow_dir / f"{video_path.stem}_flow_store"
 
     def _flow_ndjson_path(self, video_file: Optional[str] = None) -> Optional[Path]:
         candidate = video_file or getattr(self._window, "video_file", None)
@@ -447,7 +494,6 @@ class OpticalFlowTool(QtCore.QObject):
             return None
 
     def _overlay_from_record(self, record: Dict[str, object]) -> Optional[np.ndarray]:
-        w = self._window
         try:
             height = int(record.get("imageHeight") or 0)
             width = int(record.get("imageWidth") or 0)
@@ -461,7 +507,15 @@ class OpticalFlowTool(QtCore.QObject):
             dy = self._decode_flow_component(dy_comp, height, width)
             if dx is None or dy is None:
                 return None
-            flow = np.stack([dx, dy], axis=-1).astype(np.float32)
+            return self._overlay_from_flow(np.stack([dx, dy], axis=-1))
+        except Exception:
+            return None
+
+    def _overlay_from_flow(self, flow: np.ndarray) -> Optional[np.ndarray]:
+        w = self._window
+        try:
+            flow = np.asarray(flow, dtype=np.float32)
+            height, width = flow.shape[:2]
             viz = str(getattr(w, "flow_visualization", "hsv")).lower()
             if viz == "hsv":
                 global_max = (
@@ -534,6 +588,7 @@ class OpticalFlowTool(QtCore.QObject):
         w = self._window
         self._live_running = False
         ndjson_path = self._active_ndjson_path
+        output_path = self._active_flow_store_path or ndjson_path
         worker_thread = self._worker_thread
 
         if worker_thread is not None:
@@ -548,14 +603,15 @@ class OpticalFlowTool(QtCore.QObject):
         self._worker = None
         self._worker_thread = None
         self._active_ndjson_path = None
+        self._active_flow_store_path = None
 
         if isinstance(result, Exception):
             QtWidgets.QMessageBox.critical(w, w.tr("Optical flow error"), str(result))
             return
 
-        if ndjson_path is None:
+        if output_path is None:
             return
-        self._load_records_from_path(ndjson_path)
+        self._load_records_from_path(output_path)
         try:
             w.statusBar().showMessage(w.tr("Optical flow complete."), 3000)
         except Exception:
@@ -563,5 +619,5 @@ class OpticalFlowTool(QtCore.QObject):
         QtWidgets.QMessageBox.information(
             w,
             w.tr("Optical flow"),
-            w.tr("Optical flow completed.\nNDJSON: %s") % str(ndjson_path),
+            w.tr("Optical flow completed.\nOutput: %s") % str(output_path),
         )
@@ -385,7 +385,8 @@ class RealtimeManager(QtCore.QObject):
         self.realtime_perception_worker.start()
 
         self.realtime_subscriber_worker = RealtimeSubscriberWorker(
-            self._realtime_connect_address
+            self._realtime_connect_address,
+            shared_memory=bool(getattr(realtime_config, "shared_memory_frames", False)),
         )
         self.realtime_subscriber_worker.frame_received.connect(self._on_realtime_frame)
         self.realtime_subscriber_worker.status_received.connect(
@@ -427,6 +428,11 @@ class RealtimeManager(QtCore.QObject):
         self._realtime_shapes = []
         self._realtime_connect_address = None
 
+        # Cameras running the same model share one perception worker, so the
+        # model is loaded once and their frames are inferred as one batch. The
+        # worker keeps each camera's own max_fps and confidence_threshold.
+        shared_groups: Dict[str, List[str]] = {}
+        camera_groups: Dict[str, str] = {}
         for idx, (realtime_config, extras) in enumerate(sessions):
             camera_id = str(
                 extras.get("camera_id")
@@ -437,20 +443,45 @@ class RealtimeManager(QtCore.QObject):
             resolved_model = self._resolve_model_path(realtime_config.model_base_name)
             if resolved_model is not None and self._validate_model_file(resolved_model):
                 realtime_config.model_base_name = str(resolved_model)
+            group_key = (
+                f"viewer:{camera_id}"
+                if realtime_config.viewer_only
+                else f"model:{realtime_config.model_base_name}"
+            )
+            shared_groups.setdefault(group_key, []).append(camera_id)
+            camera_groups[camera_id] = group_key
 
+        group_workers: Dict[str, PerceptionProcessWorker] = {}
+        for realtime_config, extras in sessions:
+            camera_id = realtime_config.camera_id
             subscriber_address = str(
                 extras.get("subscriber_address") or "tcp://127.0.0.1:5555"
             )
-            perception_worker = PerceptionProcessWorker(
-                config=realtime_config,
-                parent=self.window,
-            )
-            subscriber_worker = RealtimeSubscriberWorker(subscriber_address)
-            perception_worker.error.connect(self._on_realtime_error)
-            perception_worker.stopped.connect(
-                lambda camera_id=camera_id: self._on_multi_camera_worker_stopped(
-                    camera_id
+            group_key = camera_groups[camera_id]
+            perception_worker = group_workers.get(group_key)
+            if perception_worker is None:
+                group_ids = shared_groups[group_key]
+                group_configs = [
+                    cfg for cfg, _extras in sessions if cfg.camera_id in group_ids
+                ]
+                perception_worker = PerceptionProcessWorker(
+                    config=group_configs
+                    if len(group_configs) > 1
+                    else group_configs[0],
+                    parent=self.window,
+                )
+                perception_worker.error.connect(self._on_realtime_error)
+                perception_worker.stopped.connect(
+                    lambda group_ids=tuple(group_ids): (
+                        self._on_multi_camera_group_stopped(group_ids)
+                    )
                 )
+                group_workers[group_key] = perception_worker
+            subscriber_worker = RealtimeSubscriberWorker(
+                subscriber_address,
+                shared_memory=bool(
+                    getattr(realtime_config, "shared_memory_frames", False)
+                ),
             )
             subscriber_worker.frame_received.connect(self._on_realtime_frame)
             subscriber_worker.status_received.connect(self._on_realtime_status)
@@ -462,8 +493,9 @@ class RealtimeManager(QtCore.QObject):
                 "extras": dict(extras or {}),
             }
 
+        for worker in group_workers.values():
+            worker.start()
         for session in self._multi_camera_workers.values():
-            session["perception"].start()
             session["subscriber"].start()
 
         self._last_realtime_model_name = ", ".join(
@@ -521,6 +553,7 @@ class RealtimeManager(QtCore.QObject):
         self.realtime_control_widget.set_status_text(
             self.window.tr("Stopping realtime multi-camera inference…")
         )
+        stopped_workers = []
         for camera_id, session in list(self._multi_camera_workers.items()):
             subscriber = session.get("subscriber")
             if subscriber is not None:
@@ -528,7 +561,8 @@ class RealtimeManager(QtCore.QObject):
                     subscriber.stop()
                     subscriber.wait(500)
             worker = session.get("perception")
-            if worker is not None:
+            if worker is not None and worker not in stopped_workers:
+                stopped_workers.append(worker)
                 with contextlib.suppress(Exception):
                     worker.request_stop()
                 if not worker.wait(5000):
@@ -1493,6 +1527,10 @@ class RealtimeManager(QtCore.QObject):
         self.realtime_perception_worker = None
         self._finalize_realtime_shutdown()
 
+    def _on_multi_camera_group_stopped(self, camera_ids: Tuple[str, ...]) -> None:
+        for camera_id in camera_ids:
+            self._on_multi_camera_worker_stopped(camera_id)
+
     def _on_multi_camera_worker_stopped(self, camera_id: str) -> None:
         session = self._multi_camera_workers.get(str(camera_id))
         if session is not None:
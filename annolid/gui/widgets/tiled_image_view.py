@@ -19,7 +19,12 @@ from annolid.gui.large_image_modes import (
 from annolid.gui.mixins.shared_polygon_edit_mixin import SharedPolygonEditMixin
 from annolid.gui.shape import Shape
 from annolid.gui.shared_vertices import SharedTopologyRegistry
-from annolid.gui.tile_scheduler import TileRenderPlan, TileRequestScheduler
+from annolid.gui.tile_cache import TileCache, TileCacheStats
+from annolid.gui.tile_scheduler import (
+    TileRenderPlan,
+    TileRequestScheduler,
+    tile_decode_workers,
+)
 from annolid.io.large_image import LargeImageBackend
 from annolid.io.large_image.common import array_to_qimage
 from annolid.utils.logger import logger
@@ -38,31 +43,6 @@ class TileKey:
     ty: int
 
 
-class TileCache:
-    def __init__(self, max_items: int = 128):
-        self.max_items = max(1, int(max_items))
-        self._items: OrderedDict[TileKey, QtGui.QImage] = OrderedDict()
-
-    def get(self, key: TileKey):
-        image = self._items.get(key)
-        if image is not None:
-            self._items.move_to_end(key)
-        return image
-
-    def put(self, key: TileKey, image):
-        self._items[key] = image
-        self._items.move_to_end(key)
-        self.trim(self.max_items)
-
-    def trim(self, max_items: int | None = None):
-        limit = self.max_items if max_items is None else max(1, int(max_items))
-        while len(self._items) > limit:
-            self._items.popitem(last=False)
-
-    def __len__(self) -> int:
-        return len(self._items)
-
-
 @dataclass
 class _RasterOverlayRuntime:
     layer_id: str
@@ -78,7 +58,9 @@ class _RasterOverlayRuntime:
     sx: float = 1.0
     sy: float = 1.0
     rotation_deg: float = 0.0
-    tile_cache: TileCache = field(default_factory=TileCache)
+    tile_cache: TileCache = field(
+        default_factory=lambda: TileCache(layer="raster_overlay")
+    )
     tile_scheduler: TileRequestScheduler | None = None
     tile_items: dict[TileKey, QtWidgets.QGraphicsPixmapItem] = field(
         default_factory=dict
@@ -349,7 +331,7 @@ class TiledImageView(SharedPolygonEditMixin, QtWidgets.QGraphicsView):
         self._scene = QtWidgets.QGraphicsScene(self)
         self.setScene(self._scene)
         self.tile_size = max(128, int(tile_size))
-        self.tile_cache = TileCache()
+        self.tile_cache = TileCache(layer="raster")
         self._tile_scheduler = TileRequestScheduler(
             cache_get=self.tile_cache.get,
             cache_put=self.tile_cache.put,
@@ -406,7 +388,7 @@ class TiledImageView(SharedPolygonEditMixin, QtWidgets.QGraphicsView):
         self._content_size: tuple[int, int] = (0, 0)
         self._fit_mode: str = "fit_window"
         self._label_backend: LargeImageBackend | None = None
-        self._label_tile_cache = TileCache()
+        self._label_tile_cache = TileCache(layer="label")
         self._last_label_level: int = 0
         self._last_label_visible_tile_count: int = 0
         self._label_tile_scheduler = TileRequestScheduler(
@@ -455,6 +437,10 @@ class TiledImageView(SharedPolygonEditMixin, QtWidgets.QGraphicsView):
             self._refresh_visible_tiles_now
         )
         self._current_visible_raster_keys: tuple[TileKey, ...] = ()
+        self._motion_last_center: tuple[float, float] | None = None
+        self._motion_last_scale: float | None = None
+        self._view_motion: tuple[float, float] = (0.0, 0.0)
+        self._zoom_trend: int = 0
         self._current_visible_label_keys: tuple[TileKey, ...] = ()
         self._adjoining_source_shape: Shape | None = None
         self._adjoining_default_point_pending: bool = False
@@ -585,12 +571,16 @@ class TiledImageView(SharedPolygonEditMixin, QtWidgets.QGraphicsView):
             pass
         self.clear_raster_overlay_layers(notify=False)
         self.backend = backend
-        self.tile_cache = TileCache()
+        self.tile_cache.clear()
         self._tile_scheduler = TileRequestScheduler(
             cache_get=self.tile_cache.get,
             cache_put=self.tile_cache.put,
             load_tile=self._load_raster_tile,
+            async_load=True,
+            max_workers=tile_decode_workers(backend),
         )
+        self._motion_last_center = None
+        self._motion_last_scale = None
         self._base_raster_visible = True
         self._pixmap_item.setVisible(True)
         self._clear_tile_items()
@@ -678,12 +668,13 @@ class TiledImageView(SharedPolygonEditMixin, QtWidgets.QGraphicsView):
             }
         else:
             self._label_transform = {"tx": 0.0, "ty": 0.0, "sx": 1.0, "sy": 1.0}
-        self._label_tile_cache = TileCache()
+        self._label_tile_cache.clear()
         self._label_tile_scheduler = TileRequestScheduler(
             cache_get=self._label_tile_cache.get,
             cache_put=self._label_tile_cache.put,
             load_tile=self._load_label_tile,
             async_load=True,
+            max_workers=tile_decode_workers(backend),
         )
         self._clear_label_value_cache()
         self._clear_label_tile_items()
@@ -696,7 +687,7 @@ class TiledImageView(SharedPolygonEditMixin, QtWidgets.QGraphicsView):
         except Exception:
             pass
         self._label_backend = None
-        self._label_tile_cache = TileCache()
+        self._label_tile_cache.clear()
         self._label_tile_scheduler = TileRequestScheduler(
             cache_get=self._label_tile_cache.get,
             cache_put=self._label_tile_cache.put,
@@ -733,7 +724,7 @@ class TiledImageView(SharedPolygonEditMixin, QtWidgets.QGraphicsView):
         if abs(normalized - self._label_overlay_opacity) < 1e-6:
             return
         self._label_overlay_opacity = normalized
-        self._label_tile_cache = TileCache()
+        self._label_tile_cache.clear()
         self._clear_label_tile_items()
         self._refresh_visible_tiles_now()
         self._notify_host_large_image_document_changed()
@@ -783,6 +774,7 @@ class TiledImageView(SharedPolygonEditMixin, QtWidgets.QGraphicsView):
                 load_tile=lambda key,
                 _layer_id=layer_id: self._load_raster_overlay_tile(_layer_id, key),
                 async_load=True,
+                max_workers=tile_decode_workers(backend),
             )
             self._raster_overlay_layers[layer_id] = runtime
         self._refresh_visible_tiles_now()
@@ -799,6 +791,7 @@ class TiledImageView(SharedPolygonEditMixin, QtWidgets.QGraphicsView):
             for item in list(runtime.tile_items.values()):
                 self._scene.removeItem(item)
             runtime.tile_items.clear()
+            runtime.tile_cache.clear()
         self._raster_overlay_layers.clear()
         if notify:
             self.refresh_visible_tiles()
@@ -1014,7 +1007,7 @@ class TiledImageView(SharedPolygonEditMixin, QtWidgets.QGraphicsView):
             except Exception:
                 continue
             runtime.page_index = int(base_page)
-            runtime.tile_cache = TileCache()
+            runtime.tile_cache.clear()
             runtime.tile_items.clear()
             runtime.current_visible_keys = ()
             runtime.last_visible_tile_count = 0
@@ -1031,7 +1024,7 @@ class TiledImageView(SharedPolygonEditMixin, QtWidgets.QGraphicsView):
         if normalized == self._selected_label_value:
             return
         self._selected_label_value = normalized
-        self._label_tile_cache = TileCache()
+        self._label_tile_cache.clear()
         self._clear_label_tile_items()
         self.refresh_visible_tiles()
         self._notify_host_large_image_document_changed()
@@ -1065,7 +1058,7 @@ class TiledImageView(SharedPolygonEditMixin, QtWidgets.QGraphicsView):
         self._tile_result_timer.stop()
         self.backend = None
         self._content_size = (0, 0)
-        self.tile_cache = TileCache()
+        self.tile_cache.clear()
         self._tile_scheduler = TileRequestScheduler(
             cache_get=self.tile_cache.get,
             cache_put=self.tile_cache.put,
@@ -2740,6 +2733,33 @@ class TiledImageView(SharedPolygonEditMixin, QtWidgets.QGraphicsView):
     def visible_tile_keys(self, level: int = 0) -> list[TileKey]:
         return self._visible_tile_keys_for_backend(self.backend, level=level)
 
+    def _update_view_motion(self) -> None:
+        """Track the pan direction and zoom trend between tile refreshes."""
+        center = self.mapToScene(self.viewport().rect().center())
+        scale = self.current_scale()
+        previous_center = self._motion_last_center
+        previous_scale = self._motion_last_scale
+        self._motion_last_center = (float(center.x()), float(center.y()))
+        self._motion_last_scale = float(scale)
+        if previous_center is None or previous_scale is None:
+            self._view_motion = (0.0, 0.0)
+            self._zoom_trend = 0
+            return
+        dx = float(center.x()) - previous_center[0]
+        dy = float(center.y()) - previous_center[1]
+        distance = math.hypot(dx, dy)
+        # Ignore sub-pixel jitter (measured in viewport pixels).
+        if distance * max(1e-9, float(scale)) < 1.0:
+            self._view_motion = (0.0, 0.0)
+        else:
+            self._view_motion = (dx / distance, dy / distance)
+        if scale > previous_scale * 1.001:
+            self._zoom_trend = -1
+        elif scale < previous_scale / 1.001:
+            self._zoom_trend = 1
+        else:
+            self._zoom_trend = 0
+
     def _prefetch_tile_keys(
         self,
         visible_keys: Iterable[TileKey],
@@ -2747,7 +2767,16 @@ class TiledImageView(SharedPolygonEditMixin, QtWidgets.QGraphicsView):
         backend: LargeImageBackend | None,
         level: int,
         limit: int = 12,
+        level_limit: int = 4,
+        rotation_deg: float = 0.0,
     ) -> list[TileKey]:
+        """Return tiles worth decoding ahead of the visible set.
+
+        Neighbours of the visible tiles are ordered so tiles in the direction
+        of the last pan come first, with one extra ring ahead of the motion.
+        While zooming, tiles of the next pyramid level under the viewport are
+        appended as well.
+        """
         if backend is None:
             return []
         try:
@@ -2758,26 +2787,87 @@ class TiledImageView(SharedPolygonEditMixin, QtWidgets.QGraphicsView):
         max_ty = max(0, (int(level_h) - 1) // self.tile_size)
         visible = list(visible_keys)
         visible_set = set(visible)
+        motion_x, motion_y = (
+            self._view_motion if abs(float(rotation_deg)) <= 1e-9 else (0.0, 0.0)
+        )
+        offsets = [(dx, dy) for dy in (-1, 0, 1) for dx in (-1, 0, 1) if dx or dy]
+        if motion_x or motion_y:
+            step_x = int(round(motion_x * 2.0))
+            step_y = int(round(motion_y * 2.0))
+            if step_x or step_y:
+                offsets.append((step_x, step_y))
+            offsets.sort(
+                key=lambda offset: -(offset[0] * motion_x + offset[1] * motion_y)
+                / math.hypot(offset[0], offset[1])
+            )
         queued = []
         seen = set()
-        for key in visible:
-            for dy in (-1, 0, 1):
-                for dx in (-1, 0, 1):
-                    if dx == 0 and dy == 0:
-                        continue
-                    neighbor = TileKey(
-                        level=key.level,
-                        tx=max(0, min(max_tx, key.tx + dx)),
-                        ty=max(0, min(max_ty, key.ty + dy)),
-                    )
-                    if neighbor in visible_set or neighbor in seen:
-                        continue
-                    seen.add(neighbor)
-                    queued.append(neighbor)
-                    if len(queued) >= max(0, int(limit)):
-                        return queued
+        for dx, dy in offsets:
+            if len(queued) >= max(0, int(limit)):
+                break
+            for key in visible:
+                neighbor = TileKey(
+                    level=key.level,
+                    tx=max(0, min(max_tx, key.tx + dx)),
+                    ty=max(0, min(max_ty, key.ty + dy)),
+                )
+                if neighbor in visible_set or neighbor in seen:
+                    continue
+                seen.add(neighbor)
+                queued.append(neighbor)
+                if len(queued) >= max(0, int(limit)):
+                    break
+        queued.extend(
+            self._next_level_prefetch_keys(
+                visible, backend=backend, level=level, limit=level_limit
+            )
+        )
         return queued
 
+    def _next_level_prefetch_keys(
+        self,
+        visible_keys: list[TileKey],
+        *,
+        backend: LargeImageBackend,
+        level: int,
+        limit: int,
+    ) -> list[TileKey]:
+        """Tiles of the pyramid level the current zoom gesture is heading to."""
+        next_level = int(level) + int(self._zoom_trend)
+        if not self._zoom_trend or not visible_keys or limit <= 0 or next_level < 0:
+            return []
+        try:
+            if next_level >= int(backend.get_level_count()):
+                return []
+            level_w, level_h = backend.get_level_shape(level)
+            next_w, next_h = backend.get_level_shape(next_level)
+        except Exception:
+            return []
+        factor_x = float(next_w) / max(1, int(level_w))
+        factor_y = float(next_h) / max(1, int(level_h))
+        max_tx = max(0, (int(next_w) - 1) // self.tile_size)
+        max_ty = max(0, (int(next_h) - 1) // self.tile_size)
+        center_tx = sum(key.tx + 0.5 for key in visible_keys) / len(visible_keys)
+        center_ty = sum(key.ty + 0.5 for key in visible_keys) / len(visible_keys)
+        anchor_x = center_tx * factor_x
+        anchor_y = center_ty * factor_y
+        candidates = {
+            TileKey(
+                level=next_level,
+                tx=max(0, min(max_tx, int(math.floor(anchor_x + dx)))),
+                ty=max(0, min(max_ty, int(math.floor(anchor_y + dy)))),
+            )
+            for dx in (-0.5, 0.5)
+            for dy in (-0.5, 0.5)
+        }
+        ordered = sorted(
+            candidates,
+            key=lambda key: math.hypot(
+                key.tx + 0.5 - anchor_x, key.ty + 0.5 - anchor_y
+            ),
+        )
+        return ordered[: int(limit)]
+
     def _build_tile_render_plan(
         self,
         *,
@@ -2806,7 +2896,12 @@ class TiledImageView(SharedPolygonEditMixin, QtWidgets.QGraphicsView):
             key for key in list(current_items) if key not in visible_key_set
         )
         prefetch_keys = tuple(
-            self._prefetch_tile_keys(visible_keys, backend=backend, level=level)
+            self._prefetch_tile_keys(
+                visible_keys,
+                backend=backend,
+                level=level,
+                rotation_deg=float(rotation_deg),
+            )
         )
         return TileRenderPlan(
             visible_keys=visible_keys,
@@ -3156,6 +3251,7 @@ class TiledImageView(SharedPolygonEditMixin, QtWidgets.QGraphicsView):
             self._current_visible_raster_keys = ()
             self._refresh_status_overlay()
             return
+        self._update_view_motion()
         if not self._base_raster_visible:
             self._last_visible_tile_count = 0
             self._current_visible_raster_keys = ()
@@ -3190,7 +3286,9 @@ class TiledImageView(SharedPolygonEditMixin, QtWidgets.QGraphicsView):
         tile_images = self._tile_scheduler.schedule(
             ordered_visible,
             prefetch_keys=plan.prefetch_keys,
-            prime_keys=ordered_visible[:4],
+            # Decode synchronously only for the first paint; afterwards the
+            # worker pool fills tiles in while the old ones stay on screen.
+            prime_keys=() if self._tile_items else ordered_visible[:4],
         )
         tile_images.update(
             {
@@ -3262,7 +3360,7 @@ class TiledImageView(SharedPolygonEditMixin, QtWidgets.QGraphicsView):
             overlay_images = scheduler.schedule(
                 ordered_visible,
                 prefetch_keys=plan.prefetch_keys,
-                prime_keys=ordered_visible[:2],
+                prime_keys=() if runtime.tile_items else ordered_visible[:2],
             )
             overlay_images.update(
                 {
@@ -3326,7 +3424,7 @@ class TiledImageView(SharedPolygonEditMixin, QtWidgets.QGraphicsView):
         label_images = self._label_tile_scheduler.schedule(
             ordered_visible,
             prefetch_keys=plan.prefetch_keys,
-            prime_keys=ordered_visible[:2],
+            prime_keys=() if self._label_tile_items else ordered_visible[:2],
         )
         label_images.update(
             {
@@ -3413,6 +3511,21 @@ class TiledImageView(SharedPolygonEditMixin, QtWidgets.QGraphicsView):
             },
         }
 
+    def tile_cache_stats(self) -> TileCacheStats:
+        return self.tile_cache.shared.stats()
+
+    def _tile_cache_status_text(self) -> str:
+        stats = self.tile_cache_stats()
+        mib = 1024.0 * 1024.0
+        return "tile_cache=%.1f/%.0fMiB items=%d hits=%d misses=%d evictions=%d" % (
+            stats.total_bytes / mib,
+            stats.budget_bytes / mib,
+            stats.items,
+            stats.hits,
+            stats.misses,
+            stats.evictions,
+        )
+
     def debug_status_text(self) -> str:
         document = None
         host = self._host_window
@@ -3485,6 +3598,7 @@ class TiledImageView(SharedPolygonEditMixin, QtWidgets.QGraphicsView):
                     int(overlay_stats.get("cache_hits", 0)),
                     int(overlay_stats.get("cache_misses", 0)),
                 ),
+                self._tile_cache_status_text(),
                 "cache=%s" % cache_name,
             ]
         )
@@ -3563,6 +3677,7 @@ class TiledImageView(SharedPolygonEditMixin, QtWidgets.QGraphicsView):
                 int(raster_stats.get("cache_misses", 0))
                 + int(label_stats.get("cache_misses", 0)),
             ),
+            self._tile_cache_status_text(),
         ]
         host = self._host_window
         if host is not None:
@@ -1,11 +1,26 @@
 from __future__ import annotations
 
+from collections import Counter
 from dataclasses import dataclass
 import json
 from typing import Any, Callable, Dict, Iterable, List, Optional, Sequence, Tuple
 
+import numpy as np
 from qtpy import QtCore, QtGui, QtWidgets
 
+# Density bins cover 16 frames at level 0 and grow 4x per level.
+_DENSITY_BASE_BIN_FRAMES = 16
+_DENSITY_LEVEL_FACTOR = 4
+# Narrowest density bar worth drawing, and the number of opacity steps.
+_DENSITY_MIN_BIN_PIXELS = 2.0
+_DENSITY_SHADES = 4
+# Rows with more visible segments than this are drawn as density bars.
+_MAX_SEGMENTS_PER_ROW = 1500
+# Larger event diffs reset the whole scene instead of patching items.
+_MAX_INCREMENTAL_EDITS = 64
+# End frame used for open-ended events inside the interval index.
+_OPEN_END_FRAME = np.iinfo(np.int64).max // 4
+
 
 class RefreshingComboBox(QtWidgets.QComboBox):
     popupAboutToShow = QtCore.Signal()
@@ -57,27 +72,184 @@ class TimelineEventContext:
     original_end: Optional[int]
 
 
+class TimelineIntervalIndex:
+    """Events of one timeline row, indexed for range queries and density bins.
+
+    Events are sorted by start frame; a running maximum of their end frames
+    lets a range query skip every event that ends before the range begins.
+    Density bins hold the covered frames per bin of ``bin_frames(level)``
+    frames (counted from frame 0) and are built per level on first use.
+    """
+
+    def __init__(self, events: Iterable[TimelineEvent] = ()) -> None:
+        self._events = sorted(events, key=lambda event: event.start_frame)
+        count = len(self._events)
+        self._starts = np.fromiter(
+            (event.start_frame for event in self._events), dtype=np.int64, count=count
+        )
+        self._ends = np.fromiter(
+            (
+                _OPEN_END_FRAME
+                if event.end_frame is None
+                else max(event.start_frame, event.end_frame)
+                for event in self._events
+            ),
+            dtype=np.int64,
+            count=count,
+        )
+        self._max_ends = (
+            np.maximum.accumulate(self._ends) if count else self._ends.copy()
+        )
+        self._density: Dict[Tuple[int, int], np.ndarray] = {}
+
+    def __len__(self) -> int:
+        return len(self._events)
+
+    @staticmethod
+    def bin_frames(level: int) -> int:
+        return _DENSITY_BASE_BIN_FRAMES * _DENSITY_LEVEL_FACTOR ** max(0, int(level))
+
+    def _hits(self, start_frame: int, end_frame: int) -> np.ndarray:
+        lo = int(np.searchsorted(self._max_ends, int(start_frame), side="left"))
+        hi = int(np.searchsorted(self._starts, int(end_frame), side="right"))
+        if lo >= hi:
+            return np.zeros(0, dtype=np.int64)
+        return np.nonzero(self._ends[lo:hi] >= int(start_frame))[0] + lo
+
+    def query(self, start_frame: int, end_frame: int) -> List[TimelineEvent]:
+        """Events overlapping the inclusive frame range, in start order."""
+        return [self._events[idx] for idx in self._hits(start_frame, end_frame)]
+
+    def count(self, start_frame: int, end_frame: int) -> int:
+        return int(len(self._hits(start_frame, end_frame)))
+
+    def density(self, level: int, horizon: int) -> np.ndarray:
+        """Covered frames per bin, with open-ended events running to ``horizon``."""
+        level = max(0, int(level))
+        horizon = max(0, int(horizon))
+        key = (level, horizon)
+        cached = self._density.get(key)
+        if cached is not None:
+            return cached
+        bin_frames = self.bin_frames(level)
+        num_bins = horizon // bin_frames + 1
+        if level > 0:
+            finer = self.density(level - 1, horizon)
+            padded = np.zeros(num_bins * _DENSITY_LEVEL_FACTOR, dtype=np.int64)
+            size = min(len(finer), len(padded))
+            padded[:size] = finer[:size]
+            bins = padded.reshape(num_bins, _DENSITY_LEVEL_FACTOR).sum(axis=1)
+        else:
+            # Coverage up to x is sum(max(0, x - start)) - sum(max(0, x - end)),
+            # evaluated at every bin edge from sorted starts and exclusive ends.
+            edges = np.arange(num_bins + 1, dtype=np.int64) * bin_frames
+            starts = np.sort(np.minimum(self._starts, horizon + 1))
+            ends = np.sort(np.minimum(self._ends, horizon) + 1)
+            bins = np.diff(_ramp_sum(edges, starts) - _ramp_sum(edges, ends))
+        self._density[key] = bins
+        return bins
+
+
+def _ramp_sum(edges: np.ndarray, points: np.ndarray) -> np.ndarray:
+    """``sum(max(0, edge - point))`` over sorted ``points`` for every edge."""
+    if not len(points):
+        return np.zeros(len(edges), dtype=np.int64)
+    counts = np.searchsorted(points, edges, side="left")
+    prefix = np.concatenate(([0], np.cumsum(points)))
+    return counts * edges - prefix[counts]
+
+
+def _event_key(event: TimelineEvent) -> Tuple:
+    color = event.color.rgba() if event.color is not None else None
+    return (
+        event.track_id,
+        event.start_frame,
+        event.end_frame,
+        event.label,
+        color,
+        event.confidence,
+        event.kind,
+        event.behavior,
+        event.subject,
+    )
+
+
 class TimelineModel(QtCore.QObject):
+    """Timeline rows and events.
+
+    ``changed`` asks views to rebuild everything; ``eventsEdited`` carries the
+    (removed, added) events of a small edit so views can patch their items.
+    """
+
     changed = QtCore.Signal()
+    eventsEdited = QtCore.Signal(object, object)
 
     def __init__(self, parent: Optional[QtCore.QObject] = None) -> None:
         super().__init__(parent)
         self._tracks: List[TimelineTrack] = []
         self._events: List[TimelineEvent] = []
+        self._indexes: Dict[str, TimelineIntervalIndex] = {}
+        # Track ids whose index must be rebuilt; None means every track.
+        self._stale_tracks: Optional[set] = None
 
     def set_tracks(self, tracks: Iterable[TimelineTrack]) -> None:
-        self._tracks = list(tracks)
+        tracks = list(tracks)
+        if tracks == self._tracks:
+            return
+        self._tracks = tracks
         self.changed.emit()
 
     def set_events(self, events: Iterable[TimelineEvent]) -> None:
-        self._events = list(events)
-        self.changed.emit()
+        events = list(events)
+        previous = self._events
+        self._events = events
+        old_keys = Counter(_event_key(event) for event in previous)
+        new_keys = Counter(_event_key(event) for event in events)
+        removed_keys = old_keys - new_keys
+        added_keys = new_keys - old_keys
+        removed = _take_events(previous, removed_keys)
+        added = _take_events(events, added_keys)
+        if not removed and not added:
+            return
+        if len(removed) + len(added) > _MAX_INCREMENTAL_EDITS:
+            self._stale_tracks = None
+            self.changed.emit()
+            return
+        if self._stale_tracks is not None:
+            self._stale_tracks.update(event.track_id for event in removed + added)
+        self.eventsEdited.emit(removed, added)
 
     def clear(self) -> None:
         self._tracks = []
         self._events = []
+        self._stale_tracks = None
         self.changed.emit()
 
+    def index(self, track_id: str) -> TimelineIntervalIndex:
+        """Interval index over the events of one row."""
+        if self._stale_tracks is None or self._stale_tracks:
+            self._rebuild_indexes()
+        index = self._indexes.get(track_id)
+        if index is None:
+            index = TimelineIntervalIndex()
+            self._indexes[track_id] = index
+        return index
+
+    def _rebuild_indexes(self) -> None:
+        stale = self._stale_tracks
+        grouped: Dict[str, List[TimelineEvent]] = {}
+        for event in self._events:
+            if stale is None or event.track_id in stale:
+                grouped.setdefault(event.track_id, []).append(event)
+        if stale is None:
+            self._indexes = {}
+        else:
+            for track_id in stale:
+                self._indexes.pop(track_id, None)
+        for track_id, events in grouped.items():
+            self._indexes[track_id] = TimelineIntervalIndex(events)
+        self._stale_tracks = set()
+
     @property
     def tracks(self) -> List[TimelineTrack]:
         return list(self._tracks)
@@ -87,6 +259,21 @@ class TimelineModel(QtCore.QObject):
         return list(self._events)
 
 
+def _take_events(
+    events: Sequence[TimelineEvent], wanted: Counter
+) -> List[TimelineEvent]:
+    remaining = Counter(wanted)
+    taken: List[TimelineEvent] = []
+    if not remaining:
+        return taken
+    for event in events:
+        key = _event_key(event)
+        if remaining[key] > 0:
+            remaining[key] -= 1
+            taken.append(event)
+    return taken
+
+
 class TimelineSegmentItem(QtWidgets.QGraphicsRectItem):
     """A timeline segment with rounded corners and a subtle border."""
 
@@ -321,6 +508,13 @@ class TimelineGraphicsView(QtWidgets.QGraphicsView):
         self._is_dragging_playhead = False
         self._last_pixels_per_frame: float = 1.0
         self._last_scene_height: float = 0.0
+        # Row content is only built for the frames around the viewport.
+        self._rendered_frames: Optional[Tuple[int, int]] = None
+        self._row_items: Dict[str, List[QtWidgets.QGraphicsItem]] = {}
+        self._row_is_density: Dict[str, bool] = {}
+        self._segment_items: Dict[Tuple, List[TimelineSegmentItem]] = {}
+        self._pending_item: Optional[QtWidgets.QGraphicsRectItem] = None
+        self.horizontalScrollBar().valueChanged.connect(self._on_horizontal_scroll)
 
     def set_edit_mode(self, enabled: bool) -> None:
         self._edit_mode = bool(enabled)
@@ -343,11 +537,13 @@ class TimelineGraphicsView(QtWidgets.QGraphicsView):
         if self._model is not None:
             try:
                 self._model.changed.disconnect(self.rebuild_scene)
+                self._model.eventsEdited.disconnect(self._on_events_edited)
             except Exception:
                 pass
         self._model = model
         if self._model is not None:
             self._model.changed.connect(self.rebuild_scene)
+            self._model.eventsEdited.connect(self._on_events_edited)
         self.rebuild_scene()
 
     def set_time_range(self, min_frame: int, max_frame: int) -> None:
@@ -497,6 +693,7 @@ class TimelineGraphicsView(QtWidgets.QGraphicsView):
             pending_item = self._new_item
             pending_item.setBrush(QtGui.QBrush(QtGui.QColor(120, 180, 220, 160)))
             pending_item.setPen(QtGui.QPen(QtCore.Qt.NoPen))
+            self._pending_item = pending_item
             self._new_item = None
             row_idx = self._new_item_row
             self._new_item_row = None
@@ -571,6 +768,10 @@ class TimelineGraphicsView(QtWidgets.QGraphicsView):
 
         self._playhead_line = None
         self._playhead_triangle = None
+        self._pending_item = None
+        self._row_items = {}
+        self._row_is_density = {}
+        self._segment_items = {}
         self._scene.clear()
         frame_span = max(1, self._max_frame - self._min_frame + 1)
         view_width = max(1, self.viewport().width())
@@ -579,7 +780,6 @@ class TimelineGraphicsView(QtWidgets.QGraphicsView):
         self._last_pixels_per_frame = pixels_per_frame
 
         tracks = self._model.tracks if self._model is not None else []
-        events = self._model.events if self._model is not None else []
         self._track_order = list(tracks)
         row_pitch = self._row_height + self._row_gap
         total_rows = len(tracks)
@@ -640,77 +840,227 @@ class TimelineGraphicsView(QtWidgets.QGraphicsView):
                 row_rect, QtGui.QPen(QtCore.Qt.NoPen), QtGui.QBrush(base_color)
             )
 
-        track_index = {track.track_id: idx for idx, track in enumerate(tracks)}
-        for event in events:
-            row_idx = track_index.get(event.track_id)
-            if row_idx is None:
-                continue
-            y = self._header_height + row_idx * row_pitch
-            end_frame = (
-                event.end_frame if event.end_frame is not None else self._max_frame
+        self._rendered_frames = None
+        self._render_rows()
+
+        self._create_or_update_playhead(playhead_frame=self._current_frame)
+
+    def _visible_frames(self) -> Tuple[int, int]:
+        visible = self.mapToScene(self.viewport().rect()).boundingRect()
+        return self._x_to_frame(visible.left()), self._x_to_frame(visible.right())
+
+    def _render_rows(self) -> None:
+        """(Re)build row content for the viewport plus one viewport on each side."""
+        first, last = self._visible_frames()
+        margin = max(1, last - first + 1)
+        self._rendered_frames = (
+            max(self._min_frame, first - margin),
+            min(self._max_frame, last + margin),
+        )
+        for row_idx, track in enumerate(self._track_order):
+            self._render_row(row_idx, track)
+
+    def _render_row(self, row_idx: int, track: TimelineTrack) -> None:
+        self._clear_row(track.track_id)
+        if self._model is None or self._rendered_frames is None:
+            return
+        first, last = self._rendered_frames
+        index = self._model.index(track.track_id)
+        if index.count(first, last) > _MAX_SEGMENTS_PER_ROW:
+            self._row_is_density[track.track_id] = True
+            self._add_density_items(row_idx, track, index)
+            return
+        self._row_is_density[track.track_id] = False
+        for event in index.query(first, last):
+            self._add_segment_item(row_idx, event)
+
+    def _clear_row(self, track_id: str) -> None:
+        for item in self._row_items.pop(track_id, []):
+            if isinstance(item, TimelineSegmentItem):
+                key = _event_key(item.data(0))
+                items = self._segment_items.get(key, [])
+                if item in items:
+                    items.remove(item)
+                if not items:
+                    self._segment_items.pop(key, None)
+            self._scene.removeItem(item)
+        self._row_is_density.pop(track_id, None)
+
+    def _add_segment_item(self, row_idx: int, event: TimelineEvent) -> None:
+        pixels_per_frame = self._last_pixels_per_frame
+        y = self._row_y(row_idx)
+        end_frame = event.end_frame if event.end_frame is not None else self._max_frame
+        start_frame = max(self._min_frame, event.start_frame)
+        end_frame = max(start_frame, min(self._max_frame, end_frame))
+        x0 = self._frame_to_x(start_frame, pixels_per_frame)
+        x1 = self._frame_to_x(end_frame + 1, pixels_per_frame)
+        width = max(1.0, x1 - x0)
+        rect = QtCore.QRectF(x0, y, width, self._row_height)
+        color = event.color or QtGui.QColor(100, 140, 200)
+        brush = QtGui.QBrush(self._apply_confidence(color, event.confidence))
+        context = TimelineEventContext(
+            event=event,
+            original_start=event.start_frame,
+            original_end=event.end_frame,
+        )
+        is_editable_event = (
+            self._edit_mode
+            and self._edit_callback
+            and event.end_frame is not None
+            and event.kind == "behavior"
+            and bool(event.behavior)
+        )
+        segment_item: TimelineSegmentItem
+        if is_editable_event:
+            segment_item = TimelineEventItem(
+                rect,
+                context,
+                pixels_per_frame,
+                self._min_frame,
+                self._max_frame,
+                self._edit_callback,
+                self.frameSelected.emit,
+            )
+        else:
+            segment_item = TimelineSegmentItem(rect)
+        segment_item.setBrush(brush)
+        segment_item.setData(0, event)
+        self._scene.addItem(segment_item)
+        self._row_items.setdefault(event.track_id, []).append(segment_item)
+        self._segment_items.setdefault(_event_key(event), []).append(segment_item)
+
+        # Subtle border that follows the fill color.
+        border_color = QtGui.QColor(0, 0, 0, 70)
+        if color.isValid():
+            border_color = QtGui.QColor(color)
+            border_color.setAlpha(90)
+        segment_item.set_border_color(border_color)
+
+        label_padding = 6
+        if width > 34:
+            label_font = QtGui.QFont(self.font())
+            label_font.setPointSize(max(8, self.font().pointSize() - 1))
+            metrics = QtGui.QFontMetrics(label_font)
+            elided = metrics.elidedText(
+                event.label,
+                QtCore.Qt.ElideRight,
+                int(max(0.0, width - 2 * label_padding)),
             )
-            start_frame = max(self._min_frame, event.start_frame)
-            end_frame = max(start_frame, min(self._max_frame, end_frame))
+            if elided:
+                text_item = QtWidgets.QGraphicsSimpleTextItem(elided, segment_item)
+                text_item.setFont(label_font)
+                text_item.setPos(label_padding, 1)
+                text_item.setBrush(QtGui.QBrush(_ideal_text_color(brush.color())))
+
+    def _density_level(self) -> int:
+        level = 0
+        pixels_per_frame = max(1e-9, self._last_pixels_per_frame)
+        span = max(1, self._max_frame - self._min_frame + 1)
+        while (
+            TimelineIntervalIndex.bin_frames(level) * pixels_per_frame
+            < _DENSITY_MIN_BIN_PIXELS
+            and TimelineIntervalIndex.bin_frames(level) < span
+        ):
+            level += 1
+        return level
+
+    def _add_density_items(
+        self, row_idx: int, track: TimelineTrack, index: TimelineIntervalIndex
+    ) -> None:
+        """Draw a crowded row as bars shaded by the covered share of each bin."""
+        first, last = self._rendered_frames
+        level = self._density_level()
+        bin_frames = TimelineIntervalIndex.bin_frames(level)
+        bins = index.density(level, self._max_frame)
+        first_bin = first // bin_frames
+        last_bin = min(len(bins) - 1, last // bin_frames)
+        if last_bin < first_bin:
+            return
+        share = bins[first_bin : last_bin + 1] / float(bin_frames)
+        shades = np.ceil(np.clip(share, 0.0, 1.0) * _DENSITY_SHADES).astype(int)
+        paths = [QtGui.QPainterPath() for _ in range(_DENSITY_SHADES + 1)]
+        pixels_per_frame = self._last_pixels_per_frame
+        y = self._row_y(row_idx)
+        # One rectangle per run of bins with the same shade.
+        changes = np.flatnonzero(np.diff(shades)) + 1
+        run_starts = np.concatenate(([0], changes))
+        run_ends = np.concatenate((changes, [len(shades)]))
+        for run_start, run_end in zip(run_starts, run_ends):
+            shade = int(shades[run_start])
+            if shade <= 0:
+                continue
+            start_frame = max(self._min_frame, (first_bin + run_start) * bin_frames)
+            end_frame = min(self._max_frame + 1, (first_bin + run_end) * bin_frames)
             x0 = self._frame_to_x(start_frame, pixels_per_frame)
-            x1 = self._frame_to_x(end_frame + 1, pixels_per_frame)
-            width = max(1.0, x1 - x0)
-            rect = QtCore.QRectF(x0, y, width, self._row_height)
-            color = event.color or QtGui.QColor(100, 140, 200)
-            brush = QtGui.QBrush(self._apply_confidence(color, event.confidence))
-            context = TimelineEventContext(
-                event=event,
-                original_start=event.start_frame,
-                original_end=event.end_frame,
+            x1 = self._frame_to_x(end_frame, pixels_per_frame)
+            paths[shade].addRect(
+                QtCore.QRectF(x0, y, max(1.0, x1 - x0), self._row_height)
             )
-            is_editable_event = (
-                self._edit_mode
-                and self._edit_callback
-                and event.end_frame is not None
-                and event.kind == "behavior"
-                and bool(event.behavior)
+        color = track.color or QtGui.QColor(100, 140, 200)
+        for shade, path in enumerate(paths):
+            if path.isEmpty():
+                continue
+            fill = QtGui.QColor(color)
+            fill.setAlpha(int(60 + 195 * shade / _DENSITY_SHADES))
+            item = self._scene.addPath(
+                path, QtGui.QPen(QtCore.Qt.NoPen), QtGui.QBrush(fill)
             )
-            segment_item: TimelineSegmentItem
-            if is_editable_event:
-                segment_item = TimelineEventItem(
-                    rect,
-                    context,
-                    pixels_per_frame,
-                    self._min_frame,
-                    self._max_frame,
-                    self._edit_callback,
-                    self.frameSelected.emit,
-                )
-                segment_item.setBrush(brush)
-                self._scene.addItem(segment_item)
-            else:
-                segment_item = TimelineSegmentItem(rect)
-                segment_item.setBrush(brush)
-                self._scene.addItem(segment_item)
-
-            # Subtle border that follows the fill color.
-            border_color = QtGui.QColor(0, 0, 0, 70)
-            if color.isValid():
-                border_color = QtGui.QColor(color)
-                border_color.setAlpha(90)
-            segment_item.set_border_color(border_color)
-
-            label_padding = 6
-            if width > 34:
-                label_font = QtGui.QFont(self.font())
-                label_font.setPointSize(max(8, self.font().pointSize() - 1))
-                metrics = QtGui.QFontMetrics(label_font)
-                elided = metrics.elidedText(
-                    event.label,
-                    QtCore.Qt.ElideRight,
-                    int(max(0.0, width - 2 * label_padding)),
-                )
-                if elided:
-                    text_item = QtWidgets.QGraphicsSimpleTextItem(elided, segment_item)
-                    text_item.setFont(label_font)
-                    text_item.setPos(label_padding, 1)
-                    text_item.setBrush(QtGui.QBrush(_ideal_text_color(brush.color())))
+            self._row_items.setdefault(track.track_id, []).append(item)
 
-        self._create_or_update_playhead(playhead_frame=self._current_frame)
+    def _on_events_edited(
+        self, removed: List[TimelineEvent], added: List[TimelineEvent]
+    ) -> None:
+        """Patch the items of edited events instead of rebuilding the scene."""
+        if self._new_item is not None or self._rendered_frames is None:
+            self.rebuild_scene()
+            return
+        if self._pending_item is not None:
+            self._scene.removeItem(self._pending_item)
+            self._pending_item = None
+        rows = {track.track_id: idx for idx, track in enumerate(self._track_order)}
+        dirty_rows = set()
+        for event in removed:
+            if self._row_is_density.get(event.track_id):
+                dirty_rows.add(event.track_id)
+                continue
+            items = self._segment_items.get(_event_key(event))
+            if not items:
+                continue
+            item = items.pop()
+            if not items:
+                self._segment_items.pop(_event_key(event), None)
+            row_items = self._row_items.get(event.track_id, [])
+            if item in row_items:
+                row_items.remove(item)
+            self._scene.removeItem(item)
+        first, last = self._rendered_frames
+        for event in added:
+            row_idx = rows.get(event.track_id)
+            if row_idx is None or event.track_id in dirty_rows:
+                continue
+            if self._row_is_density.get(event.track_id):
+                dirty_rows.add(event.track_id)
+                continue
+            end_frame = (
+                event.end_frame if event.end_frame is not None else self._max_frame
+            )
+            if end_frame < first or event.start_frame > last:
+                continue
+            self._add_segment_item(row_idx, event)
+            if len(self._row_items.get(event.track_id, [])) > _MAX_SEGMENTS_PER_ROW:
+                dirty_rows.add(event.track_id)
+        for track_id in dirty_rows:
+            row_idx = rows.get(track_id)
+            if row_idx is not None:
+                self._render_row(row_idx, self._track_order[row_idx])
+
+    def _on_horizontal_scroll(self, _value: int) -> None:
+        if self._rendered_frames is None:
+            return
+        first, last = self._visible_frames()
+        rendered_first, rendered_last = self._rendered_frames
+        if first < rendered_first or last > rendered_last:
+            self._render_rows()
 
     def _frame_to_x(self, frame: int, pixels_per_frame: float) -> float:
         return max(0.0, (frame - self._min_frame) * pixels_per_frame)
@@ -792,6 +1142,8 @@ class TimelineGraphicsView(QtWidgets.QGraphicsView):
                 self._last_scene_height,
                 playhead_pen,
             )
+            # Row content is re-rendered on scroll; keep the playhead on top.
+            self._playhead_line.setZValue(10)
         else:
             self._playhead_line.setLine(
                 playhead_x, 0, playhead_x, self._last_scene_height
@@ -812,6 +1164,7 @@ class TimelineGraphicsView(QtWidgets.QGraphicsView):
                 QtGui.QPen(QtCore.Qt.NoPen),
                 QtGui.QBrush(QtGui.QColor(220, 60, 60)),
             )
+            self._playhead_triangle.setZValue(10)
         else:
             self._playhead_triangle.setPolygon(tri)
 
@@ -23,6 +23,11 @@ from qtpy.QtCore import QThread, Signal, QObject
 from annolid.annotation.labelme2csv import convert_json_to_csv
 from annolid.data.videos import extract_frames_from_videos
 from annolid.gui.label_file import LabelFile
+from annolid.realtime.shared_frames import (
+    SHARED_FRAME_TOPIC,
+    SharedFrameReader,
+    is_same_host_address,
+)
 from annolid.jobs.tracking_jobs import TrackingSegment
 from annolid.services.tracking import (
     build_tracking_video_processor,
@@ -1038,7 +1043,8 @@ class PerceptionProcessWorker(QtCore.QThread):
     """
     Background thread that runs the asynchronous PerceptionProcess inside its
     own event loop. Exposes a request_stop() helper so the GUI can trigger a
-    graceful shutdown without blocking.
+    graceful shutdown without blocking. ``config`` may also be a list of
+    camera configs that share one model (MultiCameraPerceptionProcess).
     """
 
     error = Signal(str)
@@ -1076,10 +1082,17 @@ class PerceptionProcessWorker(QtCore.QThread):
             self.stopped.emit()
 
     async def _run_main(self):
-        from annolid.realtime.perception import PerceptionProcess
+        from annolid.realtime.perception import (
+            MultiCameraPerceptionProcess,
+            PerceptionProcess,
+        )
 
         try:
-            self._perception = PerceptionProcess(self.config)
+            if isinstance(self.config, (list, tuple)):
+                # Several cameras sharing one model and batched inference.
+                self._perception = MultiCameraPerceptionProcess(self.config)
+            else:
+                self._perception = PerceptionProcess(self.config)
         except Exception:
             self._perception = None
             raise
@@ -1109,19 +1122,23 @@ class PerceptionProcessWorker(QtCore.QThread):
 class RealtimeSubscriberWorker(QtCore.QThread):
     """
     Subscribes to perception PUB socket topics and emits Qt signals with the
-    decoded payloads for consumption by the GUI thread.
+    decoded payloads for consumption by the GUI thread. With
+    ``shared_memory=True`` and a same-host address, raw frames are read from
+    the publisher's shared-memory ring instead of being decoded.
     """
 
     frame_received = Signal(object, dict, list)
     status_received = Signal(dict)
     error = Signal(str)
 
-    def __init__(self, address: str, parent=None):
+    def __init__(self, address: str, parent=None, shared_memory: bool = False):
         super().__init__(parent)
         self.address = address
+        self.shared_memory = bool(shared_memory) and is_same_host_address(address)
         self._running = False
         self._context: Optional[zmq.Context] = None
         self._socket: Optional[zmq.Socket] = None
+        self._frame_reader: Optional[SharedFrameReader] = None
         self._detections: Dict[Tuple[str, Optional[float]], List[dict]] = {}
 
     def _make_key(self, frame_index, capture_timestamp):
@@ -1165,6 +1182,9 @@ class RealtimeSubscriberWorker(QtCore.QThread):
                 pass
             finally:
                 self._context = None
+        if self._frame_reader is not None:
+            self._frame_reader.close()
+            self._frame_reader = None
 
     def stop(self):
         self._running = False
@@ -1177,7 +1197,11 @@ class RealtimeSubscriberWorker(QtCore.QThread):
             self._context = zmq.Context()
             self._socket = self._context.socket(zmq.SUB)
             self._socket.connect(self.address)
-            for topic in ("frames", "detections", "status"):
+            frame_topic = "frames"
+            if self.shared_memory:
+                frame_topic = SHARED_FRAME_TOPIC
+                self._frame_reader = SharedFrameReader()
+            for topic in (frame_topic, "detections", "status"):
                 self._socket.setsockopt_string(zmq.SUBSCRIBE, topic)
 
             poller = zmq.Poller()
@@ -1214,7 +1238,7 @@ class RealtimeSubscriberWorker(QtCore.QThread):
 
                 if topic == "detections":
                     self._handle_detection(parts)
-                elif topic == "frames":
+                elif topic in ("frames", SHARED_FRAME_TOPIC):
                     self._handle_frame(parts)
                 elif topic == "status":
                     self._handle_status(parts)
@@ -1247,19 +1271,24 @@ class RealtimeSubscriberWorker(QtCore.QThread):
 
         frame_bytes = parts[2]
         qimage = None
-        if frame_bytes:
+        frame = None
+        descriptor = metadata.get("shared_memory")
+        if descriptor and self._frame_reader is not None:
+            # None when the slot was already reused; the frame is dropped.
+            frame = self._frame_reader.read(descriptor)
+        elif frame_bytes:
             np_buffer = np.frombuffer(frame_bytes, dtype=np.uint8)
             frame = cv2.imdecode(np_buffer, cv2.IMREAD_COLOR)
-            if frame is not None:
-                frame_rgb = cv2.cvtColor(frame, cv2.COLOR_BGR2RGB)
-                height, width, channels = frame_rgb.shape
-                qimage = QtGui.QImage(
-                    frame_rgb.data,
-                    width,
-                    height,
-                    channels * width,
-                    QtGui.QImage.Format_RGB888,
-                ).copy()
+        if frame is not None and frame.ndim == 3 and frame.shape[2] == 3:
+            frame_rgb = cv2.cvtColor(frame, cv2.COLOR_BGR2RGB)
+            height, width, channels = frame_rgb.shape
+            qimage = QtGui.QImage(
+                frame_rgb.data,
+                width,
+                height,
+                channels * width,
+                QtGui.QImage.Format_RGB888,
+            ).copy()
 
         key = self._make_key(
             metadata.get("frame_index"), metadata.get("capture_timestamp")
@@ -62,6 +62,9 @@ class LargeImageBackendCapabilities:
 
 class LargeImageBackend(ABC):
     name: str
+    # True when ``read_region`` releases the GIL and is safe to call from
+    # several threads at once, so tiles can be decoded in parallel.
+    supports_parallel_reads: bool = False
 
     @abstractmethod
     def can_handle(self, path: Path) -> bool:
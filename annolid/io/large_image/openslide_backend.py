@@ -15,6 +15,7 @@ from .common import array_to_qimage, is_large_tiff_path
 
 class OpenSlideBackend(LargeImageBackend):
     name = "openslide"
+    supports_parallel_reads = True
 
     def __init__(self, path: str | Path | None = None):
         self.path = Path(path) if path is not None else None
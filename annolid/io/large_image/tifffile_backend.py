@@ -68,6 +68,7 @@ def _normalize_tiff_array_axes(arr: np.ndarray, axes: str = "") -> np.ndarray:
 
 class TiffFileBackend(LargeImageBackend):
     name = "tifffile"
+    supports_parallel_reads = True
 
     def __init__(self, path: str | Path | None = None):
         self.path = Path(path) if path is not None else None
@@ -78,6 +79,9 @@ class TiffFileBackend(LargeImageBackend):
         self._active_page_index: int = 0
         self._page_array_cache: dict[int, np.ndarray] = {}
         self._cache_lock = threading.RLock()
+        # Serializes full-level decodes so parallel tile workers that miss the
+        # cache at the same time decode each level only once.
+        self._level_decode_locks: dict[int, threading.Lock] = {}
         self._memmap_failure_logged_levels: set[int] = set()
 
     def can_handle(self, path: Path) -> bool:
@@ -266,8 +270,17 @@ class TiffFileBackend(LargeImageBackend):
     def _decoded_level_array(self, level: int = 0) -> np.ndarray:
         with self._cache_lock:
             cached = self._level_array_cache.get(level)
+            decode_lock = self._level_decode_locks.setdefault(level, threading.Lock())
         if cached is not None:
             return cached
+        with decode_lock:
+            with self._cache_lock:
+                cached = self._level_array_cache.get(level)
+            if cached is not None:
+                return cached
+            return self._decode_level_array(level)
+
+    def _decode_level_array(self, level: int) -> np.ndarray:
         import tifffile
 
         path = self._require_path()
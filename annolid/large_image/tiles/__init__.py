@@ -1,3 +1,7 @@
+from annolid.gui.tile_cache import (
+    SharedTileCache as SharedTileCache,
+    TileCacheStats as TileCacheStats,
+)
 from annolid.gui.tile_scheduler import *  # noqa: F403
 from annolid.gui.widgets.tiled_image_view import (
     TileCache as TileCache,
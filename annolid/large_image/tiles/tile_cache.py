@@ -1,3 +1,8 @@
-from annolid.gui.widgets.tiled_image_view import TileCache
+from annolid.gui.tile_cache import (
+    SharedTileCache,
+    TileCache,
+    TileCacheStats,
+    shared_tile_cache,
+)
 
-__all__ = ["TileCache"]
+__all__ = ["SharedTileCache", "TileCache", "TileCacheStats", "shared_tile_cache"]
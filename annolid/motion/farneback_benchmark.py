@@ -0,0 +1,197 @@
+"""
+Throughput benchmark: OpenCV Farneback vs. torch Farneback (per pair and batched).
+
+Usage (CLI):
+    python -m annolid.motion.farneback_benchmark --frames 33 --size 480x640 \
+        --batch-sizes 1,4,8,16 --output farneback_bench.json
+
+Frames are a synthetic blurred texture drifting by a sub-pixel translation,
+so every variant sees identical input. Each result reports pairs per second
+and the mean end-point error against OpenCV (outside the 5 px border band).
+The torch variants run with OpenCV-parity settings, without outlier
+suppression or clipping.
+"""
+
+from __future__ import annotations
+
+import argparse
+import json
+import os
+import platform
+import time
+from pathlib import Path
+from typing import Dict, List, Optional, Sequence
+
+import cv2
+import numpy as np
+import torch
+
+from annolid.motion.farneback_torch import (
+    calc_optical_flow_farneback_torch,
+    calc_optical_flow_farneback_torch_batch,
+)
+
+_BORDER = 5
+
+
+def synthetic_frames(
+    count: int, height: int, width: int, step: float = 0.6, seed: int = 0
+) -> List[np.ndarray]:
+    """Grayscale float32 frames of a texture translating by ``step`` px per frame."""
+    rng = np.random.default_rng(seed)
+    base = np.zeros((height, width), np.float32)
+    dots = max(1, height * width // 200)
+    base[rng.integers(0, height, dots), rng.integers(0, width, dots)] = 255.0
+    kernel = cv2.getGaussianKernel(9, 1.5)
+    base = cv2.sepFilter2D(base, -1, kernel, kernel)
+    frames = []
+    for idx in range(count):
+        shift = np.float32([[1, 0, step * idx], [0, 1, -0.5 * step * idx]])
+        frames.append(
+            cv2.warpAffine(base, shift, (width, height), borderMode=cv2.BORDER_REFLECT)
+        )
+    return frames
+
+
+def _mean_epe(flows: np.ndarray, reference: np.ndarray) -> float:
+    inner = (slice(None), slice(_BORDER, -_BORDER), slice(_BORDER, -_BORDER))
+    diff = flows[inner] - reference[inner]
+    return float(np.linalg.norm(diff, axis=-1).mean())
+
+
+def run_benchmark(
+    frames: int = 33,
+    height: int = 240,
+    width: int = 320,
+    batch_sizes: Sequence[int] = (1, 4, 8, 16),
+    device: str = "cpu",
+    repeats: int = 1,
+    farneback: Optional[Dict[str, float]] = None,
+) -> Dict[str, object]:
+    params = dict(
+        pyr_scale=0.5, levels=1, winsize=15, iterations=3, poly_n=5, poly_sigma=1.1
+    )
+    params.update(farneback or {})
+    clip = synthetic_frames(frames, height, width)
+    pairs = len(clip) - 1
+    results: List[Dict[str, object]] = []
+
+    def _timed(name: str, fn, **extra) -> np.ndarray:
+        best = float("inf")
+        flows = None
+        for _ in range(max(1, int(repeats))):
+            start = time.perf_counter()
+            flows = fn()
+            best = min(best, time.perf_counter() - start)
+        results.append(
+            {
+                "variant": name,
+                "seconds": best,
+                "pairs_per_second": pairs / best if best > 0 else None,
+                **extra,
+            }
+        )
+        return flows
+
+    reference = _timed(
+        "opencv",
+        lambda: np.stack(
+            [
+                cv2.calcOpticalFlowFarneback(
+                    clip[idx], clip[idx + 1], None, flags=0, **params
+                )
+                for idx in range(pairs)
+            ]
+        ),
+    )
+    torch_kwargs = dict(
+        params,
+        device=device,
+        clip_percentile=None,
+        max_magnitude=None,
+        outlier_ksize=0,
+    )
+    for batch_size in batch_sizes:
+        batch_size = max(1, int(batch_size))
+        if batch_size == 1:
+            name = "torch_pairwise"
+
+            def _run(batch_size=batch_size):
+                return np.stack(
+                    [
+                        calc_optical_flow_farneback_torch(
+                            clip[idx], clip[idx + 1], **torch_kwargs
+                        )
+                        for idx in range(pairs)
+                    ]
+                )
+
+        else:
+            name = f"torch_batch_{batch_size}"
+
+            def _run(batch_size=batch_size):
+                chunks = [
+                    calc_optical_flow_farneback_torch_batch(
+                        clip[start : min(start + batch_size, pairs) + 1],
+                        **torch_kwargs,
+                    )
+                    for start in range(0, pairs, batch_size)
+                ]
+                return np.concatenate(chunks)
+
+        flows = _timed(name, _run, batch_size=batch_size)
+        results[-1]["mean_epe_vs_opencv"] = _mean_epe(flows, reference)
+
+    return {
+        "frames": frames,
+        "height": height,
+        "width": width,
+        "device": device,
+        "torch_threads": torch.get_num_threads(),
+        "opencv_threads": cv2.getNumThreads(),
+        "cpu_count": os.cpu_count(),
+        "platform": platform.platform(),
+        "farneback": params,
+        "results": results,
+    }
+
+
+def _parse_size(value: str) -> tuple[int, int]:
+    height, width = value.lower().split("x", 1)
+    return int(height), int(width)
+
+
+def _parse_args() -> argparse.Namespace:
+    p = argparse.ArgumentParser(description="Farneback optical-flow benchmark")
+    p.add_argument("--frames", type=int, default=33, help="Frames (pairs + 1)")
+    p.add_argument("--size", default="240x320", help="Frame size as HxW")
+    p.add_argument(
+        "--batch-sizes",
+        default="1,4,8,16",
+        help="Comma-separated torch batch sizes (1 = per-pair calls)",
+    )
+    p.add_argument("--device", default="cpu", help="Torch device")
+    p.add_argument("--repeats", type=int, default=1, help="Keep the best of N runs")
+    p.add_argument("--output", help="Optional JSON file for the results")
+    return p.parse_args()
+
+
+def main():
+    args = _parse_args()
+    height, width = _parse_size(args.size)
+    report = run_benchmark(
+        frames=max(2, int(args.frames)),
+        height=height,
+        width=width,
+        batch_sizes=[int(v) for v in str(args.batch_sizes).split(",") if v.strip()],
+        device=args.device,
+        repeats=args.repeats,
+    )
+    text = json.dumps(report, indent=2)
+    if args.output:
+        Path(args.output).write_text(text + "\n", encoding="utf-8")
+    print(text)
+
+
+if __name__ == "__main__":  # pragma: no cover
+    main()
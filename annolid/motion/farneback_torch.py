@@ -3,13 +3,18 @@ Minimal PyTorch Farneback optical flow (CPU/GPU) with optional OpenCV fallback.
 - farneback_prepare_gaussian: matches OpenCV FarnebackPrepareGaussian (moment matrix + Cholesky inverse)
 - farneback_polyexp: matches OpenCV FarnebackPolyExp structure (even/odd vertical + horizontal)
 - farneback_update_matrices: includes OpenCV-exact border attenuation behavior
-- _box_blur5: matches OpenCV FarnebackUpdateFlow_Blur blur stage (running sums, float64 accumulators)
+- _box_blur5: follows the OpenCV FarnebackUpdateFlow_Blur blur stage with a separable
+  box filter (float64 accumulators where available), so it is not bit-exact; the tests
+  hold the resulting flow to mean EPE < 0.15 px (max < 3 px) against cv2 away from a
+  5 px border, and batched flow to atol 1e-5 of per-pair calls
+- calc_optical_flow_farneback_torch_batch: flows for many frame pairs in one call; each
+  frame's pyramid and polynomial expansion is computed once and shared by its pairs
 """
 
 from __future__ import annotations
 from dataclasses import dataclass
 import warnings
-from typing import Optional
+from typing import Optional, Sequence, Tuple
 
 import cv2
 import numpy as np
@@ -40,14 +45,6 @@ def _to_gray_f32(img: np.ndarray) -> np.ndarray:
     return np.ascontiguousarray(gray, dtype=np.float32)
 
 
-def _torch_gray(x: np.ndarray, device: torch.device) -> torch.Tensor:
-    """(H,W) float32 numpy -> (1,1,H,W) float32 tensor."""
-    t = torch.from_numpy(x).to(device=device, dtype=torch.float32)
-    if t.ndim != 2:
-        raise ValueError("Expected (H,W) gray image.")
-    return t.unsqueeze(0).unsqueeze(0)
-
-
 def _replicate_pad2d(x: torch.Tensor, pad: int) -> torch.Tensor:
     if pad <= 0:
         return x
@@ -307,7 +304,16 @@ def farneback_polyexp(
     """
     if img_1x1hw.ndim != 4 or img_1x1hw.shape[0] != 1 or img_1x1hw.shape[1] != 1:
         raise ValueError("Expected (1,1,H,W)")
-    if img_1x1hw.dtype != torch.float32:
+    return _polyexp_batch(img_1x1hw, kernels)[0]
+
+
+def _polyexp_batch(
+    imgs_n1hw: torch.Tensor, kernels: FarnebackGaussKernels
+) -> torch.Tensor:
+    """Batched :func:`farneback_polyexp`: (N,1,H,W) -> (N,H,W,5)."""
+    if imgs_n1hw.ndim != 4 or imgs_n1hw.shape[1] != 1:
+        raise ValueError("Expected (N,1,H,W)")
+    if imgs_n1hw.dtype != torch.float32:
         raise ValueError("Expected float32")
 
     n = kernels.n
@@ -316,17 +322,18 @@ def farneback_polyexp(
     ig33 = kernels.ig33
     ig55 = kernels.ig55
 
-    H, W = img_1x1hw.shape[2:]
-    dev = img_1x1hw.device
+    N = imgs_n1hw.shape[0]
+    H, W = imgs_n1hw.shape[2:]
+    dev = imgs_n1hw.device
     acc_dtype = _acc_dtype_for_device(dev)
 
     # --- vertical stage: replicate padding then 1D conv over Y ---
     if acc_dtype == torch.float32:
-        src_4d = img_1x1hw
+        src_4d = imgs_n1hw
         kv = kernels.kv_f32
         kh = kernels.kh_f32
     else:
-        src_4d = img_1x1hw.to(dtype=acc_dtype)
+        src_4d = imgs_n1hw.to(dtype=acc_dtype)
         kv = (
             kernels.kv_f64
             if kernels.kv_f64 is not None
@@ -339,14 +346,14 @@ def farneback_polyexp(
         )
 
     src_pad_v = F.pad(src_4d, (0, 0, n, n), mode="replicate")
-    row = F.conv2d(src_pad_v, kv)  # (1,3,H,W)
+    row = F.conv2d(src_pad_v, kv)  # (N,3,H,W)
 
     # --- horizontal stage: replicate padding then 1D conv over X ---
     row_pad = F.pad(row, (n, n, 0, 0), mode="replicate")
-    b = F.conv2d(row_pad, kh)  # (1,6,H,W)
+    b = F.conv2d(row_pad, kh)  # (N,6,H,W)
     b1, b2, b3, b4, b5, b6 = torch.unbind(b, dim=1)
 
-    dst = torch.empty((H, W, 5), device=dev, dtype=torch.float32)
+    dst = torch.empty((N, H, W, 5), device=dev, dtype=torch.float32)
     dst[..., 0] = (b3 * ig11).float()
     dst[..., 1] = (b2 * ig11).float()
     dst[..., 2] = (b1 * ig03 + b5 * ig33).float()
@@ -366,22 +373,30 @@ def farneback_update_matrices(
         scale = (x<B ? border[x] : 1) * (x>=W-B ? border[W-x-1] : 1) * ...
     """
     R0_hw5, R1_hw5, flow_hw2, H, W = _normalize_flow_hw2(R0_hw5, R1_hw5, flow_hw2)
-    device = R0_hw5.device
-    assert R0_hw5.dtype == torch.float32
+    return _update_matrices_batch(R0_hw5[None], R1_hw5[None], flow_hw2[None])[0]
+
+
+def _update_matrices_batch(
+    R0_bhw5: torch.Tensor, R1_bhw5: torch.Tensor, flow_bhw2: torch.Tensor
+) -> torch.Tensor:
+    """Batched :func:`farneback_update_matrices` over (B,H,W,C) pair stacks."""
+    B, H, W = R0_bhw5.shape[:3]
+    device = R0_bhw5.device
+    assert R0_bhw5.dtype == torch.float32
 
     # Grid
     ys_1d, xs_1d = _get_base_coords(H, W, device)
-    ys = ys_1d.view(H, 1)
-    xs = xs_1d.view(1, W)
+    ys = ys_1d.view(1, H, 1)
+    xs = xs_1d.view(1, 1, W)
 
-    dx = flow_hw2[..., 0]
-    dy = flow_hw2[..., 1]
+    dx = flow_bhw2[..., 0]
+    dy = flow_bhw2[..., 1]
     fx = xs + dx
     fy = ys + dy
     if device.type == "mps":
         # Avoid int64 indexing on MPS by using grid_sample.
         valid = (fx >= 0) & (fx < W - 1) & (fy >= 0) & (fy < H - 1)
-        R1w = _grid_sample_R1(R1_hw5, fx, fy)
+        R1w = _grid_sample_R1(R1_bhw5, fx, fy)
     else:
         x1 = torch.floor(fx).to(torch.int64)
         y1 = torch.floor(fy).to(torch.int64)
@@ -398,16 +413,19 @@ def farneback_update_matrices(
         a10 = (1.0 - fx_frac) * fy_frac
         a11 = fx_frac * fy_frac
 
-        flat = R1_hw5.reshape(H * W, 5)
-        idx00 = (y1c * W + x1c).view(-1)
-        idx01 = (y1c * W + (x1c + 1)).view(-1)
-        idx10 = ((y1c + 1) * W + x1c).view(-1)
-        idx11 = ((y1c + 1) * W + (x1c + 1)).view(-1)
+        flat = R1_bhw5.reshape(B * H * W, 5)
+        base = (torch.arange(B, device=device, dtype=torch.int64) * (H * W)).view(
+            B, 1, 1
+        )
+        idx00 = (base + y1c * W + x1c).view(-1)
+        idx01 = (base + y1c * W + (x1c + 1)).view(-1)
+        idx10 = (base + (y1c + 1) * W + x1c).view(-1)
+        idx11 = (base + (y1c + 1) * W + (x1c + 1)).view(-1)
 
-        R00 = flat[idx00].view(H, W, 5)
-        R01 = flat[idx01].view(H, W, 5)
-        R10 = flat[idx10].view(H, W, 5)
-        R11 = flat[idx11].view(H, W, 5)
+        R00 = flat[idx00].view(B, H, W, 5)
+        R01 = flat[idx01].view(B, H, W, 5)
+        R10 = flat[idx10].view(B, H, W, 5)
+        R11 = flat[idx11].view(B, H, W, 5)
 
         R1w = (
             R00 * a00.unsqueeze(-1)
@@ -426,15 +444,15 @@ def farneback_update_matrices(
 
     inb = valid
 
-    r4 = torch.where(inb, (R0_hw5[..., 2] + r4) * 0.5, R0_hw5[..., 2])
-    r5 = torch.where(inb, (R0_hw5[..., 3] + r5) * 0.5, R0_hw5[..., 3])
-    r6 = torch.where(inb, (R0_hw5[..., 4] + r6) * 0.25, R0_hw5[..., 4] * 0.5)
+    r4 = torch.where(inb, (R0_bhw5[..., 2] + r4) * 0.5, R0_bhw5[..., 2])
+    r5 = torch.where(inb, (R0_bhw5[..., 3] + r5) * 0.5, R0_bhw5[..., 3])
+    r6 = torch.where(inb, (R0_bhw5[..., 4] + r6) * 0.25, R0_bhw5[..., 4] * 0.5)
 
     r2 = torch.where(inb, r2, torch.zeros_like(r2))
     r3 = torch.where(inb, r3, torch.zeros_like(r3))
 
-    r2 = (R0_hw5[..., 0] - r2) * 0.5
-    r3 = (R0_hw5[..., 1] - r3) * 0.5
+    r2 = (R0_bhw5[..., 0] - r2) * 0.5
+    r3 = (R0_bhw5[..., 1] - r3) * 0.5
 
     r2 = r2 + r4 * dy + r6 * dx
     r3 = r3 + r6 * dy + r5 * dx
@@ -494,10 +512,10 @@ def _normalize_flow_hw2(
 
 
 def _grid_sample_R1(
-    R1_hw5: torch.Tensor, fx: torch.Tensor, fy: torch.Tensor
+    R1_bhw5: torch.Tensor, fx: torch.Tensor, fy: torch.Tensor
 ) -> torch.Tensor:
-    """MPS-safe bilinear sampling of R1 without int64 indexing."""
-    H, W = fx.shape
+    """MPS-safe bilinear sampling of (B,H,W,5) R1 without int64 indexing."""
+    H, W = fx.shape[-2:]
     if W > 1:
         x_norm = fx / (W - 1) * 2.0 - 1.0
     else:
@@ -506,8 +524,8 @@ def _grid_sample_R1(
         y_norm = fy / (H - 1) * 2.0 - 1.0
     else:
         y_norm = torch.zeros_like(fy)
-    grid = torch.stack((x_norm, y_norm), dim=-1).unsqueeze(0)
-    R1_t = R1_hw5.permute(2, 0, 1).unsqueeze(0)
+    grid = torch.stack((x_norm, y_norm), dim=-1)
+    R1_t = R1_bhw5.permute(0, 3, 1, 2)
     R1w = F.grid_sample(
         R1_t,
         grid,
@@ -515,7 +533,7 @@ def _grid_sample_R1(
         padding_mode="zeros",
         align_corners=True,
     )
-    return R1w.squeeze(0).permute(1, 2, 0).contiguous()
+    return R1w.permute(0, 2, 3, 1).contiguous()
 
 
 def farneback_update_flow_blur(matM_hw5: torch.Tensor) -> torch.Tensor:
@@ -550,23 +568,27 @@ OPTFLOW_FARNEBACK_GAUSSIAN = 256
 
 def _box_blur5(matM_hw5: torch.Tensor, winsize: int) -> torch.Tensor:
     """
-    5-channel OpenCV-style box blur over matM (H,W,5), matching FarnebackUpdateFlow_Blur's blur stage.
-    Uses replicate padding + avg pooling, accumulating in float64 when available.
+    5-channel OpenCV-style box blur over matM (H,W,5) or (B,H,W,5), following FarnebackUpdateFlow_Blur's blur stage.
+    Uses replicate padding + separable avg pooling, accumulating in float64 when available.
     Returns blurred M as float32.
     """
     if winsize <= 1:
         return matM_hw5
-    _, _, C = matM_hw5.shape
-    if C != 5:
+    if matM_hw5.shape[-1] != 5:
         raise ValueError("Expected matM_hw5 with last dim=5")
+    single = matM_hw5.ndim == 3
+    batch = matM_hw5.unsqueeze(0) if single else matM_hw5
 
     # OpenCV accumulates in double; fall back to float32 on backends without float64.
     acc_dtype = _acc_dtype_for_device(matM_hw5.device)
-    mat = matM_hw5.permute(2, 0, 1).unsqueeze(0).to(acc_dtype)  # (1,5,H,W)
+    mat = batch.permute(0, 3, 1, 2).to(acc_dtype)  # (B,5,H,W)
     pad = winsize // 2
     mat_pad = F.pad(mat, (pad, pad, pad, pad), mode="replicate")
-    out = F.avg_pool2d(mat_pad, kernel_size=winsize, stride=1)
-    return out.squeeze(0).permute(1, 2, 0).contiguous().to(torch.float32)
+    # The box filter is separable; two 1D passes cost 2k instead of k*k per pixel.
+    out = F.avg_pool2d(mat_pad, kernel_size=(winsize, 1), stride=1)
+    out = F.avg_pool2d(out, kernel_size=(1, winsize), stride=1)
+    out = out.permute(0, 2, 3, 1).contiguous().to(torch.float32)
+    return out[0] if single else out
 
 
 def calc_optical_flow_farneback_torch(
@@ -595,10 +617,70 @@ def calc_optical_flow_farneback_torch(
       outlier_ksize=0, clip_percentile=None, max_magnitude=None
 
     Note: The custom kernels here are heavy on small, per-row/per-pixel ops that
-    launch many tiny kernels.
+    launch many tiny kernels. For whole videos prefer
+    calc_optical_flow_farneback_torch_batch, which amortizes them over many pairs.
+    This call is a one-pair batch. Its window blur is separable, so results
+    match a direct 2-D box filter to within float32 rounding (max abs diff
+    about 1e-7), not bit for bit.
 
     cpu_num_threads: Optional override for torch CPU thread count (None keeps default).
     """
+    return calc_optical_flow_farneback_torch_batch(
+        [prev, nxt],
+        pyr_scale=pyr_scale,
+        levels=levels,
+        winsize=winsize,
+        iterations=iterations,
+        poly_n=poly_n,
+        poly_sigma=poly_sigma,
+        flags=flags,
+        device=device,
+        clip_percentile=clip_percentile,
+        max_magnitude=max_magnitude,
+        outlier_ksize=outlier_ksize,
+        outlier_ratio=outlier_ratio,
+        outlier_min_magnitude=outlier_min_magnitude,
+        cpu_num_threads=cpu_num_threads,
+    )[0]
+
+
+def calc_optical_flow_farneback_torch_batch(
+    frames: Sequence[np.ndarray],
+    pairs: Optional[Sequence[Tuple[int, int]]] = None,
+    pyr_scale: float = 0.5,
+    levels: int = 1,
+    winsize: int = 15,
+    iterations: int = 3,
+    poly_n: int = 5,
+    poly_sigma: float = 1.1,
+    flags: int = 0,
+    device: Optional[str] = None,
+    clip_percentile: float = 99.0,
+    max_magnitude: Optional[float] = None,
+    outlier_ksize: int = 7,
+    outlier_ratio: float = 25.0,
+    outlier_min_magnitude: float = 10.0,
+    cpu_num_threads: Optional[int] = None,
+) -> np.ndarray:
+    """
+    Torch Farneback for several frame pairs at once; returns (P,H,W,2) float32.
+
+    frames: same-sized images (any layout accepted by the single-pair call).
+    pairs: (prev_index, next_index) into frames; defaults to every adjacent pair
+        of consecutive frames, so N frames yield N-1 flows.
+
+    Each frame's pyramid and polynomial expansion is computed once and shared
+    by every pair it belongs to, and the per-pixel update runs over all pairs
+    in one set of tensor ops, which keeps CPU thread pools busy on small
+    frames. Results match calling calc_optical_flow_farneback_torch per pair.
+    Memory grows linearly with the number of frames; callers should chunk long
+    videos (peak is roughly 100 bytes per pixel per pair on float64 devices).
+    """
+    if pairs is None:
+        pairs = [(idx, idx + 1) for idx in range(len(frames) - 1)]
+    pairs = [(int(a), int(b)) for a, b in pairs]
+    if not pairs:
+        return np.zeros((0, 0, 0, 2), dtype=np.float32)
     if device is None:
         device = "cuda" if torch.cuda.is_available() else "cpu"
 
@@ -608,12 +690,21 @@ def calc_optical_flow_farneback_torch(
         _ = torch.zeros(1, device=dev)
         torch.mps.synchronize()
 
-    prev_f = _to_gray_f32(prev)
-    nxt_f = _to_gray_f32(nxt)
+    used = sorted({idx for pair in pairs for idx in pair})
+    slot = {idx: pos for pos, idx in enumerate(used)}
+    grays = [_to_gray_f32(frames[idx]) for idx in used]
+    H0, W0 = grays[0].shape[:2]
+    if any(gray.shape[:2] != (H0, W0) for gray in grays):
+        raise ValueError("All frames must share the same size.")
+    prev_slots = [slot[a] for a, _ in pairs]
+    next_slots = [slot[b] for _, b in pairs]
+    # Consecutive chains (the common video case) index R with views, not copies.
+    chained = prev_slots == list(range(len(pairs))) and next_slots == list(
+        range(1, len(pairs) + 1)
+    )
+
     # OpenCV pyramid: blur original with sigma(level), then resize
-    pyr_prev: list[np.ndarray] = []
-    pyr_nxt: list[np.ndarray] = []
-    H0, W0 = prev_f.shape[:2]
+    pyramids: list[np.ndarray] = []  # per level: (F,H,W) float32
     for lvl in range(0, levels + 1):
         scale = pyr_scale**lvl
         sigma = (1.0 / scale - 1.0) * 0.5 if scale > 0 else 0.0
@@ -621,14 +712,20 @@ def calc_optical_flow_farneback_torch(
         smooth_sz = max(smooth_sz, 3)
         w = max(1, int(round(W0 * scale)))
         h = max(1, int(round(H0 * scale)))
-        prev_blur = cv2.GaussianBlur(
-            prev_f, (smooth_sz, smooth_sz), sigmaX=sigma, sigmaY=sigma
-        )
-        nxt_blur = cv2.GaussianBlur(
-            nxt_f, (smooth_sz, smooth_sz), sigmaX=sigma, sigmaY=sigma
+        pyramids.append(
+            np.stack(
+                [
+                    cv2.resize(
+                        cv2.GaussianBlur(
+                            gray, (smooth_sz, smooth_sz), sigmaX=sigma, sigmaY=sigma
+                        ),
+                        (w, h),
+                        interpolation=cv2.INTER_LINEAR,
+                    )
+                    for gray in grays
+                ]
+            )
         )
-        pyr_prev.append(cv2.resize(prev_blur, (w, h), interpolation=cv2.INTER_LINEAR))
-        pyr_nxt.append(cv2.resize(nxt_blur, (w, h), interpolation=cv2.INTER_LINEAR))
 
     def _run_torch(dev_run: torch.device) -> torch.Tensor:
         prev_threads: Optional[int] = None
@@ -644,31 +741,34 @@ def calc_optical_flow_farneback_torch(
         try:
             with torch.inference_mode():
                 kernels = farneback_prepare_gaussian(poly_n, poly_sigma, dev_run)
+                prev_idx = torch.tensor(prev_slots, device=dev_run)
+                next_idx = torch.tensor(next_slots, device=dev_run)
 
                 flow_t: Optional[torch.Tensor] = None
 
                 for lvl in reversed(range(levels + 1)):
-                    I0 = pyr_prev[lvl]
-                    I1 = pyr_nxt[lvl]
-
-                    t0 = _torch_gray(I0, dev_run)
-                    t1 = _torch_gray(I1, dev_run)
-                    H, W = I0.shape[:2]
+                    level = pyramids[lvl]
+                    imgs = _to_device_safe(torch.from_numpy(level), dev_run)
+                    H, W = level.shape[1:3]
 
                     if flow_t is None:
                         flow_t = torch.zeros(
-                            (H, W, 2), device=dev_run, dtype=torch.float32
+                            (len(pairs), H, W, 2), device=dev_run, dtype=torch.float32
                         )
                     else:
-                        flow_t = flow_t.permute(2, 0, 1).unsqueeze(0)
+                        flow_t = flow_t.permute(0, 3, 1, 2)
                         flow_t = F.interpolate(
                             flow_t, size=(H, W), mode="bilinear", align_corners=False
                         )
-                        flow_t = flow_t.squeeze(0).permute(1, 2, 0).contiguous()
+                        flow_t = flow_t.permute(0, 2, 3, 1).contiguous()
                         flow_t = flow_t * (1.0 / pyr_scale)
 
-                    R0 = farneback_polyexp(t0, kernels)
-                    R1 = farneback_polyexp(t1, kernels)
+                    R = _polyexp_batch(imgs.unsqueeze(1), kernels)
+                    if chained:
+                        R0, R1 = R[:-1], R[1:]
+                    else:
+                        R0 = R.index_select(0, prev_idx)
+                        R1 = R.index_select(0, next_idx)
 
                     use_gaussian = (flags & OPTFLOW_FARNEBACK_GAUSSIAN) != 0
                     if use_gaussian:
@@ -676,12 +776,12 @@ def calc_optical_flow_farneback_torch(
                             "Gaussian window update path not implemented in this script."
                         )
 
-                    matM = farneback_update_matrices(R0, R1, flow_t)
+                    matM = _update_matrices_batch(R0, R1, flow_t)
                     for it in range(iterations):
                         matM_blur = _box_blur5(matM, winsize)
                         flow_t = farneback_update_flow_blur(matM_blur)
                         if it < iterations - 1:
-                            matM = farneback_update_matrices(R0, R1, flow_t)
+                            matM = _update_matrices_batch(R0, R1, flow_t)
 
                 if flow_t is None:
                     raise RuntimeError("Torch Farneback produced no flow.")
@@ -691,7 +791,7 @@ def calc_optical_flow_farneback_torch(
                     k = int(outlier_ksize)
                     if k % 2 == 0:
                         k += 1
-                    flow_chw = flow_t.permute(2, 0, 1).unsqueeze(0)  # (1,2,H,W)
+                    flow_chw = flow_t.permute(0, 3, 1, 2)  # (P,2,H,W)
                     flow_mean = F.avg_pool2d(
                         flow_chw, kernel_size=k, stride=1, padding=k // 2
                     )
@@ -704,7 +804,7 @@ def calc_optical_flow_farneback_torch(
                         mag > float(outlier_min_magnitude)
                     )
                     flow_chw = torch.where(mask, flow_mean, flow_chw)
-                    flow_t = flow_chw.squeeze(0).permute(1, 2, 0).contiguous()
+                    flow_t = flow_chw.permute(0, 2, 3, 1).contiguous()
 
                 return flow_t
         finally:
@@ -727,19 +827,20 @@ def calc_optical_flow_farneback_torch(
     else:
         flow_t = _run_torch(dev)
 
-    flow = flow_t.cpu().numpy().astype(np.float32)
+    flows = flow_t.cpu().numpy().astype(np.float32)
 
-    # Global clipping (optional) to bound remaining extremes.
-    if clip_percentile is not None and 0 < clip_percentile < 100:
-        mag_np = np.linalg.norm(flow, axis=2)
-        thresh = float(np.percentile(mag_np, clip_percentile))
-        if thresh > 0:
-            scale_np = np.minimum(mag_np, thresh) / (mag_np + 1e-9)
-            flow = flow * scale_np[..., None]
+    for flow in flows:
+        # Global clipping (optional) to bound remaining extremes.
+        if clip_percentile is not None and 0 < clip_percentile < 100:
+            mag_np = np.linalg.norm(flow, axis=2)
+            thresh = float(np.percentile(mag_np, clip_percentile))
+            if thresh > 0:
+                scale_np = np.minimum(mag_np, thresh) / (mag_np + 1e-9)
+                flow *= scale_np[..., None]
 
-    if max_magnitude is not None:
-        mag_np = np.linalg.norm(flow, axis=2)
-        scale_np = np.minimum(mag_np, float(max_magnitude)) / (mag_np + 1e-9)
-        flow = flow * scale_np[..., None]
+        if max_magnitude is not None:
+            mag_np = np.linalg.norm(flow, axis=2)
+            scale_np = np.minimum(mag_np, float(max_magnitude)) / (mag_np + 1e-9)
+            flow *= scale_np[..., None]
 
-    return flow
+    return flows
@@ -7,12 +7,20 @@ Usage (CLI):
         --viz quiver
 
 Notes:
-- Torch Farneback uses --backend farneback_torch.
+- Torch Farneback uses --backend farneback_torch; it runs --batch-size frame
+  pairs per call, sharing each frame's polynomial expansion between its pairs.
+  Peak memory is about 100 bytes per pixel per pair, so the default of 8
+  pairs needs roughly 1.6 GB at 1080p; lower it for large frames.
+- Frames are decoded on a background thread (--decode-ahead) so decoding
+  overlaps flow computation.
 - RAFT requires torch+torchvision optical_flow models; pass --backend raft to opt in.
 - Overlays use annolid.utils.draw.draw_flow for visualization and can be streamed
   via a preview callback instead of saving to disk.
 - NDJSON output mirrors depth-anything metadata: one record per frame with
   base64-encoded uint16 flow components and scales for reconstruction.
+- --flow-store writes the same encodings into a chunked binary store
+  (annolid.motion.flow_store) with random access by frame; existing NDJSON
+  files convert with ``python -m annolid.motion.flow_store flow.ndjson``.
 """
 
 from __future__ import annotations
@@ -20,15 +28,25 @@ from __future__ import annotations
 import argparse
 import base64
 import json
+import queue
+import threading
 from pathlib import Path
-from typing import Callable, Optional, Tuple, List
+from typing import Callable, Iterable, Iterator, Optional, Tuple, List, TypeVar
 import gzip
 
 import cv2
 import numpy as np
 
-from annolid.motion.optical_flow import compute_optical_flow
+from annolid.motion.flow_store import FlowStoreWriter, encode_flow_component
+from annolid.motion.optical_flow import (
+    compute_optical_flow,
+    compute_torch_farneback_flows,
+)
 from annolid.utils import draw
+from annolid.utils.logger import logger
+
+T = TypeVar("T")
+FramePair = Tuple[int, np.ndarray, np.ndarray]
 
 
 def flow_to_color(flow: np.ndarray, max_mag: Optional[float] = None) -> np.ndarray:
@@ -97,29 +115,13 @@ def _build_flow_record(
 
 def _encode_array(arr: np.ndarray, quantize: bool = True) -> dict:
     """Encode an array with base64 + gzip compression."""
-    data = np.asarray(arr, dtype=np.float32)
-    scale = {
-        "min": float(np.nanmin(data)),
-        "max": float(np.nanmax(data)),
-    }
-    if quantize:
-        d_min, d_max = scale["min"], scale["max"]
-        if abs(d_max - d_min) < 1e-6:
-            d_max = d_min + 1e-6
-        normalized = (data - d_min) / (d_max - d_min)
-        quantized = np.clip(np.round(normalized * 65535.0), 0, 65535).astype(np.uint16)
-        raw_bytes = quantized.tobytes()
-        dtype = "uint16"
-    else:
-        arr16 = data.astype(np.float16)
-        raw_bytes = arr16.tobytes()
-        dtype = "float16"
-
-    compressed = gzip.compress(raw_bytes)
+    encoded, d_min, d_max = encode_flow_component(arr, quantize=quantize)
+    scale = {"min": d_min, "max": d_max}
+    compressed = gzip.compress(encoded.tobytes())
     b64 = base64.b64encode(compressed).decode("ascii")
     return {
-        "dtype": dtype,
-        "shape": list(data.shape),
+        "dtype": encoded.dtype.name,
+        "shape": list(encoded.shape),
         "scale": scale,
         "compressed": True,
         "data": b64,
@@ -133,11 +135,113 @@ def _append_flow_ndjson(ndjson_path: Path, record: dict) -> None:
         fh.write("\n")
 
 
+def _read_frame_pairs(cap: cv2.VideoCapture, sample_stride: int) -> Iterator[FramePair]:
+    """Yield ``(frame_index, previous_frame, frame)`` for every sampled frame."""
+    ret, prev_frame = cap.read()
+    frame_idx = 0
+    while ret:
+        ret, curr_frame = cap.read()
+        frame_idx += 1
+        if not ret or curr_frame is None:
+            break
+        if frame_idx % sample_stride == 0:
+            yield frame_idx, prev_frame, curr_frame
+        prev_frame = curr_frame
+
+
+def _decode_ahead(items: Iterable[T], depth: int) -> Iterator[T]:
+    """Drain ``items`` on a background thread, staying at most ``depth`` ahead.
+
+    Errors raised while producing are re-raised to the consumer. Closing the
+    generator stops and joins the thread, so the source may be released after.
+    """
+    buffer: "queue.Queue[Tuple[Optional[BaseException], object]]" = queue.Queue(
+        maxsize=max(1, int(depth))
+    )
+    stop = threading.Event()
+    done = object()
+
+    def _put(entry: Tuple[Optional[BaseException], object]) -> bool:
+        while not stop.is_set():
+            try:
+                buffer.put(entry, timeout=0.1)
+                return True
+            except queue.Full:
+                continue
+        return False
+
+    def _produce() -> None:
+        try:
+            for item in items:
+                if not _put((None, item)):
+                    return
+        except BaseException as exc:
+            _put((exc, done))
+            return
+        _put((None, done))
+
+    thread = threading.Thread(target=_produce, name="flow-decode-ahead", daemon=True)
+    thread.start()
+    try:
+        while True:
+            error, item = buffer.get()
+            if error is not None:
+                raise error
+            if item is done:
+                return
+            yield item  # type: ignore[misc]
+    finally:
+        stop.set()
+        thread.join()
+
+
+def _batched_torch_flows(
+    pairs: Iterable[FramePair], batch_size: int, farneback_kwargs: dict
+) -> Iterator[Tuple[int, np.ndarray, np.ndarray]]:
+    """Yield ``(frame_index, frame, flow)`` computing ``batch_size`` pairs per call."""
+    chunk: List[FramePair] = []
+    for pair in pairs:
+        chunk.append(pair)
+        if len(chunk) >= batch_size:
+            yield from _torch_flow_chunk(chunk, farneback_kwargs)
+            chunk = []
+    if chunk:
+        yield from _torch_flow_chunk(chunk, farneback_kwargs)
+
+
+def _torch_flow_chunk(
+    chunk: List[FramePair], farneback_kwargs: dict
+) -> List[Tuple[int, np.ndarray, np.ndarray]]:
+    frames: List[np.ndarray] = []
+    index_pairs: List[Tuple[int, int]] = []
+    for _frame_idx, prev_frame, curr_frame in chunk:
+        # With stride 1 a pair's previous frame is the last pair's frame.
+        if not frames or frames[-1] is not prev_frame:
+            frames.append(prev_frame)
+        frames.append(curr_frame)
+        index_pairs.append((len(frames) - 2, len(frames) - 1))
+    try:
+        flows = compute_torch_farneback_flows(frames, index_pairs, **farneback_kwargs)
+    except Exception as exc:
+        logger.warning("Batched torch Farneback failed (%s); computing per pair.", exc)
+        flows = [
+            compute_optical_flow(
+                prev_frame, curr_frame, use_torch_farneback=True, **farneback_kwargs
+            )[1]
+            for _frame_idx, prev_frame, curr_frame in chunk
+        ]
+    return [
+        (frame_idx, curr_frame, flow)
+        for (frame_idx, _prev, curr_frame), flow in zip(chunk, flows)
+    ]
+
+
 def process_video_flow(
     video_path: str,
     backend: str = "farneback",
     save_csv: Optional[str] = None,
     save_ndjson: Optional[str] = None,
+    save_flow_store: Optional[str] = None,
     sample_stride: int = 1,
     visualization: str = "quiver",
     raft_model: str = "small",
@@ -149,6 +253,8 @@ def process_video_flow(
     smooth_kernel: int = 3,
     quantize: bool = True,
     use_torch_farneback: bool = False,
+    batch_size: int = 8,
+    decode_ahead: int = 8,
     farneback_pyr_scale: float = 0.5,
     farneback_levels: int = 1,
     farneback_winsize: int = 1,
@@ -167,6 +273,8 @@ def process_video_flow(
         raft_model: 'small' or 'large' RAFT variant when backend='raft'.
         save_csv: output csv path with mean dx, dy, magnitude per frame (optional).
         save_ndjson: optional NDJSON path (depth-anything style) storing flow components.
+        save_flow_store: optional directory for a binary flow store (see
+            annolid.motion.flow_store); replaces any store already there.
         sample_stride: process every Nth frame (>=1).
         visualization: 'quiver' or 'hsv' for color-coded magnitude/direction.
         opacity: overlay opacity percent (0-100).
@@ -175,8 +283,11 @@ def process_video_flow(
         stable_hsv: if True, stabilize HSV brightness across frames.
         smooth: spatially smooth flow before encoding/preview.
         smooth_kernel: odd kernel size for smoothing when enabled.
-        quantize: store ndjson values quantized to uint16 (smaller); if False store float16.
+        quantize: store ndjson/flow-store values quantized to uint16 (smaller); if False store float16.
         use_torch_farneback: attempt torch Farneback (for verification) before cv CUDA/UMat/CPU.
+        batch_size: frame pairs per torch Farneback call (1 computes pairs one by one).
+            The default 8 peaks at about 1.6 GB for 1080p frames.
+        decode_ahead: frames decoded ahead on a background thread (0 decodes inline).
         farneback_*: parameters forwarded to Farneback computation when backend='farneback'.
         progress_callback: optional callable receiving integer percent progress.
         preview_callback: optional callable receiving overlay previews.
@@ -196,92 +307,119 @@ def process_video_flow(
         max(1, (total_frames - 1) // max(sample_stride, 1)) if total_frames > 1 else 0
     )
 
-    ret, prev_frame = cap.read()
-    frame_idx = 0
     processed = 0
     ndjson_path = Path(save_ndjson) if save_ndjson else None
+    store_writer = (
+        FlowStoreWriter(
+            Path(save_flow_store),
+            quantize=quantize,
+            video_name=Path(video_path).name,
+        )
+        if save_flow_store
+        else None
+    )
     mag_scale: Optional[float] = None
     ema_alpha = 0.9  # higher -> slower adaptation
 
-    while ret:
-        ret, curr_frame = cap.read()
-        frame_idx += 1
-        if not ret or curr_frame is None:
-            break
-        if frame_idx % sample_stride != 0:
-            prev_frame = curr_frame
-            continue
-
-        flow_hsv, flow = compute_optical_flow(
-            prev_frame,
-            curr_frame,
-            use_raft=use_raft_backend,
-            raft_model=raft_model,
-            use_torch_farneback=use_torch,
-            farneback_pyr_scale=farneback_pyr_scale,
-            farneback_levels=farneback_levels,
-            farneback_winsize=farneback_winsize,
-            farneback_iterations=farneback_iterations,
-            farneback_poly_n=farneback_poly_n,
-            farneback_poly_sigma=farneback_poly_sigma,
-        )
-        if smooth and smooth_kernel > 1:
-            k = int(max(1, smooth_kernel))
-            if k % 2 == 0:
-                k += 1
-            flow[..., 0] = cv2.GaussianBlur(flow[..., 0], (k, k), 0)
-            flow[..., 1] = cv2.GaussianBlur(flow[..., 1], (k, k), 0)
-        if visualization.lower() == "hsv":
-            mag = np.sqrt(flow[..., 0] ** 2 + flow[..., 1] ** 2).astype(np.float32)
-            finite = mag[np.isfinite(mag)]
-            if stable_hsv and finite.size:
-                current_p95 = float(np.percentile(finite, 95))
-                if mag_scale is None:
-                    mag_scale = max(current_p95, 1e-6)
-                else:
-                    mag_scale = ema_alpha * mag_scale + (1.0 - ema_alpha) * current_p95
-            overlay_out = flow_to_color(flow, max_mag=mag_scale if stable_hsv else None)
-        else:
-            flow_scaled = flow * float(quiver_gain)
-            blank = np.zeros_like(curr_frame)
-            arrows_bgr = draw.draw_flow(blank, flow_scaled, step=int(quiver_step))
-            arrows_rgb = cv2.cvtColor(arrows_bgr, cv2.COLOR_BGR2RGB)
-            mask = np.any(arrows_bgr != 0, axis=2)
-            alpha_val = int(np.clip(opacity, 0, 100) / 100.0 * 255.0)
-            alpha = np.zeros((arrows_rgb.shape[0], arrows_rgb.shape[1]), dtype=np.uint8)
-            alpha[mask] = alpha_val
-            overlay_out = np.ascontiguousarray(np.dstack([arrows_rgb, alpha]))
-        mean_dx, mean_dy, mean_mag = _compute_mean_flow(flow)
-        stats.append((frame_idx, mean_dx, mean_dy, mean_mag))
-        processed += 1
-        if preview_callback:
-            preview_callback(
-                {
-                    "overlay": overlay_out,
-                    "frame_index": frame_idx,
-                    "mean_flow": {
-                        "dx": mean_dx,
-                        "dy": mean_dy,
-                        "magnitude": mean_mag,
-                    },
-                }
-            )
-        if progress_callback and total_flows > 0:
-            percent = min(int(processed / total_flows * 100), 100)
-            progress_callback(percent)
-        if ndjson_path:
-            record = _build_flow_record(
-                Path(video_path).name,
+    farneback_kwargs = dict(
+        farneback_pyr_scale=farneback_pyr_scale,
+        farneback_levels=farneback_levels,
+        farneback_winsize=farneback_winsize,
+        farneback_iterations=farneback_iterations,
+        farneback_poly_n=farneback_poly_n,
+        farneback_poly_sigma=farneback_poly_sigma,
+    )
+    pairs: Iterable[FramePair] = _read_frame_pairs(cap, max(int(sample_stride), 1))
+    if decode_ahead > 0:
+        pairs = _decode_ahead(pairs, decode_ahead)
+    if use_torch and not use_raft_backend and batch_size > 1:
+        flows = _batched_torch_flows(pairs, int(batch_size), farneback_kwargs)
+    else:
+        flows = (
+            (
                 frame_idx,
-                flow,
-                curr_frame.shape[0],
-                curr_frame.shape[1],
-                quantize=quantize,
+                curr_frame,
+                compute_optical_flow(
+                    prev_frame,
+                    curr_frame,
+                    use_raft=use_raft_backend,
+                    raft_model=raft_model,
+                    use_torch_farneback=use_torch,
+                    **farneback_kwargs,
+                )[1],
             )
-            _append_flow_ndjson(ndjson_path, record)
-        prev_frame = curr_frame
+            for frame_idx, prev_frame, curr_frame in pairs
+        )
 
-    cap.release()
+    try:
+        for frame_idx, curr_frame, flow in flows:
+            if smooth and smooth_kernel > 1:
+                k = int(max(1, smooth_kernel))
+                if k % 2 == 0:
+                    k += 1
+                flow[..., 0] = cv2.GaussianBlur(flow[..., 0], (k, k), 0)
+                flow[..., 1] = cv2.GaussianBlur(flow[..., 1], (k, k), 0)
+            if visualization.lower() == "hsv":
+                mag = np.sqrt(flow[..., 0] ** 2 + flow[..., 1] ** 2).astype(np.float32)
+                finite = mag[np.isfinite(mag)]
+                if stable_hsv and finite.size:
+                    current_p95 = float(np.percentile(finite, 95))
+                    if mag_scale is None:
+                        mag_scale = max(current_p95, 1e-6)
+                    else:
+                        mag_scale = (
+                            ema_alpha * mag_scale + (1.0 - ema_alpha) * current_p95
+                        )
+                overlay_out = flow_to_color(
+                    flow, max_mag=mag_scale if stable_hsv else None
+                )
+            else:
+                flow_scaled = flow * float(quiver_gain)
+                blank = np.zeros_like(curr_frame)
+                arrows_bgr = draw.draw_flow(blank, flow_scaled, step=int(quiver_step))
+                arrows_rgb = cv2.cvtColor(arrows_bgr, cv2.COLOR_BGR2RGB)
+                mask = np.any(arrows_bgr != 0, axis=2)
+                alpha_val = int(np.clip(opacity, 0, 100) / 100.0 * 255.0)
+                alpha = np.zeros(
+                    (arrows_rgb.shape[0], arrows_rgb.shape[1]), dtype=np.uint8
+                )
+                alpha[mask] = alpha_val
+                overlay_out = np.ascontiguousarray(np.dstack([arrows_rgb, alpha]))
+            mean_dx, mean_dy, mean_mag = _compute_mean_flow(flow)
+            stats.append((frame_idx, mean_dx, mean_dy, mean_mag))
+            processed += 1
+            if preview_callback:
+                preview_callback(
+                    {
+                        "overlay": overlay_out,
+                        "frame_index": frame_idx,
+                        "mean_flow": {
+                            "dx": mean_dx,
+                            "dy": mean_dy,
+                            "magnitude": mean_mag,
+                        },
+                    }
+                )
+            if progress_callback and total_flows > 0:
+                percent = min(int(processed / total_flows * 100), 100)
+                progress_callback(percent)
+            if ndjson_path:
+                record = _build_flow_record(
+                    Path(video_path).name,
+                    frame_idx,
+                    flow,
+                    curr_frame.shape[0],
+                    curr_frame.shape[1],
+                    quantize=quantize,
+                )
+                _append_flow_ndjson(ndjson_path, record)
+            if store_writer is not None:
+                store_writer.add(frame_idx, flow)
+    finally:
+        cap.release()
+        # Publish what was written even when the run is interrupted.
+        if store_writer is not None:
+            store_writer.close()
 
     if save_csv and stats:
         import csv
@@ -308,6 +446,10 @@ def _parse_args() -> argparse.Namespace:
         "--stride", type=int, default=1, help="Process every Nth frame (default 1)"
     )
     p.add_argument("--ndjson", help="Path to save NDJSON of per-frame flow maps")
+    p.add_argument(
+        "--flow-store",
+        help="Directory to save a chunked binary store of per-frame flow maps",
+    )
     p.add_argument(
         "--viz",
         default="quiver",
@@ -352,6 +494,23 @@ def _parse_args() -> argparse.Namespace:
         action="store_false",
         help="Store raw float16 instead of quantized uint16",
     )
+    p.add_argument(
+        "--torch-farneback",
+        action="store_true",
+        help="Try the torch Farneback implementation first",
+    )
+    p.add_argument(
+        "--batch-size",
+        type=int,
+        default=8,
+        help="Frame pairs per torch Farneback call (default 8, ~1.6 GB at 1080p)",
+    )
+    p.add_argument(
+        "--decode-ahead",
+        type=int,
+        default=8,
+        help="Frames decoded ahead on a background thread (0 disables)",
+    )
     p.set_defaults(stable_hsv=True)
     p.set_defaults(quantize=True)
     return p.parse_args()
@@ -364,6 +523,7 @@ def main():
         backend=args.backend,
         save_csv=args.csv,
         save_ndjson=args.ndjson,
+        save_flow_store=args.flow_store,
         sample_stride=max(1, int(args.stride)),
         visualization=args.viz,
         raft_model=args.raft_model,
@@ -375,6 +535,8 @@ def main():
         smooth_kernel=int(args.smooth_kernel),
         quantize=bool(args.quantize),
         use_torch_farneback=bool(args.torch_farneback),
+        batch_size=max(1, int(args.batch_size)),
+        decode_ahead=max(0, int(args.decode_ahead)),
     )
 
 
@@ -0,0 +1,617 @@
+"""Chunked binary store for dense optical-flow fields.
+
+The NDJSON flow output gzips and base64-encodes every component into a JSON
+line, which makes files a third larger than the data, costs CPU on both ends
+and forces a full scan to reach frame N. A flow store is a directory::
+
+    meta.json          format version, video name, quantization default
+    index.npy          structured array: frame, shard, offset, shape, dtype,
+                       per-component min/max scales
+    index.rows         the same records, appended while the store is written
+    shard_00000.bin    raw (2, H, W) dx/dy planes, 64-byte aligned
+    shard_00001.bin    ...
+
+Components keep the NDJSON encodings: ``uint16`` values quantized between the
+recorded min/max (the default) or raw ``float16``. Magnitude is not stored;
+only its min/max are kept in the index for stable colour scaling, and
+:meth:`FlowStore.read` callers can derive it from dx/dy.
+
+Shards are append-only. While writing, every ``publish_every`` frames only
+the new index records are appended to ``index.rows`` after their planes are
+flushed; closing the writer publishes ``index.npy`` atomically and drops the
+row log. A reader can therefore map a store that is still being produced and
+always sees complete frames.
+"""
+
+from __future__ import annotations
+
+import argparse
+import base64
+import gzip
+import json
+import os
+import tempfile
+import threading
+from pathlib import Path
+from typing import Dict, List, Mapping, Optional, Tuple
+
+import numpy as np
+
+from annolid.utils.logger import logger
+
+STORE_FORMAT = "annolid-flow-store"
+STORE_VERSION = 1
+INDEX_FILENAME = "index.npy"
+INDEX_LOG_FILENAME = "index.rows"
+META_FILENAME = "meta.json"
+DEFAULT_SHARD_BYTES = 256 << 20
+DEFAULT_PUBLISH_EVERY = 100
+_ALIGNMENT = 64
+_QUANT_LEVELS = 65535.0
+_INDEX_DTYPE = np.dtype(
+    [
+        ("frame", "<i8"),
+        ("shard", "<i4"),
+        ("offset", "<i8"),
+        ("height", "<i4"),
+        ("width", "<i4"),
+        ("dtype", "S8"),
+        ("dx_min", "<f8"),
+        ("dx_max", "<f8"),
+        ("dy_min", "<f8"),
+        ("dy_max", "<f8"),
+        ("mag_min", "<f8"),
+        ("mag_max", "<f8"),
+    ]
+)
+_SUPPORTED_DTYPES = {"uint16", "float16"}
+
+
+def flow_store_path_for_ndjson(ndjson_path: Path) -> Path:
+    """Default store location next to an NDJSON file (``x_flow.ndjson`` -> ``x_flow_store``)."""
+    path = Path(ndjson_path)
+    return path.with_name(f"{path.stem}_store")
+
+
+def _shard_path(root: Path, shard: int) -> Path:
+    return root / f"shard_{int(shard):05d}.bin"
+
+
+def _load_index(root: Path) -> np.ndarray:
+    path = root / INDEX_FILENAME
+    if not path.exists():
+        try:
+            raw = (root / INDEX_LOG_FILENAME).read_bytes()
+        except FileNotFoundError:
+            if not path.exists():
+                return np.zeros((0,), dtype=_INDEX_DTYPE)
+        else:
+            # Ignore a record the writer is still appending.
+            usable = len(raw) - len(raw) % _INDEX_DTYPE.itemsize
+            return np.frombuffer(raw[:usable], dtype=_INDEX_DTYPE)
+    index = np.load(path, allow_pickle=False)
+    if index.dtype != _INDEX_DTYPE:
+        raise ValueError(f"Unsupported flow store index layout: {path}")
+    return index
+
+
+def _atomic_write(path: Path, write) -> None:
+    fd, temp_name = tempfile.mkstemp(
+        dir=str(path.parent), prefix=f"{path.name}.", suffix=".tmp"
+    )
+    try:
+        with os.fdopen(fd, "wb") as fh:
+            write(fh)
+        os.replace(temp_name, path)
+    finally:
+        if os.path.exists(temp_name):
+            os.unlink(temp_name)
+
+
+def encode_flow_component(
+    values: np.ndarray, quantize: bool = True
+) -> Tuple[np.ndarray, float, float]:
+    """Encode one flow component as stored on disk.
+
+    Returns ``(encoded, min, max)`` where ``encoded`` is ``uint16`` quantized
+    between min and max, or ``float16`` when ``quantize`` is False.
+    """
+    data = np.asarray(values, dtype=np.float32)
+    v_min = float(np.nanmin(data))
+    v_max = float(np.nanmax(data))
+    if not quantize:
+        return data.astype(np.float16), v_min, v_max
+    span = v_max - v_min
+    if abs(span) < 1e-6:
+        span = 1e-6
+    normalized = (data - v_min) / span
+    encoded = np.clip(np.round(normalized * _QUANT_LEVELS), 0, _QUANT_LEVELS)
+    return encoded.astype(np.uint16), v_min, v_max
+
+
+def decode_flow_components(
+    encoded: np.ndarray, mins: np.ndarray, maxs: np.ndarray
+) -> np.ndarray:
+    """Decode ``(..., C, H, W)`` components with per-component ``(..., C)`` scales."""
+    mins = np.asarray(mins, dtype=np.float32)[..., None, None]
+    maxs = np.asarray(maxs, dtype=np.float32)[..., None, None]
+    values = encoded.astype(np.float32)
+    if encoded.dtype == np.uint16:
+        span = np.where(np.abs(maxs - mins) < 1e-6, np.float32(1e-6), maxs - mins)
+        values *= span / np.float32(_QUANT_LEVELS)
+        values += mins
+    return np.clip(values, mins, maxs)
+
+
+class FlowStoreWriter:
+    """Write flow frames into a new store under ``root``.
+
+    An existing store at ``root`` is replaced. Writing the same frame twice
+    keeps the later copy.
+    """
+
+    def __init__(
+        self,
+        root: Path,
+        *,
+        quantize: bool = True,
+        video_name: str = "",
+        shard_bytes: int = DEFAULT_SHARD_BYTES,
+        publish_every: int = DEFAULT_PUBLISH_EVERY,
+    ) -> None:
+        self.root = Path(root)
+        self.root.mkdir(parents=True, exist_ok=True)
+        self.quantize = bool(quantize)
+        self.video_name = str(video_name or "")
+        self.shard_bytes = max(_ALIGNMENT, int(shard_bytes))
+        self.publish_every = max(0, int(publish_every))
+        for stale in [
+            self.root / INDEX_FILENAME,
+            self.root / INDEX_LOG_FILENAME,
+            *self.root.glob("shard_*.bin"),
+        ]:
+            if stale.exists():
+                stale.unlink()
+        self._rows: List[tuple] = []
+        self._unpublished = 0
+        self._published = 0
+        self._index_fh = None
+        self._next_shard = 0
+        self._shard: Optional[int] = None
+        self._fh = None
+        self._offset = 0
+        self._bytes_written = 0
+        self._lock = threading.Lock()
+        self._write_meta()
+
+    def __enter__(self) -> "FlowStoreWriter":
+        return self
+
+    def __exit__(self, exc_type, exc, tb) -> None:
+        self.close()
+
+    def add(self, frame_index: int, flow: np.ndarray) -> None:
+        """Encode and append an ``(H, W, 2)`` flow field."""
+        flow = np.asarray(flow)
+        if flow.ndim != 3 or flow.shape[2] < 2:
+            raise ValueError(f"Expected (H, W, 2) flow, got shape {flow.shape}")
+        dx = flow[..., 0].astype(np.float32)
+        dy = flow[..., 1].astype(np.float32)
+        mag = np.sqrt(dx**2 + dy**2)
+        dx_enc, dx_min, dx_max = encode_flow_component(dx, self.quantize)
+        dy_enc, dy_min, dy_max = encode_flow_component(dy, self.quantize)
+        self.add_encoded(
+            frame_index,
+            np.stack([dx_enc, dy_enc]),
+            {
+                "dx": (dx_min, dx_max),
+                "dy": (dy_min, dy_max),
+                "mag": (float(np.nanmin(mag)), float(np.nanmax(mag))),
+            },
+        )
+
+    def add_encoded(
+        self,
+        frame_index: int,
+        planes: np.ndarray,
+        scales: Mapping[str, Tuple[float, float]],
+    ) -> None:
+        """Append already encoded ``(2, H, W)`` dx/dy planes with their scales."""
+        planes = np.ascontiguousarray(planes)
+        if planes.ndim != 3 or planes.shape[0] != 2:
+            raise ValueError(f"Expected (2, H, W) planes, got shape {planes.shape}")
+        if planes.dtype.name not in _SUPPORTED_DTYPES:
+            raise ValueError(f"Unsupported flow store dtype: {planes.dtype}")
+        with self._lock:
+            padding = (-self._offset) % _ALIGNMENT
+            if (
+                self._fh is None
+                or self._offset + padding + planes.nbytes > self.shard_bytes
+            ):
+                self._roll_shard()
+                padding = 0
+            if padding:
+                self._fh.write(b"\0" * padding)
+                self._offset += padding
+            self._fh.write(planes.tobytes(order="C"))
+            self._rows.append(
+                (
+                    int(frame_index),
+                    self._shard,
+                    self._offset,
+                    planes.shape[1],
+                    planes.shape[2],
+                    planes.dtype.name.encode("ascii"),
+                    *scales["dx"],
+                    *scales["dy"],
+                    *scales["mag"],
+                )
+            )
+            self._offset += planes.nbytes
+            self._bytes_written += planes.nbytes
+            self._unpublished += 1
+            if self.publish_every and self._unpublished >= self.publish_every:
+                self._publish()
+
+    def flush(self) -> None:
+        """Make every frame added so far visible to readers."""
+        with self._lock:
+            self._publish()
+
+    def close(self) -> None:
+        with self._lock:
+            if self._fh is not None:
+                self._fh.close()
+                self._fh = None
+            index = np.array(self._rows, dtype=_INDEX_DTYPE)
+            _atomic_write(
+                self.root / INDEX_FILENAME,
+                lambda fh: np.save(fh, index, allow_pickle=False),
+            )
+            if self._index_fh is not None:
+                self._index_fh.close()
+                self._index_fh = None
+            log_path = self.root / INDEX_LOG_FILENAME
+            if log_path.exists():
+                log_path.unlink()
+            self._published = len(self._rows)
+            self._unpublished = 0
+
+    def summary(self) -> dict:
+        return {
+            "path": str(self.root),
+            "frames": int(len(self._rows)),
+            "bytes_written": int(self._bytes_written),
+            "shards": int(self._next_shard),
+        }
+
+    def _roll_shard(self) -> None:
+        if self._fh is not None:
+            self._fh.close()
+        self._shard = self._next_shard
+        self._next_shard += 1
+        self._fh = _shard_path(self.root, self._shard).open("wb")
+        self._offset = 0
+
+    def _publish(self) -> None:
+        # Planes reach the shard before the records that point at them.
+        if self._fh is not None:
+            self._fh.flush()
+        pending = self._rows[self._published :]
+        if pending:
+            if self._index_fh is None:
+                self._index_fh = (self.root / INDEX_LOG_FILENAME).open("ab")
+            self._index_fh.write(np.array(pending, dtype=_INDEX_DTYPE).tobytes())
+            self._index_fh.flush()
+            self._published = len(self._rows)
+        self._unpublished = 0
+
+    def _write_meta(self) -> None:
+        meta = {
+            "format": STORE_FORMAT,
+            "version": STORE_VERSION,
+            "video_name": self.video_name,
+            "quantized": self.quantize,
+            "components": ["dx", "dy"],
+        }
+        _atomic_write(
+            self.root / META_FILENAME,
+            lambda fh: fh.write(json.dumps(meta, indent=2).encode("utf-8")),
+        )
+
+
+class FlowStore:
+    """Random and range access to a flow store; safe to share across threads.
+
+    The index is loaded on first access; :meth:`refresh` picks up frames a
+    writer published since.
+    """
+
+    def __init__(self, root: Path) -> None:
+        self.root = Path(root)
+        self._lock = threading.Lock()
+        self._index: Optional[np.ndarray] = None
+        self._rows: Dict[int, int] = {}
+        self._frames = np.zeros((0,), dtype=np.int64)
+        self._shards: Dict[int, np.memmap] = {}
+        self.meta: Dict[str, object] = {}
+        meta_path = self.root / META_FILENAME
+        if meta_path.exists():
+            try:
+                self.meta = json.loads(meta_path.read_text(encoding="utf-8"))
+            except Exception as exc:
+                logger.warning(
+                    "Ignoring unreadable flow store meta %s: %s", meta_path, exc
+                )
+
+    @classmethod
+    def open(cls, root: Path) -> Optional["FlowStore"]:
+        """Return the store at ``root`` or None when none was written."""
+        root = Path(root)
+        if not (root / INDEX_FILENAME).exists() and not (
+            (root / INDEX_LOG_FILENAME).exists()
+        ):
+            return None
+        return cls(root)
+
+    def __getstate__(self) -> dict:
+        return {"root": self.root}
+
+    def __setstate__(self, state: dict) -> None:
+        self.__init__(state["root"])
+
+    def __len__(self) -> int:
+        return len(self._ensure_index()[0])
+
+    def __contains__(self, frame_index: int) -> bool:
+        return int(frame_index) in self._ensure_index()[0]
+
+    @property
+    def frame_indices(self) -> np.ndarray:
+        """Sorted frame indices present in the store."""
+        self._ensure_index()
+        return self._frames
+
+    def refresh(self) -> None:
+        with self._lock:
+            self._index = None
+            self._shards.clear()
+
+    def max_magnitude(self) -> Optional[float]:
+        rows, index = self._ensure_index()
+        if not rows:
+            return None
+        value = float(np.nanmax(index["mag_max"][list(rows.values())]))
+        return value if value > 0 else None
+
+    def scales(self, frame_index: int) -> Optional[Dict[str, Tuple[float, float]]]:
+        entry = self._entry(frame_index)
+        if entry is None:
+            return None
+        return {
+            name: (float(entry[f"{name}_min"]), float(entry[f"{name}_max"]))
+            for name in ("dx", "dy", "mag")
+        }
+
+    def read_encoded(self, frame_index: int) -> Optional[np.ndarray]:
+        """Return the stored ``(2, H, W)`` dx/dy planes without decoding."""
+        entry = self._entry(frame_index)
+        if entry is None:
+            return None
+        dtype = np.dtype(entry["dtype"].decode("ascii"))
+        shape = (2, int(entry["height"]), int(entry["width"]))
+        nbytes = int(np.prod(shape)) * dtype.itemsize
+        offset = int(entry["offset"])
+        shard = self._shard(int(entry["shard"]), offset + nbytes)
+        if shard is None:
+            logger.warning(
+                "Flow store frame %d points past the end of shard %d; ignoring.",
+                int(frame_index),
+                int(entry["shard"]),
+            )
+            return None
+        return shard[offset : offset + nbytes].view(dtype).reshape(shape)
+
+    def read(self, frame_index: int) -> Optional[np.ndarray]:
+        """Return the decoded ``(H, W, 2)`` float32 flow, or None if absent."""
+        planes = self.read_encoded(frame_index)
+        if planes is None:
+            return None
+        entry = self._entry(frame_index)
+        flow = decode_flow_components(
+            planes,
+            [entry["dx_min"], entry["dy_min"]],
+            [entry["dx_max"], entry["dy_max"]],
+        )
+        return np.ascontiguousarray(np.moveaxis(flow, 0, -1))
+
+    def read_range(
+        self, start: int, stop: int, step: int = 1
+    ) -> Tuple[np.ndarray, np.ndarray]:
+        """Decode every stored frame in ``range(start, stop, step)``.
+
+        Returns ``(frame_indices, flows)`` with flows shaped ``(N, H, W, 2)``;
+        missing frames are skipped. Frames must share one shape.
+        """
+        rows, index = self._ensure_index()
+        wanted = self._frames[(self._frames >= int(start)) & (self._frames < int(stop))]
+        if int(step) > 1:
+            wanted = wanted[(wanted - int(start)) % int(step) == 0]
+        frames: List[int] = []
+        planes: List[np.ndarray] = []
+        for frame in wanted.tolist():
+            encoded = self.read_encoded(frame)
+            if encoded is not None:
+                frames.append(frame)
+                planes.append(encoded)
+        if not planes:
+            return np.zeros((0,), dtype=np.int64), np.zeros(
+                (0, 0, 0, 2), dtype=np.float32
+            )
+        entries = index[[rows[frame] for frame in frames]]
+        if len({plane.dtype for plane in planes}) > 1:
+            # Mixed encodings decode frame by frame.
+            flows = np.stack([self.read(frame) for frame in frames])
+        else:
+            flows = np.moveaxis(
+                decode_flow_components(
+                    np.stack(planes),
+                    np.stack([entries["dx_min"], entries["dy_min"]], axis=-1),
+                    np.stack([entries["dx_max"], entries["dy_max"]], axis=-1),
+                ),
+                1,
+                -1,
+            )
+        return np.asarray(frames, dtype=np.int64), np.ascontiguousarray(flows)
+
+    def _entry(self, frame_index: int) -> Optional[np.void]:
+        rows, index = self._ensure_index()
+        row = rows.get(int(frame_index))
+        return None if row is None else index[row]
+
+    def _ensure_index(self) -> Tuple[Dict[int, int], np.ndarray]:
+        index = self._index
+        if index is not None:
+            return self._rows, index
+        with self._lock:
+            if self._index is None:
+                index = _load_index(self.root)
+                # Later rows win so a re-written frame supersedes the old copy.
+                self._rows = {
+                    int(frame): row for row, frame in enumerate(index["frame"])
+                }
+                self._frames = np.asarray(sorted(self._rows), dtype=np.int64)
+                self._index = index
+            return self._rows, self._index
+
+    def _shard(self, shard: int, required_bytes: int) -> Optional[np.memmap]:
+        with self._lock:
+            mapped = self._shards.get(shard)
+            if mapped is None or mapped.shape[0] < required_bytes:
+                # The shard may have grown since it was mapped.
+                mapped = np.memmap(
+                    _shard_path(self.root, shard), dtype=np.uint8, mode="r"
+                )
+                self._shards[shard] = mapped
+        return mapped if mapped.shape[0] >= required_bytes else None
+
+
+def _decode_ndjson_component(
+    comp: Mapping[str, object],
+) -> Optional[Tuple[np.ndarray, float, float]]:
+    """Return ``(encoded, min, max)`` for an NDJSON flow component."""
+    if not comp:
+        return None
+    dtype = np.float16 if comp.get("dtype") == "float16" else np.uint16
+    values = comp.get("values")
+    if values is not None:
+        arr = np.asarray(values, dtype=dtype)
+    elif comp.get("data"):
+        raw = base64.b64decode(comp["data"])
+        if comp.get("compressed"):
+            raw = gzip.decompress(raw)
+        arr = np.frombuffer(raw, dtype=dtype)
+    else:
+        return None
+    shape = comp.get("shape")
+    if shape:
+        arr = arr.reshape([int(dim) for dim in shape])
+    scale = comp.get("scale") or {}
+    return arr, float(scale.get("min", 0.0)), float(scale.get("max", 0.0))
+
+
+def convert_ndjson_to_flow_store(
+    ndjson_path: Path,
+    output: Optional[Path] = None,
+    *,
+    shard_bytes: int = DEFAULT_SHARD_BYTES,
+) -> dict:
+    """Convert an NDJSON flow file into a flow store without re-quantizing.
+
+    Records whose components cannot be decoded are skipped with a warning.
+    Returns the writer summary plus the number of skipped records.
+    """
+    ndjson_path = Path(ndjson_path)
+    output = Path(output) if output else flow_store_path_for_ndjson(ndjson_path)
+    skipped = 0
+    writer: Optional[FlowStoreWriter] = None
+    with ndjson_path.open("r", encoding="utf-8") as fh:
+        for line_no, line in enumerate(fh, start=1):
+            line = line.strip()
+            if not line:
+                continue
+            try:
+                record = json.loads(line)
+                frame_index = int(record.get("frame_index", -1))
+                other = record.get("otherData") or {}
+                dx = _decode_ndjson_component(
+                    other.get("flow_dx_raw") or other.get("flow_dx")
+                )
+                dy = _decode_ndjson_component(
+                    other.get("flow_dy_raw") or other.get("flow_dy")
+                )
+                mag = _decode_ndjson_component(
+                    other.get("flow_mag_raw") or other.get("flow_magnitude")
+                )
+            except Exception as exc:
+                logger.warning("Skipping %s:%d: %s", ndjson_path, line_no, exc)
+                skipped += 1
+                continue
+            if frame_index < 0 or dx is None or dy is None:
+                skipped += 1
+                continue
+            if dx[0].dtype != dy[0].dtype or dx[0].shape != dy[0].shape:
+                logger.warning(
+                    "Skipping %s:%d: dx/dy encodings differ", ndjson_path, line_no
+                )
+                skipped += 1
+                continue
+            if mag is None:
+                flow = decode_flow_components(
+                    np.stack([dx[0], dy[0]]), [dx[1], dy[1]], [dx[2], dy[2]]
+                )
+                magnitude = np.sqrt(flow[0] ** 2 + flow[1] ** 2)
+                mag_scale = (float(magnitude.min()), float(magnitude.max()))
+            else:
+                mag_scale = (mag[1], mag[2])
+            if writer is None:
+                writer = FlowStoreWriter(
+                    output,
+                    quantize=dx[0].dtype == np.uint16,
+                    video_name=str(record.get("video_name") or ""),
+                    shard_bytes=shard_bytes,
+                    publish_every=0,
+                )
+            writer.add_encoded(
+                frame_index,
+                np.stack([dx[0], dy[0]]),
+                {"dx": dx[1:], "dy": dy[1:], "mag": mag_scale},
+            )
+    if writer is None:
+        writer = FlowStoreWriter(output, shard_bytes=shard_bytes, publish_every=0)
+    writer.close()
+    summary = writer.summary()
+    summary["skipped"] = skipped
+    return summary
+
+
+def _parse_args() -> argparse.Namespace:
+    p = argparse.ArgumentParser(
+        description="Convert optical-flow NDJSON output into a binary flow store"
+    )
+    p.add_argument("ndjson", help="Path to the flow NDJSON file")
+    p.add_argument(
+        "--output",
+        help="Store directory (default: <ndjson stem>_store next to the input)",
+    )
+    return p.parse_args()
+
+
+def main():
+    args = _parse_args()
+    summary = convert_ndjson_to_flow_store(Path(args.ndjson), args.output)
+    print(json.dumps(summary, indent=2))
+
+
+if __name__ == "__main__":  # pragma: no cover
+    main()
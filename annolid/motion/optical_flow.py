@@ -1,4 +1,4 @@
-from typing import Any, Mapping, Optional, Tuple, Dict
+from typing import Any, Mapping, Optional, Sequence, Tuple, Dict
 
 import cv2
 import numpy as np
@@ -391,6 +391,40 @@ def compute_optical_flow(
     return flow_hsv, flow
 
 
+def compute_torch_farneback_flows(
+    frames: Sequence[np.ndarray],
+    pairs: Optional[Sequence[Tuple[int, int]]] = None,
+    farneback_pyr_scale: float = 0.5,
+    farneback_levels: int = 1,
+    farneback_winsize: int = 1,
+    farneback_iterations: int = 3,
+    farneback_poly_n: int = 3,
+    farneback_poly_sigma: float = 1.1,
+) -> np.ndarray:
+    """
+    Torch Farneback flows for several frame pairs in one batched call.
+
+    Uses the same grayscale conversion, device and post-processing as the
+    torch path of compute_optical_flow, so each flow matches the per-pair
+    result. `pairs` index into `frames` and default to consecutive frames.
+    Returns a (P, H, W, 2) float32 array; errors propagate to the caller.
+    """
+    from annolid.motion.farneback_torch import calc_optical_flow_farneback_torch_batch
+
+    return calc_optical_flow_farneback_torch_batch(
+        [_to_gray(frame) for frame in frames],
+        pairs=pairs,
+        pyr_scale=float(farneback_pyr_scale),
+        levels=int(farneback_levels),
+        winsize=int(farneback_winsize),
+        iterations=int(farneback_iterations),
+        poly_n=int(farneback_poly_n),
+        poly_sigma=float(farneback_poly_sigma),
+        flags=0,
+        device=AVAILABLE_DEVICE,
+    )
+
+
 def compute_optical_flow_raft(
     prev_frame: np.ndarray,
     current_frame: np.ndarray,
@@ -0,0 +1,579 @@
+"""Reproducible throughput benchmarks for the tracking post-processing paths.
+
+Each benchmark builds a synthetic multi-animal tracking dataset (seeded
+random walks in a 1000 x 1000 arena with a fixed zone layout), writes it in
+the format the code under test reads, then times the call with
+``time.perf_counter`` over ``repeats`` runs. Dataset generation is excluded
+from the timings and reused from ``workdir`` when it already exists.
+
+Results are JSON with the environment (git commit, Python/numpy/pandas
+versions, CPU count) and, per benchmark and scale, the best and median
+seconds plus rows per second. :func:`compare_reports` matches two reports
+by (benchmark, rows) and flags slowdowns beyond a tolerance, so results can
+be compared across commits::
+
+    annolid-run benchmark-postprocessing --rows 10k,100k,1M --output new.json
+    annolid-run benchmark-postprocessing --rows 10k,100k,1M --compare old.json
+"""
+
+from __future__ import annotations
+
+import gc
+import json
+import os
+import platform
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+from dataclasses import asdict, dataclass, field
+from datetime import datetime, timezone
+from pathlib import Path
+from typing import Any, Callable, Dict, List, Mapping, Optional, Sequence, Tuple
+
+import numpy as np
+import pandas as pd
+
+from annolid.utils.logger import logger
+
+REPORT_SCHEMA_VERSION = 1
+_DATASET_VERSION = 1
+ARENA_SIZE = 1000.0
+DEFAULT_ROWS: Tuple[int, ...] = (10_000, 100_000)
+DEFAULT_ANIMALS = 4
+_BOX_HALF = 12.0
+_STORE_LOOKUPS = 1000
+
+# Writing one LabelMe JSON per frame gets impractical past this size.
+_ROW_LIMITS: Dict[str, int] = {"identity_governor": 1_000_000}
+
+
+@dataclass
+class BenchmarkResult:
+    benchmark: str
+    rows: int
+    animals: int
+    repeats: int
+    seconds_best: Optional[float] = None
+    seconds_median: Optional[float] = None
+    rows_per_second: Optional[float] = None
+    setup_seconds: Optional[float] = None
+    skipped: Optional[str] = None
+    extra: Dict[str, Any] = field(default_factory=dict)
+
+
+def parse_row_count(value: str | int) -> int:
+    """Parse ``10000``, ``10k`` or ``10M`` style row counts."""
+    if isinstance(value, int):
+        return value
+    text = str(value).strip().lower().replace("_", "")
+    scale = {"k": 1_000, "m": 1_000_000}.get(text[-1:], 1)
+    if scale != 1:
+        text = text[:-1]
+    return int(float(text) * scale)
+
+
+def zone_layout() -> Dict[str, Any]:
+    """Zone JSON payload shared by all benchmarks."""
+    from annolid.postprocessing.zone_schema import build_zone_shape
+
+    third = ARENA_SIZE / 3.0
+    shapes = [
+        build_zone_shape(
+            name,
+            [[left, 0.0], [left + third, ARENA_SIZE]],
+            shape_type="rectangle",
+            zone_kind="chamber",
+            phase="phase_1",
+            occupant_role=role,
+            access_state="open",
+        )
+        for name, left, role in (
+            ("left_chamber", 0.0, "stim"),
+            ("center_chamber", third, "neutral"),
+            ("right_chamber", 2.0 * third, "stim"),
+        )
+    ]
+    shapes.append(
+        build_zone_shape(
+            "mesh_edge",
+            [[0.0, 0.0], [ARENA_SIZE, 50.0]],
+            shape_type="rectangle",
+            zone_kind="barrier_edge",
+            phase="phase_1",
+            access_state="blocked",
+        )
+    )
+    shapes.append(
+        build_zone_shape(
+            "nest",
+            [[400.0, 400.0], [600.0, 380.0], [650.0, 600.0], [380.0, 620.0]],
+            zone_kind="custom",
+            phase="phase_1",
+        )
+    )
+    return {"shapes": shapes, "imagePath": "", "imageData": None}
+
+
+def synthetic_tracking_dataframe(
+    rows: int, *, animals: int = DEFAULT_ANIMALS, seed: int = 0
+) -> pd.DataFrame:
+    """Tracking-CSV rows: ``animals`` random walks over ``rows // animals`` frames."""
+    animals = max(1, int(animals))
+    frames = max(1, int(rows) // animals)
+    rng = np.random.default_rng(seed)
+    steps = rng.normal(0.0, 4.0, size=(frames, animals, 2))
+    start = rng.uniform(0.0, ARENA_SIZE, size=(1, animals, 2))
+    walk = np.cumsum(steps, axis=0) + start
+    # Reflect into the arena so the walk keeps crossing zone borders.
+    period = 2.0 * ARENA_SIZE
+    walk = np.mod(walk, period)
+    walk = np.where(walk > ARENA_SIZE, period - walk, walk)
+    cx = walk[..., 0].reshape(-1)
+    cy = walk[..., 1].reshape(-1)
+    names = np.array([f"mouse_{i}" for i in range(animals)])
+    frame = np.repeat(np.arange(frames), animals)
+    track = np.tile(np.arange(1, animals + 1), frames)
+    return pd.DataFrame(
+        {
+            "frame_number": frame,
+            "x1": cx - _BOX_HALF,
+            "y1": cy - _BOX_HALF,
+            "x2": cx + _BOX_HALF,
+            "y2": cy + _BOX_HALF,
+            "cx": cx,
+            "cy": cy,
+            "instance_name": np.tile(names, frames),
+            "class_score": rng.uniform(0.5, 1.0, size=frames * animals).round(4),
+            "segmentation": "",
+            "tracking_id": track,
+        }
+    )
+
+
+def _rect_points(cx: float, cy: float) -> List[List[float]]:
+    return [
+        [cx - _BOX_HALF, cy - _BOX_HALF],
+        [cx + _BOX_HALF, cy - _BOX_HALF],
+        [cx + _BOX_HALF, cy + _BOX_HALF],
+        [cx - _BOX_HALF, cy + _BOX_HALF],
+    ]
+
+
+def _iter_frame_shapes(dataframe: pd.DataFrame, animals: int):
+    """Yield (frame, LabelMe shapes) using the generator's frame-major layout."""
+    frames = dataframe["frame_number"].to_numpy()[::animals]
+    names = dataframe["instance_name"].to_numpy().reshape(-1, animals)
+    tracks = dataframe["tracking_id"].to_numpy().reshape(-1, animals)
+    cxs = dataframe["cx"].to_numpy().reshape(-1, animals)
+    cys = dataframe["cy"].to_numpy().reshape(-1, animals)
+    for row, frame in enumerate(frames):
+        shapes = []
+        for name, track, cx, cy in zip(names[row], tracks[row], cxs[row], cys[row]):
+            token = str(int(track))
+            shapes.append(
+                {
+                    "label": str(name),
+                    "instance_label": str(name),
+                    "shape_type": "polygon",
+                    "points": _rect_points(float(cx), float(cy)),
+                    "track_id": token,
+                    "group_id": token,
+                    "flags": {"instance_label": str(name), "track_id": token},
+                }
+            )
+        yield int(frame), shapes
+
+
+def governor_policy() -> Dict[str, Any]:
+    return {
+        "metric_aliases": {
+            "in_left": "zone.inside.left_chamber",
+            "in_right": "zone.inside.right_chamber",
+            "nearest": "distance.nearest",
+        },
+        "rules": [
+            {
+                "name": "mouse_0_in_left",
+                "assign_label": "mouse_0",
+                "conditions": [
+                    {"metric": "in_left", "op": "eq", "value": True},
+                    {"metric": "nearest", "op": "gte", "value": 100.0},
+                ],
+            },
+            {
+                "name": "mouse_1_in_right",
+                "assign_label": "mouse_1",
+                "conditions": [
+                    {"metric": "in_right", "op": "eq", "value": True},
+                    {"metric": "nearest", "op": "gte", "value": 100.0},
+                ],
+            },
+        ],
+        "ambiguity_conditions": [{"metric": "nearest", "op": "lte", "value": 20.0}],
+        "canonical_track_ids": {"mouse_0": "1", "mouse_1": "2"},
+    }
+
+
+class _Datasets:
+    """Lazily written benchmark inputs for one (rows, animals, seed) scale."""
+
+    def __init__(self, workdir: Path, rows: int, animals: int, seed: int) -> None:
+        self.rows = int(rows)
+        self.animals = int(animals)
+        self.seed = int(seed)
+        self.root = (
+            Path(workdir)
+            / f"v{_DATASET_VERSION}_rows{rows}_animals{animals}_seed{seed}"
+        )
+        self.root.mkdir(parents=True, exist_ok=True)
+        self._dataframe: Optional[pd.DataFrame] = None
+
+    @property
+    def dataframe(self) -> pd.DataFrame:
+        if self._dataframe is None:
+            self._dataframe = synthetic_tracking_dataframe(
+                self.rows, animals=self.animals, seed=self.seed
+            )
+        return self._dataframe
+
+    def zone_file(self) -> Path:
+        path = self.root / "zones.json"
+        if not path.exists():
+            path.write_text(json.dumps(zone_layout()), encoding="utf-8")
+        return path
+
+    def tracking_csv(self) -> Path:
+        path = self.root / "session_tracking.csv"
+        if not path.exists():
+            self.dataframe.to_csv(path, index=False)
+        return path
+
+    def tracked_csv(self) -> Path:
+        path = self.root / "session_tracked.csv"
+        if not path.exists():
+            tracked = self.dataframe.copy()
+            jitter = np.random.default_rng(self.seed + 1).normal(
+                0.0, 0.5, size=(len(tracked), 2)
+            )
+            tracked["cx"] += jitter[:, 0]
+            tracked["cy"] += jitter[:, 1]
+            tracked.to_csv(path, index=False)
+        return path
+
+    def annotation_store(self) -> Path:
+        folder = self.root / "store_session"
+        path = folder / f"store_session{_store_suffix()}"
+        if not path.exists():
+            folder.mkdir(parents=True, exist_ok=True)
+            temp_path = path.with_suffix(".tmp")
+            with temp_path.open("w", encoding="utf-8") as fh:
+                for frame, shapes in _iter_frame_shapes(self.dataframe, self.animals):
+                    record = {
+                        "frame": frame,
+                        "version": "5.0.1",
+                        "flags": {},
+                        "shapes": shapes,
+                        "imagePath": "",
+                        "imageHeight": int(ARENA_SIZE),
+                        "imageWidth": int(ARENA_SIZE),
+                    }
+                    fh.write(json.dumps(record, separators=(",", ":")) + "\n")
+            os.replace(temp_path, path)
+        return path
+
+    def labelme_dir(self) -> Path:
+        folder = self.root / "labelme_session"
+        done = folder / ".complete"
+        if not done.exists():
+            folder.mkdir(parents=True, exist_ok=True)
+            for frame, shapes in _iter_frame_shapes(self.dataframe, self.animals):
+                payload = {
+                    "version": "5.0.1",
+                    "shapes": shapes,
+                    "imagePath": "",
+                    "imageData": None,
+                }
+                (folder / f"labelme_session_{frame:09d}.json").write_text(
+                    json.dumps(payload, separators=(",", ":")), encoding="utf-8"
+                )
+            done.write_text("", encoding="utf-8")
+        return folder
+
+
+def _store_suffix() -> str:
+    from annolid.utils.annotation_store import AnnotationStore
+
+    return AnnotationStore.STORE_SUFFIX
+
+
+# A benchmark prepares its inputs and returns (timed callable, extra info).
+BenchmarkSetup = Callable[[_Datasets], Tuple[Callable[[], Any], Dict[str, Any]]]
+
+
+def _setup_zone_engine(data: _Datasets):
+    from annolid.postprocessing.zone_analysis_engine import GenericZoneEngine
+    from annolid.postprocessing.zone_schema import load_zone_shapes
+
+    engine = GenericZoneEngine(load_zone_shapes(zone_layout()), fps=30.0)
+    dataframe = data.dataframe
+    labels = sorted(dataframe["instance_name"].unique())
+
+    def run():
+        return [engine.analyze_instance(dataframe, label) for label in labels]
+
+    return run, {"instances": len(labels)}
+
+
+def _setup_tracking_results_analyzer(data: _Datasets):
+    from annolid.postprocessing.tracking_results_analyzer import (
+        TrackingResultsAnalyzer,
+    )
+
+    data.tracking_csv()
+    data.tracked_csv()
+    zone_file = data.zone_file()
+    video_path = data.root / "session.mp4"
+    output = data.root / "session_zone_metrics.csv"
+
+    def run():
+        analyzer = TrackingResultsAnalyzer(video_path, zone_file=zone_file, fps=30.0)
+        analyzer.merge_and_calculate_distance()
+        return analyzer.save_zone_metrics_to_csv(output)
+
+    return run, {"steps": "read_csv+merge+distances+zone_metrics"}
+
+
+def _setup_tracks_from_labelme_csv(data: _Datasets):
+    from annolid.core.io.tracking_csv import tracks_from_labelme_csv
+
+    path = data.tracking_csv()
+
+    def run():
+        return tracks_from_labelme_csv(path, video_name="session")
+
+    return run, {"csv_bytes": path.stat().st_size}
+
+
+def _setup_annotation_store(data: _Datasets):
+    from annolid.utils.annotation_store import AnnotationStore
+
+    path = data.annotation_store()
+    frames = max(1, data.rows // data.animals)
+    lookups = np.random.default_rng(data.seed).integers(
+        0, frames, size=min(_STORE_LOOKUPS, frames)
+    )
+    timings: Dict[str, float] = {}
+
+    def _timed(name: str, fn: Callable[[], Any]) -> None:
+        start = time.perf_counter()
+        fn()
+        timings[name] = time.perf_counter() - start
+
+    def run():
+        # Every phase starts from a cold in-process cache; the sidecar index
+        # persists on disk after the first run, as it does in the GUI.
+        AnnotationStore._CACHE.pop(path, None)
+        store = AnnotationStore(path)
+        _timed(
+            "get_frame_fast_seconds",
+            lambda: [store.get_frame_fast(int(f)) for f in lookups],
+        )
+        AnnotationStore._CACHE.pop(path, None)
+        _timed(
+            "get_frames_fast_seconds",
+            lambda: store.get_frames_fast(int(f) for f in lookups),
+        )
+        AnnotationStore._CACHE.pop(path, None)
+        _timed("iter_frame_numbers_fast_seconds", store.iter_frame_numbers_fast)
+        AnnotationStore._CACHE.pop(path, None)
+        _timed("full_load_get_frame_seconds", lambda: store.get_frame(0))
+        AnnotationStore._CACHE.pop(path, None)
+        return dict(timings)
+
+    return run, {"store_bytes": path.stat().st_size, "lookups": len(lookups)}
+
+
+def _setup_identity_governor(data: _Datasets):
+    from annolid.postprocessing.identity_governor import run_identity_governor
+
+    folder = data.labelme_dir()
+    zone_file = data.zone_file()
+    policy = governor_policy()
+    report = data.root / "identity_governor_report.json"
+
+    def run():
+        return run_identity_governor(
+            folder, policy, zone_file=zone_file, report_path=report
+        )
+
+    return run, {"files": max(1, data.rows // data.animals)}
+
+
+BENCHMARKS: Dict[str, BenchmarkSetup] = {
+    "zone_engine": _setup_zone_engine,
+    "tracking_results_analyzer": _setup_tracking_results_analyzer,
+    "tracks_from_labelme_csv": _setup_tracks_from_labelme_csv,
+    "annotation_store_reads": _setup_annotation_store,
+    "identity_governor": _setup_identity_governor,
+}
+
+
+def _git_commit() -> Optional[str]:
+    try:
+        out = subprocess.run(
+            ["git", "rev-parse", "HEAD"],
+            cwd=str(Path(__file__).resolve().parent),
+            capture_output=True,
+            text=True,
+            timeout=10,
+        )
+    except Exception:
+        return None
+    commit = out.stdout.strip()
+    return commit if out.returncode == 0 and commit else None
+
+
+def _environment() -> Dict[str, Any]:
+    return {
+        "git_commit": _git_commit(),
+        "python": sys.version.split()[0],
+        "numpy": np.__version__,
+        "pandas": pd.__version__,
+        "platform": platform.platform(),
+        "cpu_count": os.cpu_count(),
+    }
+
+
+def run_benchmark(
+    name: str,
+    data: _Datasets,
+    *,
+    repeats: int = 3,
+) -> BenchmarkResult:
+    repeats = max(1, int(repeats))
+    result = BenchmarkResult(
+        benchmark=name, rows=data.rows, animals=data.animals, repeats=repeats
+    )
+    limit = _ROW_LIMITS.get(name)
+    if limit is not None and data.rows > limit:
+        result.skipped = f"rows above the {limit} row limit for this benchmark"
+        return result
+    start = time.perf_counter()
+    fn, extra = BENCHMARKS[name](data)
+    result.setup_seconds = time.perf_counter() - start
+    result.extra = dict(extra)
+    durations: List[float] = []
+    for _ in range(repeats):
+        gc.collect()
+        start = time.perf_counter()
+        value = fn()
+        durations.append(time.perf_counter() - start)
+        if isinstance(value, Mapping):
+            # Sub-phase timings: keep the best seen per phase.
+            for key, seconds in value.items():
+                best = result.extra.get(key)
+                result.extra[key] = seconds if best is None else min(best, seconds)
+        del value
+    result.seconds_best = min(durations)
+    result.seconds_median = statistics.median(durations)
+    if result.seconds_best > 0:
+        result.rows_per_second = data.rows / result.seconds_best
+    return result
+
+
+def run_suite(
+    rows: Sequence[int | str] = DEFAULT_ROWS,
+    *,
+    benchmarks: Optional[Sequence[str]] = None,
+    animals: int = DEFAULT_ANIMALS,
+    repeats: int = 3,
+    seed: int = 0,
+    workdir: Optional[Path] = None,
+) -> Dict[str, Any]:
+    """Run the selected benchmarks at every scale and return a JSON report."""
+    names = list(benchmarks or BENCHMARKS)
+    unknown = sorted(set(names) - set(BENCHMARKS))
+    if unknown:
+        raise ValueError(
+            f"Unknown benchmark(s) {unknown}; choose from {sorted(BENCHMARKS)}"
+        )
+    scales = [parse_row_count(value) for value in rows]
+    temp_dir = None
+    if workdir is None:
+        temp_dir = tempfile.TemporaryDirectory(prefix="annolid_bench_")
+        workdir = Path(temp_dir.name)
+    results: List[BenchmarkResult] = []
+    try:
+        for scale in scales:
+            data = _Datasets(Path(workdir), scale, animals, seed)
+            for name in names:
+                logger.info("Benchmark %s at %d rows", name, scale)
+                results.append(run_benchmark(name, data, repeats=repeats))
+    finally:
+        if temp_dir is not None:
+            temp_dir.cleanup()
+    return {
+        "schema_version": REPORT_SCHEMA_VERSION,
+        "dataset_version": _DATASET_VERSION,
+        "created_at": datetime.now(timezone.utc).isoformat(),
+        "environment": _environment(),
+        "config": {
+            "rows": scales,
+            "animals": int(animals),
+            "repeats": int(repeats),
+            "seed": int(seed),
+        },
+        "results": [asdict(result) for result in results],
+    }
+
+
+def compare_reports(
+    baseline: Mapping[str, Any],
+    current: Mapping[str, Any],
+    *,
+    tolerance: float = 0.2,
+) -> List[Dict[str, Any]]:
+    """Per (benchmark, rows) best-time ratios of ``current`` over ``baseline``.
+
+    Entries slower than ``1 + tolerance`` are marked ``regression``.
+    """
+
+    def _index(report: Mapping[str, Any]) -> Dict[Tuple[str, int], Mapping[str, Any]]:
+        return {
+            (str(item["benchmark"]), int(item["rows"])): item
+            for item in report.get("results", [])
+            if item.get("seconds_best")
+        }
+
+    before = _index(baseline)
+    rows = []
+    for key, item in sorted(_index(current).items()):
+        previous = before.get(key)
+        if previous is None:
+            continue
+        ratio = float(item["seconds_best"]) / float(previous["seconds_best"])
+        rows.append(
+            {
+                "benchmark": key[0],
+                "rows": key[1],
+                "baseline_seconds": float(previous["seconds_best"]),
+                "current_seconds": float(item["seconds_best"]),
+                "ratio": ratio,
+                "regression": ratio > 1.0 + float(tolerance),
+            }
+        )
+    return rows
+
+
+__all__ = [
+    "BENCHMARKS",
+    "BenchmarkResult",
+    "compare_reports",
+    "parse_row_count",
+    "run_benchmark",
+    "run_suite",
+    "synthetic_tracking_dataframe",
+    "zone_layout",
+]
@@ -2,17 +2,29 @@ from __future__ import annotations
 
 import json
 import math
+import os
 import re
+from concurrent.futures import ProcessPoolExecutor
 from dataclasses import dataclass, field
 from pathlib import Path
 from typing import Any, Mapping, Sequence
 
+import numpy as np
+
 from annolid.postprocessing.zone_schema import (
     ZoneShapeSpec,
     load_zone_shapes,
-    zone_shape_covers_point,
-    zone_shape_distance_to_point,
+    zone_shapes_cover_points,
+    zone_shapes_distance_to_points,
 )
+from annolid.utils.annotation_store import AnnotationStore, AnnotationStoreError
+from annolid.utils.logger import logger
+
+OBSERVATION_SOURCES = ("auto", "json", "store")
+# Below this many inputs a process pool costs more than it saves.
+_PARALLEL_MIN_FILES = 512
+_SCAN_CHUNK_FILES = 256
+_STORE_CHUNK_BYTES = 16 * 1024 * 1024
 
 
 def _normalize_text(value: Any) -> str:
@@ -196,6 +208,103 @@ def _distance(
     return float(math.hypot(float(p1[0]) - float(p2[0]), float(p1[1]) - float(p2[1])))
 
 
+# A compact observation row: (shape_index, track_id, label, centroid, area).
+_ShapeRow = tuple[int, str, str, tuple[float, float] | None, float]
+
+
+def _shape_rows(shapes: Sequence[Any]) -> list[_ShapeRow]:
+    rows: list[_ShapeRow] = []
+    for shape_index, shape in enumerate(shapes):
+        if not isinstance(shape, Mapping):
+            continue
+        track_id = _shape_track_id(shape)
+        if not track_id:
+            continue
+        label = _shape_instance_label(shape)
+        if not label:
+            continue
+        centroid, area = _shape_centroid_and_area(shape)
+        rows.append((int(shape_index), track_id, label, centroid, float(area)))
+    return rows
+
+
+def _scan_frame_files(paths: Sequence[str]) -> list[tuple[str, list[_ShapeRow]]]:
+    """Extract shape rows from LabelMe files without keeping their payloads.
+
+    Files that cannot be parsed or carry no shape list (for example
+    annotation-store stubs) are left out of the result.
+    """
+    out: list[tuple[str, list[_ShapeRow]]] = []
+    for path in paths:
+        try:
+            with open(path, "rb") as fh:
+                payload = json.loads(fh.read())
+        except Exception:
+            continue
+        if not isinstance(payload, dict):
+            continue
+        shapes = payload.get("shapes")
+        if not isinstance(shapes, list):
+            continue
+        out.append((path, _shape_rows(shapes)))
+    return out
+
+
+def _scan_store_range(
+    store_path: str, start: int, end: int
+) -> tuple[list[tuple[int, int, dict[str, Any], list[_ShapeRow]]], int]:
+    """Extract shape rows from NDJSON records whose line starts in [start, end).
+
+    Returns ``(records, count)``. Each record carries its position among the
+    range's parsed lines, its byte offset and the metadata the store keys
+    frames on; ``count`` is the number of parsed lines in the range. The
+    caller resolves frames, since legacy rows without a ``"frame"`` key are
+    numbered by their position in the whole store.
+    """
+    out: list[tuple[int, int, dict[str, Any], list[_ShapeRow]]] = []
+    count = 0
+    with open(store_path, "rb") as fh:
+        if start > 0:
+            fh.seek(start - 1)
+            fh.readline()
+        while True:
+            offset = fh.tell()
+            if offset >= end:
+                break
+            raw_line = fh.readline()
+            if not raw_line:
+                break
+            if not raw_line.strip():
+                continue
+            try:
+                record = json.loads(raw_line)
+            except Exception:
+                continue
+            position = count
+            count += 1
+            if not isinstance(record, dict):
+                continue
+            shapes = record.get("shapes")
+            if not isinstance(shapes, list):
+                continue
+            key = {"frame": record.get("frame"), "imagePath": record.get("imagePath")}
+            out.append((position, int(offset), key, _shape_rows(shapes)))
+    return out, count
+
+
+def _run_chunks(func, chunks: Sequence[tuple], workers: int) -> list[list]:
+    """Return ``[func(*chunk) for chunk in chunks]``, across processes when useful."""
+    if workers > 1 and len(chunks) > 1:
+        try:
+            with ProcessPoolExecutor(max_workers=min(workers, len(chunks))) as pool:
+                return list(pool.map(func, *zip(*chunks)))
+        except (OSError, RuntimeError) as exc:
+            logger.warning(
+                "Parallel annotation scan unavailable (%s); reading serially.", exc
+            )
+    return [func(*chunk) for chunk in chunks]
+
+
 @dataclass(frozen=True)
 class MetricCondition:
     metric: str
@@ -357,8 +466,23 @@ class IdentityGovernor:
         policy: GovernorPolicy | Mapping[str, Any],
         *,
         zone_file: str | Path | None = None,
+        source: str = "auto",
+        workers: int | None = None,
     ) -> None:
         self.annotation_dir = Path(annotation_dir).expanduser().resolve()
+        if source not in OBSERVATION_SOURCES:
+            raise ValueError(
+                f"Unknown observation source {source!r}; "
+                f"expected one of {', '.join(OBSERVATION_SOURCES)}."
+            )
+        self.source = source
+        if workers is None:
+            workers = os.cpu_count() or 1
+        self.workers = max(1, int(workers))
+        self.store_path = (
+            self.annotation_dir
+            / f"{self.annotation_dir.name}{AnnotationStore.STORE_SUFFIX}"
+        )
         self.policy = (
             policy
             if isinstance(policy, GovernorPolicy)
@@ -391,58 +515,112 @@ class IdentityGovernor:
             files.append(path)
         return files
 
+    def _scan_json_rows(self) -> list[tuple[str, list[_ShapeRow]]]:
+        paths = [str(path) for path in self._iter_frame_files()]
+        chunks = [
+            (paths[idx : idx + _SCAN_CHUNK_FILES],)
+            for idx in range(0, len(paths), _SCAN_CHUNK_FILES)
+        ]
+        workers = self.workers if len(paths) >= _PARALLEL_MIN_FILES else 1
+        parts = _run_chunks(_scan_frame_files, chunks, workers)
+        return [item for part in parts for item in part]
+
+    def _scan_store_rows(self) -> dict[int, list[_ShapeRow]]:
+        if not self.store_path.is_file():
+            return {}
+        size = self.store_path.stat().st_size
+        chunks = [
+            (str(self.store_path), start, min(start + _STORE_CHUNK_BYTES, size))
+            for start in range(0, size, _STORE_CHUNK_BYTES)
+        ]
+        store = AnnotationStore(self.store_path)
+        latest: dict[int, tuple[int, list[_ShapeRow]]] = {}
+        record_base = 0
+        for part, count in _run_chunks(_scan_store_range, chunks, self.workers):
+            for position, offset, key, rows in part:
+                # Same resolution as the store: explicit frame, then the
+                # image path, then the row position for legacy stores.
+                frame = store._frame_key_for_record(key, record_base + position)
+                if frame is None:
+                    continue
+                current = latest.get(frame)
+                if current is None or offset > current[0]:
+                    latest[frame] = (offset, rows)
+            record_base += count
+        return {frame: rows for frame, (_offset, rows) in latest.items()}
+
     def _load_observations(
         self,
-    ) -> tuple[dict[int, list[_Observation]], dict[Path, dict[str, Any]], int]:
+    ) -> tuple[dict[int, list[_Observation]], int, int]:
+        """Pass one: compact observations per frame, without file payloads.
+
+        Returns ``(by_frame, scanned_files, scanned_observations)``, where
+        ``scanned_files`` counts JSON files plus store records read. With the
+        ``auto`` source a frame's LabelMe JSON takes precedence over its store
+        record.
+        """
+        sources: list[tuple[Path, int, list[_ShapeRow]]] = []
+        if self.source in {"auto", "json"}:
+            for path_text, rows in self._scan_json_rows():
+                path = Path(path_text)
+                frame_number = _frame_number_from_name(path)
+                if frame_number is not None:
+                    sources.append((path, frame_number, rows))
+        if self.source in {"auto", "store"}:
+            covered = {frame for _path, frame, _rows in sources}
+            for frame_number, rows in sorted(self._scan_store_rows().items()):
+                if frame_number not in covered:
+                    sources.append((self.store_path, frame_number, rows))
+
         by_frame: dict[int, list[_Observation]] = {}
-        payloads: dict[Path, dict[str, Any]] = {}
         count = 0
-        for json_path in self._iter_frame_files():
-            frame_number = _frame_number_from_name(json_path)
-            if frame_number is None:
-                continue
-            try:
-                payload = json.loads(json_path.read_text(encoding="utf-8"))
-            except Exception:
-                continue
-            if not isinstance(payload, dict):
-                continue
-            shapes = payload.get("shapes") or []
-            if not isinstance(shapes, list):
-                continue
-            payloads[json_path] = payload
-            frame_rows: list[_Observation] = []
-            for shape_index, shape in enumerate(shapes):
-                if not isinstance(shape, Mapping):
-                    continue
-                track_id = _shape_track_id(shape)
-                if not track_id:
-                    continue
-                label = _shape_instance_label(shape)
-                if not label:
-                    continue
-                centroid, area = _shape_centroid_and_area(shape)
-                frame_rows.append(
-                    _Observation(
-                        frame_number=int(frame_number),
-                        json_path=json_path,
-                        shape_index=int(shape_index),
-                        track_id=track_id,
-                        observed_label=label,
-                        centroid=centroid,
-                        area=float(area),
-                    )
+        for json_path, frame_number, rows in sources:
+            frame_rows = [
+                _Observation(
+                    frame_number=int(frame_number),
+                    json_path=json_path,
+                    shape_index=shape_index,
+                    track_id=track_id,
+                    observed_label=label,
+                    centroid=centroid,
+                    area=area,
                 )
-                count += 1
+                for shape_index, track_id, label, centroid, area in rows
+            ]
+            count += len(frame_rows)
             if frame_rows:
                 by_frame[int(frame_number)] = frame_rows
-        return by_frame, payloads, count
+        return by_frame, len(sources), count
+
+    def _zone_hits(self, rows: Sequence[_Observation]) -> tuple[np.ndarray, np.ndarray]:
+        """Containment and distance of every row centroid to every zone.
+
+        Returns ``(inside, distance)`` arrays of shape ``(rows, zones)``;
+        distances are NaN where a row has no centroid or a zone has no area.
+        Each zone is tested against all centroids in one shapely call.
+        """
+        inside = np.zeros((len(rows), len(self.zone_specs)), dtype=bool)
+        distance = np.full(inside.shape, np.nan, dtype=np.float64)
+        located = np.array(
+            [idx for idx, row in enumerate(rows) if row.centroid is not None],
+            dtype=np.int64,
+        )
+        if not len(located) or not self.zone_specs:
+            return inside, distance
+        coords = np.array([rows[idx].centroid for idx in located], dtype=np.float64)
+        inside[located] = zone_shapes_cover_points(self.zone_specs, coords)
+        distance[located] = zone_shapes_distance_to_points(self.zone_specs, coords)
+        return inside, distance
 
     def _populate_features(self, by_frame: dict[int, list[_Observation]]) -> None:
         zone_kind_tokens = sorted({_zone_kind_token(zone) for zone in self.zone_specs})
         zone_role_tokens = sorted({_zone_role_token(zone) for zone in self.zone_specs})
+        all_rows = [row for frame_rows in by_frame.values() for row in frame_rows]
+        zone_inside, zone_distance = self._zone_hits(all_rows)
+        row_index = -1
         for frame_rows in by_frame.values():
             for row in frame_rows:
+                row_index += 1
                 row.features["area"] = float(row.area)
                 row.features["frame_number"] = int(row.frame_number)
                 row.features["track_id"] = row.track_id
@@ -458,13 +636,11 @@ class IdentityGovernor:
                 distance_neutral_transit: float | None = None
                 inside_stim_chamber = False
                 distance_stim_chamber: float | None = None
-                for zone in self.zone_specs:
+                for zone_index, zone in enumerate(self.zone_specs):
                     name = zone.display_label
-                    inside = False
-                    distance = None
-                    if row.centroid is not None:
-                        inside = bool(zone_shape_covers_point(zone, row.centroid))
-                        distance = zone_shape_distance_to_point(zone, row.centroid)
+                    inside = bool(zone_inside[row_index, zone_index])
+                    distance = zone_distance[row_index, zone_index]
+                    distance = None if np.isnan(distance) else float(distance)
                     row.features[f"zone.inside.{name}"] = inside
                     if distance is not None:
                         row.features[f"zone.distance.{name}"] = float(distance)
@@ -809,6 +985,105 @@ class IdentityGovernor:
                         changed = True
         return changed
 
+    def _pending_shape_updates(
+        self,
+        by_track: Mapping[str, list[_Observation]],
+        corrections: Sequence[IdentityCorrection],
+    ) -> dict[Path, dict[int, list[tuple[_Observation, str]]]]:
+        """Group corrected shapes by source file and frame for pass two."""
+        corrections_by_track: dict[str, list[IdentityCorrection]] = {}
+        for correction in corrections:
+            corrections_by_track.setdefault(correction.track_id, []).append(correction)
+        pending: dict[Path, dict[int, list[tuple[_Observation, str]]]] = {}
+        for track_id, rows in by_track.items():
+            candidate_corrections = corrections_by_track.get(track_id, [])
+            if not candidate_corrections:
+                continue
+            for row in rows:
+                for correction in candidate_corrections:
+                    if not (
+                        correction.frame_start
+                        <= row.frame_number
+                        <= correction.frame_end
+                    ):
+                        continue
+                    if row.observed_label == correction.corrected_label:
+                        continue
+                    pending.setdefault(row.json_path, {}).setdefault(
+                        row.frame_number, []
+                    ).append((row, correction.corrected_label))
+        return pending
+
+    def _apply_to_shapes(
+        self, shapes: Any, updates: Sequence[tuple[_Observation, str]]
+    ) -> int:
+        if not isinstance(shapes, list):
+            return 0
+        changed = 0
+        for row, corrected_label in updates:
+            if row.shape_index < 0 or row.shape_index >= len(shapes):
+                continue
+            shape = shapes[row.shape_index]
+            if not isinstance(shape, dict):
+                continue
+            # The source was re-read after pass one; skip shapes that moved.
+            if _shape_track_id(shape) != row.track_id:
+                continue
+            if self._apply_shape_identity(shape, corrected_label):
+                changed += 1
+        return changed
+
+    def _write_corrections(
+        self,
+        pending: Mapping[Path, Mapping[int, Sequence[tuple[_Observation, str]]]],
+    ) -> tuple[int, int]:
+        """Pass two: re-open and rewrite only the sources that receive corrections.
+
+        Returns ``(updated_files, updated_shapes)``; each changed store record
+        counts as one updated file.
+        """
+        updated_files = 0
+        updated_shapes = 0
+        for path in sorted(pending):
+            frames = pending[path]
+            if path == self.store_path:
+                store = AnnotationStore(path)
+                records = store.get_frames_fast(frames)
+                changed_records: dict[int, dict[str, Any]] = {}
+                for frame, updates in frames.items():
+                    record = records.get(frame)
+                    if not isinstance(record, dict):
+                        continue
+                    # Store lookups may hand out cached records; edit a copy.
+                    record = json.loads(json.dumps(record))
+                    changed = self._apply_to_shapes(record.get("shapes"), updates)
+                    if changed:
+                        changed_records[frame] = record
+                        updated_shapes += changed
+                if changed_records:
+                    try:
+                        store.update_frames(changed_records)
+                    except AnnotationStoreError as exc:
+                        logger.error("Failed to update %s: %s", path, exc)
+                        continue
+                    updated_files += len(changed_records)
+                continue
+            try:
+                payload = json.loads(path.read_text(encoding="utf-8"))
+            except Exception:
+                continue
+            if not isinstance(payload, dict):
+                continue
+            changed = sum(
+                self._apply_to_shapes(payload.get("shapes"), updates)
+                for updates in frames.values()
+            )
+            if changed:
+                _write_json_atomic(path, payload)
+                updated_files += 1
+                updated_shapes += changed
+        return updated_files, updated_shapes
+
     def _serialize_report(
         self,
         *,
@@ -850,7 +1125,7 @@ class IdentityGovernor:
         apply_changes: bool = False,
         report_path: str | Path | None = None,
     ) -> IdentityGovernorResult:
-        by_frame, payloads, scanned_observations = self._load_observations()
+        by_frame, scanned_files, scanned_observations = self._load_observations()
         self._populate_features(by_frame)
         self._assign_evidence(by_frame)
 
@@ -859,52 +1134,11 @@ class IdentityGovernor:
         for rows in by_track.values():
             corrections.extend(self._build_track_corrections(rows))
 
-        updated_files: set[Path] = set()
+        updated_files = 0
         updated_shapes = 0
         if corrections and apply_changes:
-            corrections_by_track: dict[str, list[IdentityCorrection]] = {}
-            for correction in corrections:
-                corrections_by_track.setdefault(correction.track_id, []).append(
-                    correction
-                )
-            for rows in by_track.values():
-                if not rows:
-                    continue
-                track_id = rows[0].track_id
-                candidate_corrections = corrections_by_track.get(track_id, [])
-                if not candidate_corrections:
-                    continue
-                for row in rows:
-                    for correction in candidate_corrections:
-                        if not (
-                            correction.frame_start
-                            <= row.frame_number
-                            <= correction.frame_end
-                        ):
-                            continue
-                        if row.observed_label == correction.corrected_label:
-                            continue
-                        payload = payloads.get(row.json_path)
-                        if payload is None:
-                            continue
-                        shapes = payload.get("shapes")
-                        if not isinstance(shapes, list):
-                            continue
-                        if row.shape_index < 0 or row.shape_index >= len(shapes):
-                            continue
-                        shape = shapes[row.shape_index]
-                        if not isinstance(shape, dict):
-                            continue
-                        if self._apply_shape_identity(
-                            shape, correction.corrected_label
-                        ):
-                            updated_shapes += 1
-                            updated_files.add(row.json_path)
-
-            for path in sorted(updated_files):
-                payload = payloads.get(path)
-                if isinstance(payload, Mapping):
-                    _write_json_atomic(path, payload)
+            pending = self._pending_shape_updates(by_track, corrections)
+            updated_files, updated_shapes = self._write_corrections(pending)
 
         if report_path is None:
             report_path = self.annotation_dir / "identity_governor_report.json"
@@ -913,18 +1147,18 @@ class IdentityGovernor:
             report_path=resolved_report,
             corrections=corrections,
             dry_run=not apply_changes,
-            scanned_files=len(payloads),
+            scanned_files=scanned_files,
             scanned_observations=scanned_observations,
-            updated_files=len(updated_files),
+            updated_files=updated_files,
             updated_shapes=updated_shapes,
         )
         return IdentityGovernorResult(
             annotation_dir=self.annotation_dir,
             dry_run=not apply_changes,
-            scanned_files=len(payloads),
+            scanned_files=int(scanned_files),
             scanned_observations=int(scanned_observations),
             proposed_corrections=tuple(corrections),
-            updated_files=len(updated_files),
+            updated_files=int(updated_files),
             updated_shapes=int(updated_shapes),
             report_path=resolved_report,
         )
@@ -937,10 +1171,14 @@ def run_identity_governor(
     zone_file: str | Path | None = None,
     apply_changes: bool = False,
     report_path: str | Path | None = None,
+    source: str = "auto",
+    workers: int | None = None,
 ) -> IdentityGovernorResult:
     governor = IdentityGovernor(
         annotation_dir=annotation_dir,
         policy=policy,
         zone_file=zone_file,
+        source=source,
+        workers=workers,
     )
     return governor.run(apply_changes=apply_changes, report_path=report_path)
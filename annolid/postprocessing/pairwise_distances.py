@@ -0,0 +1,159 @@
+from __future__ import annotations
+
+from dataclasses import dataclass
+from typing import Sequence
+
+import numpy as np
+import pandas as pd
+
+
+@dataclass(frozen=True)
+class InstancePositions:
+    """Tracking rows pivoted to a dense (frame x instance x value) array.
+
+    ``values[f, i]`` holds the requested columns for ``instances[i]`` in
+    ``frames[f]``; ``present[f, i]`` is False (and values are NaN) when the
+    instance has no row in that frame.
+    """
+
+    frames: np.ndarray
+    instances: list[str]
+    values: np.ndarray
+    present: np.ndarray
+
+
+@dataclass(frozen=True)
+class PairwiseDistances:
+    """Per-frame distances for every unordered instance pair.
+
+    ``distances[f, p]`` is the distance between ``pairs[p]`` in ``frames[f]``
+    and is NaN when either instance is missing from that frame.
+    """
+
+    frames: np.ndarray
+    instances: list[str]
+    pairs: np.ndarray
+    distances: np.ndarray
+    pair_present: np.ndarray
+
+    def pair_labels(self) -> list[tuple[str, str]]:
+        return [(self.instances[i], self.instances[j]) for i, j in self.pairs]
+
+    def to_long_dataframe(self) -> pd.DataFrame:
+        """Return one row per (frame, pair) where both instances are present."""
+        frame_rows, pair_cols = np.nonzero(self.pair_present)
+        names = np.asarray(self.instances, dtype=object)
+        return pd.DataFrame(
+            {
+                "frame_number": self.frames[frame_rows],
+                "instance_name_1": names[self.pairs[pair_cols, 0]],
+                "instance_name_2": names[self.pairs[pair_cols, 1]],
+                "distance": self.distances[frame_rows, pair_cols],
+            }
+        )
+
+    def to_wide_dataframe(self) -> pd.DataFrame:
+        """Return one row per frame and one ``distance__<a>__<b>`` column per pair."""
+        columns = [f"distance__{left}__{right}" for left, right in self.pair_labels()]
+        return pd.DataFrame(
+            self.distances,
+            index=pd.Index(self.frames, name="frame_number"),
+            columns=columns,
+        )
+
+
+def pivot_instance_positions(
+    dataframe: pd.DataFrame,
+    value_columns: Sequence[str],
+    *,
+    frame_column: str = "frame_number",
+    instance_column: str = "instance_name",
+) -> InstancePositions:
+    """Pivot long tracking rows into a dense (frame x instance x value) array.
+
+    Frames are sorted ascending and instances keep their order of first
+    appearance. When an instance has several rows in one frame the last row
+    wins, matching how the zone engine de-duplicates observations.
+    """
+    value_columns = list(value_columns)
+    subset = dataframe[[frame_column, instance_column, *value_columns]]
+    subset = subset[subset[instance_column].notna()]
+    frame_codes, frames = pd.factorize(subset[frame_column], sort=True)
+    instance_codes, instances = pd.factorize(
+        subset[instance_column].astype(str), sort=False
+    )
+    values = np.full(
+        (len(frames), len(instances), len(value_columns)), np.nan, dtype=np.float64
+    )
+    present = np.zeros((len(frames), len(instances)), dtype=bool)
+    if len(subset):
+        flat_index = frame_codes * len(instances) + instance_codes
+        keep = ~pd.Series(flat_index).duplicated(keep="last").to_numpy()
+        frame_codes = frame_codes[keep]
+        instance_codes = instance_codes[keep]
+        values[frame_codes, instance_codes] = (
+            subset[value_columns]
+            .apply(pd.to_numeric, errors="coerce")
+            .to_numpy(dtype=np.float64)[keep]
+        )
+        present[frame_codes, instance_codes] = True
+    return InstancePositions(
+        frames=np.asarray(frames),
+        instances=[str(name) for name in instances],
+        values=values,
+        present=present,
+    )
+
+
+def pairwise_instance_distances(
+    positions: InstancePositions,
+    *,
+    source: slice = slice(0, 2),
+    target: slice | None = None,
+    chunk_frames: int = 65536,
+) -> PairwiseDistances:
+    """Compute distances for all instance pairs in every frame by broadcasting.
+
+    ``source`` and ``target`` select the (x, y) value columns used for the
+    first and second instance of each pair; they default to the same columns.
+    Work is chunked over frames so temporaries stay bounded for long
+    recordings with many animals.
+    """
+    target = source if target is None else target
+    instance_count = len(positions.instances)
+    first, second = np.triu_indices(instance_count, k=1)
+    pairs = np.stack([first, second], axis=1)
+    frame_count = len(positions.frames)
+    distances = np.empty((frame_count, len(pairs)), dtype=np.float64)
+    source_x, source_y = (
+        np.ascontiguousarray(column)
+        for column in np.moveaxis(positions.values[:, :, source], -1, 0)
+    )
+    target_x, target_y = (
+        np.ascontiguousarray(column)
+        for column in np.moveaxis(positions.values[:, :, target], -1, 0)
+    )
+    step = max(1, int(chunk_frames))
+    for start in range(0, frame_count, step):
+        rows = slice(start, min(frame_count, start + step))
+        # Pairs are in row-major upper-triangle order, so every pair whose
+        # first instance is ``i`` occupies one contiguous block of columns and
+        # can be computed with a broadcast against a contiguous slice.
+        column = 0
+        for i in range(instance_count - 1):
+            block = slice(column, column + instance_count - 1 - i)
+            np.hypot(
+                target_x[rows, i + 1 :] - source_x[rows, i, None],
+                target_y[rows, i + 1 :] - source_y[rows, i, None],
+                out=distances[rows, block],
+            )
+            column = block.stop
+    pair_present = positions.present[:, first] & positions.present[:, second]
+    np.putmask(distances, ~pair_present, np.nan)
+    return PairwiseDistances(
+        frames=positions.frames,
+        instances=positions.instances,
+        pairs=pairs,
+        distances=distances,
+        pair_present=pair_present,
+    )
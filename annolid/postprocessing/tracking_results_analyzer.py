@@ -1,12 +1,15 @@
 import pandas as pd
 import json
-import itertools
 from pathlib import Path
 from datetime import datetime
 import matplotlib.pyplot as plt
 from annolid.data.videos import CV2Video
 from annolid.utils.logger import logger
 from annolid.postprocessing.zone_analysis_engine import GenericZoneEngine
+from annolid.postprocessing.pairwise_distances import (
+    pairwise_instance_distances,
+    pivot_instance_positions,
+)
 from annolid.postprocessing.social_zone_metrics import (
     build_anchor_dataframe,
     compute_pairwise_centroid_summary,
@@ -42,6 +45,8 @@ class TrackingResultsAnalyzer:
         tracked_df (DataFrame): DataFrame containing tracked data.
         merged_df (DataFrame): DataFrame containing merged tracking and tracked data.
         distances_df (DataFrame): DataFrame containing distances between instances.
+        distances_wide_df (DataFrame): Optional per-frame table with one column
+            per instance pair.
         zone_data (dict): Dictionary containing zone information loaded from the zone JSON file.
     """
 
@@ -100,9 +105,14 @@ class TrackingResultsAnalyzer:
         self.tracked_df = result.dataframe
         self.zone_policy_audit_df = result.audit
 
-    def merge_and_calculate_distance(self):
+    def merge_and_calculate_distance(self, wide=False):
         """Merge tracking and tracked dataframes based on
-        frame number and instance name, and calculate distances."""
+        frame number and instance name, and calculate distances.
+
+        Args:
+            wide (bool): Also build ``distances_wide_df`` with one row per
+                frame and one ``distance__<a>__<b>`` column per instance pair.
+        """
         self.read_csv_files()
 
         # Merge DataFrames based on frame number and instance name
@@ -113,34 +123,18 @@ class TrackingResultsAnalyzer:
             suffixes=("_tracking", "_tracked"),
         )
 
-        # Calculate distance between different instances in the same frame
-        distances = []
-        for frame_number, frame_group in self.merged_df.groupby("frame_number"):
-            instances_in_frame = frame_group["instance_name"].unique()
-            instance_combinations = itertools.combinations(instances_in_frame, 2)
-            for instance_combination in instance_combinations:
-                instance1 = instance_combination[0]
-                instance2 = instance_combination[1]
-                instance1_data = frame_group[frame_group["instance_name"] == instance1]
-                instance2_data = frame_group[frame_group["instance_name"] == instance2]
-                for _, row1 in instance1_data.iterrows():
-                    for _, row2 in instance2_data.iterrows():
-                        distance = self.calculate_distance(
-                            row1["cx_tracking"],
-                            row1["cy_tracking"],
-                            row2["cx_tracked"],
-                            row2["cy_tracked"],
-                        )
-                        distances.append(
-                            {
-                                "frame_number": frame_number,
-                                "instance_name_1": instance1,
-                                "instance_name_2": instance2,
-                                "distance": distance,
-                            }
-                        )
-
-        self.distances_df = pd.DataFrame(distances)
+        # Pivot to (frame x instance x xy) and broadcast over all instance
+        # pairs: the tracking centroid of the first instance against the
+        # tracked centroid of the second, as before.
+        positions = pivot_instance_positions(
+            self.merged_df,
+            ["cx_tracking", "cy_tracking", "cx_tracked", "cy_tracked"],
+        )
+        pairwise = pairwise_instance_distances(
+            positions, source=slice(0, 2), target=slice(2, 4)
+        )
+        self.distances_df = pairwise.to_long_dataframe()
+        self.distances_wide_df = pairwise.to_wide_dataframe() if wide else None
 
     def calculate_distance(self, x1, y1, x2, y2):
         """
@@ -1,9 +1,10 @@
 from __future__ import annotations
 
-from collections import Counter, defaultdict
+from collections import Counter
 from dataclasses import dataclass, field
 from typing import Any, Iterable, Sequence
 
+import numpy as np
 import pandas as pd
 from shapely.geometry import Polygon
 
@@ -11,6 +12,7 @@ from annolid.postprocessing.zone_schema import (
     ZoneShapeSpec,
     zone_shape_bounds,
     zone_shape_covers_point,
+    zone_shapes_cover_points,
 )
 
 
@@ -100,6 +102,32 @@ def _frame_column(dataframe: pd.DataFrame) -> str | None:
     return None
 
 
+def _float_array(series: pd.Series) -> np.ndarray:
+    if pd.api.types.is_numeric_dtype(series) and not pd.api.types.is_bool_dtype(series):
+        return series.to_numpy(dtype=np.float64, na_value=np.nan)
+    return np.fromiter(
+        (_safe_float(value) for value in series), dtype=np.float64, count=len(series)
+    )
+
+
+def _int_array(values: pd.Series | pd.Index) -> np.ndarray:
+    if pd.api.types.is_integer_dtype(values):
+        return np.asarray(values, dtype=np.int64)
+    if pd.api.types.is_float_dtype(values):
+        floats = np.asarray(values, dtype=np.float64)
+        return np.where(np.isfinite(floats), floats, 0.0).astype(np.int64)
+    return np.fromiter(
+        (_safe_int(value) for value in values), dtype=np.int64, count=len(values)
+    )
+
+
+def _truthy_array(series: pd.Series) -> np.ndarray:
+    if pd.api.types.is_bool_dtype(series):
+        return series.fillna(False).to_numpy(dtype=bool)
+    truthy = {value: _is_truthy(value) for value in series.dropna().unique()}
+    return series.map(truthy).fillna(False).to_numpy(dtype=bool)
+
+
 def _shape_point_columns(dataframe: pd.DataFrame) -> tuple[str, str]:
     candidates = [
         ("cx_tracked", "cy_tracked"),
@@ -248,6 +276,17 @@ class GenericZoneEngine:
             enumerate(self.zone_specs),
             key=lambda item: (_zone_area(item[1]), item[0]),
         )
+        # Unique display labels in resolution priority (smallest zone first),
+        # so the primary zone of a frame is its lowest present label index.
+        self._zone_labels: list[str] = []
+        self._zone_label_index: dict[str, int] = {}
+        self._ordered_zone_label_indices: list[int] = []
+        for _, spec in self._ordered_zone_specs:
+            label = spec.display_label
+            if label not in self._zone_label_index:
+                self._zone_label_index[label] = len(self._zone_labels)
+                self._zone_labels.append(label)
+            self._ordered_zone_label_indices.append(self._zone_label_index[label])
         self._barrier_zone_labels = {
             spec.display_label
             for spec in self.zone_specs
@@ -283,6 +322,27 @@ class GenericZoneEngine:
         _, _, spec = min(matches, key=lambda item: (item[0], item[1]))
         return spec.display_label
 
+    def _resolve_zone_label_indices(self, xs: np.ndarray, ys: np.ndarray) -> np.ndarray:
+        """Vectorized :meth:`_resolve_zone_label` returning label indices.
+
+        Every zone polygon is tested against all points in one shapely call.
+        Zones are applied from lowest to highest priority so the smallest
+        covering zone wins, matching the scalar resolver. ``-1`` marks points
+        outside every zone.
+        """
+        labels = np.full(len(xs), -1, dtype=np.int64)
+        if not len(labels):
+            return labels
+        covered = zone_shapes_cover_points(
+            [spec for _, spec in self._ordered_zone_specs],
+            np.column_stack(
+                [np.asarray(xs, dtype=np.float64), np.asarray(ys, dtype=np.float64)]
+            ),
+        )
+        for column in reversed(range(covered.shape[1])):
+            labels[covered[:, column]] = self._ordered_zone_label_indices[column]
+        return labels
+
     def _zone_columns_for_dataframe(self, dataframe: pd.DataFrame) -> dict[str, str]:
         columns = {str(column) for column in dataframe.columns}
         mapping: dict[str, str] = {}
@@ -321,140 +381,162 @@ class GenericZoneEngine:
             instance_df = instance_df.sort_index()
         return instance_df
 
-    def _iter_observations(
+    def _observation_arrays(
         self, dataframe: pd.DataFrame, instance_label: str
-    ) -> Iterable[tuple[int, set[str]]]:
+    ) -> tuple[np.ndarray, np.ndarray]:
+        """Return per-observation frames and a (frames x zone labels) mask.
+
+        Mask columns follow ``self._zone_labels``. With precomputed zone
+        columns a frame may be in several zones; otherwise each centroid is
+        resolved to at most one zone.
+        """
         instance_df = self._prepare_instance_dataframe(dataframe, instance_label)
+        membership = np.zeros((len(instance_df), len(self._zone_labels)), dtype=bool)
         if instance_df.empty:
-            return []
+            return np.zeros(0, dtype=np.int64), membership
         frame_col = _frame_column(instance_df)
+        frames = (
+            _int_array(instance_df[frame_col])
+            if frame_col
+            else _int_array(instance_df.index)
+        )
         zone_columns = self._zone_columns_for_dataframe(instance_df)
-        use_zone_columns = bool(zone_columns)
-        if not use_zone_columns:
-            if self.point_columns is not None:
-                x_col, y_col = self.point_columns
-                if x_col not in instance_df.columns or y_col not in instance_df.columns:
-                    x_col, y_col = _shape_point_columns(instance_df)
-            else:
+        if zone_columns:
+            for label, column in zone_columns.items():
+                membership[:, self._zone_label_index[label]] = _truthy_array(
+                    instance_df[column]
+                )
+            return frames, membership
+
+        if self.point_columns is not None:
+            x_col, y_col = self.point_columns
+            if x_col not in instance_df.columns or y_col not in instance_df.columns:
                 x_col, y_col = _shape_point_columns(instance_df)
         else:
-            x_col = y_col = ""
-        observations: list[tuple[int, set[str]]] = []
-        for index, row in instance_df.iterrows():
-            frame = _safe_int(row[frame_col]) if frame_col else _safe_int(index)
-            if use_zone_columns:
-                zone_labels = {
-                    label
-                    for label, column in zone_columns.items()
-                    if column in row.index and _is_truthy(row[column])
-                }
-            else:
-                zone_label = self._resolve_zone_label(row[x_col], row[y_col])
-                zone_labels = {zone_label} if zone_label is not None else set()
-            observations.append((frame, zone_labels))
-        return observations
+            x_col, y_col = _shape_point_columns(instance_df)
+        label_indices = self._resolve_zone_label_indices(
+            _float_array(instance_df[x_col]), _float_array(instance_df[y_col])
+        )
+        inside = np.flatnonzero(label_indices >= 0)
+        membership[inside, label_indices[inside]] = True
+        return frames, membership
+
+    def _label_mask(self, labels: Iterable[str]) -> np.ndarray:
+        mask = np.zeros(len(self._zone_labels), dtype=bool)
+        for label in labels:
+            index = self._zone_label_index.get(label)
+            if index is not None:
+                mask[index] = True
+        return mask
 
     def analyze_instance(
         self, dataframe: pd.DataFrame, instance_label: str
     ) -> ZoneAnalysisResult:
-        observations = list(self._iter_observations(dataframe, instance_label))
-        occupancy_frames: Counter[str] = Counter()
+        frames, membership = self._observation_arrays(dataframe, instance_label)
+        frame_count = int(len(frames))
+        zone_labels = self._zone_labels
+
+        occupancy = membership.sum(axis=0)
+        occupancy_frames = {
+            zone_labels[index]: int(occupancy[index])
+            for index in np.flatnonzero(occupancy)
+        }
+        in_any_zone = membership.any(axis=1)
+        outside_frames = int(frame_count - np.count_nonzero(in_any_zone))
+        barrier_adjacent_frames = int(
+            occupancy[self._label_mask(self._barrier_zone_labels)].sum()
+        )
+        aggregate_occupancy_frames: dict[str, int] = {}
+        for key, labels in self._aggregate_zone_groups.items():
+            total = int(occupancy[self._label_mask(labels)].sum())
+            if total:
+                aggregate_occupancy_frames[key] = total
+
+        # Run-length encode visits: a visit starts where a zone becomes present
+        # (or a frame gap interrupts it) and ends where the next observation
+        # leaves the zone or follows a gap.
+        gap_break = np.zeros(frame_count, dtype=bool)
+        if frame_count > 1:
+            gap_break[1:] = np.diff(frames) > 1
+        previous = np.zeros_like(membership)
+        previous[1:] = membership[:-1]
+        following = np.zeros_like(membership)
+        following[:-1] = membership[1:]
+        following_gap = np.zeros(frame_count, dtype=bool)
+        following_gap[:-1] = gap_break[1:]
+        starts = membership & (~previous | gap_break[:, None])
+        ends = membership & (~following | following_gap[:, None])
+
+        visits: list[tuple[int, int, str]] = []
+        for index, zone_label in enumerate(zone_labels):
+            start_rows = np.flatnonzero(starts[:, index])
+            end_rows = np.flatnonzero(ends[:, index])
+            visits.extend(
+                (int(end_row), int(start_row), zone_label)
+                for start_row, end_row in zip(start_rows, end_rows)
+            )
+        # Emit visits in the order they close, as the per-frame tracker did.
+        visits.sort()
+        segments: list[ZoneVisit] = []
         dwell_frames: Counter[str] = Counter()
         entry_counts: Counter[str] = Counter()
-        first_entry_frames: dict[str, int] = {}
-        transition_counts: dict[str, Counter[str]] = defaultdict(Counter)
-        segments: list[ZoneVisit] = []
-        barrier_adjacent_frames = 0
-        outside_frames = 0
-        aggregate_occupancy_frames: Counter[str] = Counter()
-        aggregate_entry_counts: Counter[str] = Counter()
-
-        active_zone_segments: dict[str, tuple[int, int, int]] = {}
-        current_zone: str | None = None
-        prev_frame: int | None = None
-
-        def finalize_zone_segment(zone_label: str) -> None:
-            segment = active_zone_segments.pop(zone_label, None)
-            if segment is None:
-                return
-            start_frame, end_frame, frame_count = segment
+        for end_row, start_row, zone_label in visits:
+            visit_frames = end_row - start_row + 1
             segments.append(
                 ZoneVisit(
                     zone_label=zone_label,
-                    start_frame=start_frame,
-                    end_frame=end_frame,
-                    frame_count=frame_count,
+                    start_frame=int(frames[start_row]),
+                    end_frame=int(frames[end_row]),
+                    frame_count=visit_frames,
                 )
             )
-            dwell_frames[zone_label] += frame_count
-
-        def finalize_all_segments() -> None:
-            for zone_label in list(active_zone_segments.keys()):
-                finalize_zone_segment(zone_label)
-
-        for frame, zone_labels in observations:
-            if not zone_labels:
-                outside_frames += 1
-            else:
-                for zone_label in sorted(zone_labels):
-                    occupancy_frames[zone_label] += 1
-                    if zone_label in self._barrier_zone_labels:
-                        barrier_adjacent_frames += 1
-                    for key, labels in self._aggregate_zone_groups.items():
-                        if zone_label in labels:
-                            aggregate_occupancy_frames[key] += 1
-
-            gap_break = prev_frame is not None and frame - prev_frame > 1
-            if gap_break:
-                finalize_all_segments()
-
-            for zone_label in list(active_zone_segments.keys()):
-                if zone_label not in zone_labels:
-                    finalize_zone_segment(zone_label)
-
-            for zone_label in sorted(zone_labels):
-                if zone_label not in active_zone_segments:
-                    active_zone_segments[zone_label] = (frame, frame, 1)
-                    entry_counts[zone_label] += 1
-                    for key, labels in self._aggregate_zone_groups.items():
-                        if zone_label in labels:
-                            aggregate_entry_counts[key] += 1
-                    if zone_label not in first_entry_frames:
-                        first_entry_frames[zone_label] = frame
-                else:
-                    start_frame, _, frame_count = active_zone_segments[zone_label]
-                    active_zone_segments[zone_label] = (
-                        start_frame,
-                        frame,
-                        frame_count + 1,
-                    )
-
-            primary_zone = self._primary_zone_label(zone_labels)
-            if current_zone is not None and primary_zone != current_zone:
-                if primary_zone is not None and not gap_break:
-                    transition_counts[current_zone][primary_zone] += 1
-            current_zone = primary_zone
-
-            prev_frame = frame
-
-        finalize_all_segments()
+            dwell_frames[zone_label] += visit_frames
+            entry_counts[zone_label] += 1
+
+        first_entry_frames: dict[str, int] = {}
+        for start_row, zone_label in sorted(
+            (start_row, zone_label) for _, start_row, zone_label in visits
+        ):
+            first_entry_frames.setdefault(zone_label, int(frames[start_row]))
+
+        aggregate_entry_counts: dict[str, int] = {}
+        for key, labels in self._aggregate_zone_groups.items():
+            total = sum(entry_counts.get(label, 0) for label in labels)
+            if total:
+                aggregate_entry_counts[key] = total
+
+        transition_counts: dict[str, dict[str, int]] = {}
+        if frame_count > 1:
+            primary = np.where(in_any_zone, membership.argmax(axis=1), -1)
+            source = primary[:-1]
+            target = primary[1:]
+            changed = (
+                (source >= 0) & (target >= 0) & (source != target) & ~gap_break[1:]
+            )
+            pairs, counts = np.unique(
+                np.stack([source[changed], target[changed]], axis=1),
+                axis=0,
+                return_counts=True,
+            )
+            for (source_index, target_index), count in zip(pairs, counts):
+                transition_counts.setdefault(zone_labels[source_index], {})[
+                    zone_labels[target_index]
+                ] = int(count)
 
         return ZoneAnalysisResult(
             instance_name=instance_label,
-            frame_count=len(observations),
+            frame_count=frame_count,
             assay_profile="generic",
-            occupancy_frames=dict(occupancy_frames),
+            occupancy_frames=occupancy_frames,
             dwell_frames=dict(dwell_frames),
             entry_counts=dict(entry_counts),
             first_entry_frames=first_entry_frames,
             barrier_adjacent_frames=barrier_adjacent_frames,
-            transition_counts={
-                src: dict(targets) for src, targets in transition_counts.items()
-            },
+            transition_counts=transition_counts,
             segments=segments,
             outside_frames=outside_frames,
-            aggregate_occupancy_frames=dict(aggregate_occupancy_frames),
-            aggregate_entry_counts=dict(aggregate_entry_counts),
+            aggregate_occupancy_frames=aggregate_occupancy_frames,
+            aggregate_entry_counts=aggregate_entry_counts,
         )
 
     def analyze_dataframe(
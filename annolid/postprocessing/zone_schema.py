@@ -4,6 +4,8 @@ import re
 from dataclasses import dataclass, field
 from typing import Any, Mapping, Sequence
 
+import numpy as np
+import shapely
 from shapely.geometry import Point, Polygon
 
 
@@ -362,3 +364,61 @@ def zone_shape_distance_to_point(
         return float(polygon.distance(Point(float(point[0]), float(point[1]))))
     except Exception:
         return None
+
+
+def _prepared_zone_polygon(shape: ZoneShapeSpec) -> Polygon | None:
+    if len(shape.analysis_points) < 3:
+        return None
+    try:
+        polygon = Polygon(shape.analysis_points)
+        shapely.prepare(polygon)
+    except Exception:
+        return None
+    return polygon
+
+
+def zone_shapes_cover_points(
+    shapes: Sequence[ZoneShapeSpec], points: np.ndarray
+) -> np.ndarray:
+    """Vectorized :func:`zone_shape_covers_point` for ``(N, 2)`` points.
+
+    Returns a ``(N, len(shapes))`` boolean array. Each zone is tested against
+    all points in one shapely call.
+    """
+    coords = np.asarray(points, dtype=np.float64).reshape(-1, 2)
+    covered = np.zeros((len(coords), len(shapes)), dtype=bool)
+    if not len(coords):
+        return covered
+    geometries = shapely.points(coords)
+    for index, shape in enumerate(shapes):
+        polygon = _prepared_zone_polygon(shape)
+        if polygon is None:
+            continue
+        try:
+            covered[:, index] = shapely.covers(polygon, geometries)
+        except Exception:
+            continue
+    return covered
+
+
+def zone_shapes_distance_to_points(
+    shapes: Sequence[ZoneShapeSpec], points: np.ndarray
+) -> np.ndarray:
+    """Vectorized :func:`zone_shape_distance_to_point` for ``(N, 2)`` points.
+
+    Returns a ``(N, len(shapes))`` float array, NaN where a zone has no area.
+    """
+    coords = np.asarray(points, dtype=np.float64).reshape(-1, 2)
+    distance = np.full((len(coords), len(shapes)), np.nan, dtype=np.float64)
+    if not len(coords):
+        return distance
+    geometries = shapely.points(coords)
+    for index, shape in enumerate(shapes):
+        polygon = _prepared_zone_polygon(shape)
+        if polygon is None:
+            continue
+        try:
+            distance[:, index] = shapely.distance(polygon, geometries)
+        except Exception:
+            continue
+    return distance
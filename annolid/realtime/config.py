@@ -19,6 +19,11 @@ class Config:
     frame_width: int = 640
     frame_height: int = 480
     max_fps: float = 30.0
+    # Run capture, inference and post/publish as concurrent stages joined by
+    # bounded queues. "auto" drops stale frames for live sources only.
+    pipeline_mode: bool = False
+    pipeline_queue_size: int = 2
+    pipeline_drop_policy: str = "auto"  # auto|latest|block
     retry_attempts: int = 3
     retry_delay: float = 5.0
     visualize: bool = False
@@ -32,6 +37,10 @@ class Config:
     publish_frames: bool = True
     frame_encoding: str = "jpg"
     frame_quality: int = 80
+    # Same-host viewers read raw frames from a shared-memory ring instead of
+    # decoding JPEG/PNG; remote subscribers still receive encoded frames.
+    shared_memory_frames: bool = False
+    shared_memory_slots: int = 4
     publish_annotated_frames: bool = False
     viewer_only: bool = False
     enable_segmentation: bool = True
@@ -20,6 +20,7 @@ from typing import (
     Union,
     Tuple,
     Protocol,
+    Sequence,
 )
 from contextlib import asynccontextmanager
 
@@ -27,6 +28,7 @@ if TYPE_CHECKING:
     from annolid.realtime.mediapipe_engine import MediaPipeEngine
 
 from collections import deque
+from dataclasses import replace
 from enum import Enum, auto
 from functools import partial
 from itertools import accumulate
@@ -51,6 +53,7 @@ from annolid.utils.logger import logger
 from annolid.utils.log_paths import resolve_annolid_realtime_logs_root
 from annolid.yolo import configure_ultralytics_cache, resolve_weight_path
 from annolid.realtime.config import Config
+from annolid.realtime.shared_frames import SHARED_FRAME_TOPIC, SharedFrameRing
 # Late import to avoid dependency issues
 # from annolid.realtime.mediapipe_engine import MediaPipeEngine
 
@@ -1280,6 +1283,19 @@ class PerformanceMetrics:
         self.skipped_frame_count = 0
         self.last_report_time = time.time()
         self.error_count = 0
+        self.dropped_frame_count = 0
+        self.stage_history: Dict[str, deque] = {}
+
+    def record_stage(self, stage: str, seconds: float):
+        """Record the time one frame spent in a pipeline stage."""
+        history = self.stage_history.get(stage)
+        if history is None:
+            history = self.stage_history[stage] = deque(maxlen=100)
+        history.append(float(seconds))
+
+    def record_dropped_frame(self):
+        """Record a frame replaced by a newer one before inference."""
+        self.dropped_frame_count += 1
 
     def record_frame(self, inference_time: float, detection_count: int):
         """Record metrics for a processed frame."""
@@ -1326,11 +1342,18 @@ class PerformanceMetrics:
             "recording_state": recording_state,
             "frames_processed": self.frame_count,
             "frames_skipped": self.skipped_frame_count,
+            "frames_dropped": self.dropped_frame_count,
+            "stage_ms": {
+                stage: f"{statistics.mean(history) * 1000:.2f}"
+                for stage, history in self.stage_history.items()
+                if history
+            },
         }
 
         # Reset counters
         self.frame_count = 0
         self.skipped_frame_count = 0
+        self.dropped_frame_count = 0
         self.last_report_time = current_time
 
         return report
@@ -1618,14 +1641,31 @@ class DetectionSegmentRecorder:
 
 
 class DetectionPublisher:
-    """ZMQ publisher for detection results."""
+    """ZMQ publisher for detection results.
 
-    def __init__(self, address: str, camera_id: str = "camera0"):
+    With ``shared_memory_slots`` > 0 the socket is an XPUB that tracks which
+    frame topics have subscribers: same-host viewers subscribed to
+    ``shmframes`` get raw frames through a shared-memory ring, and frames are
+    only encoded while somebody (e.g. a remote viewer) subscribes to
+    ``frames``.
+    """
+
+    def __init__(
+        self, address: str, camera_id: str = "camera0", shared_memory_slots: int = 0
+    ):
         self.address = address
         self.camera_id = str(camera_id or "camera0")
         self.context = zmq.asyncio.Context()
-        self.socket = self.context.socket(zmq.PUB)
+        self.shared_frames: Optional[SharedFrameRing] = None
+        if int(shared_memory_slots or 0) > 0:
+            self.shared_frames = SharedFrameRing(
+                int(shared_memory_slots), prefix=f"annolid_{self.camera_id}"
+            )
+            self.socket = self.context.socket(zmq.XPUB)
+        else:
+            self.socket = self.context.socket(zmq.PUB)
         self.socket.setsockopt(zmq.LINGER, 0)
+        self._subscribed_topics: set[str] = set()
         self._bound = False
 
     async def bind(self):
@@ -1675,6 +1715,21 @@ class DetectionPublisher:
         except Exception as e:
             logger.error(f"Failed to publish status: {e}")
 
+    async def _poll_subscriptions(self) -> None:
+        """Drain XPUB (un)subscribe notifications into ``_subscribed_topics``."""
+        while True:
+            try:
+                message = await self.socket.recv(flags=zmq.NOBLOCK)
+            except zmq.Again:
+                return
+            if not message:
+                continue
+            topic = bytes(message[1:]).decode(errors="ignore")
+            if message[0] == 1:
+                self._subscribed_topics.add(topic)
+            elif message[0] == 0:
+                self._subscribed_topics.discard(topic)
+
     async def publish_frame(
         self,
         frame: Optional[np.ndarray],
@@ -1682,7 +1737,56 @@ class DetectionPublisher:
         encoding: str = "jpg",
         quality: int = 80,
     ):
-        """Publish an encoded frame with associated metadata."""
+        """Publish a frame with associated metadata.
+
+        Frames are encoded for ``frames`` subscribers and, when the shared
+        memory transport is enabled, written raw to the ring for
+        ``shmframes`` subscribers.
+        """
+        if self.shared_frames is None:
+            await self._publish_encoded_frame(frame, metadata, encoding, quality)
+            return
+        try:
+            await self._poll_subscriptions()
+        except Exception as e:
+            logger.debug(f"Failed to read frame subscriptions: {e}")
+        if self._has_subscriber(SHARED_FRAME_TOPIC):
+            await self._publish_shared_frame(frame, metadata)
+        if self._has_subscriber("frames"):
+            await self._publish_encoded_frame(frame, metadata, encoding, quality)
+
+    def _has_subscriber(self, topic: str) -> bool:
+        """Return whether any subscription prefix matches ``topic``, as ZMQ does."""
+        return any(topic.startswith(sub) for sub in self._subscribed_topics)
+
+    async def _publish_shared_frame(
+        self, frame: Optional[np.ndarray], metadata: Dict[str, Any]
+    ) -> None:
+        try:
+            payload_metadata = dict(metadata or {})
+            payload_metadata.setdefault("camera_id", self.camera_id)
+            if frame is not None:
+                descriptor = await asyncio.to_thread(self.shared_frames.write, frame)
+                payload_metadata["encoding"] = "raw"
+                payload_metadata.setdefault(
+                    "shape", [int(frame.shape[0]), int(frame.shape[1])]
+                )
+                payload_metadata["shared_memory"] = descriptor
+            else:
+                payload_metadata["skip_frame"] = True
+            await self.socket.send_string(SHARED_FRAME_TOPIC, flags=zmq.SNDMORE)
+            await self.socket.send_json(payload_metadata, flags=zmq.SNDMORE)
+            await self.socket.send(b"")
+        except Exception as e:
+            logger.error(f"Failed to publish shared-memory frame: {e}")
+
+    async def _publish_encoded_frame(
+        self,
+        frame: Optional[np.ndarray],
+        metadata: Dict[str, Any],
+        encoding: str = "jpg",
+        quality: int = 80,
+    ) -> None:
         try:
             payload_metadata = dict(metadata or {})
             payload_metadata.setdefault("camera_id", self.camera_id)
@@ -1737,6 +1841,8 @@ class DetectionPublisher:
                 self.context.term()
             self.context = None
             self._bound = False
+            if self.shared_frames is not None:
+                self.shared_frames.close()
             logger.info("Detection publisher cleaned up")
         except Exception as e:
             logger.error(f"Publisher cleanup error: {e}")
@@ -1775,6 +1881,11 @@ class PerceptionProcess:
         self.publisher = DetectionPublisher(
             config.publisher_address,
             camera_id=str(getattr(config, "camera_id", "") or "camera0"),
+            shared_memory_slots=(
+                int(getattr(config, "shared_memory_slots", 0) or 0)
+                if getattr(config, "shared_memory_frames", False)
+                else 0
+            ),
         )
         self.running = True
         self._shutdown_event = asyncio.Event()
@@ -1909,7 +2020,11 @@ class PerceptionProcess:
     async def setup(self):
         """Setup the perception process."""
         logger.info("Setting up perception process...")
+        await self._ensure_model_available()
+        await self._connect_io()
+        logger.info("Setup complete")
 
+    async def _ensure_model_available(self) -> None:
         configure_ultralytics_cache()
 
         if not self.config.viewer_only:
@@ -1927,13 +2042,13 @@ class PerceptionProcess:
         else:
             logger.info("Viewer-only mode enabled; skipping model setup.")
 
+    async def _connect_io(self) -> None:
         # Initialize publisher
         await self.publisher.bind()
 
         # Initialize video source. Keep process alive on startup failures so
         # get_frame() can continue reconnection attempts.
         await self.video_source.connect(raise_on_failure=False)
-        logger.info("Setup complete")
 
     async def run(self):
         """Main processing loop with recording state awareness."""
@@ -1945,26 +2060,20 @@ class PerceptionProcess:
 
         async with self._model_context() as model:
             self.model = model
+            if bool(getattr(self.config, "pipeline_mode", False)):
+                await self._run_pipelined_loop(frame_interval)
+                return
 
             while self.running and not self._shutdown_event.is_set():
                 loop_start = time.time()
 
                 try:
-                    await self._publish_source_status_events()
-                    # Get frame
-                    frame_data = await self.video_source.get_frame()
-                    await self._publish_source_status_events()
+                    frame_data = await self._capture_frame()
                     if not frame_data:
                         await asyncio.sleep(0.1)
                         continue
-
                     frame, metadata = frame_data
-                    metadata = dict(metadata or {})
-                    metadata.setdefault("capture_timestamp", time.time())
-                    metadata["frame_index"] = self._frame_index
-                    metadata["camera_id"] = str(
-                        getattr(self.config, "camera_id", "") or "camera0"
-                    )
+                    self.metrics.record_stage("capture", time.time() - loop_start)
 
                     # Check if we should process this frame based on recording state
                     processing_active = self.recording_manager.should_process_frames()
@@ -1976,89 +2085,15 @@ class PerceptionProcess:
 
                     try:
                         # Run inference
+                        inference_start = time.time()
                         results = await self._run_inference(frame)
-                        inference_time = time.time() - loop_start
-
-                        # Process results
-                        (
-                            detection_count,
-                            matched_classes,
-                        ) = await self._process_detections(
-                            results, loop_start, metadata
-                        )
-                        self.segment_recorder.update(frame, loop_start, matched_classes)
-                        completed_segments = (
-                            self.segment_recorder.pop_completed_segments()
+                        self.metrics.record_stage(
+                            "inference", time.time() - inference_start
                         )
-                        for segment in completed_segments:
-                            await self.publisher.publish_status(
-                                {
-                                    "event": "detection_segment_saved",
-                                    "path": str(segment.get("path") or ""),
-                                    "duration_sec": float(
-                                        segment.get("duration_sec") or 0.0
-                                    ),
-                                    "labels": list(segment.get("labels") or []),
-                                    "timestamp": float(
-                                        segment.get("timestamp") or time.time()
-                                    ),
-                                }
-                            )
-
-                        # Update metrics
-                        self.metrics.record_frame(inference_time, detection_count)
-
-                        # Prepare visualization output if requested
-                        annotated_frame = None
-                        if (
-                            self.config.visualize
-                            or self.config.publish_annotated_frames
-                        ):
-                            annotated_frame = self._visualize_results(
-                                results, frame, show_window=self.config.visualize
-                            )
-
-                        # Report metrics
-                        if self.metrics.should_report():
-                            report = self.metrics.generate_report(
-                                self.video_source.state.name,
-                                self.recording_manager.state.name,
-                            )
-                            logger.info(f"Performance: {json.dumps(report)}")
-                            await self.publisher.publish_status(
-                                {
-                                    "event": "performance_report",
-                                    **report,
-                                    "timestamp": time.time(),
-                                }
-                            )
+                        inference_time = time.time() - loop_start
 
-                        if self.config.publish_frames:
-                            frame_to_publish = (
-                                annotated_frame
-                                if (
-                                    self.config.publish_annotated_frames
-                                    and annotated_frame is not None
-                                )
-                                else frame
-                            )
-                        else:
-                            frame_to_publish = None
-
-                        await self.publisher.publish_frame(
-                            frame_to_publish,
-                            {
-                                "frame_index": metadata["frame_index"],
-                                "capture_timestamp": metadata.get("capture_timestamp"),
-                                "camera_id": metadata.get("camera_id"),
-                                "source": metadata.get("source"),
-                                "recording_state": self.recording_manager.state.name,
-                                "processing": processing_active,
-                                "detection_count": detection_count,
-                                "inference_ms": inference_time * 1000.0,
-                            },
-                            encoding=self.config.frame_encoding,
-                            quality=self.config.frame_quality,
+                        await self._publish_results(
+                            frame, metadata, results, loop_start, inference_time
                         )
                     finally:
                         self._frame_index += 1
@@ -2071,25 +2106,250 @@ class PerceptionProcess:
                 elapsed = time.time() - loop_start
                 await asyncio.sleep(max(0, frame_interval - elapsed))
 
+    async def _capture_frame(self) -> Optional[Tuple[np.ndarray, Dict[str, Any]]]:
+        """Read the next frame and stamp its metadata; None when none is ready."""
+        await self._publish_source_status_events()
+        frame_data = await self.video_source.get_frame()
+        await self._publish_source_status_events()
+        if not frame_data:
+            return None
+
+        frame, metadata = frame_data
+        metadata = dict(metadata or {})
+        metadata.setdefault("capture_timestamp", time.time())
+        metadata["frame_index"] = self._frame_index
+        metadata["camera_id"] = str(getattr(self.config, "camera_id", "") or "camera0")
+        return frame, metadata
+
+    async def _publish_results(
+        self,
+        frame: np.ndarray,
+        metadata: Dict[str, Any],
+        results,
+        loop_start: float,
+        inference_time: float,
+    ) -> None:
+        """Post-process one inferred frame, then visualize and publish it."""
+        post_start = time.time()
+        detection_count, matched_classes = await self._process_detections(
+            results, loop_start, metadata
+        )
+        self.segment_recorder.update(frame, loop_start, matched_classes)
+        completed_segments = self.segment_recorder.pop_completed_segments()
+        for segment in completed_segments:
+            await self.publisher.publish_status(
+                {
+                    "event": "detection_segment_saved",
+                    "path": str(segment.get("path") or ""),
+                    "duration_sec": float(segment.get("duration_sec") or 0.0),
+                    "labels": list(segment.get("labels") or []),
+                    "timestamp": float(segment.get("timestamp") or time.time()),
+                }
+            )
+
+        # Update metrics
+        self.metrics.record_frame(inference_time, detection_count)
+        publish_start = time.time()
+        self.metrics.record_stage("postprocess", publish_start - post_start)
+
+        # Prepare visualization output if requested
+        annotated_frame = None
+        if self.config.visualize or self.config.publish_annotated_frames:
+            annotated_frame = self._visualize_results(
+                results, frame, show_window=self.config.visualize
+            )
+
+        # Report metrics
+        if self.metrics.should_report():
+            report = self.metrics.generate_report(
+                self.video_source.state.name,
+                self.recording_manager.state.name,
+            )
+            logger.info(f"Performance: {json.dumps(report)}")
+            await self.publisher.publish_status(
+                {
+                    "event": "performance_report",
+                    **report,
+                    "timestamp": time.time(),
+                }
+            )
+
+        if self.config.publish_frames:
+            frame_to_publish = (
+                annotated_frame
+                if (
+                    self.config.publish_annotated_frames and annotated_frame is not None
+                )
+                else frame
+            )
+        else:
+            frame_to_publish = None
+
+        await self.publisher.publish_frame(
+            frame_to_publish,
+            {
+                "frame_index": metadata["frame_index"],
+                "capture_timestamp": metadata.get("capture_timestamp"),
+                "camera_id": metadata.get("camera_id"),
+                "source": metadata.get("source"),
+                "recording_state": self.recording_manager.state.name,
+                "processing": True,
+                "detection_count": detection_count,
+                "inference_ms": inference_time * 1000.0,
+            },
+            encoding=self.config.frame_encoding,
+            quality=self.config.frame_quality,
+        )
+        self.metrics.record_stage("publish", time.time() - publish_start)
+
+    # --- Pipelined mode ---
+
+    def _pipeline_active(self) -> bool:
+        return self.running and not self._shutdown_event.is_set()
+
+    def _pipeline_drops_stale_frames(self) -> bool:
+        """Latest-frame-wins for live sources; files keep every frame."""
+        policy = str(getattr(self.config, "pipeline_drop_policy", "auto") or "auto")
+        policy = policy.strip().lower()
+        if policy in ("latest", "drop"):
+            return True
+        if policy == "block":
+            return False
+        source = self.config.camera_index
+        if HybridVideoSource._is_network_stream_source(source):
+            return True
+        value = str(source or "").strip()
+        if not value or value.isdigit():
+            return True
+        try:
+            return not Path(value).expanduser().is_file()
+        except Exception:
+            return True
+
+    async def _pipeline_get(self, queue: asyncio.Queue):
+        """Next queued item, or None once the process is stopping."""
+        while self._pipeline_active():
+            try:
+                return await asyncio.wait_for(queue.get(), timeout=0.1)
+            except asyncio.TimeoutError:
+                continue
+        return None
+
+    async def _run_pipelined_loop(self, frame_interval: float) -> None:
+        """Run capture, inference and post/publish as concurrent stages.
+
+        Stages are joined by queues of ``pipeline_queue_size`` items, so
+        throughput follows the slowest stage rather than the sum of all of
+        them. When inference falls behind a live source, the capture stage
+        replaces the oldest queued frame (latest frame wins); file sources
+        apply backpressure instead so no frame is lost.
+        """
+        depth = max(1, int(getattr(self.config, "pipeline_queue_size", 2) or 1))
+        drop_stale = self._pipeline_drops_stale_frames()
+        logger.info(
+            "Pipelined perception enabled (queue=%d, drop_stale=%s).",
+            depth,
+            drop_stale,
+        )
+        inference_queue: asyncio.Queue = asyncio.Queue(maxsize=depth)
+        publish_queue: asyncio.Queue = asyncio.Queue(maxsize=depth)
+        stages = [
+            asyncio.create_task(
+                self._capture_stage(inference_queue, frame_interval, drop_stale)
+            ),
+            asyncio.create_task(self._inference_stage(inference_queue, publish_queue)),
+            asyncio.create_task(self._publish_stage(publish_queue)),
+        ]
+        try:
+            done, _pending = await asyncio.wait(
+                stages, return_when=asyncio.FIRST_COMPLETED
+            )
+        finally:
+            for task in stages:
+                task.cancel()
+            await asyncio.gather(*stages, return_exceptions=True)
+        for task in done:
+            if not task.cancelled() and task.exception() is not None:
+                raise task.exception()
+
+    async def _capture_stage(
+        self, queue: asyncio.Queue, frame_interval: float, drop_stale: bool
+    ) -> None:
+        while self._pipeline_active():
+            loop_start = time.time()
+            try:
+                frame_data = await self._capture_frame()
+                if not frame_data:
+                    await asyncio.sleep(0.1)
+                    continue
+                if not self.recording_manager.should_process_frames():
+                    self.metrics.record_skipped_frame()
+                    await asyncio.sleep(0.05)
+                    continue
+                frame, metadata = frame_data
+                self.metrics.record_stage("capture", time.time() - loop_start)
+                item = (frame, metadata, loop_start)
+                if drop_stale and queue.full():
+                    with contextlib.suppress(asyncio.QueueEmpty):
+                        queue.get_nowait()
+                        self.metrics.record_dropped_frame()
+                    queue.put_nowait(item)
+                else:
+                    await queue.put(item)
+                self._frame_index += 1
+            except Exception as e:
+                logger.error(f"Capture stage error: {e}", exc_info=True)
+                self.metrics.record_error()
+
+            elapsed = time.time() - loop_start
+            await asyncio.sleep(max(0, frame_interval - elapsed))
+
+    async def _inference_stage(
+        self, inbox: asyncio.Queue, outbox: asyncio.Queue
+    ) -> None:
+        while True:
+            item = await self._pipeline_get(inbox)
+            if item is None:
+                return
+            frame, metadata, loop_start = item
+            try:
+                inference_start = time.time()
+                results = await self._run_inference(frame)
+                now = time.time()
+                self.metrics.record_stage("inference", now - inference_start)
+                # Results are never dropped; a full outbox slows capture down.
+                await outbox.put(
+                    (frame, metadata, loop_start, results, now - loop_start)
+                )
+            except Exception as e:
+                logger.error(f"Inference stage error: {e}", exc_info=True)
+                self.metrics.record_error()
+
+    async def _publish_stage(self, inbox: asyncio.Queue) -> None:
+        while True:
+            item = await self._pipeline_get(inbox)
+            if item is None:
+                return
+            frame, metadata, loop_start, results, inference_time = item
+            try:
+                await self._publish_results(
+                    frame, metadata, results, loop_start, inference_time
+                )
+                self.metrics.record_stage("end_to_end", time.time() - loop_start)
+            except Exception as e:
+                logger.error(f"Publish stage error: {e}", exc_info=True)
+                self.metrics.record_error()
+
     async def _run_viewer_only_loop(self, frame_interval: float) -> None:
         """Publish raw frames without loading or running a perception model."""
         while self.running and not self._shutdown_event.is_set():
             loop_start = time.time()
             try:
-                await self._publish_source_status_events()
-                frame_data = await self.video_source.get_frame()
-                await self._publish_source_status_events()
+                frame_data = await self._capture_frame()
                 if not frame_data:
                     await asyncio.sleep(0.1)
                     continue
-
                 frame, metadata = frame_data
-                metadata = dict(metadata or {})
-                metadata.setdefault("capture_timestamp", time.time())
-                metadata["frame_index"] = self._frame_index
-                metadata["camera_id"] = str(
-                    getattr(self.config, "camera_id", "") or "camera0"
-                )
 
                 self.metrics.record_frame(0.0, 0)
                 if self.metrics.should_report():
@@ -2593,11 +2853,230 @@ class PerceptionProcess:
         self._shutdown_event.set()
 
 
+class MultiCameraPerceptionProcess:
+    """Serve several cameras from one process and one shared model.
+
+    Every camera keeps its own :class:`PerceptionProcess` lane (video source,
+    recording state, metrics, segment recorder and publisher on its own
+    address) but no model of its own. A capture task per lane keeps only the
+    most recent frame; the inference loop gathers whatever frames are ready,
+    runs them through the model as one batch and fans the results back out to
+    the lanes, whose publishers stamp them with their ``camera_id``. Each lane
+    keeps its own ``max_fps`` and ``confidence_threshold``: lanes capture at
+    their own rate and frames are batched per distinct threshold.
+    """
+
+    def __init__(
+        self, configs: Sequence[Config], *, max_batch_size: Optional[int] = None
+    ):
+        configs = list(configs or [])
+        if not configs:
+            raise ValueError("At least one camera configuration is required.")
+        camera_ids = [str(c.camera_id or "camera0") for c in configs]
+        if len(set(camera_ids)) != len(camera_ids):
+            raise ValueError(f"Camera ids must be unique: {camera_ids}")
+        self.lanes: List[PerceptionProcess] = [PerceptionProcess(c) for c in configs]
+        self.config = self.lanes[0].config
+        self.max_batch_size = max(1, int(max_batch_size or len(self.lanes)))
+        self.model: Optional[Union[YOLO, "MediaPipeEngine"]] = None
+        self.running = True
+        self._shutdown_event = asyncio.Event()
+
+    @property
+    def camera_ids(self) -> List[str]:
+        return [lane.publisher.camera_id for lane in self.lanes]
+
+    def _active(self) -> bool:
+        return self.running and not self._shutdown_event.is_set()
+
+    async def setup(self):
+        logger.info("Setting up %d-camera perception process...", len(self.lanes))
+        await self.lanes[0]._ensure_model_available()
+        await asyncio.gather(*(lane._connect_io() for lane in self.lanes))
+        logger.info("Setup complete")
+
+    async def run(self):
+        await self.setup()
+        # The batch loop keeps up with the fastest camera.
+        frame_interval = min(self._lane_interval(lane) for lane in self.lanes)
+        primary = self.lanes[0]
+        async with primary._model_context() as model:
+            self.model = model
+            for lane in self.lanes:
+                lane.model = model
+                lane.class_names = primary.class_names
+                lane.keypoint_labels = primary.keypoint_labels
+                lane.config.enable_pose = primary.config.enable_pose
+                lane.config.enable_segmentation = primary.config.enable_segmentation
+            await self._run_batched_loop(frame_interval)
+
+    async def _run_batched_loop(self, frame_interval: float) -> None:
+        slots: Dict[str, Tuple[PerceptionProcess, np.ndarray, Dict[str, Any], float]]
+        slots = {}
+        ready = asyncio.Event()
+        capture_tasks = [
+            asyncio.create_task(self._capture_lane(lane, slots, ready))
+            for lane in self.lanes
+        ]
+        try:
+            while self._active():
+                try:
+                    await asyncio.wait_for(ready.wait(), timeout=0.1)
+                except asyncio.TimeoutError:
+                    continue
+                loop_start = time.time()
+                ready.clear()
+                batch = list(slots.values())
+                slots.clear()
+                for start in range(0, len(batch), self.max_batch_size):
+                    await self._infer_and_publish(
+                        batch[start : start + self.max_batch_size]
+                    )
+                elapsed = time.time() - loop_start
+                await asyncio.sleep(max(0, frame_interval - elapsed))
+        finally:
+            for task in capture_tasks:
+                task.cancel()
+            await asyncio.gather(*capture_tasks, return_exceptions=True)
+
+    async def _capture_lane(
+        self,
+        lane: PerceptionProcess,
+        slots: Dict[str, Tuple[PerceptionProcess, np.ndarray, Dict[str, Any], float]],
+        ready: asyncio.Event,
+    ) -> None:
+        camera_id = lane.publisher.camera_id
+        frame_interval = self._lane_interval(lane)
+        while self._active() and lane.running:
+            loop_start = time.time()
+            try:
+                frame_data = await lane._capture_frame()
+                if not frame_data:
+                    await asyncio.sleep(0.1)
+                    continue
+                if not lane.recording_manager.should_process_frames():
+                    lane.metrics.record_skipped_frame()
+                    await asyncio.sleep(0.05)
+                    continue
+                frame, metadata = frame_data
+                lane.metrics.record_stage("capture", time.time() - loop_start)
+                if camera_id in slots:
+                    # The batch loop has not picked up the previous frame yet;
+                    # only the most recent one is worth inferring.
+                    lane.metrics.record_dropped_frame()
+                slots[camera_id] = (lane, frame, metadata, loop_start)
+                lane._frame_index += 1
+                ready.set()
+            except Exception as e:
+                logger.error(f"Capture error on {camera_id}: {e}", exc_info=True)
+                lane.metrics.record_error()
+
+            elapsed = time.time() - loop_start
+            await asyncio.sleep(max(0, frame_interval - elapsed))
+
+    async def _infer_and_publish(
+        self,
+        batch: List[Tuple[PerceptionProcess, np.ndarray, Dict[str, Any], float]],
+    ) -> None:
+        inference_start = time.time()
+        try:
+            results = await self._run_batch_inference(
+                [item[0] for item in batch], [item[1] for item in batch]
+            )
+        except Exception as e:
+            logger.error(f"Batched inference error: {e}", exc_info=True)
+            for lane, *_rest in batch:
+                lane.metrics.record_error()
+            return
+        now = time.time()
+        publishes = []
+        for (lane, frame, metadata, captured_at), result in zip(batch, results):
+            lane.metrics.record_stage("inference", now - inference_start)
+            publishes.append(
+                lane._publish_results(
+                    frame, metadata, result, captured_at, now - captured_at
+                )
+            )
+        outcomes = await asyncio.gather(*publishes, return_exceptions=True)
+        for (lane, *_rest), outcome in zip(batch, outcomes):
+            if isinstance(outcome, Exception):
+                logger.error(
+                    f"Publish error on {lane.publisher.camera_id}: {outcome}",
+                    exc_info=outcome,
+                )
+                lane.metrics.record_error()
+
+    @staticmethod
+    def _lane_interval(lane: PerceptionProcess) -> float:
+        max_fps = float(lane.config.max_fps or 0)
+        return 1.0 / max_fps if max_fps > 0 else 0.0
+
+    async def _run_batch_inference(
+        self, lanes: List[PerceptionProcess], frames: List[np.ndarray]
+    ) -> List[Any]:
+        """One model call per confidence threshold; per-frame for MediaPipe."""
+        if "mediapipe" in str(self.config.model_base_name).lower():
+            return [
+                await lane._run_inference(frame) for lane, frame in zip(lanes, frames)
+            ]
+        by_threshold: Dict[float, List[int]] = {}
+        for pos, lane in enumerate(lanes):
+            conf = float(lane.config.confidence_threshold)
+            by_threshold.setdefault(conf, []).append(pos)
+        results: List[Any] = [None] * len(frames)
+        for conf, positions in by_threshold.items():
+            group = await asyncio.to_thread(
+                self.model,
+                [frames[pos] for pos in positions],
+                stream=False,
+                conf=conf,
+                verbose=False,
+            )
+            group = list(group)
+            if len(group) != len(positions):
+                raise RuntimeError(
+                    f"Model returned {len(group)} results for {len(positions)} frames"
+                )
+            for pos, result in zip(positions, group):
+                results[pos] = result
+        return results
+
+    async def shutdown(self):
+        self.running = False
+        self._shutdown_event.set()
+        await asyncio.gather(
+            *(lane.shutdown() for lane in self.lanes), return_exceptions=True
+        )
+
+    def request_stop(self) -> None:
+        self.running = False
+        self._shutdown_event.set()
+        for lane in self.lanes:
+            lane.request_stop()
+
+
 # --- Configuration and Main ---
 
 
 def create_config_from_args() -> Config:
     """Create configuration from command line arguments."""
+    return create_camera_configs_from_args()[0]
+
+
+def _publisher_address_with_offset(address: str, offset: int) -> str:
+    match = re.match(r"^(.*):(\d+)$", str(address or ""))
+    if not match or offset == 0:
+        return address
+    return f"{match.group(1)}:{int(match.group(2)) + int(offset)}"
+
+
+def create_camera_configs_from_args() -> List[Config]:
+    """Create one configuration per camera from command line arguments.
+
+    The first entry describes ``--camera-index``. Each ``--extra-camera``
+    (``source`` or ``camera_id=source``) adds a camera that shares the model
+    and publishes on the next port after ``--publisher``.
+    """
     parser = argparse.ArgumentParser(
         description="Enhanced Computer Vision Perception System"
     )
@@ -2627,6 +3106,36 @@ def create_config_from_args() -> Config:
     parser.add_argument("--height", type=int, default=480, help="Frame height")
     parser.add_argument("--max-fps", type=float, default=30.0, help="Maximum FPS")
     parser.add_argument("--visualize", action="store_true", help="Enable visualization")
+    parser.add_argument(
+        "--extra-camera",
+        action="append",
+        default=[],
+        metavar="[ID=]SOURCE",
+        help="Additional camera served by the same model with batched inference.",
+    )
+    parser.add_argument(
+        "--shared-memory-frames",
+        action="store_true",
+        help="Offer raw frames to same-host viewers through shared memory.",
+    )
+    parser.add_argument(
+        "--pipeline",
+        action="store_true",
+        help="Overlap capture, inference and publishing in concurrent stages.",
+    )
+    parser.add_argument(
+        "--pipeline-queue-size",
+        type=int,
+        default=2,
+        help="Frames buffered between pipeline stages.",
+    )
+    parser.add_argument(
+        "--pipeline-drop-policy",
+        choices=["auto", "latest", "block"],
+        default="auto",
+        help="Drop stale frames (latest) or apply backpressure (block); "
+        "auto drops only for live sources.",
+    )
     parser.add_argument(
         "--viewer-only",
         action="store_true",
@@ -2700,7 +3209,7 @@ def create_config_from_args() -> Config:
 
     is_pose_model = False if args.viewer_only else "pose" in args.model.lower()
 
-    return Config(
+    config = Config(
         camera_index=camera_index,
         camera_id="camera0",
         server_address=args.server_address,
@@ -2712,6 +3221,10 @@ def create_config_from_args() -> Config:
         frame_width=args.width,
         frame_height=args.height,
         max_fps=args.max_fps,
+        pipeline_mode=bool(args.pipeline),
+        pipeline_queue_size=max(1, int(args.pipeline_queue_size)),
+        pipeline_drop_policy=str(args.pipeline_drop_policy),
+        shared_memory_frames=bool(args.shared_memory_frames),
         visualize=args.visualize,
         publish_annotated_frames=False if args.viewer_only else args.publish_annotated,
         viewer_only=bool(args.viewer_only),
@@ -2738,19 +3251,47 @@ def create_config_from_args() -> Config:
         ),
     )
 
+    configs = [config]
+    for offset, entry in enumerate(args.extra_camera or [], start=1):
+        camera_id, sep, source = str(entry).partition("=")
+        if not sep:
+            camera_id, source = f"camera{offset}", camera_id
+        source = source.strip()
+        output_dir = config.detection_segment_output_dir
+        if output_dir:
+            output_dir = str(Path(output_dir) / camera_id.strip())
+        configs.append(
+            replace(
+                config,
+                camera_index=int(source) if source.isdigit() else source,
+                camera_id=camera_id.strip(),
+                publisher_address=_publisher_address_with_offset(
+                    config.publisher_address, offset
+                ),
+                target_behaviors=list(config.target_behaviors),
+                detection_segment_targets=list(config.detection_segment_targets),
+                detection_segment_output_dir=output_dir,
+            )
+        )
+    return configs
+
 
 async def main():
     """Main entry point with enhanced error handling."""
     perception = None
     try:
-        config = create_config_from_args()
+        configs = create_camera_configs_from_args()
+        config = configs[0]
 
         logger.info("🚀 Starting Enhanced Computer Vision Perception System")
         logger.info(
             f"📋 Recording behavior: {'Pause on stop' if config.pause_on_recording_stop else 'Continue on stop'}"
         )
 
-        perception = PerceptionProcess(config)
+        if len(configs) > 1:
+            perception = MultiCameraPerceptionProcess(configs)
+        else:
+            perception = PerceptionProcess(config)
 
         # Setup signal handlers
         loop = asyncio.get_running_loop()
@@ -0,0 +1,209 @@
+"""Same-host frame transport over ``multiprocessing.shared_memory``.
+
+Encoding every published frame to JPEG/PNG and decoding it again in a viewer
+on the same machine costs a core per side at high resolutions. Instead the
+publisher copies raw frames into a small ring of shared-memory slots and only
+sends a descriptor (segment name, slot, sequence number, shape, dtype) over
+ZMQ, on the ``shmframes`` topic. Subscribers on other hosts keep subscribing
+to ``frames`` and still receive encoded images.
+
+Each slot starts with a 64-byte header holding a sequence word. The writer
+marks a slot odd while copying and stores ``2 * seq`` once done; readers
+copy the slot and re-check the word, so a frame overwritten mid-read is
+dropped instead of shown torn.
+"""
+
+from __future__ import annotations
+
+import itertools
+import os
+import threading
+from multiprocessing import resource_tracker
+from multiprocessing.shared_memory import SharedMemory
+from typing import Any, Dict, Optional
+from urllib.parse import urlsplit
+
+import numpy as np
+
+from annolid.utils.logger import logger
+
+SHARED_FRAME_TOPIC = "shmframes"
+DEFAULT_SHARED_FRAME_SLOTS = 4
+_HEADER_BYTES = 64
+_LOCAL_HOSTS = {"127.0.0.1", "localhost", "::1", "[::1]"}
+_SEGMENT_IDS = itertools.count()
+# Segments created by this process. Readers attaching to them must leave
+# resource tracking to the owning ring.
+_OWNED_SEGMENTS: set[str] = set()
+
+
+def is_same_host_address(address: str) -> bool:
+    """True for ZMQ endpoints that can only be reached from this machine."""
+    value = str(address or "").strip()
+    scheme = value.split("://", 1)[0].lower() if "://" in value else ""
+    if scheme in ("ipc", "inproc"):
+        return True
+    if scheme != "tcp":
+        return False
+    host = urlsplit(value).hostname or ""
+    return host.lower() in _LOCAL_HOSTS
+
+
+class SharedFrameRing:
+    """Writer side: a ring of ``slots`` shared-memory frame buffers.
+
+    The segment is created on the first write and recreated, under a new
+    name, when a frame no longer fits a slot.
+    """
+
+    def __init__(
+        self, slots: int = DEFAULT_SHARED_FRAME_SLOTS, *, prefix: str = "annolid_rt"
+    ) -> None:
+        self.slots = max(2, int(slots))
+        self.prefix = str(prefix or "annolid_rt")
+        self._shm: Optional[SharedMemory] = None
+        self._slot_bytes = 0
+        self._seq = 0
+        self._lock = threading.Lock()
+
+    @property
+    def name(self) -> Optional[str]:
+        return None if self._shm is None else self._shm.name
+
+    def write(self, frame: np.ndarray) -> Dict[str, Any]:
+        """Copy ``frame`` into the next slot and return its descriptor."""
+        array = np.ascontiguousarray(frame)
+        with self._lock:
+            if self._shm is None or array.nbytes > self._slot_bytes:
+                self._allocate(array.nbytes)
+            self._seq += 1
+            seq = self._seq
+            slot = seq % self.slots
+            offset = slot * (_HEADER_BYTES + self._slot_bytes)
+            buf = self._shm.buf
+            header = np.ndarray((1,), dtype=np.uint64, buffer=buf, offset=offset)
+            header[0] = 2 * seq - 1
+            target = np.ndarray(
+                array.shape,
+                dtype=array.dtype,
+                buffer=buf,
+                offset=offset + _HEADER_BYTES,
+            )
+            target[...] = array
+            header[0] = 2 * seq
+            return {
+                "name": self._shm.name,
+                "slot": int(slot),
+                "seq": int(seq),
+                "offset": int(offset),
+                "shape": [int(dim) for dim in array.shape],
+                "dtype": array.dtype.str,
+            }
+
+    def close(self) -> None:
+        with self._lock:
+            self._release()
+
+    def _allocate(self, nbytes: int) -> None:
+        self._release()
+        # Leave headroom so small size changes do not churn segments.
+        self._slot_bytes = int(nbytes + nbytes // 8 + _HEADER_BYTES)
+        name = f"{self.prefix}_{os.getpid()}_{next(_SEGMENT_IDS)}"
+        self._shm = SharedMemory(
+            name=name, create=True, size=self.slots * (_HEADER_BYTES + self._slot_bytes)
+        )
+        _OWNED_SEGMENTS.add(self._shm.name)
+        logger.info(
+            "Shared-memory frame ring %s: %d slots x %d bytes",
+            self._shm.name,
+            self.slots,
+            self._slot_bytes,
+        )
+
+    def _release(self) -> None:
+        shm, self._shm = self._shm, None
+        if shm is None:
+            return
+        _OWNED_SEGMENTS.discard(shm.name)
+        try:
+            shm.close()
+        except Exception:
+            pass
+        try:
+            shm.unlink()
+        except FileNotFoundError:
+            pass
+        except Exception as exc:
+            logger.debug("Failed to unlink shared frame ring %s: %s", shm.name, exc)
+
+    def __del__(self):  # pragma: no cover - best effort
+        try:
+            self._release()
+        except Exception:
+            pass
+
+
+class SharedFrameReader:
+    """Reader side: resolves descriptors from :class:`SharedFrameRing`."""
+
+    def __init__(self, max_segments: int = 2) -> None:
+        self.max_segments = max(1, int(max_segments))
+        self._segments: Dict[str, SharedMemory] = {}
+
+    def read(self, descriptor: Dict[str, Any]) -> Optional[np.ndarray]:
+        """Copy the described frame out, or None if it is gone or overwritten."""
+        try:
+            name = str(descriptor["name"])
+            seq = int(descriptor["seq"])
+            offset = int(descriptor["offset"])
+            shape = tuple(int(dim) for dim in descriptor["shape"])
+            dtype = np.dtype(str(descriptor["dtype"]))
+        except (KeyError, TypeError, ValueError):
+            return None
+        shm = self._attach(name)
+        if shm is None:
+            return None
+        nbytes = int(np.prod(shape)) * dtype.itemsize
+        if offset + _HEADER_BYTES + nbytes > shm.size:
+            return None
+        header = np.ndarray((1,), dtype=np.uint64, buffer=shm.buf, offset=offset)
+        if int(header[0]) != 2 * seq:
+            return None
+        frame = np.ndarray(
+            shape, dtype=dtype, buffer=shm.buf, offset=offset + _HEADER_BYTES
+        ).copy()
+        if int(header[0]) != 2 * seq:
+            return None
+        return frame
+
+    def close(self) -> None:
+        for shm in self._segments.values():
+            try:
+                shm.close()
+            except Exception:
+                pass
+        self._segments.clear()
+
+    def _attach(self, name: str) -> Optional[SharedMemory]:
+        shm = self._segments.get(name)
+        if shm is not None:
+            return shm
+        try:
+            shm = SharedMemory(name=name, create=False)
+        except (FileNotFoundError, OSError, ValueError):
+            return None
+        if os.name == "posix" and name not in _OWNED_SEGMENTS:
+            # Attaching registers the segment with this process's resource
+            # tracker, which would unlink it at exit behind the writer's back.
+            try:
+                resource_tracker.unregister(shm._name, "shared_memory")  # type: ignore[attr-defined]
+            except Exception:
+                pass
+        while len(self._segments) >= self.max_segments:
+            stale_name = next(iter(self._segments))
+            try:
+                self._segments.pop(stale_name).close()
+            except Exception:
+                pass
+        self._segments[name] = shm
+        return shm
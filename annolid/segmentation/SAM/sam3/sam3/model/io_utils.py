@@ -67,6 +67,15 @@ def load_resource_as_video_frames(
             images = to_device(images, select_device(None))
         return images, orig_height, orig_width
 
+    if hasattr(resource_path, "preprocessed_frames"):
+        return load_video_frames_from_frame_source(
+            frame_source=resource_path,
+            image_size=image_size,
+            offload_video_to_cpu=offload_video_to_cpu,
+            img_mean=img_mean,
+            img_std=img_std,
+        )
+
     is_image = (
         isinstance(resource_path, str)
         and os.path.splitext(resource_path)[-1].lower() in IMAGE_EXTS
@@ -220,6 +229,32 @@ def load_video_frames_from_image_folder(
     return images, video_height, video_width
 
 
+def load_video_frames_from_frame_source(
+    frame_source,
+    image_size,
+    offload_video_to_cpu,
+    img_mean,
+    img_std,
+):
+    """
+    Load the video frames from an in-memory frame source, i.e. an object whose
+    `preprocessed_frames(image_size)` returns float16 (T, 3, image_size, image_size)
+    RGB frames in [0, 1] together with the original height and width.
+    """
+    images, video_height, video_width = frame_source.preprocessed_frames(image_size)
+    img_mean = torch.tensor(img_mean, dtype=torch.float16)[:, None, None]
+    img_std = torch.tensor(img_std, dtype=torch.float16)[:, None, None]
+    if not offload_video_to_cpu:
+        target_device = select_device(None)
+        images = to_device(images, target_device)
+        img_mean = to_device(img_mean, target_device)
+        img_std = to_device(img_std, target_device)
+    # normalize by mean and std
+    images -= img_mean
+    images /= img_std
+    return images, video_height, video_width
+
+
 def load_video_frames_from_video_file(
     video_path,
     image_size,
@@ -1784,4 +1784,6 @@ class Sam3VideoInferenceWithInstanceInteractivity(Sam3VideoInference):
 def is_image_type(resource_path: str) -> bool:
     if isinstance(resource_path, list):
         return len(resource_path) == 1
+    if not isinstance(resource_path, str):
+        return False
     return resource_path.lower().endswith(tuple(IMAGE_EXTS))
@@ -3,7 +3,6 @@ from __future__ import annotations
 import importlib
 import json
 import os
-import tempfile
 import time
 from collections import deque
 from contextlib import contextmanager
@@ -50,6 +49,7 @@ from .windowed_runner import (
     resolve_window_schedule,
     shift_annotations_to_window,
 )
+from .window_frames import WindowFrameSource
 from .window_refresh import run_mid_window_refresh
 
 SAM3_IMPORT_ERROR: Optional[Exception] = None
@@ -706,8 +706,10 @@ class Sam3SessionManager(BaseSAMVideoProcessor):
         target_device: Optional[torch.device | str] = None,
         *,
         session_id: Optional[str] = None,
-        resource_path: Optional[str] = None,
+        resource_path: Optional[str | WindowFrameSource] = None,
     ) -> str:
+        if not isinstance(resource_path, WindowFrameSource):
+            resource_path = str(resource_path or self.video_path)
         runtime = getattr(self, "_runtime", None)
         if runtime is not None:
             runtime.default_device = self.default_device
@@ -720,7 +722,7 @@ class Sam3SessionManager(BaseSAMVideoProcessor):
             self._session_id = runtime.start_session(
                 target_device=target_device,
                 session_id=session_id,
-                resource_path=str(resource_path or self.video_path),
+                resource_path=resource_path,
             )
             self._predictor = runtime.predictor
             self._predictor_device = runtime.predictor_device
@@ -742,13 +744,13 @@ class Sam3SessionManager(BaseSAMVideoProcessor):
             self._predictor_device = resolved_device
         try:
             session = self._predictor.start_session(
-                resource_path=str(resource_path or self.video_path),
+                resource_path=resource_path,
                 session_id=session_id,
                 offload_video_to_cpu=self.offload_video_to_cpu,
             )
         except TypeError:
             session = self._predictor.start_session(
-                resource_path=str(resource_path or self.video_path),
+                resource_path=resource_path,
                 offload_video_to_cpu=self.offload_video_to_cpu,
             )
         self._session_id = session["session_id"]
@@ -1703,58 +1705,25 @@ class Sam3SessionManager(BaseSAMVideoProcessor):
     ) -> Optional[np.ndarray]:
         return recent_track_mask(self, obj_id, frame_idx=frame_idx)
 
-    @staticmethod
-    def _empty_window_dir(window_dir: Path) -> None:
-        for child in window_dir.glob("*"):
-            if child.is_file():
-                child.unlink(missing_ok=True)
-
     @staticmethod
     def _write_window_frames(
-        window_dir: Path,
+        window_frames: WindowFrameSource,
         frames: List[np.ndarray],
         *,
         previous_count: int = 0,
         shift: int = 0,
     ) -> int:
         """
-        Materialize a window using stable local filenames.
+        Load a window into the in-memory frame source handed to the predictor.
 
-        For heavily overlapping windows, reuse prior files by shifting existing
-        frame files left and writing only the new tail frames.
+        For heavily overlapping windows, already-preprocessed frames are shifted
+        left and only the new tail frames are prepared again.
         """
-        frame_count = len(frames)
-        prev_count = max(0, int(previous_count))
-        shift_count = max(0, int(shift))
-
-        can_shift_reuse = (
-            prev_count > 0
-            and frame_count > 0
-            and shift_count > 0
-            and shift_count < prev_count
-            and frame_count == prev_count
+        return window_frames.update(
+            frames,
+            previous_count=previous_count,
+            shift=shift,
         )
-        if can_shift_reuse:
-            # Shift files left in-place (0..n-1) => (0..n-1-shift), then write
-            # only the last `shift` positions for the new tail frames.
-            for src_idx in range(shift_count, prev_count):
-                src_path = window_dir / f"{src_idx:06d}.jpg"
-                dst_path = window_dir / f"{src_idx - shift_count:06d}.jpg"
-                if src_path.exists():
-                    src_path.replace(dst_path)
-            start_write = max(0, frame_count - shift_count)
-        else:
-            start_write = 0
-
-        for local_idx in range(start_write, frame_count):
-            frame = frames[local_idx]
-            out_path = window_dir / f"{local_idx:06d}.jpg"
-            cv2.imwrite(str(out_path), frame)
-
-        for stale_idx in range(frame_count, max(frame_count, prev_count)):
-            stale_path = window_dir / f"{stale_idx:06d}.jpg"
-            stale_path.unlink(missing_ok=True)
-        return frame_count
 
     def _iter_video_windows(
         self,
@@ -3091,9 +3060,7 @@ class Sam3SessionManager(BaseSAMVideoProcessor):
             self._predictor = self._initialize_predictor(resolved_device)
             self._predictor_device = resolved_device
 
-        with tempfile.TemporaryDirectory(prefix="annolid_sam3p1_windows_") as tmp_root:
-            window_dir = Path(tmp_root) / "frames"
-            window_dir.mkdir(parents=True, exist_ok=True)
+        with WindowFrameSource() as window_frames:
             previous_window_frame_count = 0
             previous_window_end_idx: Optional[int] = None
             previous_window_state: Optional[dict] = None
@@ -3112,8 +3079,8 @@ class Sam3SessionManager(BaseSAMVideoProcessor):
                 window_allowed_gids: Optional[set[int]] = None
                 window_start_idx = int(start_idx)
                 window_end_idx = int(end_idx)
-                # When windows overlap and slide forward by stride, reuse temp
-                # files by shifting existing files and writing only the new tail.
+                # When windows overlap and slide forward by stride, reuse the
+                # prepared frames and only prepare the new tail.
                 shift = compute_window_reuse_shift(
                     previous_window_end_idx=previous_window_end_idx,
                     window_start_idx=window_start_idx,
@@ -3121,14 +3088,14 @@ class Sam3SessionManager(BaseSAMVideoProcessor):
                     previous_window_frame_count=previous_window_frame_count,
                 )
                 previous_window_frame_count = self._write_window_frames(
-                    window_dir,
+                    window_frames,
                     frames,
                     previous_count=previous_window_frame_count,
                     shift=shift,
                 )
                 current_window_end_idx = int(window_end_idx)
                 session_resp = self._predictor.start_session(
-                    resource_path=str(window_dir),
+                    resource_path=window_frames,
                     offload_video_to_cpu=self.offload_video_to_cpu,
                 )
                 session_id = str(session_resp["session_id"])
@@ -3584,9 +3551,7 @@ class Sam3SessionManager(BaseSAMVideoProcessor):
             self._predictor = self._initialize_predictor(resolved_device)
             self._predictor_device = resolved_device
 
-        with tempfile.TemporaryDirectory(prefix="annolid_sam3p1_windows_") as tmp_root:
-            window_dir = Path(tmp_root) / "frames"
-            window_dir.mkdir(parents=True, exist_ok=True)
+        with WindowFrameSource() as window_frames:
             previous_window_frame_count = 0
             previous_window_end_idx: Optional[int] = None
             previous_window_state: Optional[dict] = None
@@ -3626,7 +3591,7 @@ class Sam3SessionManager(BaseSAMVideoProcessor):
                     previous_window_frame_count=previous_window_frame_count,
                 )
                 previous_window_frame_count = self._write_window_frames(
-                    window_dir,
+                    window_frames,
                     frames,
                     previous_count=previous_window_frame_count,
                     shift=shift,
@@ -3635,7 +3600,7 @@ class Sam3SessionManager(BaseSAMVideoProcessor):
                 session_id = self.start_session(
                     target_device=resolved_device,
                     session_id=None,
-                    resource_path=str(window_dir),
+                    resource_path=window_frames,
                 )
                 if previous_window_state is not None and shift > 0:
                     self._carry_forward_window_state(previous_window_state, shift=shift)
@@ -0,0 +1,113 @@
+"""In-memory frame source for SAM3 windowed video propagation.
+
+The windowed runners hand each window of decoded frames to the predictor as a
+:class:`WindowFrameSource` instead of a directory of JPEGs. The bundled SAM3
+loader recognizes it by its ``preprocessed_frames`` method, so frames skip the
+lossy JPEG round-trip and overlapping windows reuse already-resized frames.
+"""
+
+from __future__ import annotations
+
+from typing import List, Optional, Sequence, Tuple
+
+import cv2
+import numpy as np
+import torch
+import torchvision.transforms.functional as TF
+from PIL import Image
+
+
+class WindowFrameSource:
+    """BGR frames of the current window plus their resized model inputs.
+
+    Resized tensors are cached per frame; :meth:`update` shifts the cache on
+    overlapping windows so only the new tail frames are preprocessed again.
+    """
+
+    def __init__(self) -> None:
+        self._frames: List[np.ndarray] = []
+        self._tensors: List[Optional[torch.Tensor]] = []
+        self._image_size: Optional[int] = None
+
+    def __enter__(self) -> "WindowFrameSource":
+        return self
+
+    def __exit__(self, *exc_info) -> None:
+        self.clear()
+
+    def __len__(self) -> int:
+        return len(self._frames)
+
+    def __repr__(self) -> str:
+        return f"<WindowFrameSource frames={len(self._frames)}>"
+
+    def clear(self) -> None:
+        self._frames = []
+        self._tensors = []
+
+    def update(
+        self,
+        frames: Sequence[np.ndarray],
+        *,
+        previous_count: int = 0,
+        shift: int = 0,
+    ) -> int:
+        """Replace the window with ``frames``; returns the new frame count.
+
+        When the window slid forward by ``shift`` frames over a window of the
+        same length, the first ``len(frames) - shift`` cached inputs are kept.
+        """
+        frame_count = len(frames)
+        prev_count = max(0, int(previous_count))
+        shift_count = max(0, int(shift))
+        can_shift_reuse = (
+            prev_count > 0
+            and frame_count > 0
+            and shift_count > 0
+            and shift_count < prev_count
+            and frame_count == prev_count == len(self._tensors)
+        )
+        if can_shift_reuse:
+            tensors = self._tensors[shift_count:] + [None] * shift_count
+        else:
+            tensors = [None] * frame_count
+        self._frames = list(frames)
+        self._tensors = tensors
+        return frame_count
+
+    def preprocessed_frames(self, image_size: int) -> Tuple[torch.Tensor, int, int]:
+        """Stack the window as float16 ``(T, 3, S, S)`` RGB inputs in [0, 1].
+
+        Matches SAM3's image-folder loader (PIL resize, then ``to_tensor``) so
+        results only differ by the JPEG compression that is no longer applied.
+        Returns the stack with the original frame height and width.
+        """
+        if not self._frames:
+            raise RuntimeError("no frames in SAM3 window")
+        image_size = int(image_size)
+        if image_size != self._image_size:
+            self._tensors = [None] * len(self._frames)
+            self._image_size = image_size
+        images = torch.zeros(
+            len(self._frames), 3, image_size, image_size, dtype=torch.float16
+        )
+        for idx, frame in enumerate(self._frames):
+            tensor = self._tensors[idx]
+            if tensor is None:
+                tensor = self._to_tensor(frame, image_size)
+                self._tensors[idx] = tensor
+            images[idx] = tensor
+        height, width = self._frames[0].shape[:2]
+        return images, int(height), int(width)
+
+    @staticmethod
+    def _to_tensor(frame: np.ndarray, image_size: int) -> torch.Tensor:
+        if frame.ndim == 2:
+            rgb = cv2.cvtColor(frame, cv2.COLOR_GRAY2RGB)
+        else:
+            rgb = cv2.cvtColor(frame, cv2.COLOR_BGR2RGB)
+        img = TF.resize(Image.fromarray(rgb), size=(image_size, image_size))
+        return TF.to_tensor(img).to(torch.float16)
+
+
+__all__ = ["WindowFrameSource"]
@@ -0,0 +1,139 @@
+"""Pipelined persistence of CUTIE per-frame instance masks.
+
+Turning a predicted frame into annotations is CPU bound (mask metrics,
+polygon extraction, optional flow medoids) and ends with an annotation-store
+append. :class:`AnnotationWriterPipeline` takes the stateless parts of that
+work off the inference loop:
+
+``render``
+    Runs the per-instance mask work of one frame on a worker pool. It must
+    only read its arguments, never processor state.
+``persist``
+    Runs on a single writer thread, so store appends keep frame order. The
+    job's ``on_written`` callback then runs on the submitting thread, again
+    in frame order.
+
+The stateful checks (bbox cache, mask-jump detection, fallbacks) consume the
+rendered results on the submitting thread before the frame is persisted, so
+the next frame always sees the history a serial loop would.
+
+At most ``max_pending`` frames wait to be persisted. An exception raised by
+a write is re-raised on the submitting thread by the next :meth:`submit`,
+:meth:`drain` or :meth:`flush` call.
+"""
+
+from __future__ import annotations
+
+import os
+from collections import deque
+from concurrent.futures import Future, ThreadPoolExecutor
+from dataclasses import dataclass, field
+from typing import Any, Callable, Deque, Iterable, List, Optional, Tuple, TypeVar
+
+import numpy as np
+
+MAX_ANNOTATION_WRITER_WORKERS = 4
+
+_T = TypeVar("_T")
+_R = TypeVar("_R")
+
+
+def default_annotation_writer_workers() -> int:
+    return max(1, min(MAX_ANNOTATION_WRITER_WORKERS, (os.cpu_count() or 2) // 2))
+
+
+@dataclass
+class RenderedInstance:
+    """Mask-only results computed off the inference loop for one instance."""
+
+    mask: np.ndarray
+    metrics: Optional[Tuple[float, float, float]]
+    kmedoid_shapes: List[Any] = field(default_factory=list)
+    polygon_shapes: List[Any] = field(default_factory=list)
+
+
+@dataclass
+class PersistJob:
+    write: Callable[[], Any]
+    on_written: Optional[Callable[[Any], None]] = None
+
+
+class AnnotationWriterPipeline:
+    """Parallel per-instance render and ordered, bounded persist."""
+
+    def __init__(
+        self,
+        *,
+        workers: int = 2,
+        max_pending: int = 4,
+        name: str = "cutie-annotation",
+    ) -> None:
+        self.workers = max(1, int(workers))
+        self.max_pending = max(1, int(max_pending))
+        self._render_pool = ThreadPoolExecutor(
+            max_workers=self.workers, thread_name_prefix=f"{name}-render"
+        )
+        self._persist_pool = ThreadPoolExecutor(
+            max_workers=1, thread_name_prefix=f"{name}-persist"
+        )
+        self._persisting: Deque[Tuple[int, Future, Optional[Callable[[Any], None]]]] = (
+            deque()
+        )
+        self._closed = False
+
+    @property
+    def pending(self) -> int:
+        return len(self._persisting)
+
+    def render(self, render: Callable[[_T], _R], items: Iterable[_T]) -> List[_R]:
+        """Apply ``render`` to every item on the worker pool, in item order."""
+        if self._closed:
+            raise RuntimeError("Annotation writer pipeline is closed")
+        return list(self._render_pool.map(render, items))
+
+    def submit(self, frame_idx: int, job: PersistJob) -> None:
+        """Queue one frame's write; blocks while ``max_pending`` are in flight."""
+        if self._closed:
+            raise RuntimeError("Annotation writer pipeline is closed")
+        self.drain()
+        while self.pending >= self.max_pending:
+            self._advance(block=True)
+        self._persisting.append(
+            (int(frame_idx), self._persist_pool.submit(job.write), job.on_written)
+        )
+
+    def drain(self) -> None:
+        """Collect every write that has already finished."""
+        while self._advance(block=False):
+            pass
+
+    def flush(self) -> None:
+        """Block until every submitted frame is persisted."""
+        while self._persisting:
+            self._advance(block=True)
+
+    def close(self) -> None:
+        """Stop the workers, letting an in-progress store append finish."""
+        if self._closed:
+            return
+        self._closed = True
+        self._render_pool.shutdown(wait=True)
+        # Let an in-progress store append finish so no record is torn.
+        self._persist_pool.shutdown(wait=True)
+        self._persisting.clear()
+
+    def __enter__(self) -> "AnnotationWriterPipeline":
+        return self
+
+    def __exit__(self, exc_type, exc, tb) -> None:
+        self.close()
+
+    def _advance(self, *, block: bool) -> bool:
+        """Collect the oldest write and run its callback."""
+        if self._persisting and (block or self._persisting[0][1].done()):
+            _frame_idx, future, on_written = self._persisting.popleft()
+            written = future.result()
+            if on_written is not None:
+                on_written(written)
+            return True
+        return False
@@ -6,6 +6,7 @@ import gdown
 import json
 import numpy as np
 from bisect import bisect_right
+from contextlib import contextmanager
 from datetime import datetime, timedelta
 from dataclasses import dataclass, replace
 from pathlib import Path
@@ -13,6 +14,12 @@ from typing import Any, Dict, Iterable, List, Optional, Set, Tuple
 from PIL import Image
 from annolid.gui.shape import MaskShape, Shape
 from annolid.annotation.keypoints import save_labels
+from annolid.segmentation.cutie_vos.annotation_writer import (
+    AnnotationWriterPipeline,
+    PersistJob,
+    RenderedInstance,
+    default_annotation_writer_workers,
+)
 from annolid.segmentation.cutie_vos.interactive_utils import (
     image_to_torch,
     torch_prob_to_numpy_mask,
@@ -41,6 +48,7 @@ from annolid.motion.optical_flow import (
 from annolid.utils import draw
 from annolid.utils.lru_cache import BboxCache
 from annolid.utils.annotation_store import AnnotationStore
+from annolid.core.media.seek_index import VideoSeekIndex, seek_capture
 from hydra.core.global_hydra import GlobalHydra
 
 """
@@ -125,6 +133,17 @@ class CutieCoreVideoProcessor:
         self.max_mem_frames = kwargs.get("t_max_value", 5)
         self.use_cpu_only = kwargs.get("use_cpu_only", False)
         self.epsilon_for_polygon = kwargs.get("epsilon_for_polygon", 2.0)
+        # Polygon/metric post-processing and store appends run on a writer
+        # pipeline next to inference; 0 workers keeps them on the loop.
+        self.annotation_writer_workers = int(
+            kwargs.get(
+                "annotation_writer_workers", default_annotation_writer_workers()
+            )
+        )
+        self.annotation_writer_max_pending = int(
+            kwargs.get("annotation_writer_max_pending", 4)
+        )
+        self._annotation_writer: Optional[AnnotationWriterPipeline] = None
         self.processor = None
         self.num_tracking_instances = 0
         current_file_path = os.path.abspath(__file__)
@@ -1589,28 +1608,37 @@ class CutieCoreVideoProcessor:
                 self.cache.add_bbox(label, _bbox)
 
     def _save_results(self, label, mask):
+        metrics = self._mask_metrics(mask, self._flow_hsv)
+        if metrics is None:
+            return None
+        self._motion_index = metrics[2]
+        return metrics
+
+    @classmethod
+    def _mask_metrics(
+        cls, mask, flow_hsv: Optional[np.ndarray]
+    ) -> Optional[Tuple[float, float, float]]:
+        """Centroid and mean flow magnitude of ``mask``; reads no processor state."""
         try:
             cx, cy = find_mask_center_opencv(mask)
         except ZeroDivisionError as e:
             logger.info(e)
             return None
-        cx = self._normalize_tracking_scalar(cx, default=0.0)
-        cy = self._normalize_tracking_scalar(cy, default=0.0)
-        if self._flow_hsv is not None:
+        cx = cls._normalize_tracking_scalar(cx, default=0.0)
+        cy = cls._normalize_tracking_scalar(cy, default=0.0)
+        if flow_hsv is not None:
             # unnormalized magnitude
-            magnitude = self._flow_hsv[..., 2]
+            magnitude = flow_hsv[..., 2]
             magnitude = magnitude.astype(np.float32)
             mask_sum = np.sum(mask)
             if mask_sum > 0:
-                self._motion_index = np.sum(mask * magnitude) / mask_sum
+                motion_index = np.sum(mask * magnitude) / mask_sum
             else:
-                self._motion_index = 0.0
+                motion_index = 0.0
         else:
-            self._motion_index = -1
-        self._motion_index = self._normalize_tracking_scalar(
-            self._motion_index, default=-1.0
-        )
-        return cx, cy, self._motion_index
+            motion_index = -1
+        motion_index = cls._normalize_tracking_scalar(motion_index, default=-1.0)
+        return cx, cy, motion_index
 
     def _save_annotation(self, filename, mask_dict, frame_shape):
         return self._save_annotation_with_notes(
@@ -1626,13 +1654,79 @@ class CutieCoreVideoProcessor:
         mask_dict,
         frame_shape,
         shape_notes: Optional[Dict[str, str]] = None,
+        rendered: Optional[Dict[str, RenderedInstance]] = None,
     ):
-        height, width, _ = frame_shape
+        label_list = self._build_frame_annotation(
+            mask_dict, frame_shape, shape_notes=shape_notes, rendered=rendered
+        )
+        height, width = frame_shape[:2]
+        written = self._write_frame_annotation(filename, label_list, height, width)
+        self._record_frame_annotation(filename, label_list, written)
+        return label_list
+
+    def _instance_polygon_shapes(
+        self,
+        label: str,
+        mask: np.ndarray,
+        metrics: Tuple[float, float, float],
+        note: Optional[str],
+    ) -> List[Shape]:
+        cx, cy, motion_index = metrics
+        note_text = str(note or "").strip()
+        description = f"motion_index: {motion_index}"
+        if note_text:
+            description += f"; note: {note_text}"
+
+        current_shape = MaskShape(
+            label=label,
+            flags={},
+            description=description,
+        )
+        current_shape.other_data = {
+            "cx": cx,
+            "cy": cy,
+            "motion_index": motion_index,
+            "annotation_source": "cutie_vos",
+        }
+        if note_text:
+            current_shape.other_data["note"] = note_text
+        current_shape.mask = mask
+        return current_shape.toPolygons(epsilon=self.epsilon_for_polygon)
+
+    def _render_instance_annotation(
+        self,
+        label: str,
+        mask: np.ndarray,
+        note: Optional[str],
+        flow: Optional[np.ndarray],
+        flow_hsv: Optional[np.ndarray],
+    ) -> RenderedInstance:
+        """Mask-only part of :meth:`_build_frame_annotation`; safe off-thread."""
+        metrics = self._mask_metrics(mask, flow_hsv)
+        if metrics is None:
+            return RenderedInstance(mask=mask, metrics=None)
+        return RenderedInstance(
+            mask=mask,
+            metrics=metrics,
+            kmedoid_shapes=self._kmedoids_shapes(mask, flow),
+            polygon_shapes=self._instance_polygon_shapes(label, mask, metrics, note),
+        )
+
+    def _build_frame_annotation(
+        self,
+        mask_dict,
+        frame_shape,
+        *,
+        shape_notes: Optional[Dict[str, str]] = None,
+        rendered: Optional[Dict[str, RenderedInstance]] = None,
+    ) -> List[Shape]:
+        height, width = frame_shape[:2]
         frame_area = height * width
         label_list = []
         persisted_masks: Dict[str, np.ndarray] = {}
         failed_shapes: Dict[str, Dict[str, Any]] = {}
         shape_notes = shape_notes or {}
+        rendered = rendered or {}
         for label_id, mask in mask_dict.items():
             label = str(label_id)
             mask, corrected = self._sanitize_full_frame_artifact(
@@ -1659,7 +1753,16 @@ class CutieCoreVideoProcessor:
                 }
                 continue
 
-            metrics = self._save_results(label, mask)
+            prepared = rendered.get(label)
+            if prepared is not None and prepared.mask is not mask:
+                # Sanitation replaced the mask, so the render no longer applies.
+                prepared = None
+            if prepared is not None:
+                metrics = prepared.metrics
+                if metrics is not None:
+                    self._motion_index = metrics[2]
+            else:
+                metrics = self._save_results(label, mask)
             if metrics is None:
                 failed_shapes[label] = {
                     "mask": np.asarray(mask).astype(bool),
@@ -1668,27 +1771,14 @@ class CutieCoreVideoProcessor:
                 }
                 continue
             cx, cy, motion_index = metrics
-            self.save_KMedoids_in_mask(label_list, mask)
-            note_text = str(shape_notes.get(label, "") or "").strip()
-            description = f"motion_index: {motion_index}"
-            if note_text:
-                description += f"; note: {note_text}"
-
-            current_shape = MaskShape(
-                label=label,
-                flags={},
-                description=description,
-            )
-            current_shape.other_data = {
-                "cx": cx,
-                "cy": cy,
-                "motion_index": motion_index,
-                "annotation_source": "cutie_vos",
-            }
-            if note_text:
-                current_shape.other_data["note"] = note_text
-            current_shape.mask = mask
-            _shapes = current_shape.toPolygons(epsilon=self.epsilon_for_polygon)
+            if prepared is not None:
+                label_list.extend(prepared.kmedoid_shapes)
+                _shapes = prepared.polygon_shapes
+            else:
+                self.save_KMedoids_in_mask(label_list, mask)
+                _shapes = self._instance_polygon_shapes(
+                    label, mask, metrics, shape_notes.get(label)
+                )
             if len(_shapes) <= 0:
                 failed_shapes[label] = {
                     "mask": np.asarray(mask).astype(bool),
@@ -1840,6 +1930,13 @@ class CutieCoreVideoProcessor:
                 repair_source=repair_source,
             )
         self._last_saved_instance_masks = persisted_masks
+        return label_list
+
+    @staticmethod
+    def _write_frame_annotation(
+        filename, label_list: List[Shape], height: int, width: int
+    ) -> Dict[str, bool]:
+        """Append the frame to the annotation store; touches no processor state."""
         save_labels(
             filename=filename,
             imagePath=None,
@@ -1850,6 +1947,14 @@ class CutieCoreVideoProcessor:
             persist_json=False,
             merge_existing=False,
         )
+        return {
+            "json_exists": Path(filename).exists(),
+            "png_exists": Path(filename).with_suffix(".png").exists(),
+        }
+
+    def _record_frame_annotation(
+        self, filename, label_list: List[Shape], written: Dict[str, bool]
+    ) -> None:
         frame_idx = AnnotationStore.frame_number_from_path(Path(filename))
         if frame_idx is None:
             try:
@@ -1863,13 +1968,108 @@ class CutieCoreVideoProcessor:
                 shape_count=len(label_list),
                 polygon_count=len(label_list),
                 has_valid_shapes=bool(len(label_list)),
-                json_exists=Path(filename).exists(),
-                png_exists=Path(filename).with_suffix(".png").exists(),
+                json_exists=bool(written.get("json_exists")),
+                png_exists=bool(written.get("png_exists")),
                 store_record_exists=True,
             )
             if bool(getattr(self, "_tracking_stats_dirty", False)):
                 self._flush_tracking_stats(force=False)
-        return label_list
+
+    @contextmanager
+    def _annotation_frame_context(self, frame_idx: int):
+        """Run a deferred write callback as of ``frame_idx`` while the loop moved on."""
+        saved = self._frame_number
+        self._frame_number = frame_idx
+        try:
+            yield
+        finally:
+            self._frame_number = saved
+
+    def _open_annotation_writer(self) -> Optional[AnnotationWriterPipeline]:
+        workers = int(getattr(self, "annotation_writer_workers", 0) or 0)
+        if workers <= 0:
+            return None
+        return AnnotationWriterPipeline(
+            workers=workers,
+            max_pending=int(getattr(self, "annotation_writer_max_pending", 4)),
+        )
+
+    def _flush_annotation_writer(self) -> None:
+        """Persist every queued frame before the loop appends to the store itself."""
+        writer = getattr(self, "_annotation_writer", None)
+        if writer is not None:
+            writer.flush()
+
+    def _submit_frame_annotation(
+        self,
+        filename,
+        frame_idx: int,
+        frame: np.ndarray,
+        mask_dict: Dict[str, np.ndarray],
+        shape_notes: Dict[str, str],
+        instance_names: Set[str],
+    ) -> None:
+        """Persist one predicted frame, pipelined when a writer is open.
+
+        Without a writer the frame is saved inline. With one, polygons and
+        metrics of the frame's instances render in parallel on the writer's
+        pool; the stateful checks and the recent-mask bookkeeping then run
+        on this thread before it returns, so the next frame sees them, and
+        only the store append is left to the writer thread.
+        """
+        writer = getattr(self, "_annotation_writer", None)
+        if writer is None:
+            self._save_annotation_with_notes(
+                filename,
+                mask_dict,
+                frame.shape,
+                shape_notes=shape_notes,
+            )
+        else:
+            flow, flow_hsv = self._flow, self._flow_hsv
+            items = [(str(label), mask) for label, mask in mask_dict.items()]
+
+            def render(item: Tuple[str, np.ndarray]) -> RenderedInstance:
+                label, mask = item
+                return self._render_instance_annotation(
+                    label, mask, shape_notes.get(label), flow, flow_hsv
+                )
+
+            rendered = {
+                label: instance
+                for (label, _mask), instance in zip(items, writer.render(render, items))
+            }
+            label_list = self._build_frame_annotation(
+                mask_dict,
+                frame.shape,
+                shape_notes=shape_notes,
+                rendered=rendered,
+            )
+            height, width = frame.shape[:2]
+
+            def on_written(written: Dict[str, bool]) -> None:
+                with self._annotation_frame_context(frame_idx):
+                    self._record_frame_annotation(filename, label_list, written)
+
+            writer.submit(
+                frame_idx,
+                PersistJob(
+                    write=lambda: self._write_frame_annotation(
+                        filename, label_list, height, width
+                    ),
+                    on_written=on_written,
+                ),
+            )
+        saved_mask_dict = getattr(self, "_last_saved_instance_masks", {})
+        if not isinstance(saved_mask_dict, dict):
+            saved_mask_dict = {}
+        self._update_recent_instance_masks(frame_idx, saved_mask_dict)
+        self._cache_recovery_seed_frame(
+            frame_idx,
+            frame,
+            saved_mask_dict,
+            instance_names,
+        )
 
     def _sanitize_full_frame_artifact(
         self, label: str, mask: np.ndarray, frame_area: float
@@ -2173,8 +2373,12 @@ class CutieCoreVideoProcessor:
         return True
 
     def save_KMedoids_in_mask(self, label_list, mask):
-        if self._flow is not None and self.showing_KMedoids_in_mask:
-            flow_points = extract_flow_points_in_mask(mask, self._flow)
+        label_list.extend(self._kmedoids_shapes(mask, self._flow))
+
+    def _kmedoids_shapes(self, mask, flow: Optional[np.ndarray]) -> List[Shape]:
+        shapes: List[Shape] = []
+        if flow is not None and self.showing_KMedoids_in_mask:
+            flow_points = extract_flow_points_in_mask(mask, flow)
             for fpoint in flow_points.tolist():
                 fpoint_shape = Shape(
                     label="kmedoids",
@@ -2183,7 +2387,8 @@ class CutieCoreVideoProcessor:
                     description="kmedoids of flow in mask",
                 )
                 fpoint_shape.points = [fpoint]
-                label_list.append(fpoint_shape)
+                shapes.append(fpoint_shape)
+        return shapes
 
     def _update_recent_instance_masks(
         self,
@@ -2788,6 +2993,18 @@ class CutieCoreVideoProcessor:
 
         return [*selected_prior, *future]
 
+    def _build_video_seek_index_in_background(self) -> None:
+        video_name = self.video_name
+        if getattr(self, "_video_seek_index_requested", None) == video_name:
+            return
+        self._video_seek_index_requested = video_name
+
+        def _attach(seek_index: Optional[VideoSeekIndex]) -> None:
+            if seek_index is not None and self.video_name == video_name:
+                self._video_seek_index = seek_index
+
+        VideoSeekIndex.build_in_background(video_name, _attach)
+
     def _run_segments(
         self,
         segments: List[SeedSegment],
@@ -2817,6 +3034,17 @@ class CutieCoreVideoProcessor:
         fps = cap.get(cv2.CAP_PROP_FPS)
         total_frames = int(cap.get(cv2.CAP_PROP_FRAME_COUNT))
         last_frame_index = max(0, total_frames - 1)
+        # Seed frames are reached by random access; a keyframe index keeps
+        # those seeks exact and bounded by one GOP on long-GOP recordings.
+        # Probing a long video can take minutes, so a missing index is built
+        # in the background and plain frame seeks are used until it lands.
+        try:
+            self._video_seek_index = VideoSeekIndex.load(self.video_name)
+        except Exception as exc:  # pragma: no cover - best effort
+            logger.debug("Seek index unavailable for %s: %s", self.video_name, exc)
+            self._video_seek_index = None
+        if self._video_seek_index is None:
+            self._build_video_seek_index_in_background()
         frame_width = int(cap.get(cv2.CAP_PROP_FRAME_WIDTH))
         frame_height = int(cap.get(cv2.CAP_PROP_FRAME_HEIGHT))
 
@@ -2952,7 +3180,21 @@ class CutieCoreVideoProcessor:
 
         return final_message or "CUTIE processing completed."
 
-    def _process_segment(
+    def _process_segment(self, *args, **kwargs) -> (Optional[str], bool):
+        """Run CUTIE on a single contiguous segment with a pipelined writer."""
+        writer = self._open_annotation_writer()
+        self._annotation_writer = writer
+        try:
+            result = self._process_segment_frames(*args, **kwargs)
+            if writer is not None:
+                writer.flush()
+            return result
+        finally:
+            self._annotation_writer = None
+            if writer is not None:
+                writer.close()
+
+    def _process_segment_frames(
         self,
         cap,
         segment: SeedSegment,
@@ -3037,8 +3279,14 @@ class CutieCoreVideoProcessor:
             with torch.amp.autocast(
                 "cuda", enabled=self.cfg.amp and self.device == "cuda"
             ):
-                if int(cap.get(cv2.CAP_PROP_POS_FRAMES)) != current_frame_index:
-                    cap.set(cv2.CAP_PROP_POS_FRAMES, current_frame_index)
+                capture_position = int(cap.get(cv2.CAP_PROP_POS_FRAMES))
+                if capture_position != current_frame_index:
+                    seek_capture(
+                        cap,
+                        current_frame_index,
+                        getattr(self, "_video_seek_index", None),
+                        current_position=capture_position,
+                    )
                 while cap.isOpened():
                     if self._should_stop(pred_worker):
                         return (None, True)
@@ -3478,6 +3726,7 @@ class CutieCoreVideoProcessor:
                                 message_with_index = (
                                     message + delimiter + str(current_frame_index)
                                 )
+                                self._flush_annotation_writer()
                                 self._save_annotation_with_notes(
                                     filename,
                                     mask_dict,
@@ -3497,22 +3746,12 @@ class CutieCoreVideoProcessor:
                                 return (message_with_index, True)
 
                     if not frame_already_labeled:
-                        self._save_annotation_with_notes(
+                        self._submit_frame_annotation(
                             filename,
-                            mask_dict,
-                            frame.shape,
-                            shape_notes=shape_notes_for_frame,
-                        )
-                        saved_mask_dict = getattr(self, "_last_saved_instance_masks", {})
-                        if not isinstance(saved_mask_dict, dict):
-                            saved_mask_dict = {}
-                        self._update_recent_instance_masks(
-                            current_frame_index, saved_mask_dict
-                        )
-                        self._cache_recovery_seed_frame(
                             current_frame_index,
                             frame,
-                            saved_mask_dict,
+                            mask_dict,
+                            shape_notes_for_frame,
                             instance_names,
                         )
 
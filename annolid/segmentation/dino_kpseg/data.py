@@ -19,6 +19,10 @@ from annolid.annotation.keypoint_visibility import (
     visibility_from_labelme_shape,
 )
 from annolid.features import Dinov3Config, Dinov3FeatureExtractor
+from annolid.segmentation.dino_kpseg.feature_store import (
+    DinoKPSEGFeatureStore,
+    DinoKPSEGFeatureStoreWriter,
+)
 from annolid.segmentation.dino_kpseg.keypoints import infer_flip_idx_from_names
 from annolid.utils.logger import logger
 
@@ -1770,6 +1774,11 @@ class DinoKPSEGPoseDataset(torch.utils.data.Dataset):
 
         if self.cache_dir is not None:
             self.cache_dir.mkdir(parents=True, exist_ok=True)
+        # Consolidated memory-mapped cache (see ``feature_store``); read first,
+        # with per-image ``.pt`` files as the fallback. When a writer is
+        # attached (``dino-kpseg-precompute``) new features go to the store.
+        self._feature_store_reader: Optional[DinoKPSEGFeatureStore] = None
+        self.feature_store_writer: Optional[DinoKPSEGFeatureStoreWriter] = None
 
         self._getitem_error_count = 0
 
@@ -2023,6 +2032,13 @@ class DinoKPSEGPoseDataset(torch.utils.data.Dataset):
         self, image_path: Path, *, cache_salt: Optional[bytes] = None
     ) -> Path:
         assert self.cache_dir is not None
+        return (
+            self.cache_dir / f"{self._cache_key(image_path, cache_salt=cache_salt)}.pt"
+        )
+
+    def _cache_key(
+        self, image_path: Path, *, cache_salt: Optional[bytes] = None
+    ) -> str:
         # Cache key must include extractor config; otherwise switching DINO backbones
         # will reuse incompatible cached features (e.g., 384 vs 1024 channels).
         cfg = getattr(self.extractor, "cfg", None)
@@ -2047,8 +2063,19 @@ class DinoKPSEGPoseDataset(torch.utils.data.Dataset):
         )
         if cache_salt:
             payload = payload + b"|" + bytes(cache_salt)
-        digest = hashlib.sha1(payload).hexdigest()
-        return self.cache_dir / f"{digest}.pt"
+        return hashlib.sha1(payload).hexdigest()
+
+    def _feature_store(self) -> Optional[DinoKPSEGFeatureStore]:
+        if self.cache_dir is None:
+            return None
+        reader = self._feature_store_reader
+        if reader is None:
+            reader = DinoKPSEGFeatureStore.open(self.cache_dir)
+            if reader is None:
+                # Not built yet; look again on the next item.
+                return None
+            self._feature_store_reader = reader
+        return reader
 
     def _load_or_compute_features(
         self,
@@ -2062,14 +2089,25 @@ class DinoKPSEGPoseDataset(torch.utils.data.Dataset):
             feats = merge_feature_layers(feats, mode=self.feature_merge)
             return feats.to(dtype=self.cache_dtype)
 
-        cache_path = self._cache_path(image_path, cache_salt=cache_salt)
+        cache_key = self._cache_key(image_path, cache_salt=cache_salt)
+        store = self._feature_store()
+        if store is not None:
+            try:
+                cached = store.get(cache_key)
+            except Exception as exc:
+                logger.debug("Feature store read failed for %s: %s", cache_key, exc)
+                cached = None
+            if cached is not None and self._is_compatible_cached_features(cached):
+                return cached
+
+        cache_path = self.cache_dir / f"{cache_key}.pt"
         if cache_path.exists():
             try:
                 payload = torch.load(cache_path, map_location="cpu")
                 if isinstance(payload, torch.Tensor):
                     cached = merge_feature_layers(payload, mode=self.feature_merge)
                     if self._is_compatible_cached_features(cached):
-                        return cached
+                        return self._store_features(cache_key, cached)
                 if isinstance(payload, dict) and isinstance(
                     payload.get("feats"), torch.Tensor
                 ):
@@ -2077,7 +2115,7 @@ class DinoKPSEGPoseDataset(torch.utils.data.Dataset):
                         payload["feats"], mode=self.feature_merge
                     )
                     if self._is_compatible_cached_features(cached):
-                        return cached
+                        return self._store_features(cache_key, cached)
             except Exception:
                 pass
 
@@ -2085,12 +2123,24 @@ class DinoKPSEGPoseDataset(torch.utils.data.Dataset):
         feats = merge_feature_layers(feats, mode=self.feature_merge).to(
             dtype=self.cache_dtype
         )
+        if self.feature_store_writer is not None:
+            return self._store_features(cache_key, feats)
         try:
             torch.save({"feats": feats}, cache_path)
         except Exception:
             pass
         return feats
 
+    def _store_features(self, cache_key: str, feats: torch.Tensor) -> torch.Tensor:
+        """Add ``feats`` to the attached feature store writer, if any."""
+        writer = self.feature_store_writer
+        if writer is not None:
+            try:
+                writer.add(cache_key, feats)
+            except Exception as exc:
+                logger.warning("Failed to add %s to feature store: %s", cache_key, exc)
+        return feats
+
     def _is_compatible_cached_features(self, feats: torch.Tensor) -> bool:
         try:
             if feats.ndim == 4:
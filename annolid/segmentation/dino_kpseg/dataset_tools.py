@@ -30,6 +30,7 @@ from annolid.segmentation.dino_kpseg.data import (
     materialize_coco_pose_as_yolo,
 )
 from annolid.segmentation.dino_kpseg import defaults as dino_defaults
+from annolid.segmentation.dino_kpseg.feature_store import DinoKPSEGFeatureStoreWriter
 from annolid.segmentation.dino_kpseg.format_utils import (
     normalize_dino_kpseg_data_format,
 )
@@ -934,33 +935,36 @@ def precompute_features(
                 ("val", val_images, val_labels),
             ]
 
-        for split_name, images, label_paths in split_items:
-            if not images:
-                summary["counts"][split_name] = 0
-                continue
-            ds = DinoKPSEGPoseDataset(
-                list(images),
-                kpt_count=kpt_count,
-                kpt_dims=kpt_dims,
-                radius_px=6.0,
-                extractor=extractor,
-                label_format=str(data_format_norm),
-                label_paths=label_paths,
-                keypoint_names=keypoint_names,
-                flip_idx=flip_idx,
-                augment=None,
-                cache_dir=cache_dir,
-                mask_type="gaussian",
-                heatmap_sigma_px=None,
-                instance_mode=str(instance_mode),
-                bbox_scale=float(bbox_scale),
-                cache_dtype=torch_dtype,
-                return_images=False,
-                feature_merge=str(feature_merge),
-            )
-            for idx in range(len(ds)):
-                _ = ds[int(idx)]
-            summary["counts"][split_name] = int(len(ds))
+        with DinoKPSEGFeatureStoreWriter(cache_dir) as store_writer:
+            for split_name, images, label_paths in split_items:
+                if not images:
+                    summary["counts"][split_name] = 0
+                    continue
+                ds = DinoKPSEGPoseDataset(
+                    list(images),
+                    kpt_count=kpt_count,
+                    kpt_dims=kpt_dims,
+                    radius_px=6.0,
+                    extractor=extractor,
+                    label_format=str(data_format_norm),
+                    label_paths=label_paths,
+                    keypoint_names=keypoint_names,
+                    flip_idx=flip_idx,
+                    augment=None,
+                    cache_dir=cache_dir,
+                    mask_type="gaussian",
+                    heatmap_sigma_px=None,
+                    instance_mode=str(instance_mode),
+                    bbox_scale=float(bbox_scale),
+                    cache_dtype=torch_dtype,
+                    return_images=False,
+                    feature_merge=str(feature_merge),
+                )
+                ds.feature_store_writer = store_writer
+                for idx in range(len(ds)):
+                    _ = ds[int(idx)]
+                summary["counts"][split_name] = int(len(ds))
+        summary["feature_store"] = store_writer.summary()
 
         return summary
     finally:
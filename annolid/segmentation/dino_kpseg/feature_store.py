@@ -0,0 +1,340 @@
+"""Sharded, memory-mapped store for cached DINO KPSEG features.
+
+The store replaces thousands of small ``<digest>.pt`` files with a handful of
+large raw shards plus one index, all inside ``<cache_dir>/feature_store``::
+
+    index.npy          structured array: key, shard, offset, shape, dtype
+    shard_00000.bin    raw feature arrays, 64-byte aligned, back to back
+    shard_00001.bin    ...
+
+Keys are the same SHA-1 digests used for the per-file ``.pt`` cache, so the
+extractor config and per-instance cache salt stay part of the key. Shards are
+mapped copy-on-write, so :meth:`DinoKPSEGFeatureStore.get` returns tensors
+that share memory with the page cache: DataLoader workers reading the same
+store share one physical copy and never pay ``torch.load`` pickle costs.
+
+Shards are immutable once the index referencing them has been published;
+writers always append new shards, which keeps concurrent readers safe.
+Several writers may share a store: each claims fresh shard numbers with an
+exclusive create, and publishing merges its entries into the index on disk
+while holding ``index.lock``.
+"""
+
+from __future__ import annotations
+
+import contextlib
+import os
+import tempfile
+import threading
+from pathlib import Path
+from typing import Dict, List, Optional
+
+import numpy as np
+import torch
+
+from annolid.utils.logger import logger
+
+try:  # POSIX
+    import fcntl
+except ImportError:  # pragma: no cover - Windows
+    fcntl = None
+try:  # Windows
+    import msvcrt
+except ImportError:
+    msvcrt = None
+
+STORE_DIRNAME = "feature_store"
+INDEX_FILENAME = "index.npy"
+LOCK_FILENAME = "index.lock"
+DEFAULT_SHARD_BYTES = 1 << 30
+_ALIGNMENT = 64
+_INDEX_DTYPE = np.dtype(
+    [
+        ("key", "S40"),
+        ("shard", "<i4"),
+        ("offset", "<i8"),
+        ("channels", "<i4"),
+        ("height", "<i4"),
+        ("width", "<i4"),
+        ("dtype", "S8"),
+    ]
+)
+_SUPPORTED_DTYPES = {"float16", "float32"}
+
+
+def feature_store_dir(cache_dir: Path) -> Path:
+    return Path(cache_dir) / STORE_DIRNAME
+
+
+def _shard_path(root: Path, shard: int) -> Path:
+    return root / f"shard_{int(shard):05d}.bin"
+
+
+def _load_index(root: Path) -> np.ndarray:
+    path = root / INDEX_FILENAME
+    if not path.exists():
+        return np.zeros((0,), dtype=_INDEX_DTYPE)
+    index = np.load(path, allow_pickle=False)
+    if index.dtype != _INDEX_DTYPE:
+        raise ValueError(f"Unsupported feature store index layout: {path}")
+    return index
+
+
+@contextlib.contextmanager
+def _index_lock(root: Path):
+    """Hold the store's inter-process index lock for the ``with`` body."""
+    with open(root / LOCK_FILENAME, "a+b") as fh:
+        if fcntl is not None:
+            fcntl.flock(fh.fileno(), fcntl.LOCK_EX)
+        elif msvcrt is not None:  # pragma: no cover - Windows
+            fh.seek(0)
+            msvcrt.locking(fh.fileno(), msvcrt.LK_LOCK, 1)
+        try:
+            yield
+        finally:
+            if fcntl is not None:
+                fcntl.flock(fh.fileno(), fcntl.LOCK_UN)
+            elif msvcrt is not None:  # pragma: no cover - Windows
+                fh.seek(0)
+                msvcrt.locking(fh.fileno(), msvcrt.LK_UNLCK, 1)
+
+
+def _index_signature(root: Path) -> Optional[tuple]:
+    try:
+        stat = (root / INDEX_FILENAME).stat()
+    except OSError:
+        return None
+    return (stat.st_mtime_ns, stat.st_size)
+
+
+class DinoKPSEGFeatureStore:
+    """Read-only view of a feature store; safe to share with DataLoader workers.
+
+    The index and shard mappings are opened lazily and dropped when pickled,
+    so each worker process maps the shards itself on first access. A lookup
+    that misses reloads the index if a writer has published a new one.
+    """
+
+    def __init__(self, root: Path) -> None:
+        self.root = Path(root)
+        self._lock = threading.Lock()
+        self._rows: Optional[Dict[bytes, int]] = None
+        self._index: Optional[np.ndarray] = None
+        self._signature: Optional[tuple] = None
+        self._shards: Dict[int, np.memmap] = {}
+
+    @classmethod
+    def open(cls, cache_dir: Path) -> Optional["DinoKPSEGFeatureStore"]:
+        """Return the store under ``cache_dir`` or None when none was built."""
+        root = feature_store_dir(cache_dir)
+        if not (root / INDEX_FILENAME).exists():
+            return None
+        return cls(root)
+
+    def __getstate__(self) -> dict:
+        return {"root": self.root}
+
+    def __setstate__(self, state: dict) -> None:
+        self.__init__(state["root"])
+
+    def __len__(self) -> int:
+        return len(self._ensure_rows())
+
+    def __contains__(self, key: str) -> bool:
+        return str(key).encode("ascii") in self._ensure_rows()
+
+    def keys(self) -> List[str]:
+        return [key.decode("ascii") for key in self._ensure_rows()]
+
+    def get(self, key: str) -> Optional[torch.Tensor]:
+        """Return the ``(C, H, W)`` features for ``key`` without copying."""
+        encoded = str(key).encode("ascii")
+        row = self._ensure_rows().get(encoded)
+        if row is None and self.refresh():
+            row = self._ensure_rows().get(encoded)
+        if row is None:
+            return None
+        entry = self._index[row]
+        dtype = np.dtype(entry["dtype"].decode("ascii"))
+        shape = (int(entry["channels"]), int(entry["height"]), int(entry["width"]))
+        nbytes = int(np.prod(shape)) * dtype.itemsize
+        offset = int(entry["offset"])
+        shard = self._shard(int(entry["shard"]))
+        if offset + nbytes > shard.shape[0]:
+            logger.warning(
+                "Feature store entry %s points past the end of shard %d; ignoring.",
+                key,
+                int(entry["shard"]),
+            )
+            return None
+        array = shard[offset : offset + nbytes].view(dtype).reshape(shape)
+        return torch.from_numpy(array)
+
+    def refresh(self) -> bool:
+        """Drop the loaded index if a newer one was published; True if so."""
+        with self._lock:
+            if self._rows is None or _index_signature(self.root) == self._signature:
+                return False
+            self._rows = None
+            self._index = None
+            return True
+
+    def _ensure_rows(self) -> Dict[bytes, int]:
+        rows = self._rows
+        if rows is not None:
+            return rows
+        with self._lock:
+            if self._rows is None:
+                self._signature = _index_signature(self.root)
+                index = _load_index(self.root)
+                # Later rows win so a re-populated key supersedes the old copy.
+                self._rows = {bytes(key): row for row, key in enumerate(index["key"])}
+                self._index = index
+            return self._rows
+
+    def _shard(self, shard: int) -> np.memmap:
+        mapped = self._shards.get(shard)
+        if mapped is None:
+            with self._lock:
+                mapped = self._shards.get(shard)
+                if mapped is None:
+                    # Copy-on-write keeps the tensors writable for torch while
+                    # the file itself can never be modified through them.
+                    mapped = np.memmap(
+                        _shard_path(self.root, shard), dtype=np.uint8, mode="c"
+                    )
+                    self._shards[shard] = mapped
+        return mapped
+
+
+class DinoKPSEGFeatureStoreWriter:
+    """Append features to a store; publishes the index atomically on close.
+
+    Existing shards are never modified. New entries go into fresh shards that
+    are rolled over at ``shard_bytes``; keys already present are skipped.
+    Concurrent writers never share a shard, and on close each one merges its
+    entries into the index on disk under the store's index lock.
+    """
+
+    def __init__(self, cache_dir: Path, *, shard_bytes: int = DEFAULT_SHARD_BYTES):
+        self.root = feature_store_dir(cache_dir)
+        self.root.mkdir(parents=True, exist_ok=True)
+        self.shard_bytes = max(_ALIGNMENT, int(shard_bytes))
+        self._existing = _load_index(self.root)
+        self._keys = {bytes(key) for key in self._existing["key"]}
+        self._rows: List[tuple] = []
+        self._next_shard = (
+            int(self._existing["shard"].max()) + 1 if len(self._existing) else 0
+        )
+        self._shard: Optional[int] = None
+        self._fh = None
+        self._offset = 0
+        self._bytes_written = 0
+        self._lock = threading.Lock()
+
+    def __enter__(self) -> "DinoKPSEGFeatureStoreWriter":
+        return self
+
+    def __exit__(self, exc_type, exc, tb) -> None:
+        self.close()
+
+    def __contains__(self, key: str) -> bool:
+        return str(key).encode("ascii") in self._keys
+
+    def add(self, key: str, feats: torch.Tensor | np.ndarray) -> bool:
+        """Append ``feats`` (C, H, W) under ``key``; returns False if present."""
+        encoded = str(key).encode("ascii")
+        if isinstance(feats, torch.Tensor):
+            tensor = feats.detach().cpu()
+            if tensor.dtype not in (torch.float16, torch.float32):
+                tensor = tensor.to(torch.float32)
+            array = tensor.contiguous().numpy()
+        else:
+            array = np.ascontiguousarray(feats)
+        if array.ndim != 3:
+            raise ValueError(f"Expected (C, H, W) features, got shape {array.shape}")
+        if array.dtype.name not in _SUPPORTED_DTYPES:
+            array = array.astype(np.float32)
+        with self._lock:
+            if encoded in self._keys:
+                return False
+            padding = (-self._offset) % _ALIGNMENT
+            if (
+                self._fh is None
+                or self._offset + padding + array.nbytes > self.shard_bytes
+            ):
+                self._roll_shard()
+                padding = 0
+            if padding:
+                self._fh.write(b"\0" * padding)
+                self._offset += padding
+            self._fh.write(array.tobytes(order="C"))
+            self._rows.append(
+                (
+                    encoded,
+                    self._shard,
+                    self._offset,
+                    array.shape[0],
+                    array.shape[1],
+                    array.shape[2],
+                    array.dtype.name.encode("ascii"),
+                )
+            )
+            self._keys.add(encoded)
+            self._offset += array.nbytes
+            self._bytes_written += array.nbytes
+        return True
+
+    def close(self) -> None:
+        with self._lock:
+            if self._fh is not None:
+                self._fh.close()
+                self._fh = None
+            if not self._rows:
+                return
+            rows = np.array(self._rows, dtype=_INDEX_DTYPE)
+            with _index_lock(self.root):
+                # Another writer may have published since this one started.
+                existing = _load_index(self.root)
+                known = set(existing["key"].tolist())
+                fresh = rows[[key not in known for key in rows["key"].tolist()]]
+                index = np.concatenate([existing, fresh])
+                self._publish_index(index)
+            self._existing = index
+            self._keys.update(bytes(key) for key in index["key"])
+            self._rows = []
+
+    def summary(self) -> dict:
+        return {
+            "path": str(self.root),
+            "entries": int(len(self._keys)),
+            "bytes_written": int(self._bytes_written),
+            "shards": int(self._next_shard),
+        }
+
+    def _roll_shard(self) -> None:
+        if self._fh is not None:
+            self._fh.close()
+            self._fh = None
+        # Exclusive create claims the number even against other writers.
+        while self._fh is None:
+            shard = self._next_shard
+            self._next_shard += 1
+            try:
+                self._fh = _shard_path(self.root, shard).open("xb")
+            except FileExistsError:
+                continue
+            self._shard = shard
+        self._offset = 0
+
+    def _publish_index(self, index: np.ndarray) -> None:
+        fd, temp_name = tempfile.mkstemp(
+            dir=str(self.root), prefix=f"{INDEX_FILENAME}.", suffix=".tmp"
+        )
+        try:
+            with os.fdopen(fd, "wb") as fh:
+                np.save(fh, index, allow_pickle=False)
+            os.replace(temp_name, self.root / INDEX_FILENAME)
+        finally:
+            if os.path.exists(temp_name):
+                os.unlink(temp_name)
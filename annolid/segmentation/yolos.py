@@ -1,6 +1,17 @@
+import queue
+import threading
 from collections import defaultdict
 from pathlib import Path
-from typing import TYPE_CHECKING, Dict, List, Optional, Sequence, Tuple
+from typing import (
+    TYPE_CHECKING,
+    Callable,
+    Dict,
+    Iterator,
+    List,
+    Optional,
+    Sequence,
+    Tuple,
+)
 
 import numpy as np
 import yaml
@@ -431,6 +442,7 @@ class InferenceProcessor:
         enable_tracking: bool = True,
         tracker: Optional[str] = None,
         save_pose_bbox: Optional[bool] = None,
+        batch_size: int = 1,
     ) -> str:
         """
         Runs inference on the given source and writes results into Annolid's annotation store.
@@ -440,6 +452,10 @@ class InferenceProcessor:
 
         Args:
             source (str): Path to the video file.
+            batch_size (int): Frames per ``predict()`` call for video files. Values
+                above 1 decode ahead on a background thread and only apply when
+                frames are predicted independently (no tracking, visual prompts
+                or CoreML).
 
         Returns:
             A string message indicating the completion and frame count.
@@ -523,14 +539,18 @@ class InferenceProcessor:
         #
         # Ultralytics' video streaming API doesn't provide start-frame support,
         # so use a CV2 loop whenever a non-default window/stride is requested.
+        # Batched inference also runs there so frames can be decoded ahead.
         try:
             source_path = Path(source)
         except Exception:
             source_path = None
+        batch_size = max(1, int(batch_size))
         if (
             source_path is not None
             and source_path.is_file()
-            and (start_frame != 0 or end_frame is not None or step != 1)
+            and (
+                start_frame != 0 or end_frame is not None or step != 1 or batch_size > 1
+            )
         ):
             return self._run_yolo_video_inference_cv2(
                 source,
@@ -546,6 +566,7 @@ class InferenceProcessor:
                 enable_tracking=enable_tracking,
                 tracker=tracker,
                 save_pose_bbox=save_pose_bbox,
+                batch_size=batch_size,
             )
 
         # Use visual prompts if supported by the model (YOLOE)
@@ -783,6 +804,7 @@ class InferenceProcessor:
         enable_tracking: bool = True,
         tracker: Optional[str] = None,
         save_pose_bbox: Optional[bool] = None,
+        batch_size: int = 1,
     ) -> str:
         import cv2
 
@@ -830,28 +852,49 @@ class InferenceProcessor:
         total_steps = max(1, (max_frames + step - 1) // step) if max_frames else 0
         processed_steps = 0
 
+        batch_size = max(1, int(batch_size))
+        if batch_size > 1 and not self._can_batch_predict(
+            visual_prompts, enable_tracking
+        ):
+            logger.info(
+                "Batched inference needs plain predict(); running frame by frame."
+            )
+            batch_size = 1
+        frame_walk = dict(
+            output_directory=output_directory,
+            start_frame=start_frame,
+            end_frame=end_frame,
+            step=step,
+            skip_existing=skip_existing,
+        )
+        if batch_size > 1:
+            try:
+                stopped = self._run_batched_cv2_inference(
+                    cap,
+                    frame_walk,
+                    should_stop=should_stop,
+                    batch_size=batch_size,
+                    output_directory=output_directory,
+                    progress_callback=progress_callback,
+                    total_steps=total_steps,
+                    save_pose_bbox=save_pose_bbox,
+                )
+            finally:
+                cap.release()
+            if stopped:
+                return f"Stopped#{self.frame_count}"
+            return f"Done#{self.frame_count}"
+
         stopped = False
         try:
-            if int(start_frame) > 0:
-                try:
-                    cap.set(cv2.CAP_PROP_POS_FRAMES, float(int(start_frame)))
-                except Exception:
-                    pass
-            frame_index = int(start_frame)
-            while True:
-                if should_stop():
+            for kind, frame_index, frame in self._iter_cv2_frames(
+                cap, should_stop=should_stop, **frame_walk
+            ):
+                if kind == "stop":
                     stopped = True
                     break
-                if end_frame is not None and frame_index > int(end_frame):
-                    break
-                if bool(skip_existing) and self._frame_has_existing_output(
-                    output_directory, frame_index=int(frame_index)
-                ):
-                    ok = cap.grab()
-                    if not ok:
-                        break
+                if kind == "existing":
                     self.frame_count += 1
-                    frame_index += 1
                     processed_steps += 1
                     if progress_callback and total_steps:
                         try:
@@ -859,62 +902,19 @@ class InferenceProcessor:
                         except Exception:
                             pass
                     continue
-                ok, frame = cap.read()
-                if not ok:
-                    break
 
                 frame_shape = (frame.shape[0], frame.shape[1], 3)
                 annotations = []
                 try:
-                    if (
-                        visual_prompts is not None
-                        and "yoloe" in self.model_name.lower()
-                    ):
-                        try:
-                            from ultralytics.models.yolo.yoloe import (
-                                YOLOEVPSegPredictor,
-                            )
-
-                            results = self.model.predict(
-                                frame,
-                                visual_prompts=visual_prompts,
-                                predictor=YOLOEVPSegPredictor,
-                                verbose=False,
-                            )
-                        except Exception:
-                            results = self.model.predict(frame, verbose=False)
-                    else:
-                        if self._is_coreml or "pose" in self.model_name.lower():
-                            results = self.model.predict(frame, verbose=False)
-                        elif not enable_tracking:
-                            results = self.model.predict(frame, verbose=False)
-                        else:
-                            track_kwargs = {"persist": True, "verbose": False}
-                            if tracker:
-                                track_kwargs["tracker"] = tracker
-                            try:
-                                results = self.model.track(frame, **track_kwargs)
-                            except Exception as exc:
-                                if tracker:
-                                    logger.warning(
-                                        "Tracker '%s' failed; falling back to default tracker. Error: %s",
-                                        tracker,
-                                        exc,
-                                    )
-                                    track_kwargs.pop("tracker", None)
-                                    results = self.model.track(frame, **track_kwargs)
-                                else:
-                                    raise
-                    if isinstance(results, (list, tuple)) and results:
-                        has_keypoints = (
-                            getattr(results[0], "keypoints", None) is not None
-                        )
-                        annotations = self.extract_yolo_results(
-                            results[0],
-                            save_bbox=self._should_save_pose_bbox(
-                                has_keypoints, save_pose_bbox
-                            ),
-                        )
+                    results = self._predict_frame(
+                        frame,
+                        visual_prompts=visual_prompts,
+                        enable_tracking=enable_tracking,
+                        tracker=tracker,
+                    )
+                    annotations = self._annotations_from_results(
+                        results, save_pose_bbox
+                    )
                 except Exception as exc:
                     logger.error(
                         "YOLO inference failed at frame %s: %s",
@@ -938,21 +938,6 @@ class InferenceProcessor:
                         progress_callback(processed_steps, total_steps)
                     except Exception:
                         pass
-
-                if step > 1:
-                    for _ in range(step - 1):
-                        frame_index += 1
-                        if end_frame is not None and frame_index > int(end_frame):
-                            break
-                        if should_stop():
-                            stopped = True
-                            break
-                        ok = cap.grab()
-                        if not ok:
-                            break
-                    if stopped:
-                        break
-                frame_index += 1
         finally:
             cap.release()
 
@@ -960,6 +945,293 @@ class InferenceProcessor:
             return f"Stopped#{self.frame_count}"
         return f"Done#{self.frame_count}"
 
+    def _iter_cv2_frames(
+        self,
+        cap,
+        *,
+        output_directory: Path,
+        start_frame: int,
+        end_frame: Optional[int],
+        step: int,
+        skip_existing: bool,
+        should_stop: Callable[[], bool],
+    ) -> Iterator[Tuple[str, int, Optional[np.ndarray]]]:
+        """Walk a video window as ``(kind, frame_index, frame)`` items.
+
+        ``kind`` is ``"frame"`` for a decoded frame to run inference on,
+        ``"existing"`` for a frame skipped because its output already exists
+        and ``"stop"`` (last item) when ``should_stop`` asked to end early.
+        Frames between strided steps are skipped with ``grab()`` so they are
+        never decoded.
+        """
+        import cv2
+
+        if int(start_frame) > 0:
+            try:
+                cap.set(cv2.CAP_PROP_POS_FRAMES, float(int(start_frame)))
+            except Exception:
+                pass
+        frame_index = int(start_frame)
+        while True:
+            if should_stop():
+                yield "stop", frame_index, None
+                return
+            if end_frame is not None and frame_index > int(end_frame):
+                return
+            if bool(skip_existing) and self._frame_has_existing_output(
+                output_directory, frame_index=int(frame_index)
+            ):
+                if not cap.grab():
+                    return
+                yield "existing", frame_index, None
+                frame_index += 1
+                continue
+            ok, frame = cap.read()
+            if not ok:
+                return
+            yield "frame", frame_index, frame
+
+            if step > 1:
+                for _ in range(step - 1):
+                    frame_index += 1
+                    if end_frame is not None and frame_index > int(end_frame):
+                        break
+                    if should_stop():
+                        yield "stop", frame_index, None
+                        return
+                    if not cap.grab():
+                        break
+            frame_index += 1
+
+    def _can_batch_predict(self, visual_prompts, enable_tracking: bool) -> bool:
+        """Whether per-frame inference would be a plain ``predict()`` call.
+
+        Tracking needs frames in sequence, visual prompts go through a custom
+        predictor and CoreML exports only run one image per call.
+        """
+        if visual_prompts is not None and "yoloe" in self.model_name.lower():
+            return False
+        if self._is_coreml:
+            return False
+        return "pose" in self.model_name.lower() or not enable_tracking
+
+    def _predict_frame(
+        self,
+        frame: np.ndarray,
+        *,
+        visual_prompts: dict = None,
+        enable_tracking: bool = True,
+        tracker: Optional[str] = None,
+    ):
+        if visual_prompts is not None and "yoloe" in self.model_name.lower():
+            try:
+                from ultralytics.models.yolo.yoloe import YOLOEVPSegPredictor
+
+                return self.model.predict(
+                    frame,
+                    visual_prompts=visual_prompts,
+                    predictor=YOLOEVPSegPredictor,
+                    verbose=False,
+                )
+            except Exception:
+                return self.model.predict(frame, verbose=False)
+        if self._is_coreml or "pose" in self.model_name.lower():
+            return self.model.predict(frame, verbose=False)
+        if not enable_tracking:
+            return self.model.predict(frame, verbose=False)
+        track_kwargs = {"persist": True, "verbose": False}
+        if tracker:
+            track_kwargs["tracker"] = tracker
+        try:
+            return self.model.track(frame, **track_kwargs)
+        except Exception as exc:
+            if not tracker:
+                raise
+            logger.warning(
+                "Tracker '%s' failed; falling back to default tracker. Error: %s",
+                tracker,
+                exc,
+            )
+            track_kwargs.pop("tracker", None)
+            return self.model.track(frame, **track_kwargs)
+
+    def _annotations_from_results(
+        self, results, save_pose_bbox: Optional[bool] = None
+    ) -> list:
+        if isinstance(results, (list, tuple)) and results:
+            has_keypoints = getattr(results[0], "keypoints", None) is not None
+            return self.extract_yolo_results(
+                results[0],
+                save_bbox=self._should_save_pose_bbox(has_keypoints, save_pose_bbox),
+            )
+        return []
+
+    def _predict_batch(self, frames: Sequence[np.ndarray]) -> List[object]:
+        """Per-frame ``predict()`` results for a batch, in order.
+
+        Falls back to one call per frame when the batched call fails; a frame
+        that still fails gets its exception in place of results.
+        """
+        try:
+            results = self.model.predict(list(frames), verbose=False)
+            if len(results) == len(frames):
+                return [[result] for result in results]
+            logger.warning(
+                "Batched YOLO inference returned %d results for %d frames; "
+                "retrying frame by frame.",
+                len(results),
+                len(frames),
+            )
+        except Exception as exc:
+            logger.warning(
+                "Batched YOLO inference failed (%s); retrying frame by frame.", exc
+            )
+        out: List[object] = []
+        for frame in frames:
+            try:
+                out.append(self.model.predict(frame, verbose=False))
+            except Exception as exc:
+                out.append(exc)
+        return out
+
+    def _run_batched_cv2_inference(
+        self,
+        cap,
+        frame_walk: Dict[str, object],
+        *,
+        should_stop: Callable[[], bool],
+        batch_size: int,
+        output_directory: Path,
+        progress_callback=None,
+        total_steps: int = 0,
+        save_pose_bbox: Optional[bool] = None,
+    ) -> bool:
+        """Offline inference with decode-ahead and a background writer.
+
+        A decoder thread walks the video exactly like the per-frame loop, the
+        calling thread runs ``predict()`` on batches of ``batch_size`` frames
+        and a writer thread converts and saves results in frame order, so the
+        written records match the per-frame path. Returns True when stopped.
+        """
+        halt = threading.Event()
+        decoded: queue.Queue = queue.Queue(maxsize=2 * batch_size)
+        to_write: queue.Queue = queue.Queue(maxsize=2 * batch_size)
+        errors: List[BaseException] = []
+        processed_steps = 0
+
+        def decode() -> None:
+            try:
+                for item in self._iter_cv2_frames(
+                    cap, should_stop=halt.is_set, **frame_walk
+                ):
+                    decoded.put(item)
+            except BaseException as exc:  # re-raised on the calling thread
+                errors.append(exc)
+            finally:
+                decoded.put(None)
+
+        def write() -> None:
+            nonlocal processed_steps
+            while True:
+                item = to_write.get()
+                if item is None:
+                    return
+                if errors:
+                    continue
+                kind, frame_index, frame_shape, results = item
+                try:
+                    if kind == "frame":
+                        annotations = []
+                        try:
+                            if isinstance(results, BaseException):
+                                raise results
+                            annotations = self._annotations_from_results(
+                                results, save_pose_bbox
+                            )
+                        except Exception as exc:
+                            logger.error(
+                                "YOLO inference failed at frame %s: %s",
+                                frame_index,
+                                exc,
+                                exc_info=True,
+                            )
+                            annotations = []
+                        self.save_yolo_to_labelme(
+                            annotations,
+                            frame_shape,
+                            output_directory,
+                            frame_index=frame_index,
+                        )
+                    self.frame_count += 1
+                    processed_steps += 1
+                    if progress_callback and total_steps:
+                        try:
+                            progress_callback(processed_steps, total_steps)
+                        except Exception:
+                            pass
+                except BaseException as exc:
+                    errors.append(exc)
+                    halt.set()
+
+        pending: List[Tuple[str, int, Optional[np.ndarray]]] = []
+
+        def flush() -> None:
+            results = iter(
+                self._predict_batch(
+                    [frame for kind, _, frame in pending if kind == "frame"]
+                )
+            )
+            for kind, frame_index, frame in pending:
+                if kind == "frame":
+                    frame_shape = (frame.shape[0], frame.shape[1], 3)
+                    to_write.put((kind, frame_index, frame_shape, next(results)))
+                else:
+                    to_write.put((kind, frame_index, None, None))
+            pending.clear()
+
+        decoder = threading.Thread(target=decode, name="yolo-decode", daemon=True)
+        writer = threading.Thread(target=write, name="yolo-write", daemon=True)
+        decoder.start()
+        writer.start()
+        stopped = False
+        decoder_done = False
+        try:
+            queued_frames = 0
+            while not errors:
+                if should_stop():
+                    stopped = True
+                    break
+                item = decoded.get()
+                if item is None:
+                    decoder_done = True
+                    break
+                kind = item[0]
+                if kind == "stop":
+                    stopped = True
+                    break
+                if kind == "existing" and not pending:
+                    to_write.put((kind, item[1], None, None))
+                    continue
+                pending.append(item)
+                if kind == "frame":
+                    queued_frames += 1
+                if queued_frames >= batch_size:
+                    flush()
+                    queued_frames = 0
+            if not stopped and not errors and pending:
+                flush()
+        finally:
+            halt.set()
+            # Drain so a decoder blocked on a full queue can see the halt.
+            while not decoder_done:
+                decoder_done = decoded.get() is None
+            decoder.join()
+            to_write.put(None)
+            writer.join()
+        if errors:
+            raise errors[0]
+        return stopped
+
     @staticmethod
     def _legacy_labelme_json_path(output_dir: Path, *, frame_index: int) -> Path:
         return output_dir / f"{int(frame_index):09d}.json"
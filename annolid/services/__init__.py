@@ -32,6 +32,7 @@ _EXPORTS = {
     "build_chat_vcs_read_roots": "annolid.services.chat_runtime",
     "build_chat_workspace_roots": "annolid.services.chat_runtime",
     "EmbeddingSearchMatch": "annolid.services.embedding_search",
+    "FrameEmbeddingIndex": "annolid.services.embedding_index",
     "build_tracking_video_processor": "annolid.services.tracking",
     "build_yolo_dataset_from_index": "annolid.services.export",
     "compute_behavior_time_budget_report": "annolid.services.time_budget",
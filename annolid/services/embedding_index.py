@@ -0,0 +1,237 @@
+"""Persistent per-video frame embedding index for embedding search.
+
+One index covers a (video, embedder, stride) triple and lives in its own
+directory under the cache root::
+
+    meta.json        identity, validity key, embedding dimension
+    embeddings.npy   float16 (slots, dim) matrix, memory-mapped
+    filled.npy       bool (slots,) marks rows that hold an embedding
+
+Slot ``i`` holds the embedding of frame ``i * stride``. The validity key
+covers the video's size and modification time, its frame count and a
+caller-supplied salt (for example the state of overlaid annotations); when it
+changes, the index is cleared and rebuilt on demand. Rows are filled
+incrementally, so an interrupted search keeps everything embedded so far.
+An index assumes a single writer at a time.
+"""
+
+from __future__ import annotations
+
+import hashlib
+import json
+import os
+from pathlib import Path
+from typing import Optional, Sequence, Tuple
+
+import numpy as np
+
+from annolid.utils.logger import logger
+
+META_FILENAME = "meta.json"
+EMBEDDINGS_FILENAME = "embeddings.npy"
+FILLED_FILENAME = "filled.npy"
+_FORMAT_VERSION = 1
+# Rows are cast to float32 in chunks so queries never materialize the matrix.
+_QUERY_CHUNK_ROWS = 65536
+
+
+def default_embedding_index_dir() -> Path:
+    return Path.home() / ".annolid" / "cache" / "embedding_index"
+
+
+def _digest(*parts: object) -> str:
+    payload = json.dumps([str(part) for part in parts])
+    return hashlib.sha1(payload.encode("utf-8")).hexdigest()
+
+
+class FrameEmbeddingIndex:
+    """Memory-mapped float16 embedding rows for the strided frames of a video."""
+
+    def __init__(
+        self, root: Path, *, validity: str, stride: int, total_frames: int
+    ) -> None:
+        self.root = Path(root)
+        self.validity = str(validity)
+        self.stride = max(1, int(stride))
+        self.total_frames = max(0, int(total_frames))
+        self.num_slots = (self.total_frames + self.stride - 1) // self.stride
+        self.dim: Optional[int] = None
+        self._embeddings: Optional[np.memmap] = None
+        self._filled: Optional[np.ndarray] = None
+        self._load()
+
+    @classmethod
+    def open(
+        cls,
+        video_path: Path,
+        *,
+        embedder_key: Sequence[str],
+        stride: int,
+        total_frames: int,
+        salt: str = "",
+        cache_dir: Optional[Path] = None,
+    ) -> "FrameEmbeddingIndex":
+        """Open (or start) the index for ``video_path`` under ``cache_dir``."""
+        video_path = Path(video_path).expanduser().resolve()
+        stride = max(1, int(stride))
+        stat = video_path.stat()
+        root = Path(cache_dir or default_embedding_index_dir()) / _digest(
+            video_path, tuple(embedder_key), stride
+        )
+        validity = _digest(
+            _FORMAT_VERSION, stat.st_size, stat.st_mtime_ns, int(total_frames), salt
+        )
+        return cls(root, validity=validity, stride=stride, total_frames=total_frames)
+
+    def __len__(self) -> int:
+        return 0 if self._filled is None else int(self._filled.sum())
+
+    def slot_of(self, frame_index: int) -> Optional[int]:
+        frame = int(frame_index)
+        if frame < 0 or frame >= self.total_frames or frame % self.stride:
+            return None
+        return frame // self.stride
+
+    def has(self, frame_indices: Sequence[int]) -> np.ndarray:
+        """Boolean mask: which of ``frame_indices`` already have an embedding."""
+        slots, valid = self._slots(frame_indices)
+        out = np.zeros(len(slots), dtype=bool)
+        if self._filled is not None:
+            out[valid] = self._filled[slots[valid]]
+        return out
+
+    def put(self, frame_indices: Sequence[int], vectors: np.ndarray) -> None:
+        """Store one embedding row per frame; frames off the stride are ignored."""
+        vectors = np.asarray(vectors, dtype=np.float32)
+        if vectors.ndim != 2 or len(vectors) != len(frame_indices):
+            raise ValueError(
+                f"Expected {len(frame_indices)} embedding rows, got shape {vectors.shape}"
+            )
+        if not len(frame_indices):
+            return
+        if self._embeddings is None:
+            self._create(int(vectors.shape[1]))
+        elif vectors.shape[1] != self.dim:
+            raise ValueError(
+                f"Embedding dimension {vectors.shape[1]} does not match index ({self.dim})"
+            )
+        slots, valid = self._slots(frame_indices)
+        self._embeddings[slots[valid]] = vectors[valid].astype(np.float16)
+        self._embeddings.flush()
+        # Rows are flushed before they are marked filled.
+        self._filled[slots[valid]] = True
+        self._filled.flush()
+
+    def vectors(self, frame_indices: Sequence[int]) -> np.ndarray:
+        """float16 rows for frames that :meth:`has` reports as filled."""
+        slots, _valid = self._slots(frame_indices)
+        if self._embeddings is None:
+            return np.zeros((len(slots), 0), dtype=np.float16)
+        return np.asarray(self._embeddings[slots])
+
+    def similarities(
+        self, query: np.ndarray, frame_indices: Optional[Sequence[int]] = None
+    ) -> np.ndarray:
+        """Dot products of ``query`` with the rows of ``frame_indices`` (all slots when None)."""
+        if self._embeddings is None:
+            count = self.num_slots if frame_indices is None else len(frame_indices)
+            return np.full(count, -np.inf, dtype=np.float32)
+        qvec = np.asarray(query, dtype=np.float32).reshape(-1)
+        if frame_indices is None:
+            rows = np.arange(self.num_slots)
+        else:
+            rows, _valid = self._slots(frame_indices)
+        out = np.empty(len(rows), dtype=np.float32)
+        contiguous = frame_indices is None
+        for start in range(0, len(rows), _QUERY_CHUNK_ROWS):
+            stop = min(start + _QUERY_CHUNK_ROWS, len(rows))
+            chunk = (
+                self._embeddings[start:stop]
+                if contiguous
+                else self._embeddings[rows[start:stop]]
+            )
+            out[start:stop] = np.asarray(chunk, dtype=np.float32) @ qvec
+        return out
+
+    def clear(self) -> None:
+        self._embeddings = None
+        self._filled = None
+        self.dim = None
+        for name in (EMBEDDINGS_FILENAME, FILLED_FILENAME, META_FILENAME):
+            path = self.root / name
+            if path.exists():
+                path.unlink()
+
+    def _slots(self, frame_indices: Sequence[int]) -> Tuple[np.ndarray, np.ndarray]:
+        frames = np.asarray(frame_indices, dtype=np.int64).reshape(-1)
+        valid = (
+            (frames >= 0) & (frames < self.total_frames) & (frames % self.stride == 0)
+        )
+        slots = np.where(valid, frames // self.stride, 0)
+        return slots, valid
+
+    def _load(self) -> None:
+        meta_path = self.root / META_FILENAME
+        if not meta_path.exists():
+            return
+        try:
+            meta = json.loads(meta_path.read_text(encoding="utf-8"))
+            if (
+                meta.get("validity") != self.validity
+                or int(meta.get("num_slots", -1)) != self.num_slots
+            ):
+                logger.info("Embedding index %s is stale; rebuilding.", self.root)
+                self.clear()
+                return
+            embeddings = np.load(
+                self.root / EMBEDDINGS_FILENAME, mmap_mode="r+", allow_pickle=False
+            )
+            filled = np.load(
+                self.root / FILLED_FILENAME, mmap_mode="r+", allow_pickle=False
+            )
+            if embeddings.shape[0] != self.num_slots or filled.shape != (
+                self.num_slots,
+            ):
+                raise ValueError("index arrays do not match the slot count")
+        except Exception as exc:
+            logger.warning(
+                "Discarding unreadable embedding index %s: %s", self.root, exc
+            )
+            self.clear()
+            return
+        self._embeddings = embeddings
+        self._filled = filled
+        self.dim = int(embeddings.shape[1])
+
+    def _create(self, dim: int) -> None:
+        self.root.mkdir(parents=True, exist_ok=True)
+        self.dim = int(dim)
+        self._embeddings = np.lib.format.open_memmap(
+            self.root / EMBEDDINGS_FILENAME,
+            mode="w+",
+            dtype=np.float16,
+            shape=(self.num_slots, self.dim),
+        )
+        self._filled = np.lib.format.open_memmap(
+            self.root / FILLED_FILENAME,
+            mode="w+",
+            dtype=np.bool_,
+            shape=(self.num_slots,),
+        )
+        meta = {
+            "version": _FORMAT_VERSION,
+            "validity": self.validity,
+            "stride": self.stride,
+            "total_frames": self.total_frames,
+            "num_slots": self.num_slots,
+            "dim": self.dim,
+        }
+        temp_path = self.root / f"{META_FILENAME}.{os.getpid()}.tmp"
+        temp_path.write_text(json.dumps(meta, indent=2), encoding="utf-8")
+        os.replace(temp_path, self.root / META_FILENAME)
+
+
+__all__ = [
+    "FrameEmbeddingIndex",
+    "default_embedding_index_dir",
+]
@@ -1,10 +1,12 @@
 from __future__ import annotations
 
 from dataclasses import dataclass
-from typing import Callable, List, Optional
+from typing import Callable, List, Optional, Sequence
 
 import numpy as np
 
+from annolid.services.embedding_index import FrameEmbeddingIndex
+
 
 @dataclass(frozen=True)
 class EmbeddingSearchMatch:
@@ -27,50 +29,97 @@ def run_embedding_search(
     max_frames: Optional[int],
     threshold: float,
     top_k: int,
-    embed_frame: Callable[[int], np.ndarray],
+    embed_frame: Optional[Callable[[int], np.ndarray]] = None,
     is_stopped: Optional[Callable[[], bool]] = None,
     on_match: Optional[Callable[[EmbeddingSearchMatch], None]] = None,
     on_progress: Optional[Callable[[int, int], None]] = None,
+    embed_frames: Optional[Callable[[Sequence[int]], np.ndarray]] = None,
+    index: Optional[FrameEmbeddingIndex] = None,
+    batch_size: int = 16,
 ) -> List[EmbeddingSearchMatch]:
-    """Run vector similarity search over frames using caller-provided embedding IO."""
+    """Run vector similarity search over frames using caller-provided embedding IO.
+
+    Frames already stored in ``index`` are scored with one matrix-vector
+    product. The rest are embedded in chunks of ``batch_size`` through
+    ``embed_frames`` (or one at a time through ``embed_frame``) and written
+    back to the index, so repeating a search does not embed them again.
+    """
     if total_frames <= 0:
         raise ValueError("No frames selected for search.")
+    if embed_frame is None and embed_frames is None:
+        raise ValueError("embed_frame or embed_frames is required.")
 
     stride = max(1, int(stride))
     top_k = max(1, int(top_k))
     threshold = float(threshold)
+    batch_size = max(1, int(batch_size))
     max_steps = (int(total_frames) + stride - 1) // stride
     if max_frames is not None:
         max_steps = min(max_steps, max(1, int(max_frames)))
     if max_steps <= 0:
         raise ValueError("No frames selected for search.")
 
-    qvec = np.asarray(query_vector, dtype=np.float32)
-    matches: List[EmbeddingSearchMatch] = []
-    step = 0
+    qvec = np.asarray(query_vector, dtype=np.float32).reshape(-1)
+    frames = np.arange(max_steps, dtype=np.int64) * stride
+    sims = np.full(max_steps, -np.inf, dtype=np.float32)
+    done = frames == int(query_frame_index)
 
-    for frame_idx in range(0, int(total_frames), stride):
-        if step >= max_steps:
-            break
-        step += 1
+    def _report(positions: np.ndarray) -> None:
+        if on_match is None:
+            return
+        for pos in positions[sims[positions] >= threshold]:
+            on_match(
+                EmbeddingSearchMatch(
+                    frame_index=int(frames[pos]), similarity=float(sims[pos])
+                )
+            )
+
+    def _progress() -> None:
+        if on_progress is not None:
+            on_progress(int(done.sum()), max_steps)
+
+    if index is not None:
+        cached = np.flatnonzero(index.has(frames) & ~done)
+        if cached.size:
+            sims[cached] = index.similarities(qvec, frames[cached])
+            done[cached] = True
+            _report(cached)
+            _progress()
+
+    missing = np.flatnonzero(~done)
+    for start in range(0, len(missing), batch_size):
         if is_stopped is not None and is_stopped():
             break
-        if int(frame_idx) == int(query_frame_index):
-            continue
-
-        vec = np.asarray(embed_frame(int(frame_idx)), dtype=np.float32)
-        sim = float(vec @ qvec)
-        if sim >= threshold:
-            match = EmbeddingSearchMatch(frame_index=int(frame_idx), similarity=sim)
-            matches.append(match)
-            if on_match is not None:
-                on_match(match)
-
-        if on_progress is not None and (step % 10 == 0 or step == max_steps):
-            on_progress(step, max_steps)
-
-    matches.sort(key=lambda m: m.similarity, reverse=True)
-    return matches[:top_k]
+        positions = missing[start : start + batch_size]
+        batch_frames = [int(frame) for frame in frames[positions]]
+        if embed_frames is not None:
+            vectors = np.asarray(embed_frames(batch_frames), dtype=np.float32)
+        else:
+            rows = []
+            for frame_idx in batch_frames:
+                if rows and is_stopped is not None and is_stopped():
+                    break
+                rows.append(np.asarray(embed_frame(frame_idx), dtype=np.float32))
+            vectors = np.stack(rows).reshape(len(rows), -1)
+            positions = positions[: len(rows)]
+            batch_frames = batch_frames[: len(rows)]
+        if index is not None:
+            index.put(batch_frames, vectors)
+        sims[positions] = vectors @ qvec
+        done[positions] = True
+        _report(positions)
+        _progress()
+
+    candidates = np.flatnonzero(done & (sims >= threshold))
+    if candidates.size > top_k:
+        keep = np.argpartition(-sims[candidates], top_k - 1)[:top_k]
+        candidates = np.sort(candidates[keep])
+    # Stable sort keeps earlier frames first among equal similarities.
+    candidates = candidates[np.argsort(-sims[candidates], kind="stable")]
+    return [
+        EmbeddingSearchMatch(frame_index=int(frames[pos]), similarity=float(sims[pos]))
+        for pos in candidates
+    ]
 
 
 __all__ = [
@@ -166,6 +166,10 @@ class CutieDinoTrackerConfig:
     tracking_smoother_one_euro_beta: float = 0.0
     tracking_smoother_kalman_process_noise: float = 1e-2
     tracking_smoother_kalman_measurement_noise: float = 1e-1
+    # Offline batching: extract DINO features for this many upcoming frames
+    # per forward pass over the current mask ROI grown by the margin.
+    feature_batch_size: int = 1
+    feature_batch_margin_px: int = 32
     progress_hook: Optional[ProgressHook] = None
     error_hook: Optional[ErrorHook] = None
     analytics_hook: Optional[Callable[[dict], None]] = None
@@ -206,6 +210,9 @@ class CutieDinoTrackerConfig:
         self.mask_enforce_reject_outside = bool(self.mask_enforce_reject_outside)
         self.motion_prior_flow_relief = max(0.0, float(self.motion_prior_flow_relief))
 
+        self.feature_batch_size = max(1, int(self.feature_batch_size))
+        self.feature_batch_margin_px = max(0, int(self.feature_batch_margin_px))
+
         self.keypoint_refine_radius = max(0, int(self.keypoint_refine_radius))
         self.keypoint_refine_sigma = max(1e-4, float(self.keypoint_refine_sigma))
         self.keypoint_refine_temperature = max(
@@ -4,7 +4,7 @@ from __future__ import annotations
 
 from dataclasses import dataclass, field
 from pathlib import Path
-from typing import Dict, List, Optional, Tuple, Set
+from typing import Dict, List, Optional, Sequence, Tuple, Set
 
 import cv2
 import numpy as np
@@ -130,6 +130,14 @@ class BodyPrior:
         return (t, p, thickness)
 
 
+@dataclass
+class RoiFeatures:
+    """Backbone features precomputed for the ``roi`` crop of one frame."""
+
+    roi: Tuple[int, int, int, int]
+    feats: torch.Tensor
+
+
 class DinoKeypointTracker:
     """Patch descriptor tracker with optional mask-aware constraints."""
 
@@ -188,7 +196,10 @@ class DinoKeypointTracker:
         self._is_fresh_start = False
         self._roi_offset: Tuple[float, float] = (0.0, 0.0)
         self._roi_box: Tuple[int, int, int, int] = (0, 0, 0, 0)
+        self._frame_roi: Tuple[int, int, int, int] = (0, 0, 0, 0)
         self._roi_size: Tuple[int, int] = (0, 0)
+        # "batch" when the last update consumed precomputed RoiFeatures.
+        self.last_feature_source = "frame"
         self._instance_body_axes: Dict[str, Tuple[float, float]] = {}
         self._manual_anchor_codebooks: Dict[str, torch.Tensor] = {}
         self._part_shared_descriptors: Dict[str, torch.Tensor] = {}
@@ -218,6 +229,7 @@ class DinoKeypointTracker:
         self._is_fresh_start = False
         self._roi_offset = (0.0, 0.0)
         self._roi_box = (0, 0, 0, 0)
+        self._frame_roi = (0, 0, 0, 0)
         self._roi_size = (0, 0)
         self._instance_body_axes = {}
         if not preserve_manual_anchors:
@@ -338,7 +350,15 @@ class DinoKeypointTracker:
         self,
         image: Image.Image,
         mask_lookup: Optional[Dict[str, np.ndarray]] = None,
+        features: Optional[RoiFeatures] = None,
     ) -> List[Dict[str, object]]:
+        """Track keypoints into ``image``.
+
+        ``features`` may carry backbone features precomputed for a crop of
+        this frame (see :meth:`extract_roi_features_batch`); they are used
+        when their ROI covers the ROI this frame needs, otherwise features
+        are extracted as usual.
+        """
         if not self.tracks:
             return []
 
@@ -347,6 +367,7 @@ class DinoKeypointTracker:
             image=image,
             mask_lookup=mask_lookup,
             polygons=None,
+            features=features,
         )
         roi_changed = self._roi_box != prev_roi_box
         grid_h, grid_w = grid_hw
@@ -1301,17 +1322,77 @@ class DinoKeypointTracker:
 
     def _extract_features(self, image: Image.Image) -> torch.Tensor:
         feats = self.extractor.extract(image, return_layer="all", normalize=True)
+        return self._reduce_feature_layers(feats)
+
+    @staticmethod
+    def _reduce_feature_layers(feats) -> torch.Tensor:
         if isinstance(feats, np.ndarray):
             feats = torch.from_numpy(feats)
         if feats.dim() == 4:  # [L, D, H, W]
             feats = feats[-2:].mean(dim=0)
         return feats
 
+    def feature_window_roi(
+        self,
+        width: int,
+        height: int,
+        mask_lookup: Optional[Dict[str, np.ndarray]],
+        *,
+        margin: int = 0,
+    ) -> Tuple[int, int, int, int]:
+        """ROI for the current masks grown by ``margin`` pixels per side.
+
+        Used to precompute features for upcoming frames: the extra margin
+        leaves room for the animals to move before the crop stops covering
+        the ROI a later frame needs.
+        """
+        left, top, right, bottom = self._determine_roi(
+            width=width,
+            height=height,
+            mask_lookup=mask_lookup,
+            polygons=None,
+        )
+        margin = max(0, int(margin))
+        return (
+            max(0, left - margin),
+            max(0, top - margin),
+            min(int(width), right + margin),
+            min(int(height), bottom + margin),
+        )
+
+    def extract_roi_features_batch(
+        self,
+        images: Sequence[Image.Image],
+        roi: Tuple[int, int, int, int],
+    ) -> List[RoiFeatures]:
+        """Extract features for the same ``roi`` crop of several frames.
+
+        Crops share one size, so extractors providing ``extract_batch`` run
+        them through the backbone in a single forward pass.
+        """
+        roi = tuple(int(v) for v in roi)
+        crops = [image.crop(roi) for image in images]
+        if not crops:
+            return []
+        extract_batch = getattr(self.extractor, "extract_batch", None)
+        if callable(extract_batch):
+            raw = extract_batch(crops, return_layer="all", normalize=True)
+        else:
+            raw = [
+                self.extractor.extract(crop, return_layer="all", normalize=True)
+                for crop in crops
+            ]
+        return [
+            RoiFeatures(roi=roi, feats=self._reduce_feature_layers(feats))
+            for feats in raw
+        ]
+
     def _prepare_roi_inputs(
         self,
         image: Image.Image,
         mask_lookup: Optional[Dict[str, np.ndarray]],
         polygons: Optional[List[List[Tuple[float, float]]]] = None,
+        features: Optional[RoiFeatures] = None,
     ) -> Tuple[torch.Tensor, float, float, Tuple[int, int]]:
         width, height = image.size
         roi = self._determine_roi(
@@ -1320,15 +1401,29 @@ class DinoKeypointTracker:
             mask_lookup=mask_lookup,
             polygons=polygons,
         )
-        if self._roi_box != roi:
+        # Stored patch masks follow the frame's own ROI, not the (possibly
+        # wider) window a batch of features was extracted for.
+        if self._frame_roi != roi:
             self._last_patch_masks = {}
             self._mask_miss_counts = {}
+        self._frame_roi = roi
+        if features is not None and _roi_contains(features.roi, roi):
+            feats, offset, roi_box, scale_x, scale_y = self._crop_window_features(
+                features, roi
+            )
+            left, top, right, bottom = roi_box
+            self._roi_offset = offset
+            self._roi_box = roi_box
+            self._roi_size = (max(1, right - left), max(1, bottom - top))
+            self.last_feature_source = "batch"
+            return feats, scale_x, scale_y, feats.shape[1:]
         left, top, right, bottom = roi
         cropped_image = image.crop((left, top, right, bottom))
         feats = self._extract_features(cropped_image)
-        new_h, new_w = self.extractor._compute_resized_hw(*cropped_image.size)
         roi_w = max(1, cropped_image.width)
         roi_h = max(1, cropped_image.height)
+        self.last_feature_source = "frame"
+        new_h, new_w = self.extractor._compute_resized_hw(roi_w, roi_h)
         scale_x = new_w / roi_w
         scale_y = new_h / roi_h
         self._roi_offset = (float(left), float(top))
@@ -1336,6 +1431,43 @@ class DinoKeypointTracker:
         self._roi_size = (roi_w, roi_h)
         return feats, scale_x, scale_y, feats.shape[1:]
 
+    def _crop_window_features(
+        self, features: RoiFeatures, roi: Tuple[int, int, int, int]
+    ) -> Tuple[
+        torch.Tensor,
+        Tuple[float, float],
+        Tuple[int, int, int, int],
+        float,
+        float,
+    ]:
+        """Slice a window's feature grid down to the patches covering ``roi``.
+
+        Returns the sliced grid, the pixel offset of its first patch, the
+        integer box it spans, and the window's resize scales.
+        """
+        win_left, win_top, win_right, win_bottom = features.roi
+        win_w = max(1, win_right - win_left)
+        win_h = max(1, win_bottom - win_top)
+        grid_h, grid_w = (int(v) for v in features.feats.shape[1:])
+        step_x = win_w / max(1, grid_w)
+        step_y = win_h / max(1, grid_h)
+        left, top, right, bottom = roi
+        c0 = min(grid_w - 1, max(0, int(math.floor((left - win_left) / step_x))))
+        r0 = min(grid_h - 1, max(0, int(math.floor((top - win_top) / step_y))))
+        c1 = max(c0 + 1, min(grid_w, int(math.ceil((right - win_left) / step_x))))
+        r1 = max(r0 + 1, min(grid_h, int(math.ceil((bottom - win_top) / step_y))))
+        feats = features.feats[:, r0:r1, c0:c1]
+        offset = (win_left + c0 * step_x, win_top + r0 * step_y)
+        roi_box = (
+            int(math.floor(offset[0])),
+            int(math.floor(offset[1])),
+            min(win_right, int(math.ceil(win_left + c1 * step_x))),
+            min(win_bottom, int(math.ceil(win_top + r1 * step_y))),
+        )
+        scale_x = self.patch_size / step_x
+        scale_y = self.patch_size / step_y
+        return feats, offset, roi_box, scale_x, scale_y
+
     def _determine_roi(
         self,
         width: int,
@@ -2254,6 +2386,10 @@ class DinoKeypointTracker:
             if misses > allowed_misses:
                 continue
             fallback_mask = stored_mask
+            if fallback_mask.shape != tuple(grid_hw):
+                # Grids sliced from different feature windows can differ by
+                # a patch for the same frame ROI.
+                fallback_mask = self._mask_to_patch(fallback_mask, grid_hw)
             if iterations > 0:
                 fallback_mask = self._dilate_patch_mask(
                     fallback_mask, kernel_size, iterations
@@ -2326,6 +2462,17 @@ class DinoKeypointTracker:
         return base_bonus * 0.5 * decay
 
 
+def _roi_contains(
+    outer: Tuple[int, int, int, int], inner: Tuple[int, int, int, int]
+) -> bool:
+    return (
+        outer[0] <= inner[0]
+        and outer[1] <= inner[1]
+        and outer[2] >= inner[2]
+        and outer[3] >= inner[3]
+    )
+
+
 class DinoKeypointVideoProcessor:
     """Video orchestrator coordinating instances, masks, and serialization."""
 
@@ -2383,14 +2530,24 @@ class DinoKeypointVideoProcessor:
         end_frame: Optional[int] = None,
         step: int = 1,
         pred_worker: Optional[object] = None,
+        feature_batch_size: Optional[int] = None,
     ) -> str:
+        """Track keypoints over the video and write per-frame annotations.
+
+        ``feature_batch_size`` (defaults to the runtime config) > 1 enables
+        offline batching: backbone features for that many upcoming frames
+        are extracted in one forward pass over a shared ROI.
+        """
         if pred_worker is not None:
             self.set_pred_worker(pred_worker)
+        if feature_batch_size is None:
+            feature_batch_size = getattr(self.config, "feature_batch_size", 1)
         try:
             return self._process_video_impl(
                 start_frame=start_frame,
                 end_frame=end_frame,
                 step=step,
+                feature_batch_size=max(1, int(feature_batch_size or 1)),
             )
         except Exception as exc:  # pragma: no cover - top-level guard
             logger.exception("DINO tracking failed")
@@ -2404,6 +2561,7 @@ class DinoKeypointVideoProcessor:
         start_frame: Optional[int],
         end_frame: Optional[int],
         step: int,
+        feature_batch_size: int = 1,
     ) -> str:
         initial_frame, registry = self._resolve_initial_state(start_frame=start_frame)
         start_frame = (
@@ -2451,8 +2609,9 @@ class DinoKeypointVideoProcessor:
         total_steps = max(1, len(frames_to_process))
         processed = 0
         stopped_early = False
+        feature_window: Dict[int, Tuple[np.ndarray, Image.Image, RoiFeatures]] = {}
 
-        for frame_number in frame_numbers:
+        for position, frame_number in enumerate(frame_numbers):
             if frame_number == initial_frame:
                 continue
             if self._should_stop():
@@ -2493,20 +2652,37 @@ class DinoKeypointVideoProcessor:
                 self._report_progress(processed, total_steps)
                 continue
 
-            frame = self.video_loader.load_frame(frame_number)
-            if frame is None:
-                logger.warning("Skipping missing frame %s", frame_number)
-                continue
+            window_entry = feature_window.pop(frame_number, None)
+            if window_entry is None and feature_batch_size > 1:
+                feature_window = self._extract_feature_window(
+                    frame_numbers[position : position + feature_batch_size],
+                    manual_frames=manual_frames,
+                    registry=registry,
+                )
+                window_entry = feature_window.pop(frame_number, None)
+            if window_entry is not None:
+                frame, image, roi_features = window_entry
+            else:
+                frame = self.video_loader.load_frame(frame_number)
+                if frame is None:
+                    logger.warning("Skipping missing frame %s", frame_number)
+                    continue
+                image, roi_features = Image.fromarray(frame), None
 
             mask_results = self.mask_manager.update_masks(frame_number, frame, registry)
             if mask_results:
                 self._apply_mask_results(registry, mask_results)
             mask_lookup = self._mask_lookup_from_registry(registry)
 
-            tracker_results = self.tracker.update(
-                Image.fromarray(frame),
-                mask_lookup,
-            )
+            if roi_features is None:
+                tracker_results = self.tracker.update(image, mask_lookup)
+            else:
+                tracker_results = self.tracker.update(
+                    image, mask_lookup, features=roi_features
+                )
+                if self.tracker.last_feature_source != "batch":
+                    # The instances left the window ROI; refill around them.
+                    feature_window.clear()
             if tracker_results:
                 registry.apply_tracker_results(
                     tracker_results, frame_number=frame_number
@@ -2534,6 +2710,48 @@ class DinoKeypointVideoProcessor:
         logger.info(message)
         return message
 
+    def _extract_feature_window(
+        self,
+        upcoming: List[int],
+        *,
+        manual_frames: Dict[int, Path],
+        registry: InstanceRegistry,
+    ) -> Dict[int, Tuple[np.ndarray, Image.Image, RoiFeatures]]:
+        """Load ``upcoming`` frames and batch-extract their ROI features.
+
+        The window stops before the next manual annotation, which reseeds
+        the tracker. The ROI is the current mask ROI grown by
+        ``feature_batch_margin_px`` so it keeps covering moving animals.
+        """
+        numbers: List[int] = []
+        frames: List[np.ndarray] = []
+        for frame_number in upcoming:
+            if numbers and frame_number in manual_frames:
+                break
+            frame = self.video_loader.load_frame(frame_number)
+            if frame is None:
+                break
+            numbers.append(frame_number)
+            frames.append(frame)
+        if not frames:
+            return {}
+
+        height, width = frames[0].shape[:2]
+        roi = self.tracker.feature_window_roi(
+            width,
+            height,
+            self._mask_lookup_from_registry(registry),
+            margin=getattr(self.config, "feature_batch_margin_px", 0),
+        )
+        images = [Image.fromarray(frame) for frame in frames]
+        roi_features = self.tracker.extract_roi_features_batch(images, roi)
+        return {
+            frame_number: (frame, image, features)
+            for frame_number, frame, image, features in zip(
+                numbers, frames, images, roi_features
+            )
+        }
+
     def _resolve_initial_state(
         self,
         *,
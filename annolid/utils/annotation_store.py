@@ -1,9 +1,11 @@
 import json
+import os
 import re
 import tempfile
 from pathlib import Path
 from typing import Any, Dict, Iterable, Mapping, Optional, Set, Union
 
+from annolid.utils.annotation_store_index import AnnotationStoreIndex
 from annolid.utils.logger import logger
 
 
@@ -25,6 +27,33 @@ class AnnotationStore:
     def __init__(self, store_path: Path):
         self.store_path = store_path
 
+    @property
+    def index(self) -> AnnotationStoreIndex:
+        """Persistent frame -> byte-offset index kept next to the store."""
+        return AnnotationStoreIndex.for_store(self.store_path)
+
+    def _read_indexed_frame(self, frame: int) -> Optional[Dict[str, Any]]:
+        """Seek straight to ``frame`` via the sidecar index.
+
+        Returns ``None`` when the frame is not in the store and raises
+        ``LookupError`` when the index cannot answer, so callers fall back to
+        scanning.
+        """
+        location = self.index.lookup(frame)
+        if location is None:
+            return None
+        raw_line = self.index.read_line(*location)
+        try:
+            data = json.loads(raw_line) if raw_line is not None else None
+        except json.JSONDecodeError:
+            data = None
+        if not isinstance(data, dict) or self._explicit_frame_for_record(data) != frame:
+            # The store changed underneath the index in a way the size/mtime
+            # check could not detect; drop it so the next lookup rebuilds.
+            self.index.invalidate()
+            raise LookupError(f"Stale index entry for frame {frame}")
+        return data
+
     def _discover_manual_seed_frames(self) -> Set[int]:
         seeds: Set[int] = set()
         folder = self.store_path.parent
@@ -211,6 +240,7 @@ class AnnotationStore:
                 temp_path = Path(fh.name)
                 fh.writelines(lines)
             temp_path.replace(self.store_path)
+            self.index.invalidate()
         finally:
             if temp_path is not None and temp_path.exists():
                 try:
@@ -254,9 +284,14 @@ class AnnotationStore:
             raise AnnotationStoreError("Record must include a 'frame' key.")
 
         self.store_path.parent.mkdir(parents=True, exist_ok=True)
-        with self.store_path.open("a", encoding="utf-8") as fh:
-            fh.write(json.dumps(record, separators=(",", ":")))
-            fh.write("\n")
+        line = json.dumps(record, separators=(",", ":")).encode("utf-8")
+        with self.store_path.open("ab") as fh:
+            offset = fh.tell()
+            fh.write(line + b"\n")
+        try:
+            self.index.note_append(int(frame), offset, len(line))
+        except (TypeError, ValueError):
+            pass
 
         # Keep the cache in sync without re-reading the entire file (O(1) append).
         cached = AnnotationStore._CACHE.get(self.store_path)
@@ -298,7 +333,11 @@ class AnnotationStore:
         self.update_frames({frame: record})
 
     def update_frames(self, updates: Mapping[int, Dict[str, Any]]) -> None:
-        """Replace stored records for multiple frames in one atomic rewrite."""
+        """Replace stored records for multiple frames in one atomic rewrite.
+
+        The sidecar index and a complete record cache are rewritten from the
+        new lines instead of being dropped and rebuilt by a full re-scan.
+        """
         if not updates:
             return
         if not self.store_path.exists():
@@ -318,24 +357,34 @@ class AnnotationStore:
 
         missing_frames = set(normalized_updates)
         lines_to_keep = []
+        # Byte offsets of the rewritten lines; text mode writes os.linesep.
+        index_entries = []
+        offset = 0
+        newline_extra = len(os.linesep) - 1
+
+        def _keep(line: str, frame: Optional[int] = None) -> None:
+            nonlocal offset
+            content = line[:-1].encode("utf-8")
+            if frame is not None:
+                index_entries.append((frame, offset, len(content)))
+            offset += len(content) + 1 + newline_extra
+            lines_to_keep.append(line)
+
         try:
             self._ensure_explicit_frame_metadata()
+            before = self.store_path.stat()
             with self.store_path.open("r", encoding="utf-8") as fh:
                 for raw_line in fh:
                     line = raw_line.rstrip("\n")
                     stripped = line.strip()
                     if not stripped:
-                        lines_to_keep.append(
-                            raw_line if raw_line.endswith("\n") else f"{raw_line}\n"
-                        )
+                        _keep(f"{line}\n")
                         continue
 
                     try:
                         payload = json.loads(stripped)
                     except json.JSONDecodeError:
-                        lines_to_keep.append(
-                            raw_line if raw_line.endswith("\n") else f"{raw_line}\n"
-                        )
+                        _keep(f"{line}\n")
                         continue
 
                     payload_frame = self._explicit_frame_for_record(payload)
@@ -345,19 +394,16 @@ class AnnotationStore:
                         )
 
                     if payload_frame in normalized_updates:
-                        lines_to_keep.append(
-                            json.dumps(
-                                normalized_updates[payload_frame],
-                                ensure_ascii=False,
-                                separators=(",", ":"),
-                            )
-                            + "\n"
+                        replacement = normalized_updates[payload_frame]
+                        encoded = json.dumps(
+                            replacement, ensure_ascii=False, separators=(",", ":")
                         )
+                        # Index the frame the rewritten line itself carries.
+                        frame_key = self._explicit_frame_for_record(replacement)
+                        _keep(f"{encoded}\n", frame_key)
                         missing_frames.discard(payload_frame)
                     else:
-                        lines_to_keep.append(
-                            raw_line if raw_line.endswith("\n") else f"{raw_line}\n"
-                        )
+                        _keep(f"{line}\n", payload_frame)
         except OSError as exc:
             raise AnnotationStoreError(
                 f"Failed to read annotation store {self.store_path}: {exc}"
@@ -371,13 +417,32 @@ class AnnotationStore:
 
         try:
             self._write_lines_atomically(lines_to_keep)
+            stat = self.store_path.stat()
         except OSError as exc:
             raise AnnotationStoreError(
                 f"Failed to rewrite annotation store {self.store_path}: {exc}"
             ) from exc
 
-        AnnotationStore._CACHE.pop(self.store_path, None)
-        self._load_records(force_reload=True)
+        if offset == stat.st_size:
+            self.index.replace(index_entries, stat)
+        cached = AnnotationStore._CACHE.pop(self.store_path, None)
+        if (
+            cached
+            and cached.get("records_complete")
+            and not cached.get("migration_in_memory")
+            and isinstance(cached.get("records"), dict)
+            and cached.get("mtime") == before.st_mtime
+            and cached.get("size") == before.st_size
+        ):
+            records = cached["records"]
+            for frame_key, replacement in normalized_updates.items():
+                records.pop(frame_key, None)
+                new_frame = self._explicit_frame_for_record(replacement)
+                if new_frame is not None:
+                    records[int(new_frame)] = replacement
+            cached["mtime"] = stat.st_mtime
+            cached["size"] = stat.st_size
+            AnnotationStore._CACHE[self.store_path] = cached
 
     def get_frame(self, frame: int) -> Optional[Dict[str, Any]]:
         """Return the latest record for a frame if present."""
@@ -392,8 +457,9 @@ class AnnotationStore:
         """Best-effort fast retrieval for a single frame without full-store parse.
 
         This path is optimized for UI-time lookups when the annotation store can be
-        very large. It first checks cache, then line-scans for the matching frame
-        row and only parses that one JSON line.
+        very large. It first checks cache, then seeks to the frame's line through
+        the persistent sidecar index, and only line-scans for the matching frame
+        row when no usable index exists. Only that one JSON line is parsed.
         """
         cached_records = self._cached_records_or_empty()
         try:
@@ -404,6 +470,10 @@ class AnnotationStore:
             return cached_records.get(frame_key)
         if not self.store_path.exists():
             return None
+        try:
+            return self._read_indexed_frame(frame_key)
+        except LookupError:
+            pass
 
         try:
             stat = self.store_path.stat()
@@ -517,6 +587,15 @@ class AnnotationStore:
         if not frame_keys or not self.store_path.exists():
             return results
 
+        try:
+            for frame in sorted(frame_keys):
+                data = self._read_indexed_frame(frame)
+                if data is not None:
+                    results[frame] = data
+            return results
+        except LookupError:
+            pass
+
         try:
             with self.store_path.open("r", encoding="utf-8") as fh:
                 for raw_line in fh:
@@ -558,6 +637,9 @@ class AnnotationStore:
             return cached_records.keys()
         if not self.store_path.exists():
             return []
+        indexed_frames = self.index.frames()
+        if indexed_frames is not None:
+            return set(indexed_frames)
 
         frames: Set[int] = set()
         try:
@@ -654,10 +736,16 @@ class AnnotationStore:
 
             cached = AnnotationStore._CACHE.get(self.store_path)
             records: Dict[int, Dict[str, Any]] = {}
+            # The full parse already walks every line, so record byte offsets
+            # as well and refresh the sidecar index for free.
+            index_entries = []
+            offset = 0
             try:
-                with self.store_path.open("r", encoding="utf-8") as fh:
-                    for line in fh:
-                        line = line.strip()
+                with self.store_path.open("rb") as fh:
+                    for raw_line in fh:
+                        line_offset = offset
+                        offset += len(raw_line)
+                        line = raw_line.strip()
                         if not line:
                             continue
                         try:
@@ -676,6 +764,9 @@ class AnnotationStore:
                             )
                             continue
                         records[int(frame)] = data
+                        index_entries.append(
+                            (int(frame), line_offset, len(raw_line.rstrip(b"\r\n")))
+                        )
             except FileNotFoundError:
                 AnnotationStore._CACHE.pop(self.store_path, None)
                 if attempt == 0:
@@ -688,6 +779,8 @@ class AnnotationStore:
                 "records": records,
                 "records_complete": True,
             }
+            if offset == stat.st_size:
+                self.index.replace(index_entries, stat)
             return records
 
         return self._cached_records_or_empty()
@@ -937,7 +1030,9 @@ def _resolve_stub(data: Dict[str, Any], source: Union[str, Path]) -> Dict[str, A
         raise AnnotationStoreError("Annotation stub missing frame identifier.")
 
     store = AnnotationStore.for_frame_path(source, annotation_store)
-    record = store.get_frame(frame)
+    record = store.get_frame_fast(frame)
+    if record is None:
+        record = store.get_frame(frame)
     if record is None:
         raise AnnotationStoreError(
             f"Frame {frame} not present in store {store.store_path}"
@@ -0,0 +1,343 @@
+"""Persistent byte-offset index for NDJSON annotation stores.
+
+The index lives next to the store as ``<store>.idx`` and maps every frame to
+the ``(offset, length)`` of its most recent JSON line. It is validated against
+the store's size and ``mtime_ns`` so any process can seek straight to a single
+record instead of line-scanning or parsing the whole store.
+
+File layout (little endian)::
+
+    header:  magic[8] version:u32 reserved:u32 store_size:i64
+             store_mtime_ns:i64 entry_count:i64
+    entries: frame:i64 offset:u64 length:u32   (repeated entry_count times)
+
+Entries are appended in store order, so a later entry for the same frame
+supersedes an earlier one exactly like later store lines do.
+"""
+
+from __future__ import annotations
+
+import os
+import re
+import struct
+import tempfile
+import threading
+from pathlib import Path
+from typing import Dict, Iterable, List, Optional, Tuple
+
+from annolid.utils.logger import logger
+
+IndexEntry = Tuple[int, int, int]
+
+_MAGIC = b"ANLIDX\x00\x01"
+_VERSION = 1
+_HEADER = struct.Struct("<8sIIqqq")
+_ENTRY = struct.Struct("<qQI")
+_FRAME_PATTERN = re.compile(rb'"frame"\s*:\s*(-?\d+)')
+
+
+def _store_signature(stat: os.stat_result) -> Tuple[int, int]:
+    return int(stat.st_size), int(stat.st_mtime_ns)
+
+
+class AnnotationStoreIndex:
+    """Frame -> (offset, length) index kept in a sidecar file next to a store.
+
+    Instances are shared per store path within a process (see
+    :meth:`for_store`). All public methods are best-effort: IO failures on the
+    sidecar are logged at debug level and the index simply reports itself as
+    unavailable so callers can fall back to scanning the store.
+    """
+
+    SUFFIX = ".idx"
+    _INSTANCES: Dict[Path, "AnnotationStoreIndex"] = {}
+    _INSTANCES_LOCK = threading.Lock()
+
+    def __init__(self, store_path: Path):
+        self.store_path = Path(store_path)
+        self.index_path = self.store_path.with_name(self.store_path.name + self.SUFFIX)
+        self._entries: Dict[int, Tuple[int, int]] = {}
+        self._last_entry: Optional[IndexEntry] = None
+        self._signature: Optional[Tuple[int, int]] = None
+        self._lock = threading.RLock()
+
+    @classmethod
+    def for_store(cls, store_path: Path) -> "AnnotationStoreIndex":
+        store_path = Path(store_path)
+        with cls._INSTANCES_LOCK:
+            index = cls._INSTANCES.get(store_path)
+            if index is None:
+                index = cls(store_path)
+                cls._INSTANCES[store_path] = index
+            return index
+
+    # ------------------------------------------------------------------ reads
+    def lookup(self, frame: int) -> Optional[Tuple[int, int]]:
+        """Return ``(offset, length)`` for ``frame`` or ``None`` if absent.
+
+        Raises ``LookupError`` when the index cannot be made consistent with
+        the store, so callers can distinguish "not present" from "unknown".
+        """
+        with self._lock:
+            if not self._ensure_current():
+                raise LookupError(f"No usable index for {self.store_path}")
+            return self._entries.get(int(frame))
+
+    def frames(self) -> Optional[List[int]]:
+        """Return all indexed frame numbers, or ``None`` when unavailable."""
+        with self._lock:
+            if not self._ensure_current():
+                return None
+            return list(self._entries.keys())
+
+    def read_line(self, offset: int, length: int) -> Optional[bytes]:
+        try:
+            with self.store_path.open("rb") as fh:
+                fh.seek(int(offset))
+                data = fh.read(int(length))
+        except OSError:
+            return None
+        if len(data) != int(length):
+            return None
+        return data
+
+    # ----------------------------------------------------------------- writes
+    def note_append(self, frame: int, offset: int, length: int) -> None:
+        """Record a line appended to the store at ``offset``.
+
+        ``offset`` must be the store size before the append; the entry is only
+        recorded when the index was in sync with that size, otherwise the next
+        reader catches up by scanning the unindexed tail.
+        """
+        entry = (int(frame), int(offset), int(length))
+        try:
+            stat = self.store_path.stat()
+        except OSError:
+            return
+        signature = _store_signature(stat)
+        with self._lock:
+            if self._signature == signature:
+                # A reader already caught up with this append.
+                return
+            if self._signature is not None:
+                if self._signature[0] == entry[1]:
+                    self._add_entries([entry])
+                    self._signature = signature
+                else:
+                    self._reset()
+            self._append_to_disk([entry], expected_size=entry[1], signature=signature)
+
+    def replace(self, entries: Iterable[IndexEntry], stat: os.stat_result) -> None:
+        """Replace the index with ``entries`` that describe the store at ``stat``."""
+        entries = [(int(f), int(o), int(n)) for f, o, n in entries]
+        with self._lock:
+            self._reset()
+            self._add_entries(entries)
+            self._signature = _store_signature(stat)
+            self._write_full(entries, self._signature)
+
+    def invalidate(self) -> None:
+        """Forget the in-memory index and remove the sidecar file."""
+        with self._lock:
+            self._reset()
+            try:
+                self.index_path.unlink(missing_ok=True)
+            except OSError as exc:
+                logger.debug(
+                    "Failed to remove store index %s: %s", self.index_path, exc
+                )
+
+    # -------------------------------------------------------------- internals
+    def _reset(self) -> None:
+        self._entries = {}
+        self._last_entry = None
+        self._signature = None
+
+    def _add_entries(self, entries: Iterable[IndexEntry]) -> None:
+        for frame, offset, length in entries:
+            self._entries[frame] = (offset, length)
+            self._last_entry = (frame, offset, length)
+
+    def _ensure_current(self) -> bool:
+        try:
+            stat = self.store_path.stat()
+        except OSError:
+            self._reset()
+            return False
+        signature = _store_signature(stat)
+        if self._signature == signature:
+            return True
+
+        if self._extend(stat):
+            return True
+
+        self._reset()
+        if self._load_from_disk():
+            if self._signature == signature or self._extend(stat):
+                return True
+            self._reset()
+
+        entries = self._scan(start=0, end=signature[0])
+        if entries is None:
+            return False
+        self._add_entries(entries)
+        self._signature = signature
+        self._write_full(entries, signature)
+        return True
+
+    def _extend(self, stat: os.stat_result) -> bool:
+        """Index lines appended since the last indexed store state."""
+        if self._signature is None or not self._can_extend(self._signature[0], stat):
+            return False
+        old_size = self._signature[0]
+        signature = _store_signature(stat)
+        tail = self._scan(start=old_size, end=signature[0])
+        if tail is None:
+            return False
+        self._add_entries(tail)
+        self._signature = signature
+        self._append_to_disk(tail, expected_size=old_size, signature=signature)
+        return True
+
+    def _can_extend(self, indexed_size: int, stat: os.stat_result) -> bool:
+        """Return True when the store looks like it only grew past ``indexed_size``."""
+        if int(stat.st_size) <= indexed_size:
+            return False
+        if indexed_size == 0:
+            return True
+        try:
+            with self.store_path.open("rb") as fh:
+                fh.seek(indexed_size - 1)
+                if fh.read(1) != b"\n":
+                    return False
+                if self._last_entry is None:
+                    return True
+                frame, offset, length = self._last_entry
+                if offset > 0:
+                    fh.seek(offset - 1)
+                    if fh.read(1) != b"\n":
+                        return False
+                else:
+                    fh.seek(0)
+                line = fh.read(length)
+        except OSError:
+            return False
+        match = _FRAME_PATTERN.search(line)
+        return bool(match) and int(match.group(1)) == frame
+
+    def _scan(self, start: int, end: int) -> Optional[List[IndexEntry]]:
+        entries: List[IndexEntry] = []
+        try:
+            with self.store_path.open("rb") as fh:
+                fh.seek(start)
+                offset = start
+                while offset < end:
+                    raw_line = fh.readline()
+                    if not raw_line:
+                        break
+                    if not raw_line.endswith(b"\n"):
+                        # A writer is mid-append; index only complete lines.
+                        return None
+                    line_offset = offset
+                    offset += len(raw_line)
+                    match = _FRAME_PATTERN.search(raw_line)
+                    if not match:
+                        continue
+                    entries.append(
+                        (
+                            int(match.group(1)),
+                            line_offset,
+                            len(raw_line.rstrip(b"\r\n")),
+                        )
+                    )
+        except OSError:
+            return None
+        if offset != end:
+            return None
+        return entries
+
+    def _read_header(self, fh) -> Optional[Tuple[int, int, int]]:
+        raw = fh.read(_HEADER.size)
+        if len(raw) != _HEADER.size:
+            return None
+        magic, version, _reserved, size, mtime_ns, count = _HEADER.unpack(raw)
+        if magic != _MAGIC or version != _VERSION or count < 0:
+            return None
+        return size, mtime_ns, count
+
+    def _load_from_disk(self) -> bool:
+        try:
+            with self.index_path.open("rb") as fh:
+                header = self._read_header(fh)
+                if header is None:
+                    return False
+                size, mtime_ns, count = header
+                payload = fh.read(count * _ENTRY.size)
+        except OSError:
+            return False
+        if len(payload) != count * _ENTRY.size:
+            return False
+        self._add_entries(_ENTRY.iter_unpack(payload))
+        self._signature = (size, mtime_ns)
+        return True
+
+    def _write_full(
+        self, entries: List[IndexEntry], signature: Tuple[int, int]
+    ) -> None:
+        header = _HEADER.pack(
+            _MAGIC, _VERSION, 0, signature[0], signature[1], len(entries)
+        )
+        temp_path: Optional[Path] = None
+        try:
+            with tempfile.NamedTemporaryFile(
+                mode="wb",
+                dir=str(self.index_path.parent),
+                prefix=f"{self.index_path.name}.",
+                suffix=".tmp",
+                delete=False,
+            ) as fh:
+                temp_path = Path(fh.name)
+                fh.write(header)
+                fh.write(b"".join(_ENTRY.pack(*entry) for entry in entries))
+            temp_path.replace(self.index_path)
+        except OSError as exc:
+            logger.debug("Failed to write store index %s: %s", self.index_path, exc)
+        finally:
+            if temp_path is not None and temp_path.exists():
+                try:
+                    temp_path.unlink(missing_ok=True)
+                except OSError:
+                    pass
+
+    def _append_to_disk(
+        self,
+        entries: List[IndexEntry],
+        expected_size: int,
+        signature: Tuple[int, int],
+    ) -> None:
+        """Append ``entries`` to the sidecar if it describes ``expected_size``."""
+        if not self.index_path.exists():
+            if expected_size == 0:
+                self._write_full(list(entries), signature)
+            return
+        try:
+            with self.index_path.open("r+b") as fh:
+                header = self._read_header(fh)
+                if header is None or header[0] != expected_size:
+                    return
+                count = header[2]
+                fh.seek(_HEADER.size + count * _ENTRY.size)
+                fh.write(b"".join(_ENTRY.pack(*entry) for entry in entries))
+                fh.seek(0)
+                fh.write(
+                    _HEADER.pack(
+                        _MAGIC,
+                        _VERSION,
+                        0,
+                        signature[0],
+                        signature[1],
+                        count + len(entries),
+                    )
+                )
+        except OSError as exc:
+            logger.debug("Failed to update store index %s: %s", self.index_path, exc)
@@ -1,6 +1,7 @@
 import json
 
 from annolid.utils.annotation_store import AnnotationStore, load_labelme_json
+from annolid.utils.annotation_store_index import AnnotationStoreIndex
 
 
 def _append_dummy_record(store: AnnotationStore, frame: int) -> None:
@@ -337,3 +338,92 @@ def test_append_after_fast_scan_keeps_full_get_frame_consistent(tmp_path):
     frame1 = store.get_frame(1)
     assert frame0 is not None and int(frame0.get("frame")) == 0
     assert frame1 is not None and int(frame1.get("frame")) == 1
+
+
+def _drop_in_process_state(store: AnnotationStore) -> None:
+    AnnotationStore._CACHE.pop(store.store_path, None)
+    AnnotationStoreIndex._INSTANCES.pop(store.store_path, None)
+
+
+def test_append_frame_maintains_persistent_index_sidecar(tmp_path, monkeypatch):
+    frame_path = tmp_path / "video" / "video_000000000.json"
+    frame_path.parent.mkdir(parents=True, exist_ok=True)
+    store = AnnotationStore.for_frame_path(frame_path)
+    for frame in range(10):
+        _append_dummy_record(store, frame)
+
+    assert store.index.index_path.exists()
+    _drop_in_process_state(store)
+
+    def _fail_scan(*_args, **_kwargs):
+        raise AssertionError("Indexed lookup should not scan the store.")
+
+    monkeypatch.setattr(AnnotationStoreIndex, "_scan", _fail_scan)
+
+    record = store.get_frame_fast(7)
+    assert record is not None and record["frame"] == 7
+    assert store.get_frame_fast(42) is None
+    assert set(store.iter_frame_numbers_fast()) == set(range(10))
+
+
+def test_index_catches_up_with_unindexed_appends(tmp_path):
+    frame_path = tmp_path / "video" / "video_000000000.json"
+    frame_path.parent.mkdir(parents=True, exist_ok=True)
+    store = AnnotationStore.for_frame_path(frame_path)
+    for frame in range(3):
+        _append_dummy_record(store, frame)
+
+    # Simulate a writer that does not know about the sidecar index.
+    with store.store_path.open("a", encoding="utf-8") as fh:
+        fh.write(json.dumps({"frame": 3, "shapes": [{"label": "late"}]}) + "\n")
+    _drop_in_process_state(store)
+
+    record = store.get_frame_fast(3)
+    assert record is not None and record["shapes"][0]["label"] == "late"
+    assert store.get_frame_fast(1)["frame"] == 1
+
+
+def test_index_tracks_latest_record_after_rewrite(tmp_path):
+    frame_path = tmp_path / "video" / "video_000000000.json"
+    frame_path.parent.mkdir(parents=True, exist_ok=True)
+    store = AnnotationStore.for_frame_path(frame_path)
+    for frame in range(4):
+        _append_dummy_record(store, frame)
+    assert store.get_frame_fast(2) is not None
+
+    store.update_frame(2, {"frame": 2, "shapes": [{"label": "edited, longer"}]})
+    _drop_in_process_state(store)
+
+    assert store.get_frame_fast(2)["shapes"][0]["label"] == "edited, longer"
+    assert store.get_frame_fast(3)["frame"] == 3
+
+    store.remove_frames_after(1)
+    assert store.get_frame_fast(3) is None
+    assert store.get_frame_fast(1)["frame"] == 1
+
+
+def test_update_frames_rewrites_index_entries_in_place(tmp_path, monkeypatch):
+    frame_path = tmp_path / "video" / "video_000000000.json"
+    frame_path.parent.mkdir(parents=True, exist_ok=True)
+    store = AnnotationStore.for_frame_path(frame_path)
+    for frame in range(6):
+        _append_dummy_record(store, frame)
+    assert store.get_frame(0)["frame"] == 0
+
+    store.update_frames(
+        {
+            1: {"frame": 1, "shapes": [{"label": "a much longer label than before"}]},
+            4: {"frame": 4, "shapes": []},
+        }
+    )
+
+    def _fail_scan(*_args, **_kwargs):
+        raise AssertionError("The rewritten index should not need a re-scan.")
+
+    monkeypatch.setattr(AnnotationStoreIndex, "_scan", _fail_scan)
+    assert store.get_frame(1)["shapes"][0]["label"].startswith("a much")
+    _drop_in_process_state(store)
+    assert store.get_frame_fast(1)["shapes"][0]["label"].startswith("a much")
+    assert store.get_frame_fast(4)["shapes"] == []
+    assert store.get_frame_fast(5)["frame"] == 5
+    assert set(store.iter_frame_numbers_fast()) == set(range(6))
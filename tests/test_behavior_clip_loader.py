@@ -0,0 +1,84 @@
+from __future__ import annotations
+
+import pickle
+from pathlib import Path
+
+import cv2
+import numpy as np
+import pandas as pd
+import pytest
+
+from annolid.behavior.data_loading.clip_loader import ClipLoader, VideoReaderPool
+from annolid.behavior.data_loading.datasets import BehaviorDataset
+
+
+def _write_video(path: Path, n_frames: int = 40) -> None:
+    writer = cv2.VideoWriter(str(path), cv2.VideoWriter_fourcc(*"MJPG"), 30.0, (32, 24))
+    if not writer.isOpened():
+        pytest.skip("OpenCV cannot write MJPG test videos here")
+    for idx in range(n_frames):
+        frame = np.full((24, 32, 3), (idx * 6) % 256, dtype=np.uint8)
+        writer.write(frame)
+    writer.release()
+
+
+def _seek_read(path: Path, indices) -> np.ndarray:
+    cap = cv2.VideoCapture(str(path))
+    frames = []
+    for idx in indices:
+        cap.set(cv2.CAP_PROP_POS_FRAMES, idx)
+        ok, frame = cap.read()
+        assert ok
+        frames.append(cv2.cvtColor(frame, cv2.COLOR_BGR2RGB))
+    cap.release()
+    return np.stack(frames)
+
+
+def test_reader_pool_decodes_forward_in_requested_order(tmp_path: Path) -> None:
+    video = tmp_path / "clip.avi"
+    _write_video(video)
+    pool = VideoReaderPool(max_open=1, max_forward_grab=8)
+    indices = [30, 2, 2, 5, 17, 39]
+
+    frames = pool.read_frames(str(video), indices)
+
+    np.testing.assert_array_equal(frames, _seek_read(video, indices))
+    assert pool.frame_count(str(video)) == 40
+    # Pickled pools (DataLoader workers) start without open handles.
+    restored = pickle.loads(pickle.dumps(pool))
+    np.testing.assert_array_equal(
+        restored.read_frames(str(video), [3]), _seek_read(video, [3])
+    )
+    assert pool.read_frames(str(tmp_path / "missing.avi"), [0]) is None
+
+
+def test_clip_cache_is_memory_mapped_and_resized(tmp_path: Path) -> None:
+    video = tmp_path / "clip.avi"
+    _write_video(video)
+    loader = ClipLoader(cache_dir=str(tmp_path / "cache"), frame_size=12)
+
+    first = loader.load(str(video), [0, 10, 20])
+    assert first.shape == (3, 12, 16, 3)
+    second = loader.load(str(video), [0, 10, 20])
+    assert isinstance(second, np.memmap)
+    np.testing.assert_array_equal(first, second)
+    assert len(list((tmp_path / "cache").rglob("*.npy"))) == 1
+
+
+def test_behavior_dataset_loads_clip_tensor(tmp_path: Path) -> None:
+    video = tmp_path / "clip.avi"
+    _write_video(video)
+    dataset = object.__new__(BehaviorDataset)
+    dataset.fps = 30
+    dataset.clip_len = 1
+    dataset.num_frames = 4
+    dataset.clip_loader = ClipLoader()
+    annotations = pd.DataFrame({"Trial time": [0.5], "Behavior": ["walk"]})
+
+    frames = dataset.load_video_frames(str(video), 0, annotations)
+
+    assert frames.shape == (4, 3, 24, 32)
+    expected = _seek_read(video, [10, 19, 29, 39])
+    np.testing.assert_allclose(
+        frames.permute(0, 2, 3, 1).numpy(), expected / 255.0, atol=1e-6
+    )
@@ -194,6 +194,48 @@ def test_tcn_prediction_smoothing_keeps_probabilities_normalized(
     assert result["predictions"]["test"].shape == (40,)
 
 
+def test_tcn_batched_overlapping_windows_match_single_window_average(
+    tmp_path: Path,
+) -> None:
+    test_session = _session(tmp_path, "test", split="test")
+    dataset = TCNSequenceDataset(
+        [test_session],
+        feature_config=TCNFeatureConfig(),
+        label_names=["background", "walk", "groom"],
+        sequence_length=20,
+    )
+    torch.manual_seed(0)
+    model = BehaviorTCN(
+        input_dim=dataset.input_dim,
+        num_classes=len(dataset.label_names),
+        config=TCNModelConfig(hidden_dim=8, num_blocks=1, kernel_size=3, dropout=0.0),
+    )
+
+    streamed = {}
+    result = predict_tcn(
+        model,
+        dataset,
+        device="cpu",
+        stride=7,
+        batch_size=3,
+        on_session=lambda session_id, preds, scores: streamed.update(
+            {session_id: scores}
+        ),
+    )
+    assert result["predictions"] == {}
+
+    # Reference: every window on its own, then a plain per-frame average.
+    features = torch.from_numpy(dataset.features_by_session["test"])
+    totals = np.zeros((40, 3), dtype=np.float64)
+    counts = np.zeros(40)
+    with torch.no_grad():
+        for start in (0, 7, 14, 20):
+            probs = torch.softmax(model(features[None, start : start + 20]), dim=-1)
+            totals[start : start + 20] += probs[0].numpy()
+            counts[start : start + 20] += 1
+    np.testing.assert_allclose(streamed["test"], totals / counts[:, None], atol=1e-6)
+
+
 def test_tcn_behavior_engine_plugin_train_predict(tmp_path: Path) -> None:
     train_session = _session(tmp_path, "train", split="train")
     test_session = _session(tmp_path, "test", split="test")
@@ -103,3 +103,34 @@ def test_build_frame_grid_annotation_header_does_not_cover_video_pixels():
     assert image.shape[:2] == (46, 32)
     assert np.any(image[:22] != 255)
     assert np.all(image[22:] == 255)
+
+
+def test_core_cv2video_prefetch_matches_synchronous_reads(tmp_path: Path):
+    video_path = tmp_path / "test.avi"
+    _write_test_video(video_path, fps=10.0, frames=20)
+
+    reference = CV2Video(video_path)
+    prefetched = CV2Video(video_path, prefetch=4)
+    try:
+        assert prefetched.prefetch_enabled
+        order = [0, 1, 2, 3, 4, 5, 12, 13, 14, 3, 19, 7]
+        for frame_number in order:
+            expected = reference.load_frame(frame_number)
+            actual = prefetched.load_frame(frame_number)
+            np.testing.assert_array_equal(actual, expected)
+
+        batches = list(prefetched.get_frames_in_batches(8, 12, batch_size=2))
+        assert len(batches) == 4
+
+        stats = prefetched.prefetch_stats()
+        assert stats is not None
+        assert stats.frames_served == len(order) + 4
+        assert stats.hits > 0
+        assert stats.seeks >= 3
+        assert stats.decode_time_sec > 0
+        with pytest.raises(KeyError):
+            prefetched.load_frame(20)
+    finally:
+        reference.release()
+        prefetched.release()
+    assert not prefetched.prefetch_enabled
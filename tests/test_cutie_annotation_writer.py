@@ -0,0 +1,183 @@
+from __future__ import annotations
+
+import threading
+import time
+from typing import Dict, List
+
+import numpy as np
+import pytest
+
+import annolid.segmentation.cutie_vos.predict as cutie_predict
+from annolid.segmentation.cutie_vos.annotation_writer import (
+    AnnotationWriterPipeline,
+    PersistJob,
+)
+from annolid.segmentation.cutie_vos.predict import CutieCoreVideoProcessor
+
+
+def test_pipeline_renders_in_item_order_and_persists_in_frame_order() -> None:
+    written: List[int] = []
+    done: List[int] = []
+    callback_threads = set()
+
+    with AnnotationWriterPipeline(workers=3, max_pending=3) as writer:
+
+        def render(item):
+            # Later items finish rendering first.
+            time.sleep(0.002 * (4 - item))
+            return item * 10
+
+        assert writer.render(render, range(4)) == [0, 10, 20, 30]
+
+        for frame_idx in range(8):
+
+            def on_written(value):
+                callback_threads.add(threading.get_ident())
+                done.append(value)
+
+            writer.submit(
+                frame_idx,
+                PersistJob(
+                    write=lambda frame_idx=frame_idx: (
+                        time.sleep(0.001),
+                        written.append(frame_idx),
+                    )
+                    and frame_idx,
+                    on_written=on_written,
+                ),
+            )
+            assert writer.pending <= 3
+        writer.flush()
+        assert writer.pending == 0
+
+    assert written == list(range(8))
+    assert done == list(range(8))
+    assert callback_threads == {threading.get_ident()}
+
+
+def test_pipeline_reraises_stage_errors_on_the_caller() -> None:
+    def fail_render(_item):
+        raise ValueError("render failed")
+
+    with AnnotationWriterPipeline(workers=1, max_pending=2) as writer:
+        with pytest.raises(ValueError, match="render failed"):
+            writer.render(fail_render, [0])
+
+    def fail_write():
+        raise OSError("disk full")
+
+    with AnnotationWriterPipeline(workers=1, max_pending=2) as writer:
+        writer.submit(0, PersistJob(write=fail_write))
+        with pytest.raises(OSError, match="disk full"):
+            writer.flush()
+
+
+class _Cache:
+    def add_bbox(self, _key, _bbox):
+        pass
+
+    def get_most_recent_bbox(self, _key):
+        return None
+
+
+def _processor(monkeypatch, saved: List[Dict[str, object]]) -> CutieCoreVideoProcessor:
+    processor = CutieCoreVideoProcessor.__new__(CutieCoreVideoProcessor)
+    processor._frame_number = None
+    processor.epsilon_for_polygon = 2.0
+    processor.reject_suspicious_mask_jumps = False
+    processor.showing_KMedoids_in_mask = False
+    processor._last_mask_area_ratio = {}
+    processor._recent_instance_masks = {}
+    processor._recent_instance_mask_frames = {}
+    processor._recovery_seed_frame_index = None
+    processor._recovery_seed_frame = None
+    processor._recovery_seed_masks = {}
+    processor._last_saved_instance_masks = {}
+    processor.cache = _Cache()
+    processor._flow = None
+    processor._flow_hsv = None
+    processor._motion_index = ""
+    processor._annotation_writer = None
+    processor._record_frame_annotation = lambda *_args: None
+
+    def _capture_save_labels(**kwargs):
+        saved.append(
+            {
+                "filename": kwargs["filename"],
+                "shapes": [
+                    (shape.label, [tuple(pt) for pt in shape.points])
+                    for shape in kwargs["label_list"]
+                ],
+            }
+        )
+
+    monkeypatch.setattr(cutie_predict, "save_labels", _capture_save_labels)
+    return processor
+
+
+def _frames():
+    for frame_idx in range(1, 6):
+        mouse = np.zeros((32, 32), dtype=bool)
+        mouse[4 : 12 + frame_idx, 4 : 14 + frame_idx] = True
+        ball = np.zeros((32, 32), dtype=bool)
+        ball[20:28, 18 + frame_idx : 26 + frame_idx] = True
+        yield frame_idx, {"mouse": mouse, "ball": ball}
+
+
+def test_pipelined_frame_annotations_match_inline_saves(monkeypatch, tmp_path) -> None:
+    frame = np.zeros((32, 32, 3), dtype=np.uint8)
+    labels = {"mouse", "ball"}
+
+    inline_saved: List[Dict[str, object]] = []
+    inline_ratios: Dict[int, Dict[str, float]] = {}
+    inline = _processor(monkeypatch, inline_saved)
+    for frame_idx, mask_dict in _frames():
+        inline._submit_frame_annotation(
+            str(tmp_path / f"clip_{frame_idx:09d}.json"),
+            frame_idx,
+            frame,
+            mask_dict,
+            {},
+            labels,
+        )
+        inline_ratios[frame_idx] = dict(inline._last_mask_area_ratio)
+
+    piped_saved: List[Dict[str, object]] = []
+    piped = _processor(monkeypatch, piped_saved)
+    piped.annotation_writer_workers = 2
+    piped.annotation_writer_max_pending = 3
+
+    def _inline_metrics(_label, _mask):
+        raise AssertionError("metrics should come from the render stage")
+
+    piped._save_results = _inline_metrics
+    writer = piped._open_annotation_writer()
+    piped._annotation_writer = writer
+    try:
+        for frame_idx, mask_dict in _frames():
+            piped._frame_number = frame_idx
+            piped._submit_frame_annotation(
+                str(tmp_path / f"clip_{frame_idx:09d}.json"),
+                frame_idx,
+                frame,
+                mask_dict,
+                {},
+                labels,
+            )
+            # Per-instance history is current before the write completes.
+            assert piped._recent_instance_mask_frames == {
+                "mouse": frame_idx,
+                "ball": frame_idx,
+            }
+            assert piped._last_mask_area_ratio == inline_ratios[frame_idx]
+        writer.flush()
+    finally:
+        writer.close()
+
+    assert piped_saved == inline_saved
+    assert [item["filename"] for item in piped_saved] == [
+        str(tmp_path / f"clip_{idx:09d}.json") for idx in range(1, 6)
+    ]
+    assert piped._recovery_seed_frame_index == inline._recovery_seed_frame_index == 5
+    assert piped._recent_instance_mask_frames == {"mouse": 5, "ball": 5}
+    assert piped._frame_number == 5
@@ -22,6 +22,7 @@ from annolid.tracking.domain import (
 from annolid.tracking.dino_keypoint_tracker import (
     DinoKeypointTracker,
     DinoKeypointVideoProcessor,
+    RoiFeatures,
     SupportProbe,
 )
 
@@ -1138,3 +1139,201 @@ def test_body_prior_rejects_ear_to_tail_swap_on_mask(monkeypatch):
     assert results[0]["visible"] is True
     assert results[0]["misses"] == 0
     assert tracker.tracks["animalnose"].patch_rc == (0, 1)
+
+
+def test_tracker_update_consumes_batched_roi_features(monkeypatch):
+    class BatchExtractor(DummyExtractor):
+        def __init__(self, cfg):
+            super().__init__(cfg)
+            self.batch_sizes: List[int] = []
+
+        def extract_batch(self, images, return_layer="all", normalize=True):
+            self.batch_sizes.append(len(images))
+            return [self.extract(image) for image in images]
+
+    monkeypatch.setattr(
+        "annolid.tracking.dino_keypoint_tracker.Dinov3FeatureExtractor",
+        BatchExtractor,
+    )
+    tracker = DinoKeypointTracker(
+        model_name="dummy",
+        runtime_config=CutieDinoTrackerConfig(),
+        search_radius=1,
+    )
+    extractor = tracker.extractor
+
+    start_features = torch.zeros((2, 3, 3), dtype=torch.float32)
+    start_features[:, 1, 1] = torch.tensor([1.0, 0.0], dtype=torch.float32)
+    moved_features = torch.zeros((2, 3, 3), dtype=torch.float32)
+    moved_features[:, 1, 2] = torch.tensor([1.0, 0.0], dtype=torch.float32)
+    extractor.set_queue([start_features, moved_features, moved_features])
+
+    image = Image.fromarray(np.zeros((3, 3, 3), dtype=np.uint8))
+    registry = InstanceRegistry()
+    registry.register_keypoint(
+        KeypointState(
+            key="animalnose",
+            instance_label="animal",
+            label="nose",
+            x=1.0,
+            y=1.0,
+        )
+    )
+    tracker.start(image, registry, None)
+
+    roi = tracker.feature_window_roi(3, 3, None, margin=4)
+    assert roi == (0, 0, 3, 3)
+    window = tracker.extract_roi_features_batch([image, image], roi)
+    assert extractor.batch_sizes == [2]
+    assert extractor._queue == []
+
+    results = tracker.update(image, None, features=window[0])
+    assert tracker.last_feature_source == "batch"
+    assert tracker.tracks["animalnose"].patch_rc == (1, 2)
+    assert results[0]["visible"] is True
+
+    # Features whose ROI does not cover the frame's ROI are ignored.
+    extractor.queue(moved_features)
+    partial = RoiFeatures(roi=(0, 0, 2, 2), feats=window[1].feats)
+    tracker.update(image, None, features=partial)
+    assert tracker.last_feature_source == "frame"
+    assert extractor._queue == []
+
+
+def test_batched_features_are_cropped_to_each_frame_roi(monkeypatch):
+    monkeypatch.setattr(
+        "annolid.tracking.dino_keypoint_tracker.Dinov3FeatureExtractor",
+        DummyExtractor,
+    )
+    tracker = DinoKeypointTracker(
+        model_name="dummy", runtime_config=CutieDinoTrackerConfig()
+    )
+    image = Image.fromarray(np.zeros((40, 40, 3), dtype=np.uint8))
+    mask = np.zeros((40, 40), dtype=bool)
+    mask[20:22, 20:22] = True
+    grid = torch.arange(2 * 40 * 40, dtype=torch.float32).reshape(2, 40, 40)
+
+    window = RoiFeatures(roi=(0, 0, 40, 40), feats=grid)
+    feats, scale_x, scale_y, grid_hw = tracker._prepare_roi_inputs(
+        image, {"animal": mask}, features=window
+    )
+    assert tracker.last_feature_source == "batch"
+    assert tracker._roi_box == (4, 4, 38, 38)
+    assert tracker._roi_offset == (4.0, 4.0)
+    assert (scale_x, scale_y) == (1.0, 1.0)
+    assert tuple(grid_hw) == (34, 34)
+    assert torch.equal(feats, grid[:, 4:38, 4:38])
+
+    # Patch masks survive moving on to the next window for the same ROI.
+    tracker._last_patch_masks = {"animal": np.ones((34, 34), dtype=bool)}
+    next_window = RoiFeatures(roi=(2, 2, 40, 40), feats=grid[:, 2:, 2:])
+    feats, _, _, _ = tracker._prepare_roi_inputs(
+        image, {"animal": mask}, features=next_window
+    )
+    assert torch.equal(feats, grid[:, 4:38, 4:38])
+    assert "animal" in tracker._last_patch_masks
+
+
+def test_video_processor_batches_feature_windows(tmp_path, monkeypatch):
+    class StubVideo:
+        def __init__(self, _path):
+            self.frames = [
+                np.full((4, 4, 3), fill_value=i, dtype=np.uint8) for i in range(7)
+            ]
+
+        def get_first_frame(self):
+            return self.frames[0]
+
+        def total_frames(self):
+            return len(self.frames)
+
+        def load_frame(self, index):
+            if 0 <= index < len(self.frames):
+                return self.frames[index]
+            return None
+
+    class StubMaskManager:
+        def __init__(self, *args, **kwargs):
+            self.enabled = False
+
+        def reset_state(self) -> None:
+            pass
+
+        def update_masks(self, _frame_number, _frame, _registry):
+            return {}
+
+    class StubTracker:
+        instance = None
+
+        def __init__(self, *args, **_kwargs):
+            self.batches: List[List[int]] = []
+            self.updates: List[Tuple[int, bool]] = []
+            self.last_feature_source = "frame"
+            StubTracker.instance = self
+
+        def reset_state(self) -> None:
+            pass
+
+        def start(self, _image, _registry, _mask_lookup) -> None:
+            pass
+
+        def feature_window_roi(self, width, height, _mask_lookup, *, margin=0):
+            return (0, 0, width, height)
+
+        def extract_roi_features_batch(self, images, roi):
+            ids = [int(np.array(image)[0, 0, 0]) for image in images]
+            self.batches.append(ids)
+            return [RoiFeatures(roi=roi, feats=torch.zeros(1, 1, 1)) for _ in ids]
+
+        def update(self, image, _mask_lookup, features=None):
+            frame_id = int(np.array(image)[0, 0, 0])
+            self.updates.append((frame_id, features is not None))
+            # Frame 2 pretends its instances left the window ROI.
+            self.last_feature_source = "frame" if frame_id == 2 else "batch"
+            return []
+
+    monkeypatch.setattr(
+        "annolid.tracking.dino_keypoint_tracker.CV2Video",
+        StubVideo,
+    )
+    monkeypatch.setattr(
+        "annolid.tracking.dino_keypoint_tracker.CutieMaskManager",
+        StubMaskManager,
+    )
+    monkeypatch.setattr(
+        "annolid.tracking.dino_keypoint_tracker.DinoKeypointTracker",
+        StubTracker,
+    )
+
+    video_path = tmp_path / "clip.mp4"
+    video_path.write_text("video")
+    result_dir = tmp_path / "clip"
+    result_dir.mkdir()
+    registry = InstanceRegistry()
+    registry.register_keypoint(
+        KeypointState(
+            key="animalnose",
+            instance_label="animal",
+            label="nose",
+            x=1.0,
+            y=1.0,
+        )
+    )
+    AnnotationAdapter(image_height=4, image_width=4).write_annotation(
+        frame_number=0,
+        registry=registry,
+        output_dir=result_dir,
+    )
+    (result_dir / "clip_000000000.png").write_bytes(b"")
+
+    processor = DinoKeypointVideoProcessor(
+        video_path=str(video_path),
+        result_folder=result_dir,
+        model_name="dummy",
+        runtime_config=CutieDinoTrackerConfig(),
+    )
+    processor.process_video(feature_batch_size=3)
+
+    tracker = StubTracker.instance
+    assert tracker.batches == [[1, 2, 3], [3, 4, 5], [6]]
+    assert tracker.updates == [(frame, True) for frame in range(1, 7)]
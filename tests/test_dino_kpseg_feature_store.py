@@ -0,0 +1,116 @@
+from __future__ import annotations
+
+import pickle
+from pathlib import Path
+
+import numpy as np
+import torch
+
+from annolid.segmentation.dino_kpseg.data import DinoKPSEGPoseDataset
+from annolid.segmentation.dino_kpseg.feature_store import (
+    DinoKPSEGFeatureStore,
+    DinoKPSEGFeatureStoreWriter,
+    feature_store_dir,
+)
+from tests.test_dino_kpseg_labelme_dataset_loading import (
+    _StubExtractor,
+    _write_minimal_labelme_pose_example,
+)
+
+
+def test_feature_store_roundtrip_rolls_shards_and_appends(tmp_path: Path) -> None:
+    feats = {
+        f"{idx:040x}": torch.arange(8 * 3 * 2, dtype=torch.float32).reshape(8, 3, 2)
+        + idx
+        for idx in range(5)
+    }
+    with DinoKPSEGFeatureStoreWriter(tmp_path, shard_bytes=200) as writer:
+        for key, value in list(feats.items())[:3]:
+            assert writer.add(key, value.to(torch.float16))
+        assert not writer.add(next(iter(feats)), feats[next(iter(feats))])
+
+    with DinoKPSEGFeatureStoreWriter(tmp_path, shard_bytes=200) as writer:
+        for key, value in list(feats.items())[3:]:
+            assert writer.add(key, value.numpy())
+        assert writer.summary()["entries"] == 5
+
+    store = DinoKPSEGFeatureStore.open(tmp_path)
+    assert store is not None
+    assert len(store) == 5
+    assert len(list(feature_store_dir(tmp_path).glob("shard_*.bin"))) == 5
+    for idx, (key, expected) in enumerate(feats.items()):
+        loaded = store.get(key)
+        assert loaded.dtype == (torch.float16 if idx < 3 else torch.float32)
+        torch.testing.assert_close(loaded.float(), expected)
+    assert store.get("0" * 40 + "f") is None
+
+    key = next(iter(feats))
+    restored = pickle.loads(pickle.dumps(store))
+    torch.testing.assert_close(restored.get(key).float(), feats[key])
+
+    # Tensors are copy-on-write views; mutating them never touches the shard.
+    store.get(key).zero_()
+    assert np.allclose(
+        DinoKPSEGFeatureStore.open(tmp_path).get(key).float().numpy(),
+        feats[key].numpy(),
+    )
+
+
+def test_concurrent_writers_keep_each_others_entries(tmp_path: Path) -> None:
+    def _feats(value: float) -> torch.Tensor:
+        return torch.full((4, 2, 2), value, dtype=torch.float32)
+
+    with DinoKPSEGFeatureStoreWriter(tmp_path) as seed:
+        seed.add("0" * 40, _feats(0.0))
+    reader = DinoKPSEGFeatureStore.open(tmp_path)
+    assert reader is not None and len(reader) == 1
+
+    first = DinoKPSEGFeatureStoreWriter(tmp_path)
+    second = DinoKPSEGFeatureStoreWriter(tmp_path)
+    assert first.add("1" * 40, _feats(1.0))
+    assert second.add("2" * 40, _feats(2.0))
+    assert second.add("3" * 40, _feats(3.0))
+    first.close()
+    second.close()
+
+    shards = sorted(feature_store_dir(tmp_path).glob("shard_*.bin"))
+    assert len(shards) == 3
+    # The open reader picks up the merged index on its next miss.
+    for digit in "0123":
+        assert torch.equal(reader.get(digit * 40), _feats(float(digit)))
+    assert len(reader) == 4
+
+
+def test_dataset_reads_precomputed_features_from_store(tmp_path: Path) -> None:
+    img_path, json_path = _write_minimal_labelme_pose_example(tmp_path / "labelme")
+    cache_dir = tmp_path / "cache"
+
+    def _dataset(extractor):
+        return DinoKPSEGPoseDataset(
+            [img_path],
+            kpt_count=2,
+            kpt_dims=3,
+            radius_px=6.0,
+            extractor=extractor,  # type: ignore[arg-type]
+            label_format="labelme",
+            label_paths=[json_path],
+            keypoint_names=["k0", "k1"],
+            instance_mode="per_instance",
+            cache_dir=cache_dir,
+        )
+
+    writer_extractor = _StubExtractor(patch_size=16)
+    ds = _dataset(writer_extractor)
+    with DinoKPSEGFeatureStoreWriter(cache_dir) as writer:
+        ds.feature_store_writer = writer
+        first = [ds[idx]["feats"].clone() for idx in range(len(ds))]
+    assert writer_extractor.calls == 2
+    assert not list(cache_dir.glob("*.pt"))
+
+    reader_extractor = _StubExtractor(patch_size=16)
+    reader = _dataset(reader_extractor)
+    second = [reader[idx]["feats"] for idx in range(len(reader))]
+    assert reader_extractor.calls == 0
+    for a, b in zip(first, second):
+        torch.testing.assert_close(a, b)
+    assert len(DinoKPSEGFeatureStore.open(cache_dir)) == 2
@@ -0,0 +1,64 @@
+from __future__ import annotations
+
+from types import SimpleNamespace
+
+import numpy as np
+import torch
+from PIL import Image
+
+from annolid.features.dinov3_extractor import Dinov3Config, Dinov3FeatureExtractor
+
+
+class _FakeBackbone:
+    """Tokens are per-patch means of the input, so results depend on the image."""
+
+    def __init__(self, patch_size: int) -> None:
+        self.patch_size = patch_size
+        self.batch_sizes: list[int] = []
+
+    def __call__(self, *, pixel_values, output_hidden_states):
+        self.batch_sizes.append(int(pixel_values.shape[0]))
+        pooled = torch.nn.functional.avg_pool2d(pixel_values, self.patch_size)
+        tokens = pooled.flatten(2).transpose(1, 2)  # B, N, 3
+        cls = tokens.mean(dim=1, keepdim=True)
+        tokens = torch.cat([cls, tokens], dim=1)
+        hidden = (tokens * 0.5, tokens, tokens * 2.0)
+        return SimpleNamespace(last_hidden_state=hidden[-1], hidden_states=hidden)
+
+
+def _extractor() -> Dinov3FeatureExtractor:
+    extractor = object.__new__(Dinov3FeatureExtractor)
+    extractor.cfg = Dinov3Config(short_side=8, return_layer="all", use_amp=False)
+    extractor.device = torch.device("cpu")
+    extractor.patch_size = 4
+    extractor.model = _FakeBackbone(patch_size=4)
+    extractor._num_special_tokens = 1
+    extractor.num_hidden_layers = 2
+    extractor._layers = (-2, -1)
+    extractor._mean = (0.5, 0.5, 0.5)
+    extractor._std = (0.25, 0.25, 0.25)
+    return extractor
+
+
+def test_extract_batch_matches_per_image_extract_and_groups_by_size():
+    rng = np.random.default_rng(0)
+    images = [
+        Image.fromarray(rng.integers(0, 255, (8, 8, 3), dtype=np.uint8)),
+        Image.fromarray(rng.integers(0, 255, (8, 16, 3), dtype=np.uint8)),
+        Image.fromarray(rng.integers(0, 255, (8, 8, 3), dtype=np.uint8)),
+    ]
+    extractor = _extractor()
+
+    batched = extractor.extract_batch(images)
+    assert sorted(extractor.model.batch_sizes) == [1, 2]
+
+    for image, feats in zip(images, batched):
+        single = extractor.extract(image)
+        assert feats.shape == single.shape
+        torch.testing.assert_close(feats, single)
+    assert batched[1].shape == (2, 3, 2, 4)
+
+    extractor.model.batch_sizes.clear()
+    last = extractor.extract_batch(images, return_layer="last", batch_size=1)
+    assert extractor.model.batch_sizes == [1, 1, 1]
+    assert last[0].shape == (3, 2, 2)
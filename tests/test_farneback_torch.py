@@ -2,7 +2,10 @@ import numpy as np
 import cv2
 import pytest
 
-from annolid.motion.farneback_torch import calc_optical_flow_farneback_torch
+from annolid.motion.farneback_torch import (
+    calc_optical_flow_farneback_torch,
+    calc_optical_flow_farneback_torch_batch,
+)
 
 
 def _synthetic_pair_translation(H=128, W=160, dx=0.25, dy=-0.35, noise=0.0, seed=0):
@@ -99,3 +102,60 @@ def test_farneback_torch_matches_opencv(case):
     mean_flow = flow_th_i.mean(axis=(0, 1))
     assert np.sign(mean_flow[0]) == np.sign(case["dx"])
     assert np.sign(mean_flow[1]) == np.sign(case["dy"])
+
+
+def test_farneback_torch_batch_matches_pairwise_calls():
+    prev, _ = _synthetic_pair_translation(H=64, W=80, seed=3)
+    frames = [
+        cv2.warpAffine(prev, np.float32([[1, 0, 0.4 * i], [0, 1, -0.3 * i]]), (80, 64))
+        for i in range(5)
+    ]
+    params = dict(levels=1, winsize=9, device="cpu")
+
+    chained = calc_optical_flow_farneback_torch_batch(frames, **params)
+    assert chained.shape == (4, 64, 80, 2)
+    for idx in range(4):
+        expected = calc_optical_flow_farneback_torch(
+            frames[idx], frames[idx + 1], **params
+        )
+        np.testing.assert_allclose(chained[idx], expected, atol=1e-5)
+
+    strided = calc_optical_flow_farneback_torch_batch(
+        frames, pairs=[(0, 2), (4, 1)], **params
+    )
+    np.testing.assert_allclose(
+        strided[1],
+        calc_optical_flow_farneback_torch(frames[4], frames[1], **params),
+        atol=1e-5,
+    )
+
+
+@pytest.mark.parametrize("stride", [1, 2])
+def test_process_video_flow_batches_torch_farneback(tmp_path, stride):
+    from annolid.motion.flow_runner import process_video_flow
+
+    video = tmp_path / "clip.avi"
+    writer = cv2.VideoWriter(
+        str(video), cv2.VideoWriter_fourcc(*"MJPG"), 10.0, (48, 32)
+    )
+    for idx in range(7):
+        frame = np.zeros((32, 48, 3), dtype=np.uint8)
+        cv2.circle(frame, (12 + 3 * idx, 16), 6, (255, 255, 255), -1)
+        writer.write(frame)
+    writer.release()
+
+    def _run(name, **kwargs):
+        csv_path = tmp_path / f"{name}.csv"
+        process_video_flow(
+            str(video),
+            backend="farneback_torch",
+            save_csv=str(csv_path),
+            sample_stride=stride,
+            **kwargs,
+        )
+        return np.loadtxt(csv_path, delimiter=",", skiprows=1)
+
+    serial = _run("serial", batch_size=1, decode_ahead=0)
+    batched = _run("batched", batch_size=3, decode_ahead=2)
+    assert serial.shape[0] == 6 // stride
+    np.testing.assert_allclose(batched, serial, atol=1e-5)
@@ -0,0 +1,119 @@
+from __future__ import annotations
+
+import json
+from pathlib import Path
+
+import cv2
+import numpy as np
+
+from annolid.motion.flow_runner import (
+    _append_flow_ndjson,
+    _build_flow_record,
+    process_video_flow,
+)
+from annolid.motion.flow_store import (
+    FlowStore,
+    FlowStoreWriter,
+    convert_ndjson_to_flow_store,
+    flow_store_path_for_ndjson,
+)
+
+
+def _flow(idx: int, height: int = 12, width: int = 16) -> np.ndarray:
+    yy, xx = np.mgrid[0:height, 0:width].astype(np.float32)
+    return np.stack([xx * 0.25 - idx, yy * -0.5 + idx * 0.1], axis=-1)
+
+
+def test_flow_store_random_and_range_reads(tmp_path: Path) -> None:
+    root = tmp_path / "store"
+    with FlowStoreWriter(root, shard_bytes=1024, publish_every=2) as writer:
+        for idx in (1, 2, 3, 5):
+            writer.add(idx, _flow(idx))
+        # Re-written frames keep the later copy.
+        writer.add(2, _flow(20))
+    assert len(list(root.glob("shard_*.bin"))) > 1
+
+    store = FlowStore.open(root)
+    assert store is not None
+    assert len(store) == 4
+    assert store.frame_indices.tolist() == [1, 2, 3, 5]
+    assert 4 not in store and store.read(4) is None
+    np.testing.assert_allclose(store.read(3), _flow(3), atol=1e-3)
+    np.testing.assert_allclose(store.read(2), _flow(20), atol=1e-3)
+    mag = np.hypot(*np.moveaxis(_flow(20), -1, 0))
+    assert store.max_magnitude() >= float(mag.max()) - 1e-4
+
+    frames, flows = store.read_range(2, 6)
+    assert frames.tolist() == [2, 3, 5]
+    assert flows.shape == (3, 12, 16, 2)
+    np.testing.assert_allclose(flows[1], store.read(3))
+    frames, _ = store.read_range(1, 6, step=2)
+    assert frames.tolist() == [1, 3, 5]
+
+    with FlowStoreWriter(root, quantize=False) as writer:
+        writer.add(7, _flow(7))
+    store = FlowStore.open(root)
+    assert store.frame_indices.tolist() == [7]
+    assert store.read_encoded(7).dtype == np.float16
+    np.testing.assert_allclose(store.read(7), _flow(7), atol=1e-2)
+
+
+def test_flow_store_publishes_only_new_index_rows(tmp_path: Path) -> None:
+    root = tmp_path / "store"
+    writer = FlowStoreWriter(root, publish_every=2)
+    log_path = root / "index.rows"
+    sizes = []
+    for idx in range(6):
+        writer.add(idx, _flow(idx))
+        sizes.append(log_path.stat().st_size if log_path.exists() else 0)
+    row_bytes = sizes[1] // 2
+    assert sizes == [count * row_bytes for count in (0, 2, 2, 4, 4, 6)]
+    assert not (root / "index.npy").exists()
+
+    live = FlowStore.open(root)
+    assert live is not None
+    assert live.frame_indices.tolist() == list(range(6))
+    np.testing.assert_allclose(live.read(4), _flow(4), atol=1e-3)
+
+    writer.add(6, _flow(6))
+    writer.close()
+    assert (root / "index.npy").exists() and not log_path.exists()
+    live.refresh()
+    assert live.frame_indices.tolist() == list(range(7))
+
+
+def test_convert_ndjson_keeps_encoded_values(tmp_path: Path) -> None:
+    ndjson = tmp_path / "clip_flow.ndjson"
+    for idx in range(1, 4):
+        record = _build_flow_record("clip.mp4", idx, _flow(idx), 12, 16)
+        _append_flow_ndjson(ndjson, record)
+    with ndjson.open("a", encoding="utf-8") as fh:
+        fh.write(json.dumps({"frame_index": 9, "otherData": {}}) + "\n")
+
+    summary = convert_ndjson_to_flow_store(ndjson)
+    assert summary["frames"] == 3
+    assert summary["skipped"] == 1
+
+    store = FlowStore.open(flow_store_path_for_ndjson(ndjson))
+    assert store.meta["video_name"] == "clip.mp4"
+    for idx in range(1, 4):
+        np.testing.assert_allclose(store.read(idx), _flow(idx), atol=2e-3)
+
+
+def test_process_video_flow_writes_store(tmp_path: Path) -> None:
+    video = tmp_path / "clip.avi"
+    writer = cv2.VideoWriter(
+        str(video), cv2.VideoWriter_fourcc(*"MJPG"), 10.0, (32, 24)
+    )
+    for idx in range(4):
+        frame = np.zeros((24, 32, 3), dtype=np.uint8)
+        cv2.rectangle(frame, (4 + 2 * idx, 6), (12 + 2 * idx, 14), (255, 255, 255), -1)
+        writer.write(frame)
+    writer.release()
+
+    process_video_flow(
+        str(video), save_flow_store=str(tmp_path / "store"), visualization="hsv"
+    )
+    store = FlowStore.open(tmp_path / "store")
+    assert store.frame_indices.tolist() == [1, 2, 3]
+    assert store.read(1).shape == (24, 32, 2)
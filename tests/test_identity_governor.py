@@ -3,8 +3,10 @@ from __future__ import annotations
 import json
 from pathlib import Path
 
+from annolid.postprocessing import identity_governor
 from annolid.postprocessing.identity_governor import run_identity_governor
 from annolid.postprocessing.zone_schema import build_zone_shape
+from annolid.utils.annotation_store import AnnotationStore
 
 
 def _rect(cx: float, cy: float, size: float = 10.0) -> list[list[float]]:
@@ -267,3 +269,96 @@ def test_identity_governor_supports_aggregate_zone_metrics(tmp_path: Path):
     correction = result.proposed_corrections[0]
     assert correction.track_id == "1"
     assert correction.corrected_label == "alpha"
+
+
+def test_identity_governor_parallel_scan_matches_serial(tmp_path: Path, monkeypatch):
+    annotation_dir, zone_path = _make_test_session(tmp_path)
+    serial = run_identity_governor(
+        annotation_dir=annotation_dir,
+        policy=_policy(),
+        zone_file=zone_path,
+        workers=1,
+    )
+    monkeypatch.setattr(identity_governor, "_PARALLEL_MIN_FILES", 0)
+    monkeypatch.setattr(identity_governor, "_SCAN_CHUNK_FILES", 2)
+    parallel = run_identity_governor(
+        annotation_dir=annotation_dir,
+        policy=_policy(),
+        zone_file=zone_path,
+        workers=2,
+    )
+
+    assert parallel.scanned_files == serial.scanned_files == 6
+    assert parallel.scanned_observations == serial.scanned_observations == 12
+    assert parallel.proposed_corrections == serial.proposed_corrections
+
+
+def test_identity_governor_reads_and_repairs_annotation_store(tmp_path: Path):
+    annotation_dir, zone_path = _make_test_session(tmp_path)
+    store = AnnotationStore(
+        annotation_dir / f"{annotation_dir.name}{AnnotationStore.STORE_SUFFIX}"
+    )
+    # Frames 2-5 live only in the store, behind stub files.
+    for frame_number in (2, 3, 4, 5):
+        frame_path = annotation_dir / f"session_{frame_number:09d}.json"
+        record = json.loads(frame_path.read_text(encoding="utf-8"))
+        record["frame"] = frame_number
+        store.append_frame(record)
+        store.write_stub(frame_path, frame_number, record)
+    frame1_text = (annotation_dir / "session_000000001.json").read_text(
+        encoding="utf-8"
+    )
+
+    result = run_identity_governor(
+        annotation_dir=annotation_dir,
+        policy=_policy(),
+        zone_file=zone_path,
+        apply_changes=True,
+    )
+
+    assert result.scanned_files == 6
+    assert len(result.proposed_corrections) == 2
+    # Only the store records that received corrections are rewritten.
+    assert result.updated_files == 4
+    assert (annotation_dir / "session_000000001.json").read_text(
+        encoding="utf-8"
+    ) == frame1_text
+    AnnotationStore._CACHE.pop(store.store_path, None)
+    for frame_number in (2, 3, 4, 5):
+        shapes = store.get_frame(frame_number)["shapes"]
+        by_track = {str(shape["track_id"]): shape for shape in shapes}
+        assert by_track["1"]["instance_label"] == "alpha"
+        assert by_track["2"]["instance_label"] == "beta"
+
+
+def test_identity_governor_resolves_legacy_store_frames(tmp_path: Path, monkeypatch):
+    annotation_dir, zone_path = _make_test_session(tmp_path)
+    expected = run_identity_governor(
+        annotation_dir=annotation_dir, policy=_policy(), zone_file=zone_path
+    )
+    store_path = annotation_dir / f"{annotation_dir.name}{AnnotationStore.STORE_SUFFIX}"
+    # Legacy rows carry no "frame": it comes from imagePath, else the row
+    # position. Rows 2 and 5 hold frames 5 and 2.
+    lines = []
+    for frame_number in (0, 1, 5, 3, 4, 2):
+        frame_path = annotation_dir / f"session_{frame_number:09d}.json"
+        record = json.loads(frame_path.read_text(encoding="utf-8"))
+        if frame_number in (2, 5):
+            record["imagePath"] = f"session_{frame_number:09d}.png"
+        lines.append(json.dumps(record) + "\n")
+        frame_path.unlink()
+    store_path.write_text("".join(lines), encoding="utf-8")
+    # Small chunks so row positions have to carry across chunk boundaries.
+    monkeypatch.setattr(identity_governor, "_STORE_CHUNK_BYTES", 256)
+
+    result = run_identity_governor(
+        annotation_dir=annotation_dir,
+        policy=_policy(),
+        zone_file=zone_path,
+        source="store",
+    )
+
+    assert result.scanned_observations == expected.scanned_observations == 12
+
+    assert result.proposed_corrections == expected.proposed_corrections
+    assert len(result.proposed_corrections) == 2
@@ -0,0 +1,94 @@
+import json
+import os
+from pathlib import Path
+
+from PIL import Image
+
+from annolid.annotation import labelme2yolo
+from annolid.annotation.labelme2yolo import EXPORT_MANIFEST_NAME, Labelme2YOLO
+
+
+def _write_frames(root: Path, count: int) -> None:
+    root.mkdir(parents=True, exist_ok=True)
+    for idx in range(count):
+        image_path = root / f"frame_{idx:05d}.png"
+        if not image_path.exists():
+            Image.new("RGB", (64, 48), color=(idx % 255, 20, 30)).save(image_path)
+        annotation = {
+            "imagePath": image_path.name,
+            "imageData": None,
+            "imageHeight": 48,
+            "imageWidth": 64,
+            "shapes": [
+                {
+                    "label": "rat" if idx % 3 == 0 else "mouse",
+                    "points": [[10, 10], [30, 10], [30, 30], [10, 30]],
+                    "shape_type": "polygon",
+                    "flags": {},
+                }
+            ],
+        }
+        (root / f"frame_{idx:05d}.json").write_text(
+            json.dumps(annotation), encoding="utf-8"
+        )
+
+
+def _dataset_files(root: Path) -> dict:
+    dataset = root / "YOLO_dataset"
+    return {
+        path.relative_to(dataset).as_posix(): path.read_bytes()
+        for path in sorted(dataset.rglob("*"))
+        if path.is_file() and path.name != EXPORT_MANIFEST_NAME
+    }
+
+
+def test_labelme2yolo_reexport_only_touches_changed_items(tmp_path: Path) -> None:
+    root = tmp_path / "frames"
+    _write_frames(root, 20)
+    first = Labelme2YOLO(str(root)).convert(val_size=0.2, test_size=0.1, workers=1)
+    assert first == {"written": 20, "unchanged": 0, "removed": 0}
+    manifest = json.loads(
+        (root / "YOLO_dataset" / EXPORT_MANIFEST_NAME).read_text(encoding="utf-8")
+    )
+    splits = {stem: entry["split"] for stem, entry in manifest["items"].items()}
+    image = root / "YOLO_dataset" / manifest["items"]["frame_00001"]["image"]
+    assert os.stat(image).st_nlink == 2
+
+    _write_frames(root, 23)
+    edited = root / "frame_00004.json"
+    edited.write_text(
+        edited.read_text(encoding="utf-8").replace("[10, 10]", "[12, 12]"),
+        encoding="utf-8",
+    )
+    (root / "frame_00007.json").unlink()
+    stale_label = root / "YOLO_dataset" / manifest["items"]["frame_00007"]["label"]
+    assert stale_label.exists()
+
+    second = Labelme2YOLO(str(root)).convert(val_size=0.2, test_size=0.1, workers=1)
+
+    assert second == {"written": 4, "unchanged": 18, "removed": 1}
+    assert not stale_label.exists()
+    manifest = json.loads(
+        (root / "YOLO_dataset" / EXPORT_MANIFEST_NAME).read_text(encoding="utf-8")
+    )
+    for stem, split in splits.items():
+        if stem != "frame_00007":
+            assert manifest["items"][stem]["split"] == split
+    labels = list((root / "YOLO_dataset" / "labels").rglob("*.txt"))
+    assert len(labels) == 22
+
+
+def test_labelme2yolo_parallel_export_matches_serial(
+    tmp_path: Path, monkeypatch
+) -> None:
+    monkeypatch.setattr(labelme2yolo, "_PARALLEL_MIN_ITEMS", 0)
+    monkeypatch.setattr(labelme2yolo, "_EXPORT_CHUNK_ITEMS", 4)
+    serial_root = tmp_path / "serial"
+    parallel_root = tmp_path / "parallel"
+    _write_frames(serial_root, 16)
+    _write_frames(parallel_root, 16)
+
+    Labelme2YOLO(str(serial_root)).convert(val_size=0.25, test_size=0.0, workers=1)
+    Labelme2YOLO(str(parallel_root)).convert(val_size=0.25, test_size=0.0, workers=2)
+
+    assert _dataset_files(parallel_root) == _dataset_files(serial_root)
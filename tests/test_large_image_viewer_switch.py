@@ -2,6 +2,7 @@ from __future__ import annotations
 
 import os
 import json
+import time
 from pathlib import Path
 
 import numpy as np
@@ -1499,9 +1500,17 @@ def test_tiled_image_view_tile_scheduler_reuses_cached_tiles(tmp_path: Path) ->
         _ensure_qapp().processEvents()
 
         view.set_backend(backend)
+        deadline = time.monotonic() + 5.0
+        while time.monotonic() < deadline:
+            pending = view.tile_scheduler_stats()["raster"]["outstanding_requests"]
+            view._poll_pending_tile_results()
+            if not pending:
+                break
+            time.sleep(0.01)
         first_stats = view.tile_scheduler_stats()["raster"]
 
         assert first_stats["loads_completed"] >= 1
+        assert first_stats["outstanding_requests"] == 0
 
         view.refresh_visible_tiles()
         second_stats = view.tile_scheduler_stats()["raster"]
@@ -2205,3 +2214,84 @@ def test_tiled_image_view_debug_status_reports_backend_tiles_and_cache(
         assert "visible tiles=" in overlay_text
     finally:
         window.close()
+
+
+class _PyramidStub:
+    supports_parallel_reads = True
+
+    def get_level_count(self) -> int:
+        return 3
+
+    def get_level_shape(self, level: int) -> tuple[int, int]:
+        return (4096 >> int(level), 4096 >> int(level))
+
+
+def test_tiled_image_view_prefetch_follows_pan_and_zoom_direction() -> None:
+    _ensure_qapp()
+    from annolid.gui.tile_scheduler import tile_decode_workers
+    from annolid.gui.widgets.tiled_image_view import TileKey
+
+    view = TiledImageView(tile_size=256)
+    try:
+        backend = _PyramidStub()
+        visible = [TileKey(level=1, tx=tx, ty=ty) for tx in (2, 3) for ty in (2, 3)]
+
+        view._view_motion = (1.0, 0.0)
+        view._zoom_trend = 0
+        queued = view._prefetch_tile_keys(visible, backend=backend, level=1, limit=4)
+        assert [key.tx for key in queued[:2]] == [4, 4]
+        assert all(key.tx > 3 for key in queued)
+
+        view._view_motion = (0.0, 0.0)
+        view._zoom_trend = -1
+        queued = view._prefetch_tile_keys(
+            visible, backend=backend, level=1, limit=0, level_limit=4
+        )
+        assert {key.level for key in queued} == {0}
+        assert {(key.tx, key.ty) for key in queued} == {(5, 5), (5, 6), (6, 5), (6, 6)}
+
+        assert tile_decode_workers(backend) >= 1
+        assert tile_decode_workers(object()) == 1
+    finally:
+        view.close()
+
+
+def test_tile_scheduler_keeps_tiles_that_finish_after_a_pan() -> None:
+    import threading
+
+    from annolid.gui.tile_scheduler import TileRequestScheduler
+
+    release = threading.Event()
+    cache: dict[str, str] = {}
+
+    def _load(key: str) -> str:
+        release.wait(5.0)
+        return f"tile-{key}"
+
+    scheduler = TileRequestScheduler(
+        cache_get=cache.get,
+        cache_put=cache.__setitem__,
+        load_tile=_load,
+        async_load=True,
+        max_workers=2,
+    )
+    try:
+        assert scheduler.schedule(["a", "b"]) == {}
+        # Pan while "b" is still decoding; it stays visible in the new view.
+        assert scheduler.schedule(["b", "c"]) == {}
+        release.set()
+        deadline = time.monotonic() + 5.0
+        ready: dict[str, str] = {}
+        while time.monotonic() < deadline:
+            ready.update(scheduler.take_completed())
+            if {"b", "c"} <= set(ready) and not (
+                scheduler.stats().outstanding_requests
+            ):
+                break
+            time.sleep(0.01)
+        assert ready["b"] == "tile-b"
+        assert ready["c"] == "tile-c"
+        assert scheduler.stats().outstanding_requests == 0
+        assert cache["b"] == "tile-b"
+    finally:
+        scheduler.shutdown()
@@ -0,0 +1,114 @@
+from __future__ import annotations
+
+import itertools
+
+import numpy as np
+import pandas as pd
+
+from annolid.postprocessing.pairwise_distances import (
+    pairwise_instance_distances,
+    pivot_instance_positions,
+)
+from annolid.postprocessing.tracking_results_analyzer import TrackingResultsAnalyzer
+
+
+def _tracking_rows(frame_count: int, instances: list[str], seed: int = 0):
+    rng = np.random.default_rng(seed)
+    rows = []
+    for frame in range(frame_count):
+        for name in instances:
+            if rng.random() < 0.2:
+                continue
+            rows.append(
+                {
+                    "frame_number": frame,
+                    "instance_name": name,
+                    "cx": float(rng.uniform(0, 100)),
+                    "cy": float(rng.uniform(0, 100)),
+                }
+            )
+    return pd.DataFrame(rows)
+
+
+def test_pairwise_instance_distances_match_scalar_reference():
+    dataframe = _tracking_rows(40, ["a", "b", "c", "d"])
+
+    pairwise = pairwise_instance_distances(
+        pivot_instance_positions(dataframe, ["cx", "cy"])
+    )
+    result = pairwise.to_long_dataframe()
+
+    expected = []
+    for frame, group in dataframe.groupby("frame_number"):
+        coords = {row.instance_name: (row.cx, row.cy) for row in group.itertuples()}
+        for left, right in itertools.combinations(pairwise.instances, 2):
+            if left in coords and right in coords:
+                (x1, y1), (x2, y2) = coords[left], coords[right]
+                expected.append(
+                    (frame, left, right, ((x2 - x1) ** 2 + (y2 - y1) ** 2) ** 0.5)
+                )
+
+    assert list(result.columns) == [
+        "frame_number",
+        "instance_name_1",
+        "instance_name_2",
+        "distance",
+    ]
+    assert [tuple(row[:3]) for row in result.itertuples(index=False)] == [
+        row[:3] for row in expected
+    ]
+    np.testing.assert_allclose(result["distance"], [row[3] for row in expected])
+
+
+def test_pairwise_wide_layout_has_one_column_per_pair():
+    dataframe = _tracking_rows(10, ["a", "b", "c"], seed=1)
+
+    wide = pairwise_instance_distances(
+        pivot_instance_positions(dataframe, ["cx", "cy"])
+    ).to_wide_dataframe()
+
+    assert wide.index.name == "frame_number"
+    assert list(wide.columns) == [
+        "distance__a__b",
+        "distance__a__c",
+        "distance__b__c",
+    ]
+    assert len(wide) == dataframe["frame_number"].nunique()
+
+
+def test_tracking_results_analyzer_computes_pairwise_distances(tmp_path):
+    video_path = tmp_path / "session.mp4"
+    tracking = pd.DataFrame(
+        [
+            {"frame_number": 0, "instance_name": "m1", "cx": 0.0, "cy": 0.0},
+            {"frame_number": 0, "instance_name": "m2", "cx": 1.0, "cy": 1.0},
+            {"frame_number": 1, "instance_name": "m1", "cx": 0.0, "cy": 0.0},
+            {"frame_number": 1, "instance_name": "m2", "cx": 3.0, "cy": 4.0},
+            {"frame_number": 2, "instance_name": "m2", "cx": 5.0, "cy": 5.0},
+        ]
+    )
+    tracking.to_csv(tmp_path / "session_tracking.csv", index=False)
+    tracking.to_csv(tmp_path / "session_tracked.csv", index=False)
+
+    analyzer = TrackingResultsAnalyzer(video_path, fps=30)
+    analyzer.merge_and_calculate_distance(wide=True)
+
+    assert analyzer.distances_df.to_dict("records") == [
+        {
+            "frame_number": 0,
+            "instance_name_1": "m1",
+            "instance_name_2": "m2",
+            "distance": 2**0.5,
+        },
+        {
+            "frame_number": 1,
+            "instance_name_1": "m1",
+            "instance_name_2": "m2",
+            "distance": 5.0,
+        },
+    ]
+    assert analyzer.distances_wide_df["distance__m1__m2"].tolist()[:2] == [
+        2**0.5,
+        5.0,
+    ]
+    assert np.isnan(analyzer.distances_wide_df["distance__m1__m2"].iloc[2])
@@ -0,0 +1,89 @@
+from __future__ import annotations
+
+import json
+
+import pytest
+
+from annolid.engine.cli import main as annolid_run
+from annolid.postprocessing.benchmarks import (
+    compare_reports,
+    parse_row_count,
+    run_suite,
+    synthetic_tracking_dataframe,
+)
+
+
+def test_parse_row_count_accepts_suffixes() -> None:
+    assert parse_row_count("10k") == 10_000
+    assert parse_row_count("2.5M") == 2_500_000
+    assert parse_row_count("1_000") == 1000
+
+
+def test_synthetic_tracking_dataframe_is_seeded_and_in_arena() -> None:
+    first = synthetic_tracking_dataframe(400, animals=4, seed=3)
+    second = synthetic_tracking_dataframe(400, animals=4, seed=3)
+
+    assert len(first) == 400
+    assert first.equals(second)
+    assert first["cx"].between(0, 1000).all()
+    assert first.groupby("frame_number").size().eq(4).all()
+
+
+def test_run_suite_reports_every_benchmark(tmp_path) -> None:
+    report = run_suite([200], repeats=1, workdir=tmp_path)
+
+    names = {entry["benchmark"] for entry in report["results"]}
+    assert names == {
+        "zone_engine",
+        "tracking_results_analyzer",
+        "tracks_from_labelme_csv",
+        "annotation_store_reads",
+        "identity_governor",
+    }
+    for entry in report["results"]:
+        assert entry["rows"] == 200
+        assert entry["seconds_best"] > 0
+    store = next(
+        e for e in report["results"] if e["benchmark"] == "annotation_store_reads"
+    )
+    assert store["extra"]["get_frame_fast_seconds"] >= 0
+    json.dumps(report)
+
+
+def test_run_suite_rejects_unknown_benchmark() -> None:
+    with pytest.raises(ValueError):
+        run_suite([100], benchmarks=["nope"])
+
+
+def test_compare_reports_flags_regressions() -> None:
+    def _report(seconds):
+        return {
+            "results": [
+                {"benchmark": "zone_engine", "rows": 10, "seconds_best": seconds}
+            ]
+        }
+
+    assert compare_reports(_report(1.0), _report(1.1))[0]["regression"] is False
+    assert compare_reports(_report(1.0), _report(1.5))[0]["regression"] is True
+
+
+def test_benchmark_cli_writes_report_and_compares(tmp_path) -> None:
+    output = tmp_path / "bench.json"
+    args = [
+        "benchmark-postprocessing",
+        "--rows",
+        "100",
+        "--benchmarks",
+        "zone_engine,tracks_from_labelme_csv",
+        "--repeats",
+        "1",
+        "--output",
+        str(output),
+    ]
+    assert annolid_run(args) == 0
+    report = json.loads(output.read_text(encoding="utf-8"))
+    assert len(report["results"]) == 2
+
+    assert (
+        annolid_run([*args, "--compare", str(output), "--max-regression", "100"]) == 0
+    )
@@ -0,0 +1,111 @@
+from __future__ import annotations
+
+import cv2
+import numpy as np
+
+from annolid.agents.project_frame_index import ProjectFrameIndex
+
+
+def _clustered_vectors(count: int, dim: int = 32, seed: int = 0) -> np.ndarray:
+    rng = np.random.default_rng(seed)
+    centers = rng.standard_normal((20, dim))
+    labels = rng.integers(0, len(centers), count)
+    vectors = centers[labels] + 0.3 * rng.standard_normal((count, dim))
+    return (vectors / np.linalg.norm(vectors, axis=1, keepdims=True)).astype(np.float32)
+
+
+def _touch(path):
+    path.write_bytes(b"video")
+    return path
+
+
+def test_project_index_recall_and_incremental_add(tmp_path) -> None:
+    vectors = _clustered_vectors(4000)
+    video_a = _touch(tmp_path / "a.mp4")
+    video_b = _touch(tmp_path / "b.mp4")
+    index = ProjectFrameIndex(tmp_path / "index")
+    index.add_vectors(video_a, range(2000), vectors[:2000])
+    index.add_vectors(video_b, range(2000), vectors[2000:])
+
+    reopened = ProjectFrameIndex(tmp_path / "index")
+    assert len(reopened) == 4000
+    assert reopened.videos == sorted([str(video_a.resolve()), str(video_b.resolve())])
+
+    queries = _clustered_vectors(20, seed=1)
+    recalls = []
+    for query in queries:
+        exact = np.argsort(-(vectors @ query))[:10]
+        expected = {
+            (str((video_a if i < 2000 else video_b).resolve()), int(i % 2000))
+            for i in exact
+        }
+        hits = reopened.search(query, k=10, nprobe=8)
+        assert [h.score for h in hits] == sorted((h.score for h in hits), reverse=True)
+        recalls.append(len(expected & {(h.video_path, h.frame_index) for h in hits}))
+    assert np.mean(recalls) / 10 >= 0.7
+
+
+def test_project_index_replaces_changed_video_and_compacts(tmp_path) -> None:
+    vectors = _clustered_vectors(600)
+    video = _touch(tmp_path / "a.mp4")
+    index = ProjectFrameIndex(tmp_path / "index", max_segments=2)
+    index.add_vectors(video, range(300), vectors[:300])
+    index.add_vectors(_touch(tmp_path / "b.mp4"), range(300), vectors[300:])
+    index.add_vectors(video, range(300), vectors[300:])  # triggers compaction
+
+    assert len(index._meta["segments"]) == 1
+    assert index._meta["retired_video_ids"] == []
+    hits = index.search(vectors[300], k=5, nprobe=index.nlist)
+    assert {h.frame_index for h in hits[:2]} == {0}
+    assert len(index) == 600
+
+
+def test_project_index_retrains_once_corpus_outgrows_quantizer(tmp_path) -> None:
+    vectors = _clustered_vectors(4000)
+    index = ProjectFrameIndex(tmp_path / "index")
+    index.add_vectors(_touch(tmp_path / "v0.mp4"), range(250), vectors[:250])
+    first_nlist = index.nlist
+    for part in range(1, 16):
+        rows = vectors[part * 250 : (part + 1) * 250]
+        index.add_vectors(_touch(tmp_path / f"v{part}.mp4"), range(250), rows)
+
+    reopened = ProjectFrameIndex(tmp_path / "index")
+    assert reopened.nlist >= 2 * first_nlist
+    assert len(reopened) == 4000
+    assert sum(len(reopened._segment(n)[1]) for n in reopened._meta["segments"]) == (
+        4000
+    )
+    hits = reopened.search(vectors[3100], k=1, nprobe=reopened.nlist)
+    assert (hits[0].video_path, hits[0].frame_index) == (
+        str((tmp_path / "v12.mp4").resolve()),
+        100,
+    )
+
+    planned = ProjectFrameIndex(tmp_path / "planned")
+    planned.train(vectors[::4], nlist=256)
+    for part in range(4):
+        rows = vectors[part * 1000 : (part + 1) * 1000]
+        planned.add_vectors(_touch(tmp_path / f"p{part}.mp4"), range(1000), rows)
+    assert planned.nlist == 256
+
+
+def test_project_index_add_video_batches_and_skips_unchanged(tmp_path) -> None:
+    video = tmp_path / "clip.avi"
+    writer = cv2.VideoWriter(str(video), cv2.VideoWriter_fourcc(*"MJPG"), 10, (32, 24))
+    for idx in range(12):
+        writer.write(np.full((24, 32, 3), idx * 20, dtype=np.uint8))
+    writer.release()
+
+    batches = []
+
+    def _embed(images):
+        batches.append(len(images))
+        return np.stack(
+            [[img.mean() / 255.0, 1.0 - img.mean() / 255.0] for img in images]
+        )
+
+    index = ProjectFrameIndex(tmp_path / "index")
+    assert index.add_video(video, _embed, stride=2, batch_size=4) == 6
+    assert batches == [4, 2]
+    assert index.add_video(video, _embed, stride=2, batch_size=4) == 0
+    assert batches == [4, 2]
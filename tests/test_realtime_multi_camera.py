@@ -0,0 +1,118 @@
+from __future__ import annotations
+
+import asyncio
+from types import SimpleNamespace
+
+import numpy as np
+import pytest
+
+from annolid.realtime.config import Config
+from annolid.realtime.perception import MultiCameraPerceptionProcess
+
+
+def _config(camera_id: str, port: int) -> Config:
+    return Config(
+        camera_index=0,
+        camera_id=camera_id,
+        model_base_name="yolo11n-seg.pt",
+        publisher_address=f"tcp://127.0.0.1:{port}",
+        publish_frames=True,
+        publish_annotated_frames=False,
+        max_fps=1000.0,
+    )
+
+
+def test_multi_camera_batches_frames_and_fans_results_out_per_camera() -> None:
+    process = MultiCameraPerceptionProcess(
+        [_config("cam_a", 5901), _config("cam_b", 5902)]
+    )
+    original_publishers = [lane.publisher for lane in process.lanes]
+    batch_sizes = []
+
+    class FakeSource:
+        state = SimpleNamespace(name="LOCAL")
+
+        def __init__(self, value: int):
+            self.value = value
+
+        def pop_status_events(self):
+            return []
+
+        async def get_frame(self):
+            await asyncio.sleep(0.001)
+            frame = np.full((4, 4, 3), self.value, dtype=np.uint8)
+            return frame, {"source": f"fake-{self.value}"}
+
+    class FakePublisher:
+        def __init__(self, camera_id: str):
+            self.camera_id = camera_id
+            self.frames = []
+
+        async def publish_frame(self, frame, metadata, **kwargs):
+            self.frames.append((int(frame[0, 0, 0]), metadata))
+            if all(len(lane.publisher.frames) >= 3 for lane in process.lanes):
+                process.request_stop()
+
+        async def publish_status(self, payload):
+            return None
+
+    def fake_model(frames, **kwargs):
+        batch_sizes.append(len(frames))
+        return [int(frame[0, 0, 0]) for frame in frames]
+
+    async def no_detections(results, loop_start, metadata):
+        return 0, set()
+
+    for value, lane in enumerate(process.lanes, start=1):
+        lane.video_source = FakeSource(value)
+        lane.publisher = FakePublisher(lane.config.camera_id)
+        lane._process_detections = no_detections
+    process.model = fake_model
+
+    try:
+        asyncio.run(process._run_batched_loop(frame_interval=0.0))
+    finally:
+        for publisher in original_publishers:
+            publisher.context.destroy(linger=0)
+
+    assert max(batch_sizes) == 2
+    for value, lane in enumerate(process.lanes, start=1):
+        assert lane.publisher.frames
+        for pixel, metadata in lane.publisher.frames:
+            assert pixel == value
+            assert metadata["camera_id"] == lane.config.camera_id
+        indices = [
+            metadata["frame_index"] for _pixel, metadata in lane.publisher.frames
+        ]
+        assert indices == sorted(indices)
+
+
+def test_multi_camera_rejects_duplicate_camera_ids() -> None:
+    with pytest.raises(ValueError):
+        MultiCameraPerceptionProcess([_config("cam", 5903), _config("cam", 5904)])
+
+
+def test_multi_camera_applies_each_lane_threshold_and_rate() -> None:
+    configs = [_config("cam_a", 5905), _config("cam_b", 5906), _config("cam_c", 5907)]
+    configs[0].confidence_threshold = 0.25
+    configs[1].confidence_threshold = 0.6
+    configs[2].confidence_threshold = 0.25
+    configs[1].max_fps = 5.0
+    process = MultiCameraPerceptionProcess(configs)
+    calls = []
+
+    def fake_model(frames, conf, **kwargs):
+        calls.append((conf, [int(frame[0, 0, 0]) for frame in frames]))
+        return [(conf, int(frame[0, 0, 0])) for frame in frames]
+
+    process.model = fake_model
+    frames = [np.full((2, 2, 3), value, dtype=np.uint8) for value in (1, 2, 3)]
+    try:
+        results = asyncio.run(process._run_batch_inference(process.lanes, frames))
+        assert sorted(calls) == [(0.25, [1, 3]), (0.6, [2])]
+        assert results == [(0.25, 1), (0.6, 2), (0.25, 3)]
+        assert process._lane_interval(process.lanes[1]) == pytest.approx(0.2)
+        assert process._lane_interval(process.lanes[0]) == pytest.approx(0.001)
+    finally:
+        for lane in process.lanes:
+            lane.publisher.context.destroy(linger=0)
@@ -0,0 +1,96 @@
+from __future__ import annotations
+
+import asyncio
+from types import SimpleNamespace
+
+import numpy as np
+
+from annolid.realtime.config import Config
+from annolid.realtime.perception import PerceptionProcess
+
+
+def _pipelined_process(*, drop_policy: str, frames: int, inference_delay: float):
+    config = Config(
+        camera_index=0,
+        camera_id="arena_a",
+        model_base_name="",
+        publish_frames=True,
+        publish_annotated_frames=False,
+        pipeline_mode=True,
+        pipeline_queue_size=1,
+        pipeline_drop_policy=drop_policy,
+        max_fps=1000.0,
+    )
+    process = PerceptionProcess(config)
+    original_publisher = process.publisher
+
+    class FakeSource:
+        state = SimpleNamespace(name="LOCAL")
+
+        def __init__(self):
+            self.served = 0
+
+        def pop_status_events(self):
+            return []
+
+        async def get_frame(self):
+            self.served += 1
+            frame = np.full((4, 4, 3), self.served % 255, dtype=np.uint8)
+            return frame, {"source": "unit-test"}
+
+    class FakePublisher:
+        def __init__(self):
+            self.frames = []
+
+        async def publish_frame(self, frame, metadata, **kwargs):
+            self.frames.append(metadata)
+            if len(self.frames) >= frames:
+                process.request_stop()
+
+        async def publish_status(self, payload):
+            return None
+
+    async def slow_inference(frame):
+        await asyncio.sleep(inference_delay)
+        return [int(frame[0, 0, 0])]
+
+    async def no_detections(results, loop_start, metadata):
+        return 0, set()
+
+    process.video_source = FakeSource()
+    process.publisher = FakePublisher()
+    process._run_inference = slow_inference
+    process._process_detections = no_detections
+    return process, original_publisher
+
+
+def test_pipelined_loop_publishes_every_file_frame_in_order() -> None:
+    process, original_publisher = _pipelined_process(
+        drop_policy="block", frames=5, inference_delay=0.005
+    )
+    try:
+        asyncio.run(process._run_pipelined_loop(frame_interval=0.0))
+    finally:
+        original_publisher.context.destroy(linger=0)
+
+    indices = [meta["frame_index"] for meta in process.publisher.frames]
+    assert indices == list(range(5))
+    assert process.metrics.dropped_frame_count == 0
+    report = process.metrics.generate_report("LOCAL", "IDLE")
+    assert {"capture", "inference", "postprocess", "publish"} <= set(report["stage_ms"])
+
+
+def test_pipelined_loop_drops_stale_frames_for_live_sources() -> None:
+    process, original_publisher = _pipelined_process(
+        drop_policy="auto", frames=3, inference_delay=0.05
+    )
+    assert process._pipeline_drops_stale_frames()
+    try:
+        asyncio.run(process._run_pipelined_loop(frame_interval=0.0))
+    finally:
+        original_publisher.context.destroy(linger=0)
+
+    indices = [meta["frame_index"] for meta in process.publisher.frames]
+    assert indices == sorted(indices)
+    assert indices[-1] > len(indices) - 1
+    assert process.metrics.dropped_frame_count > 0
@@ -0,0 +1,122 @@
+from __future__ import annotations
+
+import asyncio
+import json
+
+import numpy as np
+import zmq
+
+from annolid.realtime.perception import DetectionPublisher
+from annolid.realtime.shared_frames import (
+    SHARED_FRAME_TOPIC,
+    SharedFrameReader,
+    SharedFrameRing,
+    is_same_host_address,
+)
+
+
+def test_ring_roundtrip_drops_overwritten_slots_and_grows() -> None:
+    ring = SharedFrameRing(slots=2, prefix="annolid_test")
+    reader = SharedFrameReader()
+    try:
+        frames = [np.full((4, 5, 3), value, dtype=np.uint8) for value in range(3)]
+        descriptors = [ring.write(frame) for frame in frames]
+
+        # Slot of the first frame has been reused by the third one.
+        assert reader.read(descriptors[0]) is None
+        np.testing.assert_array_equal(reader.read(descriptors[1]), frames[1])
+        np.testing.assert_array_equal(reader.read(descriptors[2]), frames[2])
+
+        first_name = ring.name
+        large = np.arange(40 * 30 * 3, dtype=np.uint8).reshape(40, 30, 3)
+        descriptor = ring.write(large)
+        assert ring.name != first_name
+        np.testing.assert_array_equal(reader.read(descriptor), large)
+        assert reader.read({"name": "missing"}) is None
+    finally:
+        reader.close()
+        ring.close()
+
+
+def test_same_host_address_detection() -> None:
+    assert is_same_host_address("tcp://127.0.0.1:5555")
+    assert is_same_host_address("tcp://localhost:5555")
+    assert is_same_host_address("ipc:///tmp/annolid")
+    assert not is_same_host_address("tcp://192.168.1.20:5555")
+    assert not is_same_host_address("")
+
+
+def test_publisher_sends_slots_to_local_subscribers_without_encoding() -> None:
+    frame = np.random.default_rng(0).integers(0, 255, (6, 8, 3), dtype=np.uint8)
+    context = zmq.Context()
+    subscriber = context.socket(zmq.SUB)
+    subscriber.setsockopt(zmq.LINGER, 0)
+    reader = SharedFrameReader()
+
+    async def _run():
+        publisher = DetectionPublisher(
+            "tcp://127.0.0.1:*", camera_id="arena_a", shared_memory_slots=2
+        )
+        await publisher.bind()
+        try:
+            endpoint = publisher.socket.getsockopt_string(zmq.LAST_ENDPOINT)
+            subscriber.connect(endpoint)
+            subscriber.setsockopt_string(zmq.SUBSCRIBE, SHARED_FRAME_TOPIC)
+            for _ in range(50):
+                await publisher.publish_frame(frame, {"frame_index": 3})
+                if subscriber.poll(20):
+                    parts = subscriber.recv_multipart()
+                    descriptor = json.loads(parts[1])["shared_memory"]
+                    return parts, reader.read(descriptor)
+            return None, None
+        finally:
+            await publisher.cleanup()
+
+    try:
+        parts, received = asyncio.run(_run())
+        assert parts is not None
+        np.testing.assert_array_equal(received, frame)
+        topic, metadata_raw, payload = parts
+        metadata = json.loads(metadata_raw)
+        assert topic.decode() == SHARED_FRAME_TOPIC
+        assert payload == b""
+        assert metadata["camera_id"] == "arena_a"
+        assert metadata["encoding"] == "raw"
+    finally:
+        reader.close()
+        subscriber.close(0)
+        context.term()
+
+
+def test_publisher_serves_both_transports_to_prefix_subscribers() -> None:
+    frame = np.zeros((6, 8, 3), dtype=np.uint8)
+    context = zmq.Context()
+    subscriber = context.socket(zmq.SUB)
+    subscriber.setsockopt(zmq.LINGER, 0)
+
+    async def _run():
+        publisher = DetectionPublisher(
+            "tcp://127.0.0.1:*", camera_id="arena_a", shared_memory_slots=2
+        )
+        await publisher.bind()
+        try:
+            endpoint = publisher.socket.getsockopt_string(zmq.LAST_ENDPOINT)
+            subscriber.connect(endpoint)
+            # An empty subscription matches every topic by prefix.
+            subscriber.setsockopt_string(zmq.SUBSCRIBE, "")
+            topics = set()
+            for _ in range(50):
+                await publisher.publish_frame(frame, {"frame_index": 3})
+                while subscriber.poll(20):
+                    topics.add(subscriber.recv_multipart()[0].decode())
+                if {"frames", SHARED_FRAME_TOPIC} <= topics:
+                    break
+            return topics
+        finally:
+            await publisher.cleanup()
+
+    try:
+        assert {"frames", SHARED_FRAME_TOPIC} <= asyncio.run(_run())
+    finally:
+        subscriber.close(0)
+        context.term()
@@ -0,0 +1,77 @@
+from __future__ import annotations
+
+from pathlib import Path
+
+import cv2
+import numpy as np
+import torch
+
+from annolid.segmentation.SAM.sam3.sam3.model.io_utils import (
+    load_resource_as_video_frames,
+    load_video_frames_from_image_folder,
+)
+from annolid.segmentation.SAM.sam3.sam3.model.sam3_video_inference import (
+    is_image_type,
+)
+from annolid.segmentation.SAM.sam3.window_frames import WindowFrameSource
+
+
+def _frames(start: int, count: int) -> list[np.ndarray]:
+    rng = np.random.default_rng(0)
+    base = rng.integers(0, 255, size=(20, 28, 3), dtype=np.uint8)
+    return [np.roll(base, idx, axis=1) for idx in range(start, start + count)]
+
+
+def test_window_frame_source_matches_image_folder_loader(tmp_path: Path) -> None:
+    frames = _frames(0, 3)
+    for idx, frame in enumerate(frames):
+        # PNG keeps the folder reference lossless, like the in-memory path.
+        cv2.imwrite(str(tmp_path / f"{idx:06d}.png"), frame)
+    source = WindowFrameSource()
+    source.update(frames)
+    kwargs = dict(
+        image_size=16,
+        offload_video_to_cpu=True,
+        img_mean=(0.5, 0.5, 0.5),
+        img_std=(0.5, 0.5, 0.5),
+    )
+
+    images, height, width = load_resource_as_video_frames(
+        resource_path=source, **kwargs
+    )
+    expected, exp_height, exp_width = load_video_frames_from_image_folder(
+        image_folder=str(tmp_path), async_loading_frames=False, **kwargs
+    )
+
+    assert (height, width) == (exp_height, exp_width) == (20, 28)
+    assert images.dtype == torch.float16
+    assert torch.equal(images, expected)
+    assert not is_image_type(source)
+
+
+def test_window_frame_source_reuses_overlapping_frames(monkeypatch) -> None:
+    prepared: list[int] = []
+    original = WindowFrameSource._to_tensor
+
+    def _counting(frame, image_size):
+        prepared.append(int(frame[0, 0, 0]))
+        return original(frame, image_size)
+
+    monkeypatch.setattr(WindowFrameSource, "_to_tensor", staticmethod(_counting))
+    first = _frames(0, 4)
+    second = _frames(3, 4)
+    source = WindowFrameSource()
+
+    count = source.update(first)
+    source.preprocessed_frames(16)
+    assert count == 4 and len(prepared) == 4
+
+    prepared.clear()
+    source.update(second, previous_count=count, shift=3)
+    images, _h, _w = source.preprocessed_frames(16)
+    # Only the three new tail frames are prepared again.
+    assert prepared == [int(frame[0, 0, 0]) for frame in second[1:]]
+
+    fresh = WindowFrameSource()
+    fresh.update(second)
+    assert torch.equal(images, fresh.preprocessed_frames(16)[0])
@@ -55,3 +55,92 @@ def test_run_embedding_search_honors_stop() -> None:
 
     assert len(matches) <= 1
     assert calls["count"] <= 1
+
+
+def _open_index(tmp_path, *, salt: str = "", total_frames: int = 20, stride: int = 2):
+    from annolid.services.embedding_index import FrameEmbeddingIndex
+
+    video = tmp_path / "clip.mp4"
+    if not video.exists():
+        video.write_bytes(b"not really a video")
+    return FrameEmbeddingIndex.open(
+        video,
+        embedder_key=("fake", "v1"),
+        stride=stride,
+        total_frames=total_frames,
+        salt=salt,
+        cache_dir=tmp_path / "cache",
+    )
+
+
+def _fake_vector(idx: int) -> np.ndarray:
+    angle = 0.1 * float(idx)
+    return np.asarray([np.cos(angle), np.sin(angle)], dtype=np.float32)
+
+
+def test_run_embedding_search_reuses_persistent_index(tmp_path) -> None:
+    batches = []
+
+    def _embed_frames(frames):
+        batches.append(list(frames))
+        return np.stack([_fake_vector(idx) for idx in frames])
+
+    def _search(index):
+        return run_embedding_search(
+            query_vector=_fake_vector(0),
+            query_frame_index=0,
+            total_frames=20,
+            stride=2,
+            max_frames=None,
+            threshold=0.8,
+            top_k=3,
+            embed_frames=_embed_frames,
+            index=index,
+            batch_size=4,
+        )
+
+    first = _search(_open_index(tmp_path))
+    assert batches == [[2, 4, 6, 8], [10, 12, 14, 16], [18]]
+    assert [m.frame_index for m in first] == [2, 4, 6]
+
+    batches.clear()
+    second = _search(_open_index(tmp_path))
+    assert batches == []
+    assert [m.frame_index for m in second] == [2, 4, 6]
+    for a, b in zip(first, second):
+        assert abs(a.similarity - b.similarity) < 1e-3
+
+
+def test_embedding_index_invalidates_on_salt_change(tmp_path) -> None:
+    index = _open_index(tmp_path, salt="a")
+    index.put([0, 2, 3], np.stack([_fake_vector(i) for i in (0, 2, 3)]))
+    assert index.has([0, 2, 4]).tolist() == [True, True, False]
+    assert len(index) == 2  # frame 3 is off the stride
+
+    assert len(_open_index(tmp_path, salt="a")) == 2
+    assert len(_open_index(tmp_path, salt="b")) == 0
+
+
+def test_run_embedding_search_resumes_partial_index(tmp_path) -> None:
+    index = _open_index(tmp_path)
+    index.put([4, 8], np.stack([_fake_vector(4), _fake_vector(8)]))
+    embedded = []
+
+    def _embed(idx: int) -> np.ndarray:
+        embedded.append(idx)
+        return _fake_vector(idx)
+
+    matches = run_embedding_search(
+        query_vector=_fake_vector(0),
+        query_frame_index=0,
+        total_frames=20,
+        stride=2,
+        max_frames=6,
+        threshold=-1.0,
+        top_k=10,
+        embed_frame=_embed,
+        index=index,
+    )
+
+    assert embedded == [2, 6, 10]
+    assert [m.frame_index for m in matches] == [2, 4, 6, 8, 10]
@@ -0,0 +1,79 @@
+from __future__ import annotations
+
+from dataclasses import dataclass
+
+import numpy as np
+
+from annolid.gui.tile_cache import SharedTileCache, TileCache, estimate_tile_nbytes
+
+
+@dataclass(frozen=True)
+class _Key:
+    level: int
+    tx: int
+    ty: int
+
+
+def _tile(nbytes: int = 100) -> np.ndarray:
+    return np.zeros(nbytes, dtype=np.uint8)
+
+
+def test_views_share_one_byte_budget_with_layer_and_level_accounting():
+    shared = SharedTileCache(budget_bytes=1000)
+    raster = TileCache(layer="raster", shared=shared)
+    overlay = TileCache(layer="overlay", shared=shared)
+
+    raster.put(_Key(0, 0, 0), _tile())
+    raster.put(_Key(1, 0, 0), _tile())
+    overlay.put(_Key(0, 0, 0), _tile(300))
+
+    assert raster.get(_Key(0, 0, 0)) is not None
+    assert overlay.get(_Key(1, 0, 0)) is None
+    assert len(raster) == 2
+    assert len(overlay) == 1
+
+    stats = shared.stats()
+    assert stats.total_bytes == 500
+    assert stats.layer_bytes == {"raster": 200, "overlay": 300}
+    assert stats.level_bytes["raster"] == {0: 100, 1: 100}
+    assert (stats.hits, stats.misses) == (1, 1)
+
+    overlay.clear()
+    assert len(overlay) == 0
+    assert shared.stats().layer_bytes == {"raster": 200}
+
+
+def test_eviction_prefers_fine_levels_and_keeps_coarse_tiles():
+    shared = SharedTileCache(budget_bytes=300, eviction_window=4)
+    cache = TileCache(shared=shared)
+    cache.put(_Key(3, 0, 0), _tile())
+    cache.put(_Key(0, 0, 0), _tile())
+    cache.put(_Key(0, 1, 0), _tile())
+    cache.put(_Key(0, 2, 0), _tile())
+
+    stats = shared.stats()
+    assert stats.total_bytes == 300
+    assert stats.evictions == 1
+    assert cache.get(_Key(3, 0, 0)) is not None
+    assert cache.get(_Key(0, 0, 0)) is None
+
+    shared.set_budget_bytes(100)
+    assert cache.get(_Key(3, 0, 0)) is not None
+    assert len(cache) == 1
+    assert shared.stats().evicted_bytes == 300
+
+
+def test_max_items_caps_a_single_view_in_lru_order():
+    shared = SharedTileCache(budget_bytes=10_000)
+    cache = TileCache(max_items=2, shared=shared)
+    for tx in range(3):
+        cache.put(_Key(0, tx, 0), _tile())
+    assert len(cache) == 2
+    assert cache.get(_Key(0, 0, 0)) is None
+    assert cache.get(_Key(0, 2, 0)) is not None
+
+
+def test_estimate_tile_nbytes_handles_arrays_and_bytes():
+    assert estimate_tile_nbytes(np.zeros((4, 4, 4), dtype=np.uint8)) == 64
+    assert estimate_tile_nbytes(b"abc") == 3
+    assert estimate_tile_nbytes(object()) == 0
@@ -0,0 +1,135 @@
+from __future__ import annotations
+
+import numpy as np
+from qtpy import QtWidgets
+
+from annolid.gui.widgets.timeline_panel import (
+    TimelineEvent,
+    TimelineGraphicsView,
+    TimelineIntervalIndex,
+    TimelineModel,
+    TimelineSegmentItem,
+    TimelineTrack,
+)
+
+
+def _ensure_qapp() -> QtWidgets.QApplication:
+    app = QtWidgets.QApplication.instance()
+    if app is None:
+        app = QtWidgets.QApplication([])
+    return app
+
+
+def _bouts(count: int, *, spacing: int = 5, track_id: str = "grooming") -> list:
+    return [
+        TimelineEvent(
+            track_id=track_id,
+            start_frame=idx * spacing,
+            end_frame=idx * spacing + 1 + idx % 3,
+            label=track_id,
+            behavior=track_id,
+            kind="behavior",
+        )
+        for idx in range(count)
+    ]
+
+
+def test_interval_index_matches_brute_force() -> None:
+    rng = np.random.default_rng(3)
+    events = []
+    for idx in range(400):
+        start = int(rng.integers(0, 5000))
+        end = None if idx % 50 == 0 else start + int(rng.integers(0, 300))
+        events.append(TimelineEvent("row", start, end, "row"))
+    index = TimelineIntervalIndex(events)
+    horizon = 6000
+
+    def _end(event):
+        return horizon if event.end_frame is None else event.end_frame
+
+    for first, last in [(0, 10), (1200, 1300), (4990, 7000), (-5, -1)]:
+        expected = {
+            id(event)
+            for event in events
+            if event.start_frame <= last and _end(event) >= first
+        }
+        assert {id(event) for event in index.query(first, last)} == expected
+        assert index.count(first, last) == len(expected)
+
+    coverage = np.zeros(horizon + 1, dtype=np.int64)
+    for event in events:
+        coverage[event.start_frame : min(_end(event), horizon) + 1] += 1
+    for level in (0, 2):
+        bin_frames = TimelineIntervalIndex.bin_frames(level)
+        padded = np.zeros(len(index.density(level, horizon)) * bin_frames, np.int64)
+        padded[: len(coverage)] = coverage
+        expected_bins = padded.reshape(-1, bin_frames).sum(axis=1)
+        assert np.array_equal(index.density(level, horizon), expected_bins)
+
+
+def test_model_emits_incremental_edits_for_small_changes() -> None:
+    model = TimelineModel()
+    events = _bouts(200)
+    full: list[int] = []
+    edits: list[tuple] = []
+    model.changed.connect(lambda: full.append(1))
+    model.eventsEdited.connect(lambda removed, added: edits.append((removed, added)))
+
+    model.set_events(events)
+    assert full == [1] and not edits
+
+    moved = TimelineEvent("grooming", 3, 4, "grooming", behavior="grooming")
+    model.set_events([moved] + events[1:])
+    assert full == [1]
+    assert edits == [([events[0]], [moved])]
+    assert model.index("grooming").query(3, 3) == [moved]
+
+    model.set_events([moved] + events[1:])
+    assert len(edits) == 1
+
+
+def test_view_culls_to_viewport_and_patches_edits() -> None:
+    _ensure_qapp()
+    view = TimelineGraphicsView()
+    view.resize(640, 200)
+    view.show()
+    _ensure_qapp().processEvents()
+
+    events = _bouts(20000)
+    model = TimelineModel()
+    model.set_tracks([TimelineTrack("grooming", "grooming", behaviors=("grooming",))])
+    model.set_events(events)
+    view.set_model(model)
+    view.set_time_range(0, 100000)
+    _ensure_qapp().processEvents()
+
+    def _segments():
+        return [
+            item
+            for item in view.scene().items()
+            if isinstance(item, TimelineSegmentItem)
+        ]
+
+    segments = _segments()
+    assert 0 < len(segments) < 2000
+    first, last = view._rendered_frames
+    assert all(first <= item.data(0).end_frame for item in segments)
+    assert all(item.data(0).start_frame <= last for item in segments)
+
+    kept = {id(item) for item in segments if item.data(0) is not events[0]}
+    moved = TimelineEvent("grooming", 2, 3, "grooming", behavior="grooming")
+    model.set_events([moved] + events[1:])
+    after = _segments()
+    assert [item for item in after if item.data(0) is moved]
+    assert not [item for item in after if item.data(0) is events[0]]
+    assert kept <= {id(item) for item in after}
+
+    # Zoomed out, the crowded row is drawn as density bars instead.
+    view.set_zoom_factor(0.1)
+    _ensure_qapp().processEvents()
+    assert view._row_is_density["grooming"] is True
+    assert not _segments()
+    assert any(
+        isinstance(item, QtWidgets.QGraphicsPathItem) for item in view.scene().items()
+    )
+    view.close()
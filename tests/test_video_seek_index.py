@@ -0,0 +1,139 @@
+from pathlib import Path
+
+import cv2
+import numpy as np
+import pytest
+
+from annolid.core.media.seek_index import VideoSeekIndex, seek_capture, seek_index_path
+from annolid.core.media.video import CV2Video
+
+
+def _write_test_video(path: Path, frames: int = 24) -> None:
+    width, height = 64, 48
+    writer = cv2.VideoWriter(
+        str(path), cv2.VideoWriter_fourcc(*"MJPG"), 10.0, (width, height)
+    )
+    if not writer.isOpened():
+        pytest.skip("OpenCV VideoWriter is not available in this environment.")
+    try:
+        for idx in range(frames):
+            frame = np.zeros((height, width, 3), dtype=np.uint8)
+            frame[..., 1] = idx * 10
+            writer.write(frame)
+    finally:
+        writer.release()
+
+
+def test_seek_index_maps_keyframes_to_presentation_order(tmp_path: Path):
+    video_path = tmp_path / "clip.mp4"
+    video_path.write_bytes(b"stub")
+    # Decode order I P B B I P B: pts reveal presentation order.
+    packets = [
+        {"pts_time": "0.0", "pos": "48", "flags": "K__"},
+        {"pts_time": "0.3", "pos": "900", "flags": "___"},
+        {"pts_time": "0.1", "pos": "1200", "flags": "___"},
+        {"pts_time": "0.2", "pos": "1300", "flags": "___"},
+        {"pts_time": "0.4", "pos": "1400", "flags": "K__"},
+        {"pts_time": "N/A", "dts_time": "0.6", "pos": "2000", "flags": "___"},
+        {"pts_time": "0.5", "pos": "2100", "flags": "___"},
+    ]
+
+    index = VideoSeekIndex.from_packets(video_path, packets)
+
+    assert index.keyframes == [0, 4]
+    assert index.keyframe_positions == [48, 1400]
+    assert index.frame_count == 7
+    assert index.keyframe_at_or_before(3) == 0
+    assert index.keyframe_at_or_before(4) == 4
+    assert index.keyframe_at_or_before(6) == 4
+    assert index.max_gop_length() == 4
+
+
+def test_seek_index_persists_and_invalidates_on_video_change(tmp_path: Path):
+    video_path = tmp_path / "clip.mp4"
+    video_path.write_bytes(b"stub")
+    index = VideoSeekIndex.from_packets(
+        video_path, [{"pts_time": str(i / 10), "flags": "K__"} for i in range(3)]
+    )
+
+    assert index.save() == seek_index_path(video_path)
+    loaded = VideoSeekIndex.load(video_path)
+    assert loaded is not None and loaded.keyframes == [0, 1, 2]
+
+    video_path.write_bytes(b"changed contents")
+    assert VideoSeekIndex.load(video_path) is None
+
+
+def test_cv2video_random_access_uses_persisted_seek_index(tmp_path: Path):
+    video_path = tmp_path / "clip.avi"
+    _write_test_video(video_path)
+    VideoSeekIndex.from_packets(
+        video_path,
+        [
+            {"pts_time": str(i / 10), "flags": "K__" if i % 8 == 0 else "___"}
+            for i in range(24)
+        ],
+    ).save()
+
+    reference = CV2Video(video_path, seek_index=False)
+    video = CV2Video(video_path)
+    try:
+        assert video.seek_index is not None
+        assert video.seek_index.keyframes == [0, 8, 16]
+        for frame_number in [5, 6, 19, 2, 17, 23, 9]:
+            np.testing.assert_array_equal(
+                video.load_frame(frame_number), reference.load_frame(frame_number)
+            )
+    finally:
+        reference.release()
+        video.release()
+
+
+class _RecordingCapture:
+    def __init__(self, landed: float, time_seek_ok: bool = True) -> None:
+        self.landed = landed
+        self.time_seek_ok = time_seek_ok
+        self.calls = []
+        self.grabs = 0
+
+    def set(self, prop, value):
+        self.calls.append((prop, value))
+        return self.time_seek_ok if prop == cv2.CAP_PROP_POS_MSEC else True
+
+    def get(self, prop):
+        assert prop == cv2.CAP_PROP_POS_FRAMES
+        return self.landed
+
+    def grab(self):
+        self.grabs += 1
+        return True
+
+
+def test_seek_capture_seeks_by_keyframe_time_and_checks_landing(tmp_path: Path):
+    video_path = tmp_path / "clip.mp4"
+    video_path.write_bytes(b"stub")
+    # Variable frame rate: the keyframe at frame 8 sits at 2.5 s, not 0.8 s.
+    times = [1.0 + i * 0.1 for i in range(8)] + [3.5 + i * 0.1 for i in range(8)]
+    index = VideoSeekIndex.from_packets(
+        video_path,
+        [
+            {"pts_time": str(t), "flags": "K__" if i % 8 == 0 else "___"}
+            for i, t in enumerate(times)
+        ],
+    )
+
+    cap = _RecordingCapture(landed=8.0)
+    seek_capture(cap, 11, index)
+    assert cap.calls == [(cv2.CAP_PROP_POS_MSEC, pytest.approx(2500.0))]
+    assert cap.grabs == 3
+
+    # The container seek overshot the target: fall back to the frame seek.
+    cap = _RecordingCapture(landed=12.0)
+    seek_capture(cap, 11, index)
+    assert cap.calls[-1] == (cv2.CAP_PROP_POS_FRAMES, 8)
+    assert cap.grabs == 3
+
+    # A seek that lands early is still grabbed forward to the exact frame.
+    cap = _RecordingCapture(landed=7.0)
+    seek_capture(cap, 11, index)
+    assert len(cap.calls) == 1 and cap.grabs == 4
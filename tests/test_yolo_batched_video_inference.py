@@ -0,0 +1,131 @@
+from __future__ import annotations
+
+import json
+from collections import defaultdict
+from pathlib import Path
+
+import cv2
+import numpy as np
+import torch
+
+from annolid.segmentation.yolos import InferenceProcessor
+
+
+class _FakeBox:
+    def __init__(self, cls_id: int) -> None:
+        self.cls = int(cls_id)
+
+
+class _FakeBoxes:
+    def __init__(self, xywh) -> None:
+        self.xywh = torch.tensor(xywh, dtype=torch.float32)
+        self.id = None
+
+    def __len__(self) -> int:
+        return int(self.xywh.shape[0])
+
+    def __iter__(self):
+        return iter([_FakeBox(0) for _ in range(len(self))])
+
+
+class _FakeKeypoints:
+    def __init__(self, xy) -> None:
+        self.xy = torch.tensor(xy, dtype=torch.float32)
+        self.conf = torch.ones(self.xy.shape[:2], dtype=torch.float32)
+
+
+class _FakeResult:
+    def __init__(self, frame: np.ndarray) -> None:
+        # Keypoints follow the frame brightness so every frame gets its own output.
+        level = float(frame.mean())
+        self.boxes = _FakeBoxes([[level, level, 4.0, 4.0]])
+        self.keypoints = _FakeKeypoints([[[level, 1.0], [2.0, level]]])
+        self.names = {0: "mouse"}
+        self.masks = None
+
+
+class _FakePoseModel:
+    def __init__(self) -> None:
+        self.calls = []
+
+    def predict(self, source, verbose=False):
+        frames = source if isinstance(source, list) else [source]
+        self.calls.append(len(frames))
+        return [_FakeResult(frame) for frame in frames]
+
+
+def _build_processor() -> InferenceProcessor:
+    proc = InferenceProcessor.__new__(InferenceProcessor)
+    proc.model_type = "yolo"
+    proc.model_name = "yolo11n-pose.pt"
+    proc._is_coreml = False
+    proc.keypoint_names = ["nose", "tail"]
+    proc.track_history = defaultdict(list)
+    proc.persist_json = True
+    proc.frame_count = 0
+    proc.model = _FakePoseModel()
+    return proc
+
+
+def _write_video(path: Path, count: int = 11) -> Path:
+    writer = cv2.VideoWriter(str(path), cv2.VideoWriter_fourcc(*"MJPG"), 10.0, (32, 24))
+    for idx in range(count):
+        writer.write(np.full((24, 32, 3), (10 + idx * 20) % 250, dtype=np.uint8))
+    writer.release()
+    return path
+
+
+def _outputs(folder: Path) -> dict:
+    return {
+        path.name: [
+            (shape["label"], shape["points"])
+            for shape in json.loads(path.read_text(encoding="utf-8"))["shapes"]
+        ]
+        for path in sorted(folder.glob("*.json"))
+    }
+
+
+def test_batched_video_inference_matches_per_frame(tmp_path: Path) -> None:
+    video = _write_video(tmp_path / "clip.avi")
+    for step in (1, 3):
+        serial = _build_processor()
+        serial_message = serial._run_yolo_video_inference_cv2(
+            str(video),
+            output_directory=tmp_path / f"serial_{step}" / "clip",
+            step=step,
+            enable_tracking=False,
+        )
+        batched = _build_processor()
+        progress = []
+        batched_message = batched._run_yolo_video_inference_cv2(
+            str(video),
+            output_directory=tmp_path / f"batched_{step}" / "clip",
+            step=step,
+            enable_tracking=False,
+            batch_size=4,
+            progress_callback=lambda done, total: progress.append((done, total)),
+        )
+
+        expected = _outputs(tmp_path / f"serial_{step}" / "clip")
+        assert expected
+        assert _outputs(tmp_path / f"batched_{step}" / "clip") == expected
+        assert batched_message == serial_message
+        assert max(batched.model.calls) > 1
+        assert [done for done, _total in progress] == list(range(1, len(expected) + 1))
+
+
+def test_batched_video_inference_falls_back_for_tracking(tmp_path: Path) -> None:
+    video = _write_video(tmp_path / "clip.avi", count=4)
+    processor = _build_processor()
+    processor.model_name = "yolo11n-seg.pt"
+    processor.model.track = lambda frame, **_kwargs: processor.model.predict(frame)
+
+    message = processor._run_yolo_video_inference_cv2(
+        str(video),
+        output_directory=tmp_path / "clip",
+        enable_tracking=True,
+        batch_size=4,
+    )
+
+    assert message == "Done#4"
+    assert processor.model.calls == [1, 1, 1, 1]
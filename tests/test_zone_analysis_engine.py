@@ -2,6 +2,7 @@ from __future__ import annotations
 
 from pathlib import Path
 
+import numpy as np
 import pandas as pd
 
 from annolid.gui.widgets.zone_manager_utils import write_zone_json
@@ -399,3 +400,49 @@ def test_assay_summary_report_labels_profile_and_zone_access(tmp_path):
     assert "Blocked zones" in markdown
     assert "## Metrics Computed" in markdown
     assert "`occupancy_frames`" in markdown
+
+
+def test_generic_zone_engine_batched_labels_match_scalar_resolver():
+    engine = _build_test_engine()
+    xs, ys = np.meshgrid(np.arange(-5, 106, 2.5), np.arange(-5, 106, 2.5))
+    xs = xs.ravel()
+    ys = ys.ravel()
+
+    label_indices = engine._resolve_zone_label_indices(xs, ys)
+
+    expected = [engine._resolve_zone_label(x, y) for x, y in zip(xs, ys)]
+    resolved = [
+        engine._zone_labels[index] if index >= 0 else None for index in label_indices
+    ]
+    assert resolved == expected
+
+
+def test_generic_zone_engine_run_length_segments_split_on_frame_gaps():
+    engine = _build_test_engine()
+    dataframe = pd.DataFrame(
+        [
+            {"frame_number": 0, "instance_name": "mouse", "cx": 10, "cy": 50},
+            {"frame_number": 1, "instance_name": "mouse", "cx": 12, "cy": 50},
+            {"frame_number": 5, "instance_name": "mouse", "cx": 14, "cy": 50},
+            {"frame_number": 6, "instance_name": "mouse", "cx": 70, "cy": 50},
+            {"frame_number": 7, "instance_name": "mouse", "cx": 16, "cy": 50},
+        ]
+    )
+
+    result = engine.analyze_instance(dataframe, "mouse")
+
+    assert [
+        (segment.zone_label, segment.start_frame, segment.end_frame)
+        for segment in result.segments
+    ] == [
+        ("left_chamber", 0, 1),
+        ("left_chamber", 5, 5),
+        ("center_chamber", 6, 6),
+        ("left_chamber", 7, 7),
+    ]
+    assert result.entry_counts == {"left_chamber": 3, "center_chamber": 1}
+    assert result.dwell_frames == {"left_chamber": 4, "center_chamber": 1}
+    assert result.transition_counts == {
+        "left_chamber": {"center_chamber": 1},
+        "center_chamber": {"left_chamber": 1},
+    }
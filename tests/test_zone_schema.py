@@ -2,10 +2,18 @@ from __future__ import annotations
 
 import json
 
+import numpy as np
 import pandas as pd
 
 from annolid.postprocessing.tracking_results_analyzer import TrackingResultsAnalyzer
-from annolid.postprocessing.zone_schema import build_zone_shape, load_zone_shapes
+from annolid.postprocessing.zone_schema import (
+    build_zone_shape,
+    load_zone_shapes,
+    zone_shape_covers_point,
+    zone_shape_distance_to_point,
+    zone_shapes_cover_points,
+    zone_shapes_distance_to_points,
+)
 
 
 def test_build_zone_shape_adds_explicit_semantics():
@@ -107,3 +115,30 @@ def test_tracking_results_analyzer_uses_normalized_zone_shapes_without_mutation(
 
     assert result["zone_legacy"] == 2
     assert analyzer.zone_data["shapes"][0]["points"] == [[10, 10], [30, 30]]
+
+
+def test_vectorized_zone_tests_match_scalar_helpers():
+    specs = load_zone_shapes(
+        {
+            "shapes": [
+                build_zone_shape("left", [[0, 0], [10, 10]], shape_type="rectangle"),
+                build_zone_shape("tri", [[20, 0], [30, 0], [25, 8]]),
+                build_zone_shape("line", [[0, 0], [5, 5]], shape_type="line"),
+            ]
+        }
+    )
+    points = np.array([[5.0, 5.0], [10.0, 3.0], [25.0, 2.0], [40.0, 40.0]])
+
+    covered = zone_shapes_cover_points(specs, points)
+    distance = zone_shapes_distance_to_points(specs, points)
+
+    assert covered.shape == distance.shape == (len(points), len(specs))
+    for row, point in enumerate(points):
+        for column, spec in enumerate(specs):
+            assert covered[row, column] == zone_shape_covers_point(spec, point)
+            expected = zone_shape_distance_to_point(spec, point)
+            if expected is None:
+                assert np.isnan(distance[row, column])
+            else:
+                assert distance[row, column] == expected
+    assert zone_shapes_cover_points(specs, np.empty((0, 2))).shape == (0, 3)